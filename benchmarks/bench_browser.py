@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+ファイルブラウザのベンチマーク
+
+大量のファイルがあるディレクトリで、j（下へ移動）1回ごとの処理
+（move_down + 表示範囲の取得 + 選択中のファイル + ファイル数）の時間を計測する。
+比較用に、キー入力のたびに os.listdir + os.path.isdir + ソートで
+一覧を作り直す方式も計測する
+
+    python benchmarks/bench_browser.py [ファイル数]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.file_selector import FileBrowser, FileSelector
+
+VIEW_HEIGHT = 50
+REPEAT = 1000
+NAIVE_REPEAT = 5
+
+
+def list_directory_naive(directory: str):
+    """キャッシュなしでディレクトリ一覧を作る（1キーごとに呼ばれていた処理）"""
+    files = []
+    for item in os.listdir(directory):
+        if item.startswith('.'):
+            continue
+        full_path = os.path.join(directory, item)
+        files.append((item, full_path, os.path.isdir(full_path)))
+    files.sort(key=lambda x: x[0].lower())
+    return [f for f in files if f[2]] + [f for f in files if not f[2]]
+
+
+def timed(func, count: int) -> float:
+    """1回あたりの時間（ミリ秒）"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as workdir:
+        for i in range(count):
+            open(os.path.join(workdir, f"file_{i:07d}.txt"), 'w').close()
+        for i in range(100):
+            os.mkdir(os.path.join(workdir, f"dir_{i:03d}"))
+
+        selector = FileSelector()
+        selector.change_directory(workdir)
+        browser = FileBrowser(selector)
+
+        start = time.perf_counter()
+        browser.get_display_files(VIEW_HEIGHT)
+        first_ms = (time.perf_counter() - start) * 1000
+
+        def keypress():
+            browser.move_down()
+            browser.get_display_files(VIEW_HEIGHT)
+            browser.get_selected_file()
+            len(selector.get_files_in_directory())
+
+        def keypress_naive():
+            # move_down・表示・選択・ファイル数でそれぞれ一覧を作り直していた
+            for _ in range(4):
+                list_directory_naive(workdir)
+
+        def sort_by_modified():
+            selector.sort_by = 'modified'
+            selector.get_files_in_directory()
+            selector.sort_by = 'name'
+
+        print(f"File browser benchmark: {count} files")
+        print(f"first listing (scandir): {first_ms:.2f} ms")
+        print(f"{'operation':<28} {'ms/op':>10}")
+        print(f"{'j (cached snapshot)':<28} {timed(keypress, REPEAT):>10.4f}")
+        print(f"{'sort by mtime (first time)':<28} {timed(sort_by_modified, 1):>10.2f}")
+        print(f"{'j (listdir per call)':<28} {timed(keypress_naive, NAIVE_REPEAT):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Buffer ストアのベンチマーク
+
+従来の list[str] ストアと ChunkedLineStore を 1M 行のバッファで比較する
+
+    python benchmarks/bench_buffer.py [行数]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.buffer import Buffer
+from uzuki.core.text_store import ChunkedLineStore, ListLineStore
+
+OPS = 2000
+
+
+def measure(func) -> float:
+    """処理時間（ミリ秒）を計測"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(store_factory, lines):
+    buf = Buffer(store_factory)
+    results = {}
+    results['load'] = measure(lambda: setattr(buf, 'lines', lines))
+
+    def split_top():
+        for i in range(OPS):
+            buf.split_line(10, 3)
+
+    def insert_top():
+        for i in range(OPS):
+            buf.insert(10, 0, 'x')
+
+    def delete_lines_top():
+        for i in range(OPS):
+            del buf.lines[10]
+
+    def random_lookup():
+        total = len(buf.lines)
+        step = total // OPS
+        for i in range(0, total, step):
+            buf.lines[i]
+
+    def viewport_read():
+        middle = len(buf.lines) // 2
+        for i in range(OPS):
+            buf.lines[middle:middle + 50]
+
+    results['split_line (top)'] = measure(split_top)
+    results['insert char (top)'] = measure(insert_top)
+    results['delete line (top)'] = measure(delete_lines_top)
+    results['line lookup'] = measure(random_lookup)
+    results['viewport slice'] = measure(viewport_read)
+    results['full iteration'] = measure(lambda: sum(1 for _ in buf.lines))
+    return results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lines = [f"line {i}: the quick brown fox jumps over the lazy dog" for i in range(count)]
+
+    print(f"Buffer benchmark: {count} lines, {OPS} ops per row (ms)")
+    list_results = run(ListLineStore, lines)
+    chunked_results = run(ChunkedLineStore, lines)
+
+    print(f"{'operation':<20} {'list':>10} {'chunked':>10} {'speedup':>9}")
+    for name in list_results:
+        a = list_results[name]
+        b = chunked_results[name]
+        speedup = a / b if b else float('inf')
+        print(f"{name:<20} {a:>10.1f} {b:>10.1f} {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
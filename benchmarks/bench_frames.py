@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+描画スケジューラのベンチマーク
+
+疑似端末（pty）上のエディタにキーリピート相当の速さで j を送り、
+端末側の読み出し速度を絞って遅い回線を模擬したときの描画フレーム数・
+出力バイト数・処理時間を最大 fps ごとに比較する（0 は制限なし）
+
+    python benchmarks/bench_frames.py [キー数] [回線速度KB/s]
+"""
+
+import fcntl
+import glob
+import os
+import re
+import select
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_render import read_until_quiet, start_editor
+
+FPS_CAPS = [0, 60, 20]
+KEY_INTERVAL = 0.002  # キーリピートの間隔（秒）
+
+
+def throttled_read(fd, budget: int) -> int:
+    """最大 budget バイトだけ読む"""
+    ready, _, _ = select.select([fd], [], [], 0)
+    if not ready or budget <= 0:
+        return 0
+    try:
+        return len(os.read(fd, budget))
+    except OSError:
+        return 0
+
+
+def run(fps: int, keys: int, rate: int):
+    """1回分の計測（出力バイト数, 秒数, 描画フレーム数, スキップ数）"""
+    with tempfile.TemporaryDirectory() as workdir:
+        config_dir = os.path.join(workdir, '.config', 'uzuki')
+        os.makedirs(config_dir)
+        with open(os.path.join(config_dir, 'init.py'), 'w') as f:
+            f.write(f"set_display('max_fps', {fps})\n")
+        filepath = os.path.join(workdir, 'sample.txt')
+        with open(filepath, 'w') as f:
+            for i in range(keys + 100):
+                f.write(f"line {i}: the quick brown fox jumps over the lazy dog\n")
+
+        os.environ['HOME'] = workdir
+        pid, fd = start_editor(filepath, workdir)
+        try:
+            time.sleep(0.5)
+            read_until_quiet(fd, 0.5)
+            flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+            total = 0
+            start = time.perf_counter()
+            sent = 0
+            last_tick = start
+            budget = 0
+            last_output = start
+            while True:
+                now = time.perf_counter()
+                if sent < keys and now - start >= sent * KEY_INTERVAL:
+                    try:
+                        os.write(fd, b'j')
+                        sent += 1
+                    except BlockingIOError:
+                        pass
+                # 回線速度ぶんだけ読み出せる
+                budget += int((now - last_tick) * rate)
+                last_tick = now
+                count = throttled_read(fd, min(budget, 4096))
+                budget -= count
+                total += count
+                if count:
+                    last_output = now
+                elif sent >= keys and now - last_output > 0.5:
+                    break
+                time.sleep(0.001)
+            elapsed = last_output - start
+
+            fcntl.fcntl(fd, fcntl.F_SETFL, flags)
+            os.write(fd, b':q\r')
+            read_until_quiet(fd, 0.5)
+        finally:
+            try:
+                os.kill(pid, 9)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+
+        rendered = skipped = -1
+        for log in glob.glob(os.path.join(workdir, 'uzuki_debug_*.log')):
+            with open(log) as f:
+                match = re.search(r"Frames rendered: (\d+), skipped: (\d+)", f.read())
+            if match:
+                rendered, skipped = int(match.group(1)), int(match.group(2))
+        return total, elapsed, rendered, skipped
+
+
+def main():
+    keys = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rate = int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else 32 * 1024
+    print(f"Frame benchmark: {keys} x 'j' every {KEY_INTERVAL * 1000:.0f} ms, link {rate // 1024} KB/s")
+    print(f"{'max_fps':>7} {'bytes':>8} {'seconds':>8} {'rendered':>9} {'skipped':>8}")
+    for fps in FPS_CAPS:
+        total, elapsed, rendered, skipped = run(fps, keys, rate)
+        print(f"{fps:>7} {total:>8} {elapsed:>8.2f} {rendered:>9} {skipped:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+ファジーファインダーのベンチマーク
+
+合成したファイルパスの一覧に対して、1文字ずつ入力したときの
+1キーあたりの処理（最初の絞り込み + 上位の取得）の時間と、
+その入力で全件を調べ終えるまでの時間を計測する。比較用に、キー入力のたびに
+全件のスコアを計算して並べ替える方式も計測する。保存した索引の読み込み時間も計測する
+
+    python benchmarks/bench_fuzzy.py [ファイル数] [入力]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.file_index import FileIndex
+from uzuki.core.fuzzy import FuzzyMatcher, fuzzy_score
+
+WORDS = ['src', 'lib', 'core', 'utils', 'test', 'components', 'models', 'views',
+         'api', 'internal', 'docs', 'vendor', 'build', 'config', 'handlers', 'service']
+EXTENSIONS = ['py', 'js', 'ts', 'md', 'c', 'h']
+STEP_BUDGET = 0.015  # FinderController.STEP_BUDGET と同じ
+LIMIT = 200
+
+
+def create_dirs(count: int):
+    """FileIndex のディレクトリごとの記録を合成する"""
+    rng = random.Random(1)
+    dirs = {}
+    for i in range(count):
+        rel = '/'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 5)))
+        name = f"{rng.choice(WORDS)}_{i}.{rng.choice(EXTENSIONS)}"
+        dirs.setdefault(rel, (0, [], []))[1].append(name)
+    return dirs
+
+
+def rank_naive(paths, query: str):
+    """全件のスコアを計算して並べ替える"""
+    scored = []
+    for path in paths:
+        score = fuzzy_score(query, path.lower())
+        if score is not None:
+            scored.append((score, -len(path), path))
+    scored.sort(reverse=True)
+    return [path for _, _, path in scored[:LIMIT]]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    query = sys.argv[2] if len(sys.argv) > 2 else 'coreutils'
+    with tempfile.TemporaryDirectory() as workdir:
+        index = FileIndex(workdir, index_dir=workdir)
+        index._dirs = create_dirs(count)
+        index.save()
+
+        start = time.perf_counter()
+        loaded = FileIndex(workdir, index_dir=workdir)
+        loaded.load()
+        load_ms = (time.perf_counter() - start) * 1000
+    paths = loaded.paths
+
+    print(f"Fuzzy finder benchmark: {len(paths)} paths, query {query!r}")
+    print(f"load saved index: {load_ms:.1f} ms")
+    print(f"{'query':<12} {'matches':>8} {'keystroke ms':>13} {'complete ms':>12} {'naive ms':>10}")
+    matcher = FuzzyMatcher(LIMIT)
+    for i in range(1, len(query) + 1):
+        typed = query[:i]
+        start = time.perf_counter()
+        matcher.set_query(typed)
+        finished = matcher.step(paths, STEP_BUDGET)
+        matcher.results()
+        keystroke_ms = (time.perf_counter() - start) * 1000
+        while not finished:
+            finished = matcher.step(paths, STEP_BUDGET)
+        complete_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        rank_naive(paths, typed)
+        naive_ms = (time.perf_counter() - start) * 1000
+        print(f"{typed:<12} {matcher.match_count:>8} {keystroke_ms:>13.1f} {complete_ms:>12.1f} {naive_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
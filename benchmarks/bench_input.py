@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+入力処理のベンチマーク
+
+疑似端末（pty）上のエディタに挿入モードで大量のテキストを流し込み、
+処理が終わるまでの時間から 1秒あたりのキー数を計測する
+（--paste でブラケットペーストとして送る）
+
+    python benchmarks/bench_input.py [KB] [--paste]
+"""
+
+import fcntl
+import os
+import select
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_render import read_until_quiet, start_editor
+
+LINE = "the quick brown fox jumps over the lazy dog 0123456789"
+
+
+def make_payload(size: int) -> bytes:
+    """改行を含む印字可能文字のテキストを作成"""
+    lines = []
+    total = 0
+    while total < size:
+        lines.append(LINE)
+        total += len(LINE) + 1
+    return ('\n'.join(lines)).encode()[:size]
+
+
+def feed(fd, data: bytes) -> float:
+    """出力を読みながらデータを書き込み、処理が落ち着くまでの秒数を返す"""
+    # 書き込みでブロックするとエディタ側の出力と詰まるのでノンブロッキングにする
+    flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+    start = time.perf_counter()
+    view = memoryview(data)
+    while view:
+        _, writable, _ = select.select([], [fd], [], 0.01)
+        if writable:
+            try:
+                view = view[os.write(fd, view[:4096]):]
+            except BlockingIOError:
+                pass
+        read_until_quiet(fd, 0)
+    fcntl.fcntl(fd, fcntl.F_SETFL, flags)
+    last_output = time.perf_counter()
+    while True:
+        ready, _, _ = select.select([fd], [], [], 0.5)
+        if not ready:
+            break
+        if not os.read(fd, 65536):
+            break
+        last_output = time.perf_counter()
+    return last_output - start
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    paste = '--paste' in sys.argv
+    size = int(args[0]) * 1024 if args else 50 * 1024
+    payload = make_payload(size)
+    with tempfile.TemporaryDirectory() as workdir:
+        filepath = os.path.join(workdir, 'paste.txt')
+        pid, fd = start_editor(filepath, workdir)
+        try:
+            time.sleep(0.5)
+            read_until_quiet(fd, 0.5)
+            os.write(fd, b'i')
+            read_until_quiet(fd)
+
+            if paste:
+                elapsed = feed(fd, b'\x1b[200~' + payload + b'\x1b[201~')
+            else:
+                elapsed = feed(fd, payload)
+
+            os.write(fd, b'\x1b')
+            read_until_quiet(fd, 0.3)
+            os.write(fd, b':w\n')
+            read_until_quiet(fd, 0.5)
+            with open(filepath, 'rb') as f:
+                saved = f.read()
+            ok = saved == payload
+            how = 'pasted' if paste else 'typed'
+            print(f"Input benchmark: {len(payload)} bytes {how} in insert mode")
+            print(f"elapsed:   {elapsed * 1000:.0f} ms")
+            print(f"keys/sec:  {len(payload) / elapsed:,.0f}")
+            print(f"content:   {'ok' if ok else f'MISMATCH ({len(saved)} bytes saved)'}")
+            os.write(fd, b':q\n')
+            read_until_quiet(fd, 0.3)
+        finally:
+            try:
+                os.kill(pid, 9)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    main()
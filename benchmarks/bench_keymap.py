@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+キーマップ検索のベンチマーク
+
+数千件のユーザーマッピングを登録した KeyMapManager で、1キーあたりの
+検索時間（get_action + has_potential_mapping）を計測する。
+比較用に従来のフラットリスト走査方式も同じデータで計測する
+
+    python benchmarks/bench_keymap.py [マッピング数]
+"""
+
+import itertools
+import os
+import string
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.input.keycodes import Key
+from uzuki.keymaps.manager import KeyMapManager
+
+LOOKUPS = 20_000
+
+# 典型的な入力（1キーずつ送ったときのシーケンス）
+INPUTS = ['j', 'k', 'l', 'x', 'g', 'gg', 'z', 'zab', 'ctrl_r', 'Q']
+
+
+class FakeMode:
+    """get_action_handlers だけを持つモード"""
+
+    def get_action_handlers(self):
+        return {name: (lambda: None) for name in (
+            'move_left', 'move_down', 'move_up', 'move_right', 'delete_char',
+            'undo', 'redo', 'enter_insert_mode', 'enter_command_mode',
+            'move_beginning_of_file', 'move_end_of_file', 'exit_insert_mode',
+        )}
+
+
+def create_manager(count: int) -> KeyMapManager:
+    """count 件のユーザーマッピングを登録したマネージャーを作成"""
+    mode = FakeMode()
+    editor = SimpleNamespace(normal_mode=mode, insert_mode=mode,
+                             command_mode=mode, file_browser_mode=mode)
+    manager = KeyMapManager(SimpleNamespace(editor=editor, quit=lambda: None,
+                                            save_file=lambda: None))
+    letters = itertools.product(string.ascii_lowercase, repeat=3)
+    for i, suffix in zip(range(count), letters):
+        mode_name = 'normal' if i % 2 == 0 else 'insert'
+        manager.add_keymap(mode_name, 'z' + ''.join(suffix), 'move_down')
+    return manager
+
+
+def legacy_lookup(manager: KeyMapManager, mode: str, sequence: str):
+    """従来方式（毎回ソートしてリストを走査）"""
+    keymaps = manager.keymaps
+    for keymap in sorted(keymaps, key=lambda x: len(x['key']), reverse=True):
+        if keymap['mode'] == mode and sequence == keymap['key']:
+            action = keymap['action']
+            return action if callable(action) else manager._get_action_handler(mode, action)
+    for keymap in sorted(keymaps, key=lambda x: len(x['key']), reverse=True):
+        if keymap['mode'] == 'global' and sequence == keymap['key']:
+            action = keymap['action']
+            return action if callable(action) else manager._get_action_handler('global', action)
+    keys = Key.split_keys(sequence)
+    for keymap in keymaps:
+        if keymap['mode'] in (mode, 'global'):
+            mapped = Key.split_keys(keymap['key'])
+            if len(mapped) > len(keys) and mapped[:len(keys)] == keys:
+                return None
+    return None
+
+
+def trie_lookup(manager: KeyMapManager, mode: str, sequence: str):
+    """プレフィックス木による検索"""
+    keys = Key.split_keys(sequence)
+    action = manager.get_action(mode, sequence, keys)
+    if action is None:
+        manager.has_potential_mapping(mode, sequence, keys)
+    return action
+
+
+def measure(lookup, manager: KeyMapManager, count: int) -> float:
+    """1回あたりの検索時間（マイクロ秒）を返す"""
+    inputs = list(itertools.islice(itertools.cycle(INPUTS), count))
+    start = time.perf_counter()
+    for sequence in inputs:
+        lookup(manager, 'normal', sequence)
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+
+    start = time.perf_counter()
+    manager = create_manager(count)
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    manager.get_action('normal', 'j')
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Keymap benchmark: {len(manager.keymaps)} mappings")
+    print(f"register: {build_ms:.1f} ms, compile (normal): {compile_ms:.2f} ms")
+    legacy_count = max(200, LOOKUPS // max(1, count // 50))
+    print(f"{'method':<8} {'lookups':>8} {'us/lookup':>10}")
+    print(f"{'legacy':<8} {legacy_count:>8} {measure(legacy_lookup, manager, legacy_count):>10.1f}")
+    print(f"{'trie':<8} {LOOKUPS:>8} {measure(trie_lookup, manager, LOOKUPS):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
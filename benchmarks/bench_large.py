@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+巨大ファイルモードのベンチマーク
+
+大きさを変えた Python ファイルを開いて（遅延読み込み）、末尾へ移動（G）・
+先頭へ移動（gg）・ページ送り・1行移動の1フレームあたりの描画時間を計測する。
+通常のモード（構文ハイライトあり）と巨大ファイルモード（ハイライトなし）を比較する。
+通常のモードの G はファイル先頭から字句解析するので、大きなファイルでは省略する
+
+    python benchmarks/bench_large.py [最大MB]
+"""
+
+import curses
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.file_manager import FileManager
+from uzuki.core.syntax import PythonLexer, SyntaxHighlighter
+from uzuki.ui.damage import DamageTracker
+from uzuki.ui.editor_display import EditorDisplay
+
+HEIGHT = 50
+WIDTH = 120
+REPEAT = 50
+NORMAL_MAX_MB = 16  # 通常のモードで G を計測する最大の大きさ
+
+LINE = 'def method_{n}(self, value: int = {n}) -> str:  # """ convert the value'
+
+
+class NullScreen:
+    """描画結果を捨てる stdscr の代わり"""
+
+    def addstr(self, *args):
+        pass
+
+    def erase(self):
+        pass
+
+    def move(self, *args):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+
+def create_file(path: str, size_mb: int):
+    line_bytes = len(LINE.format(n=0)) + 8
+    with open(path, 'w') as f:
+        for n in range(size_mb * 1024 * 1024 // line_bytes):
+            f.write(LINE.format(n=n) + '\n')
+
+
+def bench(lines, highlight: bool, jump: bool):
+    """(G, gg, Ctrl-F, j) の1フレームあたりのミリ秒（jump が偽なら G・gg は None）"""
+    display = EditorDisplay()
+    highlighter = SyntaxHighlighter()
+    highlighter.set_lexer(PythonLexer() if highlight else None)
+    display.highlighter = highlighter
+    screen = NullScreen()
+    damage = DamageTracker()
+    cursor = [0]
+
+    def render():
+        display.render(screen, lines, cursor[0], 0, 0, 0, HEIGHT, WIDTH, damage)
+        damage.clear()
+
+    def timed(func, count: int) -> float:
+        start = time.perf_counter()
+        for _ in range(count):
+            func()
+        return (time.perf_counter() - start) / count * 1000
+
+    def go(row):
+        def step():
+            cursor[0] = row
+            render()
+        return step
+
+    def page():
+        cursor[0] = min(cursor[0] + HEIGHT - 2, len(lines) - 1)
+        damage.mark_all()
+        render()
+
+    def down():
+        cursor[0] = min(cursor[0] + 1, len(lines) - 1)
+        render()
+
+    render()
+    g_ms = gg_ms = None
+    if jump:
+        g_ms = timed(go(len(lines) - 1), 1)  # 初回（字句解析が必要なら最も遅い）
+        gg_ms = timed(go(0), 1)
+    cursor[0] = len(lines) // 2
+    render()
+    return g_ms, gg_ms, timed(page, REPEAT), timed(down, REPEAT)
+
+
+def main():
+    max_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    curses.has_colors = lambda: False  # 端末なしで描画する
+    sizes = [size for size in (4, 16, 64, 256, 1024) if size <= max_mb]
+
+    def fmt(value):
+        return f"{value:>10.2f}" if value is not None else f"{'-':>10}"
+
+    print(f"Large file benchmark: {HEIGHT}x{WIDTH} view, ms per frame")
+    print(f"{'MB':>6} {'mode':<8} {'lines':>10} {'G':>10} {'gg':>10} {'Ctrl-F':>10} {'j':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size_mb in sizes:
+            path = os.path.join(workdir, f"{size_mb}.py")
+            create_file(path, size_mb)
+            manager = FileManager()
+            lines = manager.load_file(path, lazy_threshold=0)  # 巨大ファイルモードと同じく遅延読み込みする
+            for mode, highlight in (('normal', True), ('large', False)):
+                result = bench(lines, highlight, jump=not highlight or size_mb <= NORMAL_MAX_MB)
+                print(f"{size_mb:>6} {mode:<8} {len(lines):>10} " + ' '.join(fmt(value) for value in result))
+            if manager.mapped_source is not None:
+                manager.mapped_source.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+ファイル読み込みのベンチマーク
+
+遅延読み込み（mmap）の閾値より小さい大きなファイルを、従来どおり
+読み込みが終わるまで待つ方式と、別スレッドで読み込む FileLoader で読み込み、
+最初の画面分の行が表示できるまでの時間と、読み込み完了までの時間を計測する。
+FileLoader では読み込み中にメインスレッドが何回アイドル処理を回せたかも数える
+
+    python benchmarks/bench_load.py [サイズ(MB)]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.file_loader import FileLoader
+from uzuki.core.file_manager import FileManager
+
+SCREEN_LINES = 50
+IDLE_POLL = 0.01  # メインスレッドの入力待ちの間隔の代わり
+
+
+def create_file(path: str, size_mb: int):
+    line = "line {}: the quick brown fox jumps over the lazy dog / 日本語の行\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        written = 0
+        i = 0
+        while written < size_mb * 1024 * 1024:
+            text = line.format(i)
+            f.write(text)
+            written += len(text.encode('utf-8'))
+            i += 1
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 48
+    size_mb = min(size_mb, FileManager.LAZY_LOAD_THRESHOLD // (1024 * 1024) - 1)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'sample.txt')
+        create_file(path, size_mb)
+
+        start = time.perf_counter()
+        lines = FileManager().load_file(path)
+        blocking_ms = (time.perf_counter() - start) * 1000
+        count = len(lines)
+        del lines
+
+        start = time.perf_counter()
+        loader = FileLoader(path)
+        loader.start()
+        first_ms = None
+        polls = 0
+        while not loader.done:
+            polls += 1
+            if first_ms is None and loader.lines is not None and len(loader.lines) >= SCREEN_LINES:
+                first_ms = (time.perf_counter() - start) * 1000
+            time.sleep(IDLE_POLL)
+        total_ms = (time.perf_counter() - start) * 1000
+        if first_ms is None:
+            first_ms = total_ms
+
+        print(f"Load benchmark: {size_mb} MB, {count} lines")
+        print(f"{'method':<24} {'first screen ms':>16} {'complete ms':>12} {'idle polls':>11}")
+        print(f"{'blocking load':<24} {blocking_ms:>16.1f} {blocking_ms:>12.1f} {0:>11}")
+        print(f"{'FileLoader (thread)':<24} {first_ms:>16.1f} {total_ms:>12.1f} {polls:>11}")
+
+
+if __name__ == "__main__":
+    main()
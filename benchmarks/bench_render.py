@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+描画のベンチマーク
+
+疑似端末（pty）上でエディタを起動してキーを送り、1キーあたりに
+端末へ書き出されたバイト数を計測する。
+--split を付けると同じバッファを3つのウィンドウ（:vsplit + :split）で表示して計測する
+
+    python benchmarks/bench_render.py [行数] [--split]
+"""
+
+import fcntl
+import os
+import pty
+import select
+import struct
+import sys
+import tempfile
+import termios
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROWS = 40
+COLS = 120
+QUIET = 0.08  # この時間出力がなければ描画完了とみなす（秒）
+
+# (名前, キー列)
+SCENARIOS = [
+    ('move down (j)', 'j' * 30),
+    ('move right (l)', 'l' * 30),
+    ('insert char', 'i' + 'abcdefghij' * 3 + '\x1b'),
+    ('delete char (x)', 'x' * 30),
+    ('no-op (h at col 0)', '0' + 'h' * 30),
+]
+
+
+def read_until_quiet(fd, quiet: float = QUIET) -> int:
+    """出力が止まるまで読み、読んだバイト数を返す"""
+    total = 0
+    while True:
+        ready, _, _ = select.select([fd], [], [], quiet)
+        if not ready:
+            return total
+        try:
+            data = os.read(fd, 65536)
+        except OSError:
+            return total
+        if not data:
+            return total
+        total += len(data)
+
+
+def start_editor(filepath: str, workdir: str):
+    """pty 上でエディタを起動"""
+    pid, fd = pty.fork()
+    if pid == 0:
+        fcntl.ioctl(0, termios.TIOCSWINSZ, struct.pack('HHHH', ROWS, COLS, 0, 0))
+        os.chdir(workdir)
+        os.environ['TERM'] = 'xterm-256color'
+        code = (f"import sys; sys.path.insert(0, {ROOT!r}); "
+                f"sys.argv = ['uzuki', '--no-greeting', {filepath!r}]; "
+                "from uzuki.app import main; main()")
+        os.execv(sys.executable, [sys.executable, '-c', code])
+    return pid, fd
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    split = '--split' in sys.argv[1:]
+    count = int(args[0]) if args else 10_000
+    with tempfile.TemporaryDirectory() as workdir:
+        filepath = os.path.join(workdir, 'sample.txt')
+        with open(filepath, 'w') as f:
+            for i in range(count):
+                f.write(f"line {i}: the quick brown fox jumps over the lazy dog\n")
+
+        pid, fd = start_editor(filepath, workdir)
+        try:
+            time.sleep(0.5)
+            initial = read_until_quiet(fd, 0.5)
+            if split:
+                for command in (':vsplit\r', ':split\r'):
+                    os.write(fd, command.encode())
+                    initial += read_until_quiet(fd, 0.3)
+            windows = ', 3 windows' if split else ''
+            print(f"Render benchmark: {ROWS}x{COLS} terminal, {count} lines{windows}")
+            print(f"initial screen: {initial} bytes")
+            print(f"{'scenario':<22} {'keys':>5} {'bytes':>8} {'bytes/key':>10} {'ms/key':>8}")
+            for name, keys in SCENARIOS:
+                total = 0
+                start = time.perf_counter()
+                for key in keys:
+                    os.write(fd, key.encode())
+                    total += read_until_quiet(fd)
+                elapsed = (time.perf_counter() - start - QUIET * len(keys)) * 1000
+                print(f"{name:<22} {len(keys):>5} {total:>8} {total / len(keys):>10.1f} "
+                      f"{max(0.0, elapsed) / len(keys):>8.2f}")
+            os.write(fd, b':q\n')
+            read_until_quiet(fd, 0.3)
+        finally:
+            try:
+                os.kill(pid, 9)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+自動保存のベンチマーク
+
+大きなバッファを保存するときに、キー入力（1行の書き換え）が待たされる時間を
+同期保存とスナップショット + 書き込みスレッドで比べる。あわせて、
+スナップショットの作成時間と、バックアップをハードリンクで作る場合と
+内容をコピーする場合の時間を計測する
+
+    python benchmarks/bench_save.py [行数]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.file_manager import FileManager
+from uzuki.core.file_writer import FileWriter, WriteJob
+from uzuki.core.text_store import ChunkedLineStore
+
+
+def keystroke(store: ChunkedLineStore, i: int):
+    row = (i * 7919) % len(store)
+    store[row] = store[row] + 'x'
+
+
+def bench_sync(path: str, store: ChunkedLineStore):
+    """保存が終わるまで次のキー入力を処理できない"""
+    manager = FileManager()
+    start = time.perf_counter()
+    manager.save_file(path, store)
+    keystroke(store, 0)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_background(path: str, store: ChunkedLineStore):
+    """スナップショットを書き込みスレッドに渡し、書き込み中もキー入力を続ける"""
+    manager = FileManager()
+    writer = FileWriter()
+    start = time.perf_counter()
+    snapshot = store.snapshot()
+    snapshot_ms = (time.perf_counter() - start) * 1000
+    writer.submit(WriteJob(manager, path, snapshot, 'utf-8', '\n'))
+    worst = 0.0
+    count = 0
+    while writer.depth:
+        key_start = time.perf_counter()
+        keystroke(store, count)
+        worst = max(worst, time.perf_counter() - key_start)
+        count += 1
+        time.sleep(0.001)
+    writer.close()
+    job, = writer.poll()
+    return snapshot_ms, worst * 1000, count, job.elapsed * 1000
+
+
+def bench_backup(path: str):
+    manager = FileManager()
+    start = time.perf_counter()
+    manager._make_backup(path, '.bak')
+    link_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    shutil.copy2(path, path + '.copy')
+    copy_ms = (time.perf_counter() - start) * 1000
+    return link_ms, copy_ms
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    store = ChunkedLineStore(f"line {i}: the quick brown fox jumps over the lazy dog" for i in range(line_count))
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'file.txt')
+        sync_ms = bench_sync(path, store)
+        snapshot_ms, worst_ms, count, write_ms = bench_background(path, store)
+        link_ms, copy_ms = bench_backup(path)
+        size = os.path.getsize(path)
+
+    print(f"Save benchmark: {line_count} lines, {size / 1024 / 1024:.1f} MB")
+    print(f"{'synchronous save (keystroke waits)':<38} {sync_ms:>9.1f} ms")
+    print(f"{'snapshot for background save':<38} {snapshot_ms:>9.3f} ms")
+    print(f"{'worst keystroke during background save':<38} {worst_ms:>9.3f} ms  ({count} keystrokes)")
+    print(f"{'background save latency':<38} {write_ms:>9.1f} ms")
+    print(f"{'backup by hardlink':<38} {link_ms:>9.3f} ms")
+    print(f"{'backup by copy':<38} {copy_ms:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
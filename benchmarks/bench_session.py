@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+セッションの復元のベンチマーク
+
+50ファイルのセッションを復元する時間を、全ファイルを読み込む場合と1ファイルだけを
+開く場合と比較する（復元では表示していたバッファだけを記録したエンコーディングで
+読み、ほかは一覧に加えるだけ）。セッションファイルの大きさと保存時間も計測する
+
+    python benchmarks/bench_session.py [ファイルごとの行数]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.buffer_list import BufferList
+from uzuki.core.file_manager import FileManager
+from uzuki.core.history import History
+from uzuki.core.session import BufferState, Session, pack_history
+
+FILE_COUNT = 50
+LINE = "the quick brown fox jumps over the lazy dog, いろはにほへと"
+
+
+def make_history(edits: int):
+    """edits 回の編集（それぞれ別の変更）を持つ履歴"""
+    history = History()
+    for i in range(edits):
+        history.record('insert', i, 0, 'x')
+    return history.get_state()
+
+
+def timed(func, rounds: int = 5) -> float:
+    """func の1回あたりのミリ秒（最小値）"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = []
+        for i in range(FILE_COUNT):
+            path = os.path.join(workdir, f"file{i}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(f"{j} {LINE}" for j in range(line_count)))
+            paths.append(path)
+
+        session = Session([BufferState(path, 'utf-8', (i, 0), (0, 0, 0), BufferList.file_stat(path),
+                                       pack_history(make_history(1000)))
+                           for i, path in enumerate(paths)])
+        session_path = os.path.join(workdir, 'Session.uzuki')
+        save_ms = timed(lambda: session.save(session_path))
+        session_size = os.path.getsize(session_path)
+
+        def open_all():
+            buffers = BufferList()
+            for path in paths:
+                manager = FileManager()
+                buffers.add(manager).lines = manager.load_file(path)
+
+        def open_one():
+            BufferList().add(FileManager()).lines = FileManager().load_file(paths[0])
+
+        def restore():
+            buffers = BufferList()
+            restored = Session.load(session_path)
+            entries = restored.add_to(buffers)
+            entry = entries[restored.current]
+            manager = entry.file_manager
+            entry.lines = manager.load_file(manager.filename, encoding=manager.encoding)
+            undo_stack, redo_stack, size = entry.history  # 表示するバッファの履歴だけ戻す
+
+        all_ms = timed(open_all, rounds=2)
+        one_ms = timed(open_one)
+        restore_ms = timed(restore)
+
+    print(f"Session benchmark: {FILE_COUNT} files x {line_count} lines, 1000 undo steps each")
+    print(f"{'method':<40} {'ms':>8}")
+    print(f"{'open all files (eager)':<40} {all_ms:>8.1f}")
+    print(f"{'open one file':<40} {one_ms:>8.1f}")
+    print(f"{'restore session (lazy)':<40} {restore_ms:>8.1f}")
+    print(f"session file: {session_size} bytes, saved in {save_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
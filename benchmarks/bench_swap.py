@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+スワップファイルのベンチマーク
+
+1キーごとに編集を記録してスワップファイルに追記する時間を、ファイルの大きさを
+変えて計測する（追記はファイルの大きさによらないことの確認）。比較用に、
+キーごとにバッファ全体を書き出す場合の時間と、書き直し（compact）・復旧時の
+当て直しの時間も計測する
+
+    python benchmarks/bench_swap.py [キー数]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.buffer import Buffer
+from uzuki.core.swap_journal import SwapFile, SwapJournal
+
+LINE = "the quick brown fox jumps over the lazy dog"
+
+
+def bench(workdir: str, line_count: int, keys: int):
+    buffer = Buffer()
+    buffer.lines = [f"{i} {LINE}" for i in range(line_count)]
+    path = os.path.join(workdir, f"{line_count}.swp")
+    journal = SwapJournal(path, os.path.join(workdir, 'file.txt'), (0, line_count * 50))
+    journal.start()
+    buffer.add_edit_listener(journal.record)
+
+    # 1キーごとに記録して追記する（アイドルごとに flush される最悪の場合）
+    row = line_count // 2
+    start = time.perf_counter()
+    for i in range(keys):
+        if i % 10 == 9:
+            buffer.delete_text(row, 0, row, 1)
+        else:
+            buffer.insert_text(row, 0, 'x')
+        journal.flush()
+    append_us = (time.perf_counter() - start) / keys * 1_000_000
+    journal_size = journal.size
+
+    start = time.perf_counter()
+    journal.compact(buffer.lines)
+    compact_ms = (time.perf_counter() - start) * 1000
+
+    # 比較: キーごとにバッファ全体を書き出す
+    full_path = os.path.join(workdir, 'full.txt')
+    rounds = 3
+    start = time.perf_counter()
+    for _ in range(rounds):
+        with open(full_path, 'w') as f:
+            f.write('\n'.join(buffer.lines))
+    rewrite_ms = (time.perf_counter() - start) / rounds * 1000
+    journal.close()
+
+    # 復旧: キーごとの記録を当て直す
+    journal = SwapJournal(path, os.path.join(workdir, 'file.txt'), None)
+    journal.start()
+    replay_buffer = Buffer()
+    replay_buffer.lines = [f"{i} {LINE}" for i in range(line_count)]
+    replay_buffer.add_edit_listener(journal.record)
+    for i in range(keys):
+        replay_buffer.insert_text(i % line_count, 0, 'x')  # まとめられないように行を変える
+    journal.flush()
+    swap = SwapFile.read(path)
+    start = time.perf_counter()
+    swap.replay([f"{i} {LINE}" for i in range(line_count)])
+    replay_ms = (time.perf_counter() - start) * 1000
+    journal.close()
+    return append_us, journal_size, compact_ms, rewrite_ms, replay_ms
+
+
+def main():
+    keys = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"Swap journal benchmark: {keys} keystrokes")
+    print(f"{'lines':>9} {'append us/key':>14} {'journal bytes':>14} {'compact ms':>11} "
+          f"{'full write ms/key':>18} {'replay ms':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for line_count in (10_000, 100_000, 1_000_000):
+            append_us, size, compact_ms, rewrite_ms, replay_ms = bench(workdir, line_count, keys)
+            print(f"{line_count:>9} {append_us:>14.1f} {size:>14} {compact_ms:>11.1f} "
+                  f"{rewrite_ms:>18.1f} {replay_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+構文ハイライトのベンチマーク
+
+大きな Python ファイル相当のバッファで、1キー入力ごとの
+ハイライト処理（状態の更新 + 表示行のトークン取得）の時間を計測する。
+三重引用符を開閉して後続行の状態が変わる入力も含める。
+比較用にファイル先頭から毎回字句解析し直す方式も計測する
+
+    python benchmarks/bench_syntax.py [行数]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.buffer import Buffer
+from uzuki.core.syntax import PythonLexer, SyntaxHighlighter
+
+VIEW_HEIGHT = 50
+FRAME_MS = 1000 / 60
+
+TEMPLATE = [
+    'class Item{n}(Base):',
+    '    """Item number {n}."""',
+    '',
+    '    def method_{n}(self, value: int = {n}) -> str:',
+    '        # convert the value',
+    '        if value > 0x{n:x} and not isinstance(value, bool):',
+    '            return f"item {{value}}" + \'suffix\'',
+    '        return str(value * 1.5e3)',
+    '',
+]
+
+
+def create_lines(count: int):
+    lines = []
+    n = 0
+    while len(lines) < count:
+        lines.extend(line.format(n=n) for line in TEMPLATE)
+        n += 1
+    return lines[:count]
+
+
+def render_view(highlighter: SyntaxHighlighter, lines, top: int):
+    """表示範囲の状態を確定させてトークンを取得（描画1回分）"""
+    highlighter.prepare(lines, top + VIEW_HEIGHT)
+    for row in range(top, min(len(lines), top + VIEW_HEIGHT)):
+        highlighter.line_tokens(lines, row)
+
+
+def type_text(buffer: Buffer, render, row: int, text: str):
+    """row 行目の末尾に1文字ずつ入力し、1キーあたりの時間（ミリ秒）のリストを返す"""
+    timings = []
+    for char in text:
+        start = time.perf_counter()
+        buffer.insert_text(row, len(buffer.lines[row]), char)
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def full_relex(lexer: PythonLexer, lines, top: int):
+    """従来方式: 毎回ファイル先頭から字句解析して表示行の状態を求める"""
+    state = lexer.initial_state
+    for row in range(min(len(lines), top + VIEW_HEIGHT)):
+        if row >= top:
+            lexer.tokenize(lines[row], state)
+        state = lexer.end_state(lines[row], state)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    row = count // 2
+    top = row - VIEW_HEIGHT // 2
+    text = 'x = """abc""" + 1'
+
+    buffer = Buffer()
+    buffer.lines = create_lines(count)
+    highlighter = SyntaxHighlighter()
+    highlighter.set_filename('bench.py')
+    highlighter.attach(buffer)
+
+    start = time.perf_counter()
+    render_view(highlighter, buffer.lines, top)
+    first_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Syntax benchmark: {count} lines, typing {text!r} at line {row + 1}")
+    print(f"first render (lexer state up to line {top + VIEW_HEIGHT}): {first_ms:.1f} ms")
+    print(f"{'method':<12} {'keys':>5} {'avg ms':>8} {'max ms':>8} {'< frame':>8}")
+    for name, render in (
+        ('incremental', lambda: render_view(highlighter, buffer.lines, top)),
+        ('full', lambda: full_relex(highlighter.lexer, buffer.lines, top)),
+    ):
+        timings = type_text(buffer, render, row, text)
+        ok = sum(1 for t in timings if t < FRAME_MS)
+        print(f"{name:<12} {len(timings):>5} {sum(timings) / len(timings):>8.2f} "
+              f"{max(timings):>8.2f} {ok:>4}/{len(timings)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+ファイル監視のベンチマーク
+
+多数のファイルを監視しているときの poll() 1回あたりの時間を inotify と
+stat のポーリングで計測する（ポーリングは一巡の間隔を 0 にして毎回 stat させる）。
+あわせて、大きなファイルの数行が外部で変わったときに、差分だけを当てる方式と
+行をすべて差し替える方式でバッファに反映する時間を計測する
+
+    python benchmarks/bench_watch.py [ファイル数] [行数]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.buffer import Buffer
+from uzuki.core.file_watcher import FileWatcher
+from uzuki.core.history import History
+from uzuki.core.cursor import Cursor
+from uzuki.core.line_diff import apply_hunks, diff_lines
+
+REPEAT = 200
+
+
+def timed(func, count: int) -> float:
+    """1回あたりの時間（ミリ秒）"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def bench_poll(workdir: str, count: int):
+    paths = []
+    for i in range(count):
+        directory = os.path.join(workdir, f"dir_{i % 20:02d}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"file_{i:04d}.txt")
+        with open(path, 'w') as f:
+            f.write('text\n')
+        paths.append(path)
+
+    print(f"{'backend':<10} {'poll ms (idle)':>15} {'poll ms (1 change)':>19}")
+    for use_inotify in (True, False):
+        watcher = FileWatcher(use_inotify)
+        watcher.POLL_INTERVAL = 0
+        watcher.POLL_BATCH = count  # 毎回すべてを stat する（最悪の場合）
+        for path in paths:
+            watcher.watch(path)
+        watcher.poll()
+        idle_ms = timed(watcher.poll, REPEAT)
+
+        def change():
+            with open(paths[0], 'a') as f:
+                f.write('x')
+            watcher.poll()
+        change_ms = timed(change, REPEAT)
+        print(f"{watcher.backend:<10} {idle_ms:>15.3f} {change_ms:>19.3f}")
+        watcher.close()
+
+
+def bench_reload(line_count: int):
+    old = [f"line {i}: the quick brown fox jumps over the lazy dog" for i in range(line_count)]
+    new = list(old)
+    for row in (10, line_count // 2, line_count - 5):
+        new[row] = f"changed {row}"
+    new.insert(line_count // 3, "inserted")
+
+    buffer = Buffer()
+    history = History()
+    history.attach(buffer, Cursor())
+    buffer.lines = list(old)
+    start = time.perf_counter()
+    hunks = diff_lines(buffer.lines, new)
+    apply_hunks(buffer, new, hunks)
+    patch_ms = (time.perf_counter() - start) * 1000
+    assert list(buffer.lines) == new
+
+    buffer.lines = list(old)
+    start = time.perf_counter()
+    buffer.lines = list(new)
+    replace_ms = (time.perf_counter() - start) * 1000
+
+    print(f"reload of {line_count} lines with {len(hunks)} changed regions")
+    print(f"{'patch changed lines (undoable)':<34} {patch_ms:>8.1f} ms")
+    print(f"{'replace all lines (undo lost)':<34} {replace_ms:>8.1f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    line_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    print(f"File watcher benchmark: {count} files")
+    with tempfile.TemporaryDirectory() as workdir:
+        bench_poll(workdir, count)
+    bench_reload(line_count)
+
+
+if __name__ == "__main__":
+    main()
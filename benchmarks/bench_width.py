@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+表示幅計算のベンチマーク
+
+全角文字（CJK）だけからなる行で、行レイアウトの作成・文字位置と表示桁の変換・
+表示範囲の切り出しにかかる時間を計測する。
+比較用に、変換のたびに行頭から unicodedata で幅を数え直す方式も計測する
+
+    python benchmarks/bench_width.py [行の文字数]
+"""
+
+import os
+import random
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.ui.line_layout import LayoutCache, LineLayout
+
+LINES = 200
+LOOKUPS = 20_000
+VIEW_WIDTH = 80
+
+
+def create_lines(length: int):
+    random.seed(0)
+    kana = [chr(code) for code in range(0x3041, 0x3097)]
+    kanji = [chr(code) for code in range(0x4E00, 0x4E00 + 2000)]
+    pool = kana + kanji + list('、。「」')
+    return [''.join(random.choice(pool) for _ in range(length)) for _ in range(LINES)]
+
+
+def naive_char_to_col(line: str, index: int) -> int:
+    """従来方式: 行頭から幅を数える"""
+    return sum(2 if unicodedata.east_asian_width(char) in 'WF' else 1 for char in line[:index])
+
+
+def naive_col_to_char(line: str, col: int) -> int:
+    """従来方式: 行頭から幅を数えて桁を含む文字を探す"""
+    x = 0
+    for index, char in enumerate(line):
+        x += 2 if unicodedata.east_asian_width(char) in 'WF' else 1
+        if x > col:
+            return index
+    return len(line)
+
+
+def timed(func, count: int) -> float:
+    """1回あたりの時間（マイクロ秒）"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) / count * 1_000_000
+
+
+def main():
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    lines = create_lines(length)
+    random.seed(1)
+    queries = [(random.randrange(LINES), random.randrange(length)) for _ in range(LOOKUPS)]
+
+    print(f"Width benchmark: {LINES} lines x {length} CJK characters")
+    print(f"{'operation':<28} {'us/op':>10}")
+
+    build = timed(lambda: [LineLayout(line) for line in lines], LINES)
+    print(f"{'build layout (per line)':<28} {build:>10.1f}")
+
+    cache = LayoutCache()
+    for row in range(LINES):
+        cache.get(lines, row)
+
+    def cached_char_to_col():
+        for row, index in queries:
+            cache.get(lines, row).char_to_col(index)
+
+    def cached_col_to_char():
+        for row, index in queries:
+            cache.get(lines, row).col_to_char(index * 2 + 1)
+
+    def cached_slice():
+        for row, index in queries:
+            left = index * 2 + 1  # 全角文字の途中から切り出す
+            cache.get(lines, row).slice(left, left + VIEW_WIDTH)
+
+    print(f"{'char -> col (cached)':<28} {timed(cached_char_to_col, LOOKUPS):>10.2f}")
+    print(f"{'col -> char (cached)':<28} {timed(cached_col_to_char, LOOKUPS):>10.2f}")
+    print(f"{'slice view width (cached)':<28} {timed(cached_slice, LOOKUPS):>10.2f}")
+
+    naive_count = max(100, LOOKUPS // max(1, length // 20))
+    naive_queries = queries[:naive_count]
+
+    def naive_char_to_col_all():
+        for row, index in naive_queries:
+            naive_char_to_col(lines[row], index)
+
+    def naive_col_to_char_all():
+        for row, index in naive_queries:
+            naive_col_to_char(lines[row], index * 2 + 1)
+
+    print(f"{'char -> col (naive)':<28} {timed(naive_char_to_col_all, naive_count):>10.2f}")
+    print(f"{'col -> char (naive)':<28} {timed(naive_col_to_char_all, naive_count):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+折り返し表示のベンチマーク
+
+長い行を含む大きなバッファを折り返し表示で描画し、j/k 相当の1行移動・
+ページ移動・G（末尾へ移動）・画面幅の変更・1文字入力（改行を含む）の
+1操作あたりの時間を計測する。
+比較用に、毎回全行を折り返して画面行を数え直す方式も計測する
+
+    python benchmarks/bench_wrap.py [行数]
+"""
+
+import curses
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.buffer import Buffer
+from uzuki.ui.damage import DamageTracker
+from uzuki.ui.editor_display import EditorDisplay
+from uzuki.ui.line_layout import LineLayout
+
+HEIGHT = 50
+WIDTH = 80
+REPEAT = 200
+NAIVE_SAMPLE = 50_000
+
+
+class NullScreen:
+    """描画結果を捨てる stdscr の代わり"""
+
+    def addstr(self, *args):
+        pass
+
+    def erase(self):
+        pass
+
+    def move(self, *args):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+
+def create_lines(count: int):
+    short = 'def method(self, value): return value * 2'
+    long = 'x = "' + 'a long line that wraps ' * 12 + '"'
+    wide = '全角文字を含む行も折り返して表示する。' * 8
+    pattern = [short, long, short, wide]
+    return [pattern[i % len(pattern)] for i in range(count)]
+
+
+def timed(func, count: int) -> float:
+    """1回あたりの時間（ミリ秒）"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    curses.has_colors = lambda: False  # 端末なしで描画する
+
+    buffer = Buffer()
+    buffer.lines = create_lines(count)
+    display = EditorDisplay()
+    display.wrap = True
+    display.syntax_highlight = False
+    display.layouts.attach(buffer)
+    display.wrap_layout.attach(buffer)
+    screen = NullScreen()
+    damage = DamageTracker()
+    cursor = [count // 2, 0]
+    size = [WIDTH]
+
+    def render():
+        display.render(screen, buffer.lines, cursor[0], cursor[1], 0, 0, HEIGHT, size[0], damage)
+        damage.clear()
+
+    start = time.perf_counter()
+    render()
+    first_ms = (time.perf_counter() - start) * 1000
+
+    def move(delta):
+        def step():
+            cursor[0] = max(0, min(cursor[0] + delta, count - 1))
+            render()
+        return step
+
+    def page(delta):
+        def step():
+            cursor[0] = display.scroll_rows(buffer.lines, cursor[0], cursor[1], delta)
+            damage.mark_all()
+            render()
+        return step
+
+    def jump():
+        cursor[0] = 0 if cursor[0] else len(buffer.lines) - 1
+        render()
+
+    def resize():
+        size[0] = WIDTH + 20 if size[0] == WIDTH else WIDTH
+        damage.mark_all()
+        render()
+
+    def type_newline():
+        row = cursor[0]
+        buffer.insert_text(row, 5, '\n')
+        damage.mark_lines(row, None)
+        render()
+
+    sample = min(count, NAIVE_SAMPLE)
+
+    def full_count():
+        total = 0
+        for line in buffer.lines[:sample]:
+            total += len(LineLayout(line).wrap(size[0]))
+        return total
+
+    print(f"Wrap benchmark: {count} lines, {HEIGHT}x{WIDTH} view")
+    print(f"first render: {first_ms:.2f} ms")
+    print(f"{'operation':<24} {'ms/op':>10}")
+    for name, func in (
+        ('j (line down)', move(1)),
+        ('k (line up)', move(-1)),
+        ('Ctrl-F (page down)', page(HEIGHT - 2)),
+        ('Ctrl-B (page up)', page(-(HEIGHT - 2))),
+        ('G / gg', jump),
+        ('resize width', resize),
+        ('insert newline', type_newline),
+    ):
+        print(f"{name:<24} {timed(func, REPEAT):>10.3f}")
+
+    # 全行の折り返しは時間がかかるので先頭の一部で計測して行数分に換算する
+    start = time.perf_counter()
+    full_count()
+    naive_ms = (time.perf_counter() - start) * 1000 * count / sample
+    print(f"{'full re-wrap (naive)':<24} {naive_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+保存処理のベンチマーク
+
+巨大なバッファの保存時間を、以前の実装（codecs.open で1行ごとに行と改行を
+書く）と現在の FileManager.save_file（まとめてエンコードして一時ファイルに書き、
+置き換える）で比較する。fsync の有無と、別スレッドで保存している間の
+進捗通知の回数も計測する
+
+    python benchmarks/bench_write.py [MB]
+"""
+
+import codecs
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uzuki.core.file_manager import FileManager
+from uzuki.core.file_writer import FileWriter, WriteJob
+from uzuki.core.text_store import ChunkedLineStore
+
+LINE = "the quick brown fox jumps over the lazy dog, 0123456789 いろはにほへと " * 2
+
+
+def save_legacy(path: str, lines, encoding: str = 'utf-8', line_ending: str = '\n'):
+    """以前の save_file の書き出し"""
+    with codecs.open(path, 'w', encoding=encoding) as f:
+        for i, line in enumerate(lines):
+            f.write(line)
+            if i < len(lines) - 1:
+                f.write(line_ending)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    line_bytes = len(f"{0:>9} {LINE}".encode('utf-8')) + 1
+    line_count = size_mb * 1024 * 1024 // line_bytes
+    store = ChunkedLineStore(f"{i:>9} {LINE}" for i in range(line_count))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'file.txt')
+        legacy = timed(lambda: save_legacy(path, store))
+        size = os.path.getsize(path)
+        manager = FileManager()
+        chunked = timed(lambda: manager.save_file(path, store))
+        synced = timed(lambda: manager.save_file(path, store, fsync=True))
+
+        writer = FileWriter()
+        job = WriteJob(manager, path, store.snapshot(), 'utf-8', '\n')
+        updates = set()
+        start = time.perf_counter()
+        writer.submit(job)
+        while writer.depth:
+            progress = writer.progress
+            if progress is not None:
+                updates.add(int(progress * 100))
+            time.sleep(0.01)
+        background = time.perf_counter() - start
+        writer.close()
+
+    mb = size / 1024 / 1024
+    print(f"Save benchmark: {line_count} lines, {mb:.0f} MB")
+    print(f"{'method':<36} {'seconds':>8} {'MB/s':>8}")
+    for name, seconds in (("codecs.open, per-line writes (old)", legacy),
+                          ("chunked encode + atomic replace", chunked),
+                          ("chunked + fsync", synced),
+                          ("background thread", background)):
+        print(f"{name:<36} {seconds:>8.2f} {mb / seconds:>8.0f}")
+    print(f"progress updates seen while saving in background: {len(updates)}")
+
+
+if __name__ == "__main__":
+    main()
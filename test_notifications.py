@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+通知（ステータスラインの上のメッセージ欄）の描画のテスト
+"""
+
+import curses
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from uzuki.commands.buffers import ListBuffersCommand
+from uzuki.commands.help import HelpCommand
+from uzuki.commands.registry import CommandRegistry
+from uzuki.commands.save import SaveCommand
+from uzuki.ui.screen import Screen
+
+HEIGHT = 12
+WIDTH = 160
+
+
+class FakeWindow:
+    """文字だけを記録する stdscr の代わり（derwin は同じ画面の一部を指す）"""
+
+    def __init__(self, rows, y=0, x=0, height=HEIGHT, width=WIDTH):
+        self.rows = rows
+        self.origin = (y, x)
+        self.size = (height, width)
+        self.cursor = (0, 0)
+
+    def getmaxyx(self):
+        return self.size
+
+    def derwin(self, height, width, y, x):
+        return FakeWindow(self.rows, self.origin[0] + y, self.origin[1] + x, height, width)
+
+    def addstr(self, y, x, text, attr=0):
+        row = self.rows[self.origin[0] + y]
+        start = self.origin[1] + x
+        row[start:start + len(text)] = list(text)
+        del row[WIDTH:]
+
+    def move(self, y, x):
+        self.cursor = (y, x)
+
+    def clrtoeol(self):
+        y, x = self.cursor
+        row = self.rows[self.origin[0] + y]
+        start = self.origin[1] + x
+        row[start:] = [' '] * (self.size[1] - x)
+
+    def erase(self):
+        for y in range(self.size[0]):
+            self.move(y, 0)
+            self.clrtoeol()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def screen(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(curses, 'has_colors', lambda: False)
+    path = tmp_path / 'a.txt'
+    path.write_text(''.join(f"line {i}\n" for i in range(30)), encoding='utf-8')
+    screen = Screen(initial_file=str(path), show_greeting=False)
+    screen.ui.set_show_greeting(False)
+    screen.clear_notifications()
+    return screen
+
+
+def draw(screen, height=HEIGHT):
+    """画面を描画して行の文字列を返す"""
+    if not hasattr(screen, 'fake'):
+        screen.fake = FakeWindow([[' '] * WIDTH for _ in range(height)], height=height)
+    screen.ui.draw(screen.fake)
+    screen.editor.needs_redraw = False
+    return [''.join(row).rstrip() for row in screen.fake.rows]
+
+
+def test_refused_save_is_shown(screen):
+    """外部で変わったファイルへの :w を断ったことがメッセージ欄に表示される"""
+    draw(screen)
+    path = screen.file.file_manager.filename
+    screen.editor.buffer.insert_text(0, 0, 'x')
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('changed\n')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    SaveCommand().execute(screen, [])
+    rows = draw(screen)
+    assert rows[HEIGHT - 2] == "[ERROR] File changed on disk since it was read (add ! to overwrite)"
+    assert rows[0].endswith("xline 0")
+    assert screen.file.is_modified()
+
+
+def test_messages_stack_above_status_line(screen):
+    """複数の通知は古い順に並び、改行を含む通知は複数行になる"""
+    screen.notify_info("first")
+    screen.notify_warning("second\nthird")
+    rows = draw(screen)
+    assert rows[HEIGHT - 4:HEIGHT - 1] == ["[INFO] first", "[WARN] second", "third"]
+    assert screen.ui.current_window.rect[2] == HEIGHT - 4
+
+
+def test_expired_message_is_erased(screen):
+    """期限が切れた通知はアイドル時に消え、その行には本文が描き直される"""
+    screen.notify("short", duration=0.05)
+    rows = draw(screen)
+    assert rows[HEIGHT - 2] == "[INFO] short"
+    time.sleep(0.06)
+    waits = screen.container.execute_hook('idle')
+    assert 1 in waits and screen.editor.needs_redraw
+    rows = draw(screen)
+    assert "short" not in '\n'.join(rows)
+    assert rows[HEIGHT - 2].endswith(f"line {HEIGHT - 2}")
+
+
+def test_escape_dismisses_messages(screen):
+    """ノーマルモードの Esc で通知を消す"""
+    screen.notify_error("oops")
+    assert draw(screen)[HEIGHT - 2] == "[ERROR] oops"
+    screen.editor.handle_keys([27])
+    assert "oops" not in '\n'.join(draw(screen))
+
+
+def test_buffer_list_is_shown(screen, tmp_path):
+    """:ls の一覧はバッファごとに1行ずつメッセージ欄に表示される"""
+    other = tmp_path / 'b.txt'
+    other.write_text('b\n', encoding='utf-8')
+    screen.file.load_file(str(other))
+    screen.clear_notifications()
+    ListBuffersCommand().execute(screen, [])
+    rows = draw(screen)
+    assert rows[HEIGHT - 4] == "[INFO] Buffers:"
+    assert rows[HEIGHT - 3] == f'  1 #h   "{screen.file.buffers.get(1).name}" line 1'
+    assert rows[HEIGHT - 2] == f'  2 %a   "{screen.file.buffers.get(2).name}" line 1'
+
+
+def test_help_is_shown(screen):
+    """:help の一覧は見出しとコマンドごとの行からなる1つの通知として全部表示される"""
+    specs = CommandRegistry.list_commands()
+    height = len(specs) * 2 + 4  # メッセージ欄は画面の半分まで
+    HelpCommand().execute(screen, [])
+    rows = draw(screen, height)
+    start = height - 2 - len(specs)
+    assert rows[start] == "[INFO] Available commands:"
+    for row, spec in zip(rows[start + 1:height - 1], specs):
+        assert row.startswith(f"  {spec.usage}") and row.endswith(spec.description)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+保存（:w / :wq・バックグラウンド保存・バックアップ）のテスト
+"""
+
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from uzuki.commands.save import SaveQuitCommand
+from uzuki.core.file_manager import FileManager
+from uzuki.core.file_writer import FileWriter, WriteJob
+from uzuki.ui.screen import Screen
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """ユーザーの設定を読まないように HOME を一時ディレクトリにする（デバッグログもそこに書く）"""
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def open_screen(path: str) -> Screen:
+    screen = Screen(initial_file=path, show_greeting=False)
+    screen.file.BACKGROUND_SAVE_LINES = 10  # 小さなファイルでもバックグラウンドで保存する
+    return screen
+
+
+def write_lines(path: str, count: int):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"line {i}\n" for i in range(count)))
+
+
+def test_save_quit_waits_for_background_save(home):
+    """:wq は大きなバッファの書き込みが終わってから終了する"""
+    path = str(home / 'big.txt')
+    write_lines(path, 100)
+    screen = open_screen(path)
+    screen.editor.buffer.insert_text(0, 0, 'Z')
+    SaveQuitCommand().execute(screen, [])
+    assert not screen.running
+    assert not screen.file.is_modified()
+    with open(path, encoding='utf-8') as f:
+        assert f.readline() == 'Zline 0\n'
+
+
+def test_save_quit_stays_open_when_background_save_fails(home, monkeypatch):
+    """:wq はバックグラウンドの書き込みが失敗したら終了しない（編集を失わない）"""
+    path = str(home / 'big.txt')
+    write_lines(path, 100)
+    screen = open_screen(path)
+    screen.editor.buffer.insert_text(0, 0, 'Z')
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(FileManager, 'write_file', fail)
+    SaveQuitCommand().execute(screen, [])
+    assert screen.running
+    assert screen.file.is_modified()
+    messages = [n.message for n in screen.notifications.notifications.get_active()]
+    assert any('disk full' in message for message in messages)
+
+
+def test_writer_replaces_queued_job_for_same_file(tmp_path):
+    """同じファイルの始まっていない書き込みは新しい方に置き換わる"""
+    path = str(tmp_path / 'a.txt')
+    manager = FileManager()
+    writer = FileWriter()
+    first = WriteJob(manager, path, ['old'], 'utf-8', '\n')
+    second = WriteJob(manager, path, ['new'], 'utf-8', '\n')
+    writer._queue.extend([first])  # スレッドを起こさずに積んでおく
+    writer.submit(second)
+    assert writer.close(timeout=5)
+    done = writer.poll()
+    assert done == [second] and second.error is None
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == 'new'
+
+
+def test_save_makes_backup_only_once(tmp_path):
+    """バックアップは読み込み後の最初の保存のときだけ元の内容で作る"""
+    path = str(tmp_path / 'a.txt')
+    write_lines(path, 2)
+    manager = FileManager()
+    lines = manager.load_file(path)
+    manager.save_file(path, ['first'], backup_extension='~')
+    manager.save_file(path, ['second'])
+    with open(path + '~', encoding='utf-8') as f:
+        assert f.read() == 'line 0\nline 1\n'
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == 'second'
+    assert sorted(os.listdir(tmp_path)) == ['a.txt', 'a.txt~']
+
+
+def test_failed_save_without_hardlinks_keeps_original(tmp_path, monkeypatch):
+    """ハードリンクを作れず書き込みも失敗したとき、元のファイルは元のパスに残る"""
+    path = str(tmp_path / 'a.txt')
+    write_lines(path, 2)
+    manager = FileManager()
+    manager.load_file(path)
+
+    def no_link(*args, **kwargs):
+        raise PermissionError("hardlinks not supported")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'link', no_link)
+    monkeypatch.setattr(FileManager, '_write_lines', fail)
+    with pytest.raises(IOError):
+        manager.save_file(path, ['new'], backup_extension='~')
+    for name in ('a.txt', 'a.txt~'):
+        with open(str(tmp_path / name), encoding='utf-8') as f:
+            assert f.read() == 'line 0\nline 1\n'
+    assert sorted(os.listdir(tmp_path)) == ['a.txt', 'a.txt~']
+
+
+def test_save_keeps_other_hardlinks(tmp_path):
+    """ほかのハードリンクがあるファイルは直接書き込むので、他の名前からも新しい内容が見える"""
+    path = str(tmp_path / 'a.txt')
+    other = str(tmp_path / 'b.txt')
+    write_lines(path, 2)
+    os.link(path, other)
+    manager = FileManager()
+    manager.load_file(path)
+    manager.save_file(path, ['new'], backup_extension='~')
+    for name in (path, other):
+        with open(name, encoding='utf-8') as f:
+            assert f.read() == 'new'
+    assert os.path.samefile(path, other)
+    with open(path + '~', encoding='utf-8') as f:
+        assert f.read() == 'line 0\nline 1\n'
+
+
+def test_save_in_directory_without_write_permission(tmp_path, monkeypatch):
+    """一時ファイルを作れないディレクトリでも、書き込めるファイルなら直接書き込んで保存する"""
+    path = str(tmp_path / 'a.txt')
+    write_lines(path, 2)
+    manager = FileManager()
+    manager.load_file(path)
+
+    def denied(*args, **kwargs):
+        raise PermissionError("directory not writable")
+    monkeypatch.setattr(tempfile, 'mkstemp', denied)
+    manager.save_file(path, ['new', 'lines'])
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == 'new\nlines'
+    assert os.listdir(tmp_path) == ['a.txt']
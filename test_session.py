@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+セッションの保存・復元のテスト
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from uzuki.core.buffer_list import BufferList
+from uzuki.core.file_manager import FileManager
+from uzuki.core.session import BufferState, Session
+from uzuki.ui.screen import Screen
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """ユーザーの設定を読まないように HOME を一時ディレクトリにする（デバッグログもそこに書く）"""
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def save_session(home, path: str, encoding: str) -> str:
+    """path を encoding で読んだバッファ1つのセッションを書く"""
+    session_path = str(home / 'Session.uzuki')
+    Session([BufferState(path, encoding, stat=BufferList.file_stat(path))]).save(session_path)
+    return session_path
+
+
+def restore(session_path: str, file_config=None) -> Screen:
+    screen = Screen(show_greeting=False)
+    if file_config:
+        screen.file.apply_config(file_config)
+    assert screen.session.restore(session_path)
+    return screen
+
+
+def test_restore_uses_recorded_encoding(home):
+    """変わっていないファイルは記録したエンコーディングで読む"""
+    path = str(home / 'a.txt')
+    with open(path, 'wb') as f:
+        f.write('café crème\nnaïve\n'.encode('latin-1'))
+    screen = restore(save_session(home, path, 'latin-1'))
+    assert list(screen.editor.buffer.lines) == ['café crème', 'naïve']
+    assert screen.file.file_manager.encoding == 'latin-1'
+
+
+def test_restore_detects_encoding_of_rewritten_file(home):
+    """保存後に UTF-8 で書き換えられたファイルは記録した latin-1 ではなく判定して読む"""
+    path = str(home / 'a.txt')
+    with open(path, 'wb') as f:
+        f.write('café\n'.encode('latin-1'))
+    session_path = save_session(home, path, 'latin-1')
+    with open(path, 'wb') as f:
+        f.write('café ☕\nnaïve\n'.encode('utf-8'))
+    screen = restore(session_path)
+    assert list(screen.editor.buffer.lines) == ['café ☕', 'naïve']
+    assert screen.file.file_manager.encoding == 'utf-8'
+
+
+def test_session_round_trip(home):
+    """保存したバッファとカーソルを復元し、表示していないバッファは読まずにおく"""
+    paths = []
+    for name in ('a.txt', 'b.txt'):
+        path = str(home / name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(''.join(f"{name} {i}\n" for i in range(20)))
+        paths.append(path)
+    screen = Screen(initial_file=paths[0], show_greeting=False)
+    screen.file.load_file(paths[1])
+    screen.editor.cursor.row = 5
+    assert screen.session.save()
+
+    restored = restore(str(home / 'Session.uzuki'))
+    assert restored.file.file_manager.filename == paths[1]
+    assert restored.editor.cursor.row == 5
+    entries = list(restored.file.buffers)
+    assert [entry.file_manager.filename for entry in entries] == paths
+    assert entries[0].evicted and not entries[1].evicted
+
+
+def test_restore_uses_configured_lazy_threshold(home):
+    """file.large_file_size は復元したバッファの読み込みに使い、FileManager の既定値は変えない"""
+    path = str(home / 'a.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('a\nb\n')
+    screen = restore(save_session(home, path, 'utf-8'), {'large_file_size': 1})
+    assert screen.file.file_manager.mapped_source is not None
+    assert list(screen.editor.buffer.lines) == ['a', 'b']
+    assert FileManager.LAZY_LOAD_THRESHOLD == 64 * 1024 * 1024
+    other = FileManager()
+    assert isinstance(other.load_file(path), list) and other.mapped_source is None
+    screen.file.file_manager.mapped_source.close()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+スワップファイル（ジャーナルの記録・復旧・終了時の削除）と行の差分のテスト
+"""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from uzuki.core.buffer import Buffer
+from uzuki.core.file_manager import FileManager
+from uzuki.core.line_diff import apply_hunks, diff_lines
+from uzuki.core.swap_journal import SwapFile, journal_path
+from uzuki.core.text_store import ListLineStore
+from uzuki.ui.screen import Screen
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """スワップファイルとデバッグログを一時ディレクトリに書く"""
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def idle(screen: Screen):
+    screen.container.execute_hook('idle')
+
+
+def edited_screen(path: str) -> Screen:
+    """a, b, c のファイルを開いて2か所を編集し、記録をスワップファイルに書いた画面"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('a\nb\nc\n')
+    screen = Screen(initial_file=path, show_greeting=False)
+    buffer = screen.editor.buffer
+    buffer.insert_text(0, 1, 'xy')
+    buffer.insert_text(2, 0, 'new\n')
+    idle(screen)
+    return screen
+
+
+def swap_path(screen: Screen, path: str) -> str:
+    return journal_path(path, screen.swap.directory)
+
+
+def test_journal_replays_edits(home):
+    """スワップファイルの記録をディスク上の内容に当てると編集後の内容になる"""
+    path = str(home / 'a.txt')
+    screen = edited_screen(path)
+    swap = SwapFile.read(swap_path(screen, path))
+    assert swap is not None and swap.pid == os.getpid()
+    assert swap.replay(FileManager().load_file(path)) == list(screen.editor.buffer.lines)
+
+
+def test_recover_after_crash(home):
+    """終了処理をせずに残ったスワップファイルから :recover で編集を戻す"""
+    path = str(home / 'a.txt')
+    crashed = edited_screen(path)
+    expected = list(crashed.editor.buffer.lines)
+
+    screen = Screen(initial_file=path, show_greeting=False)
+    idle(screen)
+    assert screen.swap.recover()
+    assert list(screen.editor.buffer.lines) == expected
+    screen.editor.undo()
+    assert list(screen.editor.buffer.lines) == ['a', 'b', 'c']
+
+
+def test_swap_warning_stays_until_recovered(home):
+    """見つけたスワップファイルの警告は :recover で対処するまでメッセージ欄に残る"""
+    path = str(home / 'a.txt')
+    edited_screen(path)
+
+    def messages(screen):
+        return [text for text, _ in screen.notifications.lines(200, 10)]
+
+    screen = Screen(initial_file=path, show_greeting=False)
+    idle(screen)
+    found = [text for text in messages(screen) if text.startswith('[WARN] Swap file found for') and '(2 edits)' in text]
+    assert len(found) == 1
+    for _ in range(10):
+        screen.notify_info("another message")
+    idle(screen)
+    assert found[0] in messages(screen)
+    assert screen.swap.recover()
+    assert found[0] not in messages(screen)
+
+
+def test_close_removes_journal_of_saved_buffer(home):
+    """終了時には書き込みを待ってから、保存できたバッファのスワップファイルを消す"""
+    path = str(home / 'a.txt')
+    screen = edited_screen(path)
+    screen.autosave.save_in_background(screen.file.buffers.current)
+    screen.close_files()
+    assert not os.path.exists(swap_path(screen, path))
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == 'axy\nb\nnew\nc'
+
+
+def test_close_keeps_journal_when_save_fails(home, monkeypatch):
+    """終了前の書き込みが失敗したバッファのスワップファイルは残す"""
+    path = str(home / 'a.txt')
+    screen = edited_screen(path)
+    screen.editor.buffer.insert_text(0, 0, '>')  # スワップファイルにまだ書いていない編集
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(FileManager, 'write_file', fail)
+    screen.autosave.save_in_background(screen.file.buffers.current)
+    screen.close_files()
+    swap = SwapFile.read(swap_path(screen, path))
+    assert swap is not None
+    assert swap.replay(['a', 'b', 'c']) == ['>axy', 'b', 'new', 'c']
+
+
+def test_diff_lines_patches_buffer():
+    """diff_lines の差分を当てると新しい内容になる（ランダムな編集）"""
+    rng = random.Random(12)
+    words = ['alpha', 'beta', 'gamma', '', 'delta']
+    for _ in range(300):
+        old = [rng.choice(words) for _ in range(rng.randint(1, 12))]
+        new = list(old)
+        for _ in range(rng.randint(0, 4)):
+            row = rng.randint(0, len(new))
+            action = rng.random()
+            if action < 0.4:
+                new.insert(row, rng.choice(words))
+            elif action < 0.7 and len(new) > 1 and row < len(new):
+                del new[row]
+            elif row < len(new):
+                new[row] = rng.choice(words) + '!'
+        buffer = Buffer(ListLineStore)
+        buffer.lines = ListLineStore(old)
+        apply_hunks(buffer, new, diff_lines(old, new))
+        assert list(buffer.lines) == new
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+構文ハイライトの状態キャッシュ（編集後の差分だけの再解析）のテスト
+"""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from uzuki.core.buffer import Buffer
+from uzuki.core.syntax import PythonLexer, SyntaxHighlighter
+
+
+def make_buffer(lines):
+    """行を持つバッファとその編集を監視するハイライト"""
+    buffer = Buffer()
+    buffer.lines = list(lines)
+    highlighter = SyntaxHighlighter()
+    highlighter.set_lexer(PythonLexer())
+    highlighter.attach(buffer)
+    return buffer, highlighter
+
+
+def fresh_tokens(lines, row: int):
+    """キャッシュを持たないハイライトで解析した行のトークン列"""
+    highlighter = SyntaxHighlighter()
+    highlighter.set_lexer(PythonLexer())
+    return highlighter.line_tokens(lines, row)
+
+
+def test_stale_states_after_partial_advance():
+    """途中までしか解析し直していない状態で編集しても、古い状態で収束させない"""
+    buffer, highlighter = make_buffer(['a', 'b', 'c', 'd', 'e', 'f'])
+    lines = buffer.lines
+    for row in range(len(lines)):
+        highlighter.line_tokens(lines, row)
+    buffer.insert_text(1, 0, '"""')
+    highlighter.line_tokens(lines, 3)
+    buffer.insert_text(2, 0, 'x')
+    for row in range(len(lines)):
+        assert highlighter.line_tokens(lines, row) == fresh_tokens(lines, row)
+    assert highlighter.line_tokens(lines, 5) == [(0, 1, 'string')]
+
+
+def test_prepare_reports_changed_rows():
+    """開始状態が変わった最初の行を prepare が返す"""
+    buffer, highlighter = make_buffer(['x = 1', 'y = 2', 'z = 3'])
+    lines = buffer.lines
+    assert highlighter.prepare(lines, len(lines)) is None
+    buffer.insert_text(0, 0, '"""')
+    assert highlighter.prepare(lines, len(lines)) == 1
+    buffer.delete_text(0, 0, 0, 3)
+    assert highlighter.prepare(lines, len(lines)) == 1
+
+
+def test_incremental_matches_fresh_lex():
+    """ランダムな編集と部分的な解析を繰り返しても、最初から解析し直した結果と一致する"""
+    rng = random.Random(2024)
+    pieces = ['"""', "'''", '#', '"', "'", '\\', '\n', 'x = 1', ' ', 'ab']
+    words = ['x = 1', 'ab', 'def f():', '# c', '']
+    for _ in range(500):
+        buffer, highlighter = make_buffer([rng.choice(words) for _ in range(rng.randint(1, 12))])
+        lines = buffer.lines
+        highlighter.prepare(lines, len(lines))
+        for _ in range(rng.randint(1, 8)):
+            action = rng.random()
+            row = rng.randrange(len(lines))
+            if action < 0.35:
+                col = rng.randint(0, len(lines[row]))
+                buffer.insert_text(row, col, ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 2))))
+            elif action < 0.5:
+                end_row = min(len(lines) - 1, row + rng.randint(0, 2))
+                col = rng.randint(0, len(lines[row]))
+                end_col = rng.randint(0, len(lines[end_row]))
+                if (end_row, end_col) > (row, col):
+                    buffer.delete_text(row, col, end_row, end_col)
+            elif action < 0.85:
+                highlighter.line_tokens(lines, row)  # 途中の行までだけ解析する
+            else:
+                highlighter.prepare(lines, rng.randint(0, len(lines)))
+        for row in range(len(lines)):
+            assert highlighter.line_tokens(lines, row) == fresh_tokens(lines, row), row
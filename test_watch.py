@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+外部で変更されたファイルの読み直しのテスト
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from uzuki.core.syntax import PythonLexer
+from uzuki.ui.screen import Screen
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """ユーザーの設定を読まないように HOME を一時ディレクトリにする（デバッグログもそこに書く）"""
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def write_lines(path: str, count: int):
+    """count 行のファイルを書き、読み込み時と違う状態に見えるように更新時刻を進める"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(f"x_{i} = {i}\n" for i in range(count)))
+    if os.path.exists(path):
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def open_screen(path) -> Screen:
+    screen = Screen(initial_file=path, show_greeting=False)
+    screen.watch.auto_reload = True
+    return screen
+
+
+def test_reload_closes_replaced_mapping(home):
+    """遅延読み込みのバッファを読み直したら古い mmap とファイルを閉じる"""
+    path = str(home / 'a.py')
+    write_lines(path, 20)
+    screen = open_screen(None)
+    screen.file.large_file_size = 0  # どのファイルも遅延読み込みする
+    screen.file.load_file(path)
+    file_manager = screen.file.buffers.current.file_manager
+    old_source = file_manager.mapped_source
+    assert old_source is not None
+    write_lines(path, 30)
+    screen.watch.check(screen.file.buffers.current)
+    assert len(screen.editor.buffer.lines) == 30
+    assert file_manager.mapped_source is not old_source
+    assert old_source._mm.closed and old_source._file.closed
+
+
+def test_reload_rechecks_large_mode(home):
+    """読み直して大きさが変わったら巨大ファイルモードを切り替える"""
+    path = str(home / 'a.py')
+    write_lines(path, 10)
+    screen = open_screen(path)
+    screen.file.large_file_lines = 50
+    entry = screen.file.buffers.current
+    assert not entry.large and isinstance(screen.editor.syntax.lexer, PythonLexer)
+
+    write_lines(path, 100)
+    screen.watch.check(entry)
+    assert len(screen.editor.buffer.lines) == 100
+    assert entry.large and screen.editor.syntax.lexer is None
+    assert screen.editor.history.limit_changes
+
+    write_lines(path, 10)
+    screen.watch.check(entry)
+    assert not entry.large and isinstance(screen.editor.syntax.lexer, PythonLexer)
+    assert not screen.editor.history.limit_changes
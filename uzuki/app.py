@@ -20,6 +20,7 @@ Examples:
   uzuki file.txt          # Open file.txt
   uzuki /path/to/dir      # Open file browser in directory
   uzuki --no-greeting     # Start without greeting screen
+  uzuki --session         # Restore the buffers saved with :mksession
         """
     )
     
@@ -32,8 +33,7 @@ Examples:
     parser.add_argument(
         '--encoding',
         '-e',
-        default='utf-8',
-        help='File encoding (default: utf-8)'
+        help='File encoding (default: detected, utf-8 for new files)'
     )
     
     parser.add_argument(
@@ -49,6 +49,15 @@ Examples:
         help='Start without greeting screen'
     )
     
+    parser.add_argument(
+        '--session',
+        '-S',
+        nargs='?',
+        const='',
+        metavar='FILE',
+        help='Restore a session saved with :mksession (default: Session.uzuki)'
+    )
+    
     args = parser.parse_args()
     
     # エディタを開始
@@ -56,7 +65,8 @@ Examples:
         # スクリーンを作成
         screen = Screen(
             initial_file=args.file,
-            show_greeting=not args.no_greeting
+            show_greeting=not args.no_greeting,
+            session_file=args.session
         )
         
         # エンコーディングを設定
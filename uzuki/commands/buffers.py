@@ -0,0 +1,46 @@
+from typing import List
+
+
+class ListBuffersCommand:
+    """:ls / :buffers（一覧は1つの複数行の通知としてメッセージ欄に出す）"""
+    def execute(self, screen, args):
+        lines = screen.file.list_buffers()
+        screen.notify_info('\n'.join(["Buffers:"] + lines), duration=10.0)
+
+
+class BufferCommand:
+    """:b[uffer] {N|name}"""
+    def execute(self, screen, args):
+        if args:
+            screen.file.switch_to(' '.join(args))
+        else:
+            screen.notify_error("Usage: :b <number|name>")
+
+
+class BufferNextCommand:
+    """:bn[ext] [N]"""
+    direction = 1
+
+    def execute(self, screen, args):
+        if args and not args[0].isdigit():
+            screen.notify_error(f"Invalid count: {args[0]}")
+            return
+        count = int(args[0]) if args else 1
+        screen.file.cycle_buffer(count * self.direction)
+
+
+class BufferPreviousCommand(BufferNextCommand):
+    """:bp[revious] [N]"""
+    direction = -1
+
+
+class MkSessionCommand:
+    """:mks[ession] [file]"""
+    def execute(self, screen, args):
+        screen.session.save(' '.join(args) or None)
+
+
+def complete_buffer(screen, args: List[str]) -> List[str]:
+    """開いているバッファの名前を補完"""
+    partial = args[-1] if args else ''
+    return sorted(name for name in screen.file.buffer_names() if partial in name)
@@ -1,3 +1,4 @@
+import os
 from uzuki.modes.base_mode import BaseMode
 from uzuki.commands.registry import CommandRegistry
 from uzuki.ui.notification import NotificationLevel
@@ -7,6 +8,8 @@ class CommandMode(BaseMode):
     def __init__(self, screen):
         super().__init__(screen, 'command')
         self.cmd_buf = ''
+        self._completions = []       # Tab 補完の候補
+        self._completion_index = -1  # 表示中の候補（-1 は共通部分のみ補完済み）
     
     def get_action_handlers(self):
         """Command modeのアクションハンドラー"""
@@ -17,6 +20,7 @@ class CommandMode(BaseMode):
             # コマンド実行
             'execute_command': self._execute_command,
             'delete_backward': self._delete_backward,
+            'complete_command': self._complete,
         }
     
     def handle_default(self, key_info):
@@ -26,9 +30,16 @@ class CommandMode(BaseMode):
             return
         if key_info.is_printable and key_info.char:
             self.cmd_buf += key_info.char
+            self._completions = []
             # 画面更新フラグを設定
             self.screen.editor.needs_redraw = True
     
+    def handle_paste(self, text: str):
+        """ペーストの1行目をコマンドラインに追加"""
+        self.cmd_buf += text.split('\n', 1)[0]
+        self._completions = []
+        self.screen.editor.needs_redraw = True
+    
     def _execute_command(self):
         """コマンドを実行"""
         cmd = self.cmd_buf.strip()
@@ -43,10 +54,37 @@ class CommandMode(BaseMode):
         finally:
             self.screen.set_mode('normal')
             self.cmd_buf = ''
+            self._completions = []
     
     def _delete_backward(self):
         """バックスペース処理"""
+        self._completions = []
         if self.cmd_buf:
             self.cmd_buf = self.cmd_buf[:-1]
             # 画面更新フラグを設定
             self.screen.editor.needs_redraw = True
+    
+    def _complete(self):
+        """Tab 補完（1回目は共通部分まで、以降は候補を順に切り替え）"""
+        if self._completions:
+            self._completion_index = (self._completion_index + 1) % len(self._completions)
+            self.cmd_buf = self._completions[self._completion_index]
+        else:
+            candidates = CommandRegistry.complete(self.screen, self.cmd_buf)
+            if not candidates:
+                return
+            common = os.path.commonprefix(candidates)
+            if len(candidates) == 1:
+                self.cmd_buf = candidates[0]
+                if not candidates[0].endswith(os.sep):
+                    self.cmd_buf += ' '
+                return
+            self._completions = candidates
+            self._completion_index = -1
+            if len(common) > len(self.cmd_buf):
+                self.cmd_buf = common
+            else:
+                self._completion_index = 0
+                self.cmd_buf = candidates[0]
+            self.screen.notify_info(' '.join(candidates))
+        self.screen.editor.needs_redraw = True
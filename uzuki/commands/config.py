@@ -0,0 +1,60 @@
+from typing import List
+
+SUBCOMMANDS = ['get', 'set', 'reset', 'import']
+
+
+class ConfigCommand:
+    """:config [get|set|reset|import] [args...]"""
+    def execute(self, screen, args):
+        if not args:
+            screen.print_config()
+        elif len(args) == 1:
+            screen.print_config(args[0])
+        elif len(args) >= 3 and args[0] == 'set':
+            section = args[1]
+            key = args[2]
+            value = ' '.join(args[3:]) if len(args) > 3 else ''
+            value = self._parse_value(value)
+            screen.set_config(section, key, value)
+            screen.notify_success(f"Config set: {section}.{key} = {value}")
+        elif len(args) >= 2 and args[0] == 'get':
+            section = args[1]
+            key = args[2] if len(args) > 2 else None
+            value = screen.get_config(section, key)
+            screen.notify_info(f"Config: {section}.{key if key else 'all'} = {value}")
+        elif len(args) >= 2 and args[0] == 'reset':
+            section = args[1] if len(args) > 1 else None
+            screen.reset_config(section)
+            screen.notify_success(f"Config reset: {section if section else 'all'}")
+        elif len(args) >= 2 and args[0] == 'import':
+            filepath = args[1]
+            screen.import_config(filepath)
+            screen.notify_success(f"Config imported from: {filepath}")
+        else:
+            screen.notify_error("Usage: :config [get|set|reset|import] [args...]")
+
+    @staticmethod
+    def _parse_value(value: str):
+        """値の型を推測"""
+        if value.lower() in ['true', 'on', '1']:
+            return True
+        if value.lower() in ['false', 'off', '0']:
+            return False
+        if value.isdigit():
+            return int(value)
+        if value.replace('.', '').isdigit():
+            return float(value)
+        return value
+
+
+def complete_config(screen, args: List[str]) -> List[str]:
+    """:config のサブコマンドとセクション名を補完"""
+    if len(args) == 1:
+        return [name for name in SUBCOMMANDS if name.startswith(args[0])]
+    if len(args) == 2 and args[0] in ('get', 'set', 'reset'):
+        sections = screen.get_config() or {}
+        return sorted(name for name in sections if name.startswith(args[1]))
+    if len(args) == 2 and args[0] == 'import':
+        from uzuki.commands.edit import complete_path
+        return complete_path(screen, args)
+    return []
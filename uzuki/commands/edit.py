@@ -0,0 +1,57 @@
+import os
+from typing import List
+
+
+class EditCommand:
+    """:e[dit] <file>"""
+    def execute(self, screen, args):
+        if args:
+            screen.load_file(args[0])
+        else:
+            screen.notify_error("Usage: :e <filename>")
+
+
+class ExploreCommand:
+    """:E[xplore] [dir]"""
+    def execute(self, screen, args):
+        directory = args[0] if args else None
+        screen.open_file_browser(directory)
+
+
+class FilesCommand:
+    """:Files [dir]"""
+    def execute(self, screen, args):
+        directory = os.path.expanduser(args[0]) if args else None
+        if directory and not os.path.isdir(directory):
+            screen.notify_error(f"Not a directory: {args[0]}")
+            return
+        screen.finder.open(directory)
+
+
+def complete_path(screen, args: List[str], directories_only: bool = False) -> List[str]:
+    """最後の引数をファイルパスとして補完"""
+    partial = os.path.expanduser(args[-1]) if args else ''
+    directory, prefix = os.path.split(partial)
+    try:
+        entries = os.scandir(directory or '.')
+    except OSError:
+        return []
+    candidates = []
+    with entries:
+        for entry in entries:
+            if not entry.name.startswith(prefix) or (entry.name.startswith('.') and not prefix.startswith('.')):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if directories_only and not is_dir:
+                continue
+            path = os.path.join(directory, entry.name)
+            candidates.append(path + os.sep if is_dir else path)
+    return sorted(candidates)
+
+
+def complete_directory(screen, args: List[str]) -> List[str]:
+    """最後の引数をディレクトリとして補完"""
+    return complete_path(screen, args, directories_only=True)
@@ -0,0 +1,10 @@
+from uzuki.commands.registry import CommandRegistry
+
+
+class HelpCommand:
+    """:h[elp]（一覧は1つの複数行の通知としてメッセージ欄に出す）"""
+    def execute(self, screen, args):
+        specs = CommandRegistry.list_commands()
+        width = max(len(spec.usage) for spec in specs)
+        rows = [f"  {spec.usage:<{width}} - {spec.description}" for spec in specs]
+        screen.notify_info('\n'.join(["Available commands:"] + rows), duration=15.0)
@@ -0,0 +1,43 @@
+class UndoCommand:
+    """:u[ndo]"""
+    def execute(self, screen, args):
+        screen.editor.undo()
+
+
+class RedoCommand:
+    """:red[o]"""
+    def execute(self, screen, args):
+        screen.editor.redo()
+
+
+class EarlierCommand:
+    """:ea[rlier] [N|Ns|Nm|Nh]"""
+    name = 'earlier'
+    verb = 'undone'
+
+    def execute(self, screen, args):
+        count, seconds = parse_time_offset(args[0] if args else '')
+        if count is None and seconds is None:
+            screen.notify_error(f"Usage: :{self.name} [N|Ns|Nm|Nh]")
+            return
+        move = getattr(screen.editor.history, self.name)
+        moved = move(count or 1, seconds)
+        screen.notify_info(f"{moved} change(s) {self.verb}")
+
+
+class LaterCommand(EarlierCommand):
+    """:lat[er] [N|Ns|Nm|Nh]"""
+    name = 'later'
+    verb = 'redone'
+
+
+def parse_time_offset(arg: str):
+    """:earlier / :later の引数を (回数, 秒数) に変換（不正なら (None, None)）"""
+    if not arg:
+        return 1, None
+    if arg.isdigit():
+        return int(arg), None
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    if arg[-1] in units and arg[:-1].isdigit():
+        return None, int(arg[:-1]) * units[arg[-1]]
+    return None, None
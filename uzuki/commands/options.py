@@ -0,0 +1,59 @@
+from typing import List
+
+# :set で切り替えられる表示オプション -> EditorDisplay の属性
+DISPLAY_OPTIONS = {
+    'number': 'show_line_numbers',
+    'cursorline': 'current_line_highlight',
+    'syntax': 'syntax_highlight',
+    'wrap': 'wrap',
+}
+ON_VALUES = ('on', 'true', '1')
+OFF_VALUES = ('off', 'false', '0')
+
+
+class SetCommand:
+    """:se[t] <option> [value]"""
+    def execute(self, screen, args):
+        if not args:
+            screen.notify_error("Usage: :set <option> [value]")
+            return
+        option = args[0]
+        value = args[1] if len(args) > 1 else None
+
+        if option == 'encoding':
+            if value:
+                screen.set_encoding(value)
+            else:
+                screen.notify_error("Usage: :set encoding <enc>")
+            return
+
+        if option in ('ruler', 'noruler'):
+            # ルーラー機能は現在未実装
+            return
+
+        enabled = True
+        if option.startswith('no') and option[2:] in DISPLAY_OPTIONS:
+            option = option[2:]
+            enabled = False
+        elif value in OFF_VALUES:
+            enabled = False
+        elif value is not None and value not in ON_VALUES:
+            screen.notify_error(f"Invalid value for {option}: {value}")
+            return
+
+        attribute = DISPLAY_OPTIONS.get(option)
+        if attribute is None:
+            screen.notify_error(f"Unknown option: {option}")
+            return
+        setattr(screen.ui.editor_display, attribute, enabled)
+        screen.editor.needs_redraw = True
+
+
+def complete_option(screen, args: List[str]) -> List[str]:
+    """:set のオプション名を補完"""
+    if len(args) > 1:
+        return []
+    names = ['encoding', 'ruler', 'noruler']
+    for name in DISPLAY_OPTIONS:
+        names += [name, 'no' + name]
+    return sorted(name for name in names if name.startswith(args[-1]))
@@ -1,5 +1,5 @@
 class QuitCommand:
+    """:q[uit] / :q!（ウィンドウが複数あればアクティブなウィンドウを閉じる）"""
     def execute(self, screen, args):
-        # Log the quit command execution
-        screen.notify_info("Exiting the application...")
-        raise SystemExit
+        if not screen.ui.close_window():
+            screen.quit()
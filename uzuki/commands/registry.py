@@ -1,154 +1,200 @@
-import os
-from typing import Optional
-from uzuki.ui.notification import NotificationLevel
+import bisect
+import importlib
+from typing import Callable, Dict, List, Optional, Union
+
+Handler = Union[str, Callable]  # 呼び出し可能オブジェクト、または 'module:attr'
+
+
+class CommandSpec:
+    """登録されたコマンドの定義"""
+    __slots__ = ('name', 'min_abbrev', 'handler', 'completer', 'usage', 'description')
+
+    def __init__(self, name: str, min_abbrev: int, handler: Handler,
+                 completer: Optional[Handler], usage: str, description: str):
+        self.name = name
+        self.min_abbrev = min_abbrev
+        self.handler = handler
+        self.completer = completer
+        self.usage = usage
+        self.description = description
+
 
 class CommandRegistry:
-    """コマンドレジストリ"""
-    
-    @staticmethod
-    def execute(screen, cmd: str):
+    """コマンドレジストリ
+
+    コマンドは register() で登録する。ハンドラーには関数のほか
+    'module:attr' 形式の文字列を渡せ、その場合は初回実行時に import する。
+    省略形（:w → :write）は登録時に作る省略形→コマンド名の索引で解決する。
+    """
+
+    _commands: Dict[str, CommandSpec] = {}
+    _abbreviations: Dict[str, str] = {}  # 省略形（完全名を含む） -> コマンド名
+    _names: List[str] = []               # 補完用のソート済みコマンド名
+    _dirty = False
+
+    @classmethod
+    def register(cls, name: str, min_abbrev: Optional[int] = None, handler: Handler = None,
+                 completer: Optional[Handler] = None, usage: str = '', description: str = ''):
+        """コマンドを登録（min_abbrev は省略形として受け付ける最短の長さ）
+
+        handler は (screen, args) を受け取る。クラスを指すときはインスタンスの
+        execute(screen, args) を呼ぶ。completer は (screen, args) を受け取り、
+        最後の引数の候補リストを返す。
+        """
+        if handler is None:
+            raise ValueError(f"Command '{name}' has no handler")
+        if min_abbrev is None:
+            min_abbrev = len(name)
+        cls._commands[name] = CommandSpec(name, max(1, min(min_abbrev, len(name))), handler,
+                                          completer, usage or f":{name}", description)
+        cls._dirty = True
+
+    @classmethod
+    def unregister(cls, name: str):
+        """コマンドを削除"""
+        if cls._commands.pop(name, None) is not None:
+            cls._dirty = True
+
+    @classmethod
+    def _build_index(cls):
+        """省略形の索引を作り直す（完全名が優先、同じ省略形は先に登録した方が優先）"""
+        abbreviations = {name: name for name in cls._commands}
+        for name, spec in cls._commands.items():
+            for length in range(spec.min_abbrev, len(name)):
+                abbreviations.setdefault(name[:length], name)
+        cls._abbreviations = abbreviations
+        cls._names = sorted(cls._commands)
+        cls._dirty = False
+
+    @classmethod
+    def resolve(cls, command: str) -> Optional[CommandSpec]:
+        """コマンド名または省略形からコマンド定義を取得"""
+        if cls._dirty:
+            cls._build_index()
+        name = cls._abbreviations.get(command)
+        return cls._commands[name] if name is not None else None
+
+    @classmethod
+    def list_commands(cls) -> List[CommandSpec]:
+        """登録済みのコマンドを登録順に取得"""
+        return list(cls._commands.values())
+
+    @classmethod
+    def _load(cls, target: Handler) -> Callable:
+        """'module:attr' 形式を import して呼び出し可能オブジェクトにする"""
+        if isinstance(target, str):
+            module_name, _, attr = target.partition(':')
+            target = getattr(importlib.import_module(module_name), attr)
+        if isinstance(target, type):
+            target = target().execute
+        return target
+
+    @classmethod
+    def execute(cls, screen, cmd: str):
         """コマンドを実行"""
         if not cmd:
             return
-        
+
         parts = cmd.split()
         command = parts[0]
-        args = parts[1:] if len(parts) > 1 else []
-        
-        # ファイル操作コマンド
-        if command == 'e' or command == 'edit':
-            if args:
-                screen.load_file(args[0])
-            else:
-                screen.notify_error("Usage: :e <filename>")
-        
-        elif command == 'w' or command == 'write':
-            if args:
-                screen.save_file(args[0])
-            else:
-                screen.save_file()
-        
-        elif command == 'q' or command == 'quit':
-            screen.quit()
-        
-        elif command == 'wq':
-            screen.save_file()
-            screen.quit()
-        
-        elif command == 'q!':
-            screen.quit()
-        
-        # エンコーディング設定
-        elif command == 'set' and len(args) >= 2 and args[0] == 'encoding':
-            screen.set_encoding(args[1])
-        
-        # ファイルブラウザー
-        elif command == 'Explore' or command == 'E':
-            directory = args[0] if args else None
-            screen.open_file_browser(directory)
-        
-        # 行番号表示
-        elif command == 'set' and len(args) >= 2 and args[0] == 'number':
-            if args[1] in ['on', 'true', '1']:
-                if not screen.line_display.line_numbers.show_line_numbers:
-                    screen.toggle_line_numbers()
-            elif args[1] in ['off', 'false', '0']:
-                if screen.line_display.line_numbers.show_line_numbers:
-                    screen.toggle_line_numbers()
-        
-        elif command == 'set' and len(args) >= 2 and args[0] == 'nonumber':
-            if screen.line_display.line_numbers.show_line_numbers:
-                screen.toggle_line_numbers()
-        
-        # カレント行ハイライト
-        elif command == 'set' and len(args) >= 2 and args[0] == 'cursorline':
-            if args[1] in ['on', 'true', '1']:
-                if not screen.line_display.line_numbers.current_line_highlight:
-                    screen.toggle_current_line_highlight()
-            elif args[1] in ['off', 'false', '0']:
-                if screen.line_display.line_numbers.current_line_highlight:
-                    screen.toggle_current_line_highlight()
-        
-        elif command == 'set' and len(args) >= 2 and args[0] == 'nocursorline':
-            if screen.line_display.line_numbers.current_line_highlight:
-                screen.toggle_current_line_highlight()
-        
-        # ルーラー表示
-        elif command == 'set' and len(args) >= 2 and args[0] == 'ruler':
-            if args[1] in ['on', 'true', '1']:
-                if not screen.line_display.show_ruler:
-                    screen.toggle_ruler()
-            elif args[1] in ['off', 'false', '0']:
-                if screen.line_display.show_ruler:
-                    screen.toggle_ruler()
-        
-        elif command == 'set' and len(args) >= 2 and args[0] == 'noruler':
-            if screen.line_display.show_ruler:
-                screen.toggle_ruler()
-        
-        # 設定関連コマンド
-        elif command == 'config':
-            if not args:
-                screen.print_config()
-            elif len(args) == 1:
-                screen.print_config(args[0])
-            elif len(args) >= 3 and args[0] == 'set':
-                section = args[1]
-                key = args[2]
-                value = ' '.join(args[3:]) if len(args) > 3 else ''
-                # 値の型を推測
-                if value.lower() in ['true', 'on', '1']:
-                    value = True
-                elif value.lower() in ['false', 'off', '0']:
-                    value = False
-                elif value.isdigit():
-                    value = int(value)
-                elif value.replace('.', '').isdigit():
-                    value = float(value)
-                screen.set_config(section, key, value)
-                screen.notify_success(f"Config set: {section}.{key} = {value}")
-            elif len(args) >= 2 and args[0] == 'get':
-                section = args[1]
-                key = args[2] if len(args) > 2 else None
-                value = screen.get_config(section, key)
-                screen.notify_info(f"Config: {section}.{key if key else 'all'} = {value}")
-            elif len(args) >= 2 and args[0] == 'reset':
-                section = args[1] if len(args) > 1 else None
-                screen.reset_config(section)
-                screen.notify_success(f"Config reset: {section if section else 'all'}")
-            elif len(args) >= 2 and args[0] == 'import':
-                filepath = args[1]
-                screen.import_config(filepath)
-                screen.notify_success(f"Config imported from: {filepath}")
-            else:
-                screen.notify_error("Usage: :config [get|set|reset|import] [args...]")
-        
-        # ヘルプ
-        elif command == 'help' or command == 'h':
-            help_text = """
-Available commands:
-  :e[dit] <file>     - Edit file
-  :w[rite] [file]    - Save file
-  :q[uit]            - Quit
-  :wq                - Save and quit
-  :q!                - Quit without saving
-  :Explore [dir]     - Open file browser
-  :set encoding <enc> - Set file encoding
-  :set number        - Show line numbers
-  :set nonumber      - Hide line numbers
-  :set cursorline    - Highlight current line
-  :set nocursorline  - Don't highlight current line
-  :set ruler         - Show ruler
-  :set noruler       - Hide ruler
-  :config            - Show all config
-  :config <section>  - Show section config
-  :config set <section> <key> <value> - Set config
-  :config get <section> [key] - Get config
-  :config reset [section] - Reset config
-  :config import <file> - Import config
-            """
-            for line in help_text.strip().split('\n'):
-                screen.notify_info(line)
-        
-        else:
-            screen.notify_error(f"Unknown command: {command}")
+        args = parts[1:]
+
+        spec = cls.resolve(command)
+        if spec is None:
+            # :b2 のように数値の引数が続けて書かれた場合
+            name = command.rstrip('0123456789')
+            spec = cls.resolve(name) if name and name != command else None
+            if spec is None:
+                screen.notify_error(f"Unknown command: {command}")
+                return
+            args.insert(0, command[len(name):])
+        if not callable(spec.handler) or isinstance(spec.handler, type):
+            spec.handler = cls._load(spec.handler)
+        spec.handler(screen, args)
+
+    @classmethod
+    def complete(cls, screen, line: str) -> List[str]:
+        """コマンドラインの補完候補（補完後のコマンドライン全体）を取得"""
+        if cls._dirty:
+            cls._build_index()
+        if ' ' not in line:
+            # コマンド名の補完（ソート済みの名前から前方一致を二分探索）
+            names = cls._names
+            index = bisect.bisect_left(names, line)
+            candidates = []
+            while index < len(names) and names[index].startswith(line):
+                candidates.append(names[index])
+                index += 1
+            return candidates
+
+        command, _, rest = line.partition(' ')
+        spec = cls.resolve(command)
+        if spec is None or spec.completer is None:
+            return []
+        if not callable(spec.completer) or isinstance(spec.completer, type):
+            spec.completer = cls._load(spec.completer)
+        args = rest.split(' ')
+        head = ' '.join([command] + args[:-1])
+        return [f"{head} {candidate}" for candidate in spec.completer(screen, args)]
+
+
+# 組み込みコマンド: (名前, 省略形の最短長, ハンドラー, 補完, 書式, 説明)
+BUILTIN_COMMANDS = [
+    ('edit', 1, 'uzuki.commands.edit:EditCommand', 'uzuki.commands.edit:complete_path',
+     ':e[dit] <file>', 'Edit file'),
+    ('write', 1, 'uzuki.commands.save:SaveCommand', 'uzuki.commands.edit:complete_path',
+     ':w[rite] [file]', 'Save file'),
+    ('w!', 2, 'uzuki.commands.save:ForceSaveCommand', 'uzuki.commands.edit:complete_path',
+     ':w! [file]', 'Save file, overwriting changes made on disk'),
+    ('recover', 3, 'uzuki.commands.save:RecoverCommand', None,
+     ':rec[over] [discard]', 'Restore unsaved edits from the swap file, or delete it'),
+    ('mksession', 3, 'uzuki.commands.buffers:MkSessionCommand', 'uzuki.commands.edit:complete_path',
+     ':mks[ession] [file]', 'Save the open buffers to a session file (uzuki --session file restores it)'),
+    ('quit', 1, 'uzuki.commands.quit:QuitCommand', None,
+     ':q[uit]', 'Quit'),
+    ('wq', 2, 'uzuki.commands.save:SaveQuitCommand', None,
+     ':wq', 'Save and quit'),
+    ('q!', 2, 'uzuki.commands.quit:QuitCommand', None,
+     ':q!', 'Quit without saving'),
+    ('buffer', 1, 'uzuki.commands.buffers:BufferCommand', 'uzuki.commands.buffers:complete_buffer',
+     ':b[uffer] {N|name}', 'Switch to buffer N or the buffer matching name'),
+    ('bnext', 2, 'uzuki.commands.buffers:BufferNextCommand', None,
+     ':bn[ext] [N]', 'Go to the next buffer'),
+    ('bprevious', 2, 'uzuki.commands.buffers:BufferPreviousCommand', None,
+     ':bp[revious] [N]', 'Go to the previous buffer'),
+    ('ls', 2, 'uzuki.commands.buffers:ListBuffersCommand', None,
+     ':ls', 'List buffers'),
+    ('buffers', 7, 'uzuki.commands.buffers:ListBuffersCommand', None,
+     ':buffers', 'List buffers'),
+    ('split', 2, 'uzuki.commands.window:SplitCommand', 'uzuki.commands.edit:complete_path',
+     ':sp[lit] [file]', 'Split window horizontally'),
+    ('vsplit', 2, 'uzuki.commands.window:VsplitCommand', 'uzuki.commands.edit:complete_path',
+     ':vs[plit] [file]', 'Split window vertically'),
+    ('close', 3, 'uzuki.commands.window:CloseCommand', None,
+     ':clo[se]', 'Close current window'),
+    ('only', 2, 'uzuki.commands.window:OnlyCommand', None,
+     ':on[ly]', 'Close all other windows'),
+    ('Explore', 1, 'uzuki.commands.edit:ExploreCommand', 'uzuki.commands.edit:complete_directory',
+     ':E[xplore] [dir]', 'Open file browser'),
+    ('Files', 5, 'uzuki.commands.edit:FilesCommand', 'uzuki.commands.edit:complete_directory',
+     ':Files [dir]', 'Find a file by fuzzy name match'),
+    ('set', 2, 'uzuki.commands.options:SetCommand', 'uzuki.commands.options:complete_option',
+     ':se[t] <option> [value]', 'Set encoding, (no)number, (no)cursorline, (no)ruler'),
+    ('undo', 1, 'uzuki.commands.history:UndoCommand', None,
+     ':u[ndo]', 'Undo'),
+    ('redo', 3, 'uzuki.commands.history:RedoCommand', None,
+     ':red[o]', 'Redo'),
+    ('earlier', 2, 'uzuki.commands.history:EarlierCommand', None,
+     ':ea[rlier] [N|Ns|Nm|Nh]', 'Go back N changes or N seconds/minutes/hours'),
+    ('later', 3, 'uzuki.commands.history:LaterCommand', None,
+     ':lat[er] [N|Ns|Nm|Nh]', 'Go forward N changes or N seconds/minutes/hours'),
+    ('nohlsearch', 3, 'uzuki.commands.search:NohlsearchCommand', None,
+     ':noh[lsearch]', 'Clear search highlighting'),
+    ('config', 6, 'uzuki.commands.config:ConfigCommand', 'uzuki.commands.config:complete_config',
+     ':config [get|set|reset|import]', 'Show, change, reset or import config'),
+    ('help', 1, 'uzuki.commands.help:HelpCommand', None,
+     ':h[elp]', 'Show this help'),
+]
+
+for _name, _min_abbrev, _handler, _completer, _usage, _description in BUILTIN_COMMANDS:
+    CommandRegistry.register(_name, _min_abbrev, _handler, _completer, _usage, _description)
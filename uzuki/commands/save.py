@@ -1,3 +1,31 @@
 class SaveCommand:
+    """:w[rite] [file]"""
     def execute(self, screen, args):
-        screen.save_file()
+        if args:
+            screen.save_file(args[0])
+        else:
+            screen.save_file()
+
+
+class ForceSaveCommand:
+    """:w! [file]（ファイルが外部で変わっていても上書きする）"""
+    def execute(self, screen, args):
+        screen.save_file(args[0] if args else None, force=True)
+
+
+class SaveQuitCommand:
+    """:wq（ウィンドウが複数あればアクティブなウィンドウを閉じる。書き終わるまで待ち、保存できなければ閉じない）"""
+    def execute(self, screen, args):
+        if not screen.save_file(wait=True):
+            return
+        if not screen.ui.close_window():
+            screen.quit()
+
+
+class RecoverCommand:
+    """:rec[over] [discard]（スワップファイルから保存していない編集を復旧する。discard なら削除する）"""
+    def execute(self, screen, args):
+        if args and args[0] != 'discard':
+            screen.notify_error("Usage: :recover [discard]")
+            return
+        screen.swap.recover(discard=bool(args))
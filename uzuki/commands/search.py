@@ -0,0 +1,4 @@
+class NohlsearchCommand:
+    """:noh[lsearch]"""
+    def execute(self, screen, args):
+        screen.search.clear_highlight()
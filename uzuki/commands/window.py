@@ -0,0 +1,24 @@
+class SplitCommand:
+    """:sp[lit] [file]"""
+    direction = 'horizontal'
+
+    def execute(self, screen, args):
+        screen.ui.split_window(self.direction, args[0] if args else None)
+
+
+class VsplitCommand(SplitCommand):
+    """:vs[plit] [file]"""
+    direction = 'vertical'
+
+
+class CloseCommand:
+    """:clo[se]"""
+    def execute(self, screen, args):
+        if not screen.ui.close_window():
+            screen.notify_error("Cannot close last window")
+
+
+class OnlyCommand:
+    """:on[ly]"""
+    def execute(self, screen, args):
+        screen.ui.only_window()
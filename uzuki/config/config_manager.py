@@ -120,6 +120,10 @@ class ConfigManager:
         module.disable_current_line_highlight = lambda: self.set_value('display', 'current_line_highlight', False)
         module.enable_ruler = lambda: self.set_value('display', 'ruler', True)
         module.disable_ruler = lambda: self.set_value('display', 'ruler', False)
+        module.enable_syntax_highlight = lambda: self.set_value('display', 'syntax_highlight', True)
+        module.disable_syntax_highlight = lambda: self.set_value('display', 'syntax_highlight', False)
+        module.enable_wrap = lambda: self.set_value('display', 'wrap', True)
+        module.disable_wrap = lambda: self.set_value('display', 'wrap', False)
         
         # エディタ設定の便利関数
         module.set_tab_size = lambda size: self.set_value('editor', 'tab_size', size)
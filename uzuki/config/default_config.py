@@ -12,6 +12,10 @@ class DefaultConfig:
         'auto_indent': True,
         'show_greeting': True,
         'default_encoding': 'utf-8',
+        'text_store': 'chunked',  # 'chunked' または 'list'
+        'undo_memory_limit': 16 * 1024 * 1024,  # undo 履歴の概算上限（バイト）
+        'buffer_memory_limit': 256 * 1024 * 1024,  # 開いているバッファの概算上限（バイト）
+        'bracketed_paste': True,  # 端末のブラケットペーストを使う
     }
     
     # 表示設定
@@ -22,6 +26,9 @@ class DefaultConfig:
         'status_line': True,
         'notifications': True,
         'notification_duration': 3.0,
+        'max_fps': 60,  # 入力が続く間の最大描画回数（0 で制限なし）
+        'syntax_highlight': True,  # 拡張子に応じた構文ハイライト
+        'wrap': False,  # 長い行を折り返して表示
     }
     
     # ハイライト設定
@@ -43,7 +50,7 @@ class DefaultConfig:
             'A': 'append_end_of_line',
             'o': 'new_line_below',
             'O': 'new_line_above',
-            'x': 'delete_character',
+            'x': 'delete_char',
             'dd': 'delete_line',
             'yy': 'yank_line',
             'p': 'paste_after',
@@ -59,13 +66,33 @@ class DefaultConfig:
             '^': 'move_first_non_blank',
             'gg': 'move_beginning_of_file',
             'G': 'move_end_of_file',
+            'Ctrl+f': 'page_down',
+            'Ctrl+b': 'page_up',
+            'Ctrl+d': 'half_page_down',
+            'Ctrl+u': 'half_page_up',
+            'Ctrl+w w': 'window_next',
+            'Ctrl+w Ctrl+w': 'window_next',
+            'Ctrl+w W': 'window_previous',
+            'Ctrl+w s': 'window_split',
+            'Ctrl+w v': 'window_vsplit',
+            'Ctrl+w c': 'window_close',
+            'Ctrl+w o': 'window_only',
+            'Ctrl+w h': 'window_left',
+            'Ctrl+w j': 'window_down',
+            'Ctrl+w k': 'window_up',
+            'Ctrl+w l': 'window_right',
             ':': 'enter_command_mode',
+            '/': 'search_forward',
+            '?': 'search_backward',
+            'n': 'search_next',
+            'N': 'search_previous',
             'Ctrl+e': 'open_file_browser',
+            'Ctrl+p': 'open_finder',
             'Ctrl+l': 'toggle_line_numbers',
             'Ctrl+h': 'toggle_current_line_highlight',
-            'Ctrl+r': 'toggle_ruler',
             'Ctrl+s': 'save_file',
             'Ctrl+q': 'quit',
+            'Escape': 'cancel_load',
         },
         'insert': {
             'Escape': 'enter_normal_mode',
@@ -80,6 +107,23 @@ class DefaultConfig:
             'Ctrl+c': 'enter_normal_mode',
             'Enter': 'execute_command',
             'Backspace': 'delete_backward',
+            'Tab': 'complete_command',
+        },
+        'search': {
+            'Escape': 'enter_normal_mode',
+            'Ctrl+c': 'enter_normal_mode',
+            'Enter': 'execute_search',
+            'Backspace': 'delete_backward',
+        },
+        'finder': {
+            'Escape': 'enter_normal_mode',
+            'Ctrl+c': 'enter_normal_mode',
+            'Enter': 'open_selected',
+            'Backspace': 'delete_backward',
+            'Ctrl+n': 'select_next',
+            'Ctrl+p': 'select_previous',
+            'Down': 'select_next',
+            'Up': 'select_previous',
         },
         'file_browser': {
             'Escape': 'exit_browser',
@@ -94,15 +138,23 @@ class DefaultConfig:
             'f': 'enter_filter_mode',
             'a': 'toggle_hidden_files',
             's': 'sort_files',
+            'Ctrl+l': 'refresh',
         }
     }
     
     # ファイル設定
     FILE = {
         'auto_save': False,
+        'auto_save_delay': 1.0,  # 最後の編集から自動保存するまでの秒数
         'backup_files': True,
         'backup_extension': '.bak',
+        'fsync': True,  # 保存したファイルをディスクに書き出してから置き換える
         'auto_reload': False,
+        'swap_file': True,       # 保存していない編集をスワップファイルに記録する
+        'swap_directory': '',    # 空なら ~/.config/uzuki/swap
+        'session_undo': True,    # :mksession で変更のないバッファの undo 履歴も保存する
+        'large_file_size': 64 * 1024 * 1024,  # これ以上のファイルは巨大ファイルモードにし、遅延読み込みする
+        'large_file_lines': 1_000_000,        # これ以上の行数のバッファも巨大ファイルモードにする
         'encoding_detection': True,
     }
     
@@ -8,10 +8,22 @@ from .editor_controller import EditorController
 from .file_controller import FileController
 from .config_controller import ConfigController
 from .notification_controller import NotificationController
+from .search_controller import SearchController
+from .finder_controller import FinderController
+from .watch_controller import WatchController
+from .autosave_controller import AutoSaveController
+from .swap_controller import SwapController
+from .session_controller import SessionController
 
 __all__ = [
     'EditorController',
     'FileController', 
     'ConfigController',
     'NotificationController',
+    'SearchController',
+    'FinderController',
+    'WatchController',
+    'AutoSaveController',
+    'SwapController',
+    'SessionController',
 ] 
\ No newline at end of file
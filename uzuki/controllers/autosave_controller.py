@@ -0,0 +1,171 @@
+"""
+Auto Save Controller
+
+Saves modified buffers in the background when `file.auto_save` is enabled.
+Every edit restarts a debounce timer; once no edit has arrived for
+`file.auto_save_delay` seconds, each modified buffer with a file name is
+snapshotted (a copy-on-write view of its line store, so nothing is copied up
+front) and handed to FileController's writer thread, so keystrokes never
+wait on the disk. A buffer is marked unmodified only if it was not edited
+after its snapshot was taken. Buffers whose file changed on disk since it
+was read are left alone (WatchController warns about them). The same
+path is used by FileController for `:w` of a large buffer. The status line
+shows the progress and queue depth while writing and the latency of the
+last save.
+"""
+
+import time
+from typing import Dict, Optional
+from uzuki.core.buffer_list import BufferEntry
+from uzuki.core.file_writer import WriteJob
+from uzuki.ui.notification import NotificationLevel
+
+class AutoSaveController:
+    """自動保存を制御するコントローラー"""
+
+    DEFAULT_DELAY = 1.0   # 最後の編集から保存するまでの秒数
+    STATUS_SECONDS = 3.0  # 保存にかかった時間をステータスラインに出しておく秒数
+    POLL_MS = 50          # 書き込み中に終わったかを確認する間隔
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.enabled = False
+        self.delay = self.DEFAULT_DELAY
+
+        # 状態
+        self._edits = 0                       # 編集の通し番号
+        self._stamps: Dict[int, int] = {}     # バッファ番号 -> 最後の編集の通し番号
+        self._edited_at: Optional[float] = None  # 保存していない最後の編集の時刻
+        self._last_latency: Optional[float] = None  # 最後に書き終わった保存の所要時間（秒）
+        self._last_saved_at = 0.0
+
+        screen.editor.buffer.add_edit_listener(self._on_edit)
+        screen.container.register_hook('idle', self.on_idle)
+
+    def apply_config(self, file_config: dict):
+        """ファイル設定を適用"""
+        self.enabled = file_config.get('auto_save', False)
+        self.delay = file_config.get('auto_save_delay', self.DEFAULT_DELAY)
+        if not self.enabled:
+            self._edited_at = None
+
+    def _on_edit(self, kind: str, row: int, col: int, text: str):
+        """編集のたびに保存までの待ち時間を延ばす（キー入力ごとに呼ばれるので記録だけ）"""
+        self._edits += 1
+        self._stamps[self.screen.file.buffers.current.number] = self._edits
+        if self.enabled:
+            self._edited_at = time.monotonic()
+
+    # --- 保存 ---
+    def on_idle(self):
+        """アイドル時に書き終わった保存を反映し、編集が止まっていれば保存を始める（次に呼ばれたいミリ秒数を返す）"""
+        writer = self.screen.file.writer
+        redraw = False
+        for job in writer.poll():
+            self._finish(job)
+            redraw = True
+        now = time.monotonic()
+        waits = []
+        if self._edited_at is not None:
+            remaining = self._edited_at + self.delay - now
+            if remaining > 0:
+                waits.append(int(remaining * 1000) + 1)
+            else:
+                self._edited_at = None
+                redraw = self.save_modified() > 0 or redraw
+        if writer.depth:
+            waits.append(self.POLL_MS)
+        if self._last_latency is not None:
+            status_left = self._last_saved_at + self.STATUS_SECONDS - now
+            if status_left > 0:
+                waits.append(int(status_left * 1000) + 1)  # 表示を消すために戻ってくる
+            else:
+                self._last_latency = None
+                redraw = True
+        if redraw:
+            self.screen.editor.needs_redraw = True
+            waits.append(1)
+        return min(waits) if waits else False
+
+    def save_modified(self) -> int:
+        """変更のあるファイル名付きのバッファをバックグラウンドで保存し、キューに入れた数を返す"""
+        count = 0
+        for entry in self.screen.file.buffers:
+            if self._can_save(entry):
+                self.save_in_background(entry)
+                count += 1
+        return count
+
+    def _can_save(self, entry: BufferEntry) -> bool:
+        file = self.screen.file
+        file_manager = entry.file_manager
+        if not entry.is_modified or not file_manager.filename or file.is_loading(entry):
+            return False
+        if entry is not file.buffers.current and entry.lines is None:
+            return False
+        disk = file.buffers.file_stat(file_manager.filename)
+        # 読み込み後に外部で変わったファイルは上書きしない
+        return entry.stat is None or disk is None or disk == entry.stat
+
+    def save_in_background(self, entry: BufferEntry, notify: bool = False) -> WriteJob:
+        """バッファのスナップショットを書き込みスレッドで保存する（notify なら終わったときに通知する）"""
+        file = self.screen.file
+        file_manager = entry.file_manager
+        lines = self.screen.editor.buffer.lines if entry is file.buffers.current else entry.lines
+        snapshot = lines.snapshot() if hasattr(lines, 'snapshot') else list(lines)
+        job = WriteJob(file_manager, file_manager.filename, snapshot,
+                       file_manager.encoding, file_manager.line_ending,
+                       file.next_backup(file_manager), file.fsync,
+                       tag=(entry, self._stamps.get(entry.number, 0), notify))
+        file.writer.submit(job)
+        self.screen.editor.needs_redraw = True
+        return job
+
+    def _finish(self, job: WriteJob):
+        """書き終わった保存をバッファの状態に反映"""
+        entry, stamp, notify = job.tag
+        buffers = self.screen.file.buffers
+        if job.error is not None:
+            message = "Failed to save file" if notify else "Auto-save failed"
+            self.screen.notifications.add(f"{message}: {job.error}", NotificationLevel.ERROR, duration=5.0)
+            return
+        self._last_latency = job.elapsed
+        self._last_saved_at = time.monotonic()
+        if buffers.get(entry.number) is not entry or entry.file_manager.filename != job.path:
+            return
+        # 外部の変更と見なされないように保存後の状態を記録する
+        entry.stat = buffers.file_stat(job.path)
+        if self._stamps.get(entry.number, 0) == stamp:
+            entry.file_manager.is_modified = False
+        if notify:
+            self.screen.notifications.add(f"Saved: {job.path}", NotificationLevel.SUCCESS)
+
+    def finish_pending(self):
+        """キューの書き込みが終わるまで待って結果を反映する（:wq で終了する前など）"""
+        writer = self.screen.file.writer
+        writer.wait()
+        for job in writer.poll():
+            self._finish(job)
+
+    def is_saving(self, entry: BufferEntry) -> bool:
+        """バッファのファイルを書き込み中か（書き終わりを反映する前を含む）"""
+        filename = entry.file_manager.filename
+        return filename is not None and self.screen.file.writer.is_busy(filename)
+
+    def get_status(self) -> str:
+        """ステータスラインに表示する保存の状態（進み具合・キューの件数と最後の保存の所要時間）"""
+        writer = self.screen.file.writer
+        depth = writer.depth
+        if depth:
+            progress = writer.progress
+            if progress is None:
+                return f"[Saving q{depth}]"
+            return f"[Saving {int(progress * 100)}% q{depth}]"
+        if self._last_latency is not None:
+            return f"[Saved {self._last_latency * 1000:.0f}ms]"
+        return ''
+
+    def close(self):
+        """残っている書き込みを終える（終了時）"""
+        self.screen.file.writer.close()
+        self.finish_pending()
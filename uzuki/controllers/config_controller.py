@@ -20,6 +20,10 @@ class ConfigController:
         # エディタ設定
         editor_config = self.config_manager.get_editor_config()
         self.screen.file.file_manager.encoding = editor_config.get('default_encoding', 'utf-8')
+        self.screen.editor.buffer.set_store_type(editor_config.get('text_store', 'chunked'))
+        self.screen.editor.history.max_bytes = editor_config.get('undo_memory_limit', 16 * 1024 * 1024)
+        self.screen.file.buffers.memory_budget = editor_config.get('buffer_memory_limit', 256 * 1024 * 1024)
+        self.screen.ui.editor_display.layouts.set_tab_size(editor_config.get('tab_size', 4))
         
         # 表示設定
         display_config = self.config_manager.get_display_config()
@@ -27,6 +31,20 @@ class ConfigController:
             self.screen.ui.toggle_line_numbers()
         if not display_config.get('current_line_highlight', True):
             self.screen.ui.toggle_current_line_highlight()
+        self.screen.ui.scheduler.set_max_fps(display_config.get('max_fps', 60))
+        self.screen.ui.editor_display.syntax_highlight = display_config.get('syntax_highlight', True)
+        self.screen.ui.editor_display.wrap = display_config.get('wrap', False)
+        
+        # 検索設定
+        self.screen.search.apply_config(self.config_manager.get_search_config())
+        
+        # ファイル設定
+        file_config = self.config_manager.get_file_config()
+        self.screen.file.apply_config(file_config)
+        self.screen.autosave.apply_config(file_config)
+        self.screen.watch.apply_config(file_config)
+        self.screen.swap.apply_config(file_config)
+        self.screen.session.apply_config(file_config)
         
         # 通知設定
         notification_config = self.config_manager.get_notification_config()
@@ -8,11 +8,15 @@ and core editor operations.
 from uzuki.core.buffer import Buffer
 from uzuki.core.cursor import Cursor
 from uzuki.core.history import History
+from uzuki.core.syntax import SyntaxHighlighter
 from uzuki.modes.normal_mode import NormalMode
 from uzuki.modes.insert_mode import InsertMode
 from uzuki.commands.command_mode import CommandMode
 from uzuki.modes.file_browser_mode import FileBrowserMode
-from uzuki.input.handler import InputHandler
+from uzuki.modes.search_mode import SearchMode
+from uzuki.modes.finder_mode import FinderMode
+from uzuki.input.handler import InputHandler, PasteBlock
+from uzuki.input.keycodes import Key
 from uzuki.input.sequence_manager import KeySequenceManager
 from uzuki.keymaps.manager import KeyMapManager
 
@@ -26,15 +30,20 @@ class EditorController:
         self.buffer = Buffer()
         self.cursor = Cursor()
         self.history = History()
+        self.syntax = SyntaxHighlighter()
         
         # 変更通知コールバックを設定
         self.buffer.set_change_callback(self._on_buffer_change)
         self.cursor.set_move_callback(self._on_cursor_move)
+        self.history.attach(self.buffer, self.cursor)
+        self.syntax.attach(self.buffer)
         
         # モード（FileBrowserModeは遅延初期化）
         self.normal_mode = NormalMode(screen)
         self.insert_mode = InsertMode(screen)
         self.command_mode = CommandMode(screen)
+        self.search_mode = SearchMode(screen)
+        self.finder_mode = FinderMode(screen)
         self._file_browser_mode = None  # 遅延初期化
         self.mode = self.normal_mode
         
@@ -62,33 +71,86 @@ class EditorController:
         sequence = self.sequence_manager.add_key(key_info.key_name)
         
         # アクションを検索
-        action = self.keymap.get_action(self.mode.mode_name, sequence)
+        keys = self.sequence_manager.get_keys()
+        action = self.keymap.get_action(self.mode.mode_name, sequence, keys)
         
         if action:
             # アクションが見つかったら即座に実行
             action()
             self.sequence_manager.clear()
             self.needs_redraw = True
-        elif self.keymap.has_potential_mapping(self.mode.mode_name, sequence):
+        elif self.keymap.has_potential_mapping(self.mode.mode_name, sequence, keys):
             # 潜在的なマッピングがある場合は待つ
             pass
         else:
             # マッピングがない場合は即座にデフォルト処理
-            if len(sequence) == 1:
+            if len(keys) == 1:
                 self.mode.handle_default(key_info)
                 self.needs_redraw = True
             self.sequence_manager.clear()
     
+    def handle_keys(self, events):
+        """まとめて届いた入力を処理（キーコードと PasteBlock の列）"""
+        codes = []
+        for event in events:
+            if isinstance(event, PasteBlock):
+                self._handle_codes(codes)
+                codes = []
+                self.handle_paste(event.text)
+            else:
+                codes.append(event)
+        self._handle_codes(codes)
+    
+    def handle_paste(self, text: str):
+        """ペーストされたテキストを現在のモードに渡す"""
+        self.sequence_manager.clear()
+        self.mode.handle_paste(text)
+        self.needs_redraw = True
+    
+    def _handle_codes(self, raw_codes):
+        """キーコード列を処理（挿入モードの連続した文字は1回で挿入）"""
+        i = 0
+        count = len(raw_codes)
+        while i < count:
+            if self.mode is self.insert_mode and not self.sequence_manager.get_keys():
+                # マッピングに使われていない印字可能文字の連続を1つの挿入にまとめる
+                mapped = self.keymap.get_first_keys(self.mode.mode_name)
+                end = i
+                while (end < count and 32 <= raw_codes[end] < 127 and
+                       Key.get_key_name(raw_codes[end]) not in mapped):
+                    end += 1
+                if end - i > 1:
+                    self.insert_mode.insert_text(''.join(map(chr, raw_codes[i:end])))
+                    i = end
+                    continue
+            self.handle_key(raw_codes[i])
+            i += 1
+    
     def set_mode(self, mode_name: str):
         """モードを切り替える"""
+        # 読み込み中のバッファは編集できない
+        if mode_name == 'insert' and self.buffer.read_only:
+            self.screen.notify_warning("File is still loading (read-only)")
+            return
+        
+        # 挿入モード中の入力は1つの undo 単位にまとめる
+        if mode_name == 'insert':
+            self.history.begin_group()
+        elif self.mode is self.insert_mode:
+            self.history.end_group()
+        
         if mode_name == 'normal':
             self.mode = self.normal_mode
         elif mode_name == 'insert':
             self.mode = self.insert_mode
         elif mode_name == 'command':
             self.mode = self.command_mode
+        elif mode_name == 'search':
+            self.mode = self.search_mode
         elif mode_name == 'file_browser':
             self.mode = self.file_browser_mode
+        elif mode_name == 'finder':
+            self.mode = self.finder_mode
         
         # モード切り替え時にシーケンスをクリア
         self.sequence_manager.clear()
@@ -98,14 +160,28 @@ class EditorController:
         """エディタを終了"""
         self.running = False
     
+    def undo(self):
+        """元に戻す"""
+        if not self.history.undo():
+            self.screen.notify_info("Already at oldest change")
+        self.needs_redraw = True
+    
+    def redo(self):
+        """やり直す"""
+        if not self.history.redo():
+            self.screen.notify_info("Already at newest change")
+        self.needs_redraw = True
+    
     def load_keymap_config(self, config: dict):
         """キーマップ設定を読み込み"""
         self.keymap.load_from_config(config)
     
     # コールバック
-    def _on_buffer_change(self):
+    def _on_buffer_change(self, start: int, end: int, delta: int):
         """バッファ変更時の処理"""
         self.screen.file.mark_modified()
+        # 行数が変わった場合は以降の行がずれるので末尾まで再描画
+        self.screen.ui.damage.mark_lines(start, end if delta == 0 else None)
         self.needs_redraw = True
     
     def _on_cursor_move(self):
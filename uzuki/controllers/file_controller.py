@@ -2,50 +2,492 @@
 File Controller
 
 Manages file operations including loading, saving, encoding detection,
-and file browser functionality.
+the buffer list and file browser functionality. Large files are loaded on a
+background thread: the first screenful is shown as soon as it is decoded,
+the buffer stays read-only until the load completes, and Esc cancels it.
+Saves write through `FileManager.write_file`, which writes a temporary file
+next to the target and renames it over the original (fsynced with
+`file.fsync`), or writes the original in place when it has other hardlinks
+or its directory is not writable; with `file.backup_files` the first save
+of a buffer keeps the previous file as a hardlink (or a copy) with
+`file.backup_extension`.
+Background writes go through the controller's FileWriter: auto-save, and
+`:w` of a large buffer to its own file, which shows its progress in the
+status line. A synchronous save waits for queued writes first.
+
+A buffer whose file is at least `file.large_file_size` bytes or has at least
+`file.large_file_lines` lines is in large-file mode: it is not
+syntax-highlighted, search matches are not counted, a single change too big
+for the undo memory limit is not kept, and the status line shows `[LARGE]`.
+Files of `file.large_file_size` or more are also loaded lazily (mmap).
 """
 
 import os
+from typing import List, Optional
+from uzuki.core.buffer_list import BufferEntry, BufferList
+from uzuki.core.file_loader import FileLoader
 from uzuki.core.file_manager import FileManager
+from uzuki.core.file_writer import FileWriter
 from uzuki.core.file_selector import FileSelector
+from uzuki.core.syntax import get_lexer_for_filename
 from uzuki.ui.notification import NotificationLevel
 
 class FileController:
     """ファイル操作を制御するコントローラー"""
     
+    BACKGROUND_LOAD_THRESHOLD = 4 * 1024 * 1024  # これ以上のファイルは別スレッドで読み込む
+    BACKGROUND_SAVE_LINES = 100_000  # これ以上の行数のバッファは別スレッドで保存する
+    
     def __init__(self, screen):
         self.screen = screen
-        self.file_manager = FileManager()
+        self.file_manager = FileManager()  # 表示中のバッファの FileManager
         self.file_selector = FileSelector()
+        self.buffers = BufferList()
+        self.buffers.set_current(self.buffers.add(self.file_manager))
+        
+        # バックグラウンドの読み込み
+        self.loader: Optional[FileLoader] = None
+        self._load_entry: Optional[BufferEntry] = None  # 読み込み先のバッファ
+        self._load_restore = None  # 中断時に戻す (行ストア, FileManager)（既存のバッファに読み込む場合）
+        self._load_shown = 0       # 表示に反映した行数
+        
+        # 保存
+        self.writer = FileWriter()  # バックグラウンドの書き込み（自動保存）
+        self.backup_extension: Optional[str] = '.bak'  # バックアップを作らないなら None
+        self.fsync = True  # 置き換える前に一時ファイルをディスクに書き出す
+        
+        # 巨大ファイルモードのしきい値
+        self.large_file_size = FileManager.LAZY_LOAD_THRESHOLD  # これ以上のファイルは遅延読み込みもする
+        self.large_file_lines = 1_000_000
+        screen.container.register_hook('idle', self.on_idle)
+    
+    def apply_config(self, file_config: dict):
+        """ファイル設定を適用"""
+        if file_config.get('backup_files', True):
+            self.backup_extension = file_config.get('backup_extension', '.bak') or None
+        else:
+            self.backup_extension = None
+        self.fsync = file_config.get('fsync', True)
+        self.large_file_size = file_config.get('large_file_size', self.large_file_size)
+        self.large_file_lines = file_config.get('large_file_lines', self.large_file_lines)
     
     def load_file(self, filepath: str) -> bool:
-        """ファイルを読み込み"""
+        """ファイルを読み込み（開いているファイルならそのバッファに切り替える）"""
+        current = self.buffers.current
+        entry = self.buffers.find(filepath)
+        if entry is not None and entry is self._load_entry:
+            # 読み込み中のファイル
+            return entry is current or self.switch_buffer(entry)
+        if entry is not None and entry is not current:
+            return self.switch_buffer(entry)
+        
+        # 表示中のファイルの読み直しと、空の無名バッファへの読み込みはそのバッファを使う
+        reuse = entry is current or self._is_blank(current)
         try:
-            lines = self.file_manager.load_file(filepath)
+            background = os.path.getsize(filepath) >= self.BACKGROUND_LOAD_THRESHOLD
+        except OSError:
+            background = False
+        if background:
+            return self._start_load(filepath, reuse)
+        file_manager = self.file_manager if reuse else FileManager()
+        try:
+            lines = file_manager.load_file(filepath, lazy_threshold=self.large_file_size)
+        except Exception as e:
+            self.screen.notifications.add(f"Failed to load file: {e}", NotificationLevel.ERROR, duration=5.0)
+            return False
+        
+        stat = self.buffers.file_stat(file_manager.filename)
+        if reuse:
+            entry = current
+            entry.stat = stat
+            self._check_large(entry, lines)
             self.screen.editor.buffer.lines = lines
+            self._set_syntax(filepath)
+            self.screen.editor.history.clear()
+            self._apply_large_mode(entry)
             self.screen.editor.cursor.row = 0
             self.screen.editor.cursor.col = 0
-            self.screen.notifications.add(f"Loaded: {filepath}", NotificationLevel.SUCCESS)
-            return True
+            self.buffers.rename(entry)
+        else:
+            self.stash_current()
+            entry = self.buffers.add(file_manager)
+            entry.lines = lines
+            entry.stat = stat
+            self._check_large(entry, lines)
+            self.show_buffer(entry)
+        entry.size = self.buffers.estimate_size(self.screen.editor.buffer.lines,
+                                                stat[1] if stat else None)
+        self.buffers.evict(self.screen.ui.visible_buffers())
+        self.screen.notifications.add(f"Loaded: {filepath}", NotificationLevel.SUCCESS)
+        return True
+    
+    # --- バックグラウンドの読み込み ---
+    def _start_load(self, filepath: str, reuse: bool) -> bool:
+        """別スレッドでの読み込みを開始（読み込んだ行は on_idle で順に表示する）"""
+        if self.loader is not None:
+            self.cancel_load()
+        editor = self.screen.editor
+        loader = FileLoader(filepath, editor.buffer.store_factory, self.large_file_size)
+        if reuse:
+            entry = self.buffers.current
+            self._load_restore = (editor.buffer.lines, entry.file_manager)
+            entry.file_manager = self.file_manager = loader.file_manager
+            editor.buffer.lines = ['']
+            editor.history.clear()
+            editor.cursor.row = 0
+            editor.cursor.col = 0
+            self.buffers.rename(entry)
+            self.screen.ui.invalidate()
+        else:
+            self.stash_current()
+            entry = self.buffers.add(loader.file_manager)
+            entry.lines = ['']
+            self._load_restore = None
+        self.loader = loader
+        self._load_entry = entry
+        self._load_shown = 0
+        # 行数は読み終わるまでわからないので、まずファイルの大きさで決める
+        self._check_large(entry, (), self.buffers.file_stat(filepath))
+        if not reuse:
+            self.show_buffer(entry)
+        editor.buffer.read_only = True
+        self._set_syntax(filepath)
+        self._apply_large_mode(entry)
+        editor.needs_redraw = True
+        loader.start()
+        return True
+    
+    def is_loading(self, entry: Optional[BufferEntry] = None) -> bool:
+        """読み込み中か（entry を指定するとそのバッファが読み込み中か）"""
+        return self.loader is not None and (entry is None or entry is self._load_entry)
+    
+    def _publish(self, entry: BufferEntry, lines):
+        """読み込み先のバッファの行ストアを差し替える"""
+        if entry is self.buffers.current:
+            editor = self.screen.editor
+            if editor.buffer.lines is not lines:
+                editor.buffer.lines = lines
+            cursor = editor.cursor
+            cursor.row = min(cursor.row, len(lines) - 1)
+            cursor.col = min(cursor.col, len(lines[cursor.row]))
+        else:
+            entry.lines = lines
+        self.screen.ui.damage.mark_all()
+        self.screen.editor.needs_redraw = True
+    
+    def on_idle(self) -> bool:
+        """アイドル時に読み込みの進み具合を反映（読み込み中なら True を返し、定期的に呼ばれ続ける）"""
+        loader = self.loader
+        if loader is None:
+            return False
+        if loader.done:
+            self._finish_load()
+            return False
+        lines = loader.lines
+        if lines:
+            # 最初の画面分が揃った時点から表示し、以降は伸びた分を描き直す
+            entry = self._load_entry
+            shown = self.screen.editor.buffer.lines if entry is self.buffers.current else entry.lines
+            if shown is not lines or len(lines) != self._load_shown:
+                self._load_shown = len(lines)
+                self._publish(entry, lines)
+        self.screen.editor.needs_redraw = True  # 進捗をステータスラインに反映
+        return True
+    
+    def _finish_load(self):
+        """読み込みが終わった行ストアを表示し、編集できるようにする"""
+        loader, entry = self.loader, self._load_entry
+        self.loader = self._load_entry = None
+        if loader.error is not None:
+            self.screen.notifications.add(f"Failed to load file: {loader.error}", NotificationLevel.ERROR, duration=5.0)
+            self._abort_load(loader, entry)
+            return
+        self._load_restore = None
+        lines = loader.result
+        self._publish(entry, lines)
+        if entry is self.buffers.current:
+            self.screen.editor.buffer.read_only = False
+        self.buffers.rename(entry)
+        entry.stat = self.buffers.file_stat(loader.file_manager.filename)
+        entry.size = self.buffers.estimate_size(lines, entry.stat[1] if entry.stat else None)
+        self._check_large(entry, lines)
+        if entry is self.buffers.current:
+            self._apply_large_mode(entry)
+        else:
+            entry.syntax = None  # 表示するときに字句解析器を選び直す
+        self.buffers.evict(self.screen.ui.visible_buffers())
+        self.screen.notifications.add(f"Loaded: {loader.filepath}", NotificationLevel.SUCCESS)
+    
+    def cancel_load(self) -> bool:
+        """読み込みを中断する（Esc）。読み込み中でなければ False"""
+        loader, entry = self.loader, self._load_entry
+        if loader is None:
+            return False
+        loader.cancel()
+        self.loader = self._load_entry = None
+        self._abort_load(loader, entry)
+        self.screen.notifications.add(f"Loading cancelled: {loader.filepath}", NotificationLevel.WARNING)
+        return True
+    
+    def _abort_load(self, loader: FileLoader, entry: BufferEntry):
+        """読み込みをやめたバッファを読み込み前に戻す（新しいバッファなら一覧から除く）"""
+        editor = self.screen.editor
+        restore, self._load_restore = self._load_restore, None
+        if restore is not None:
+            lines, file_manager = restore
+            entry.file_manager = file_manager
+            self.buffers.rename(entry)
+            if entry is self.buffers.current:
+                self.file_manager = file_manager
+                editor.buffer.lines = lines
+                editor.buffer.read_only = False
+                self._check_large(entry, lines)
+                self._set_syntax(file_manager.filename)
+                self._apply_large_mode(entry)
+                editor.cursor.row = editor.cursor.col = 0
+                self.screen.ui.invalidate()
+                editor.needs_redraw = True
+            else:
+                entry.lines = lines
+                entry.syntax = None
+            return
+        replacement = self.buffers.alternate
+        if replacement is None or replacement is entry:
+            replacement = self.buffers.neighbor(entry, -1)
+        if entry is self.buffers.current:
+            editor.buffer.read_only = False
+            self.switch_buffer(replacement)
+        self.buffers.remove(entry)
+        self.screen.ui.replace_buffer(entry, self.buffers.current)
+    
+    def get_load_status(self) -> str:
+        """ステータスラインに表示する読み込みの進捗"""
+        loader = self.loader
+        if loader is None:
+            return ''
+        progress = loader.progress
+        if progress is None:
+            return '[Loading...]'
+        return f"[Loading {int(progress * 100)}%]"
+    
+    # --- バッファ一覧 ---
+    def _is_blank(self, entry: BufferEntry) -> bool:
+        """名前も変更もない空のバッファか（起動直後の無名バッファ）"""
+        lines = self.screen.editor.buffer.lines
+        return (not entry.file_manager.filename and not entry.is_modified
+                and len(lines) == 1 and not lines[0])
+    
+    def stash_current(self):
+        """表示中のバッファの行ストアと状態を一覧の項目に退避"""
+        editor = self.screen.editor
+        display = self.screen.ui.editor_display
+        entry = self.buffers.current
+        entry.lines = editor.buffer.lines
+        entry.cursor = (editor.cursor.row, editor.cursor.col)
+        entry.scroll = (display.scroll_y, display.scroll_x, display.wrap_skip)
+        entry.history = editor.history.get_state()
+        entry.syntax = editor.syntax.get_state()
+        if entry.is_modified:
+            entry.size = self.buffers.estimate_size(entry.lines)
+    
+    def show_buffer(self, entry: BufferEntry):
+        """退避してあるバッファを表示中にする"""
+        editor = self.screen.editor
+        display = self.screen.ui.editor_display
+        editor.buffer.lines = entry.lines
+        entry.lines = None
+        self.file_manager = entry.file_manager
+        editor.history.set_state(entry.history)
+        if entry.syntax is not None:
+            editor.syntax.set_state(entry.syntax)
+        else:
+            editor.syntax.set_lexer(None if entry.large else get_lexer_for_filename(entry.file_manager.filename))
+        entry.history = entry.syntax = None
+        self._apply_large_mode(entry)
+        
+        lines = editor.buffer.lines
+        row, col = entry.cursor
+        editor.cursor.row = max(0, min(row, len(lines) - 1))
+        editor.cursor.col = max(0, min(col, len(lines[editor.cursor.row])))
+        display.scroll_y, display.scroll_x, display.wrap_skip = entry.scroll
+        editor.buffer.read_only = self.is_loading(entry)
+        self.buffers.set_current(entry)
+        self.screen.ui.current_window.entry = entry
+        self.screen.ui.invalidate()
+        editor.needs_redraw = True
+    
+    def _reload(self, entry: BufferEntry) -> bool:
+        """手放したバッファをファイルから読み直す"""
+        file_manager = entry.file_manager
+        filepath = file_manager.filename
+        # 前に読んだときからファイルが変わっていなければ、そのときのエンコーディングで読む
+        # （latin-1 などは何でも読めてしまうので、書き換えられたファイルでは判定し直す）
+        unchanged = entry.stat is not None and self.buffers.file_stat(filepath) == entry.stat
+        try:
+            lines = file_manager.load_file(filepath, encoding=file_manager.encoding if unchanged else None,
+                                           lazy_threshold=self.large_file_size)
         except Exception as e:
             self.screen.notifications.add(f"Failed to load file: {e}", NotificationLevel.ERROR, duration=5.0)
             return False
+        stat = self.buffers.file_stat(filepath)
+        if stat != entry.stat:
+            # 手放した後にファイルが変わっていたら履歴は当てはまらない
+            entry.history = None
+            self.screen.notifications.add(f"File changed on disk: {filepath}", NotificationLevel.WARNING)
+        entry.lines = lines
+        entry.stat = stat
+        entry.size = self.buffers.estimate_size(lines, stat[1] if stat else None)
+        entry.evicted = False
+        self._check_large(entry, lines)
+        return True
+    
+    # --- 巨大ファイルモード ---
+    def _check_large(self, entry: BufferEntry, lines, stat=None):
+        """ファイルの大きさか行数がしきい値以上なら巨大ファイルモードにする（stat を省くと entry.stat）"""
+        stat = stat or entry.stat
+        large = ((stat is not None and stat[1] >= self.large_file_size)
+                 or len(lines) >= self.large_file_lines)
+        if large != entry.large:
+            entry.large = large
+            entry.syntax = None  # 字句解析器を選び直す
+    
+    def _set_syntax(self, filename: Optional[str]):
+        """表示中のバッファの字句解析器をファイル名に合わせる（巨大ファイルモードではハイライトしない）"""
+        self.screen.editor.syntax.set_filename(None if self.buffers.current.large else filename)
+    
+    def _apply_large_mode(self, entry: BufferEntry):
+        """表示中のバッファのモードに合わせてハイライトと undo の上限を切り替える"""
+        editor = self.screen.editor
+        if entry.large and editor.syntax.lexer is not None:
+            editor.syntax.set_lexer(None)
+        # 巨大ファイルでは上限を超える1つの変更（大きな削除など）の内容を残さない
+        editor.history.limit_changes = entry.large
+    
+    def update_large_mode(self, entry: BufferEntry):
+        """読み直したバッファの巨大ファイルモードを判定し直す（表示中ならハイライトと undo の上限も切り替える）"""
+        lines = self.screen.editor.buffer.lines if entry is self.buffers.current else entry.lines
+        self._check_large(entry, lines)
+        if entry is self.buffers.current:
+            self._set_syntax(entry.file_manager.filename)
+            self._apply_large_mode(entry)
+    
+    def switch_buffer(self, entry: BufferEntry) -> bool:
+        """バッファを切り替える"""
+        if entry is self.buffers.current:
+            return True
+        if entry.evicted and not self._reload(entry):
+            return False
+        self.stash_current()
+        self.show_buffer(entry)
+        self.buffers.evict(self.screen.ui.visible_buffers())
+        return True
+    
+    def show_restored(self, entry: BufferEntry, alternate: Optional[BufferEntry] = None) -> bool:
+        """セッションから加えたバッファを表示する（起動直後の無名バッファは除く）"""
+        previous = self.buffers.current
+        blank = self._is_blank(previous)
+        if not self.switch_buffer(entry):
+            return False
+        if blank and previous is not entry:
+            self.buffers.remove(previous)
+            self.screen.ui.replace_buffer(previous, entry)
+        if alternate is not None and alternate is not entry:
+            self.buffers.alternate = alternate
+        return True
+    
+    def switch_to(self, target: str) -> bool:
+        """番号または名前の一部でバッファを指定して切り替える"""
+        if target.isdigit():
+            entry = self.buffers.get(int(target))
+            if entry is None:
+                self.screen.notify_error(f"Buffer {target} does not exist")
+                return False
+            return self.switch_buffer(entry)
+        matches = self.buffers.match(target)
+        if not matches:
+            self.screen.notify_error(f"No matching buffer for {target}")
+            return False
+        if len(matches) > 1:
+            self.screen.notify_error(f"More than one match for {target}")
+            return False
+        return self.switch_buffer(matches[0])
     
-    def save_file(self, filepath: str = None) -> bool:
-        """ファイルを保存"""
+    def cycle_buffer(self, count: int) -> bool:
+        """番号順で count 個先（負なら前）のバッファに切り替える"""
+        return self.switch_buffer(self.buffers.neighbor(self.buffers.current, count))
+    
+    def list_buffers(self) -> List[str]:
+        """バッファ一覧の表示行（:ls の形式）"""
+        result = []
+        for entry in self.buffers:
+            if entry is self.buffers.current:
+                flags = '%a'
+                row = self.screen.editor.cursor.row
+            else:
+                flags = ('#' if entry is self.buffers.alternate else ' ') + (' ' if entry.evicted else 'h')
+                row = entry.cursor[0]
+            modified = '+' if entry.is_modified else ' '
+            result.append(f"{entry.number:>3} {flags} {modified} \"{entry.name}\" line {row + 1}")
+        return result
+    
+    def buffer_names(self) -> List[str]:
+        """補完用のバッファ名"""
+        return [entry.file_manager.filename for entry in self.buffers if entry.file_manager.filename]
+    
+    def save_file(self, filepath: str = None, force: bool = False, wait: bool = False) -> bool:
+        """ファイルを保存（読み込み後に外部で変わったファイルへは force でなければ上書きしない。
+        wait ならバックグラウンドの書き込みも書き終わるまで待って結果を返す）"""
         try:
             save_path = filepath or self.file_manager.filename
+            if self.is_loading(self.buffers.current):
+                self.screen.notifications.add("File is still loading", NotificationLevel.WARNING)
+                return False
             if not save_path:
                 self.screen.notifications.add("No file to save", NotificationLevel.WARNING)
                 return False
+            if not force and self._changed_on_disk(save_path):
+                self.screen.notifications.add("File changed on disk since it was read (add ! to overwrite)",
+                                              NotificationLevel.ERROR, duration=5.0)
+                return False
+            
+            entry = self.buffers.current
+            lines = self.screen.editor.buffer.lines
+            if len(lines) >= self.BACKGROUND_SAVE_LINES and self.buffers.find(save_path) is entry:
+                # 大きなバッファは別スレッドで書き出す（終わったら AutoSaveController が通知する）
+                job = self.screen.autosave.save_in_background(entry, notify=True)
+                if not wait:
+                    return True
+                self.screen.autosave.finish_pending()
+                return job.error is None
             
-            self.file_manager.save_file(save_path, self.screen.editor.buffer.lines)
+            # 自動保存の書き込みが後から古い内容で上書きしないように待つ
+            self.writer.wait()
+            self.file_manager.save_file(save_path, lines, backup_extension=self.next_backup(self.file_manager),
+                                        fsync=self.fsync)
+            self._set_syntax(self.file_manager.filename or save_path)
+            self.buffers.rename(entry)
+            entry.stat = self.buffers.file_stat(self.file_manager.filename)
             self.screen.notifications.add(f"Saved: {save_path}", NotificationLevel.SUCCESS)
             return True
         except Exception as e:
             self.screen.notifications.add(f"Failed to save file: {e}", NotificationLevel.ERROR, duration=5.0)
             return False
     
+    def next_backup(self, file_manager: FileManager) -> Optional[str]:
+        """この保存でバックアップを作るならその拡張子（読み込み後の最初の保存だけ作る）"""
+        if self.backup_extension is None or file_manager.backed_up:
+            return None
+        file_manager.backed_up = True
+        return self.backup_extension
+    
+    def _changed_on_disk(self, save_path: str) -> bool:
+        """保存先が表示中のバッファのファイルで、読み込み・保存時から変わっているか"""
+        entry = self.buffers.current
+        if entry.stat is None or self.buffers.find(save_path) is not entry:
+            return False
+        disk = self.buffers.file_stat(save_path)
+        return disk is not None and disk != entry.stat
+    
     def set_encoding(self, encoding: str) -> bool:
         """文字エンコーディングを設定"""
         try:
@@ -71,6 +513,8 @@ class FileController:
             else:
                 # ファイルが存在しない場合は新規作成
                 self.file_manager.filename = resolved_path
+                self.buffers.rename(self.buffers.current)
+                self._set_syntax(resolved_path)
                 self.screen.notifications.add(f"New file: {resolved_path}", NotificationLevel.INFO)
         except Exception as e:
             self.screen.notifications.add(f"Failed to load initial file: {e}", NotificationLevel.ERROR)
@@ -83,9 +527,29 @@ class FileController:
         current_mode = self.screen.editor.mode.mode_name
         self.screen.editor.file_browser_mode.enter_browser(current_mode)
     
+    def get_file_browser_content(self, max_height: int) -> List[str]:
+        """ファイルブラウザーに表示する行（ディレクトリは末尾に / を付ける）"""
+        browser = self.screen.editor.file_browser_mode.browser
+        return [name + '/' if is_dir else name
+                for name, path, is_dir, selected in browser.get_display_files(max_height)]
+    
+    def get_file_browser_selection(self) -> int:
+        """ファイルブラウザーで選択中の項目の表示位置"""
+        browser = self.screen.editor.file_browser_mode.browser
+        return browser.current_index - browser.scroll_offset
+    
     def get_file_info(self) -> dict:
-        """ファイル情報を取得"""
-        return self.file_manager.get_file_info()
+        """ファイル情報を取得（描画のたびに呼ばれるので stat せず、読み込み・保存時の大きさを使う）"""
+        file_manager = self.file_manager
+        stat = self.buffers.current.stat
+        return {
+            'name': os.path.basename(file_manager.filename) if file_manager.filename else 'untitled',
+            'path': file_manager.filename,
+            'encoding': file_manager.encoding,
+            'modified': file_manager.is_modified,
+            'size': stat[1] if stat else 0,
+            'line_ending': file_manager.line_ending,
+        }
     
     def is_modified(self) -> bool:
         """ファイルが変更されているかチェック"""
@@ -0,0 +1,119 @@
+"""
+Finder Controller
+
+Manages the fuzzy file finder: the file index of the current directory (loaded
+from the on-disk cache, then refreshed by a background crawl), ranking of the
+indexed paths against the query in time-sliced steps, and opening the
+selected file. Results stream into the list while the crawl and the ranking
+are still running.
+"""
+
+import os
+from typing import List, Optional
+from uzuki.core.file_index import FileIndex
+from uzuki.core.fuzzy import FuzzyMatcher
+
+class FinderController:
+    """ファイル検索（ファジーファインダー）を制御するコントローラー"""
+
+    STEP_BUDGET = 0.015  # 1回の絞り込みにかける最大秒数
+    RESULT_LIMIT = 200
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.index: Optional[FileIndex] = None
+        self.matcher = FuzzyMatcher(self.RESULT_LIMIT)
+        self.selection = 0
+        self._active = False
+        self._settled = False  # クロールも絞り込みも済み、結果が最新
+        self._results: List[str] = []
+
+        # クロール・絞り込み中はアイドル時に続きを進める
+        screen.container.register_hook('idle', self.on_idle)
+
+    # --- 開く・閉じる ---
+    def open(self, directory: Optional[str] = None):
+        """ファインダーを開く（別スレッドで保存した索引を読み、更新のクロールを始める）"""
+        root = os.path.abspath(directory or self.screen.file.get_current_directory())
+        if self.index is None or self.index.root != root:
+            if self.index is not None:
+                self.index.cancel()
+            self.index = FileIndex(root)
+        self.index.start()
+        self._active = True
+        self.selection = 0
+        self.screen.editor.finder_mode.begin()
+        self.screen.set_mode('finder')
+        self.update('')
+
+    def close(self):
+        """ファインダーを閉じる（クロールは続けて索引を保存する）"""
+        self._active = False
+        self._results = []
+        self.screen.set_mode('normal')
+
+    def update(self, query: str):
+        """入力が変わったら絞り込み直す"""
+        self.matcher.set_query(query)
+        self.selection = 0
+        self._step()
+
+    def open_selected(self):
+        """選択中のファイルを開く"""
+        path = self.get_selected()
+        root = self.index.root if self.index is not None else ''
+        self.close()
+        if path is None:
+            return
+        self.screen.load_file(os.path.join(root, path))
+
+    # --- 選択 ---
+    def move_selection(self, count: int):
+        """選択を count 個動かす（端で止まる）"""
+        if self._results:
+            self.selection = max(0, min(self.selection + count, len(self._results) - 1))
+
+    def get_selected(self) -> Optional[str]:
+        """選択中のパス（root からの相対パス）"""
+        if 0 <= self.selection < len(self._results):
+            return self._results[self.selection]
+        return None
+
+    # --- 絞り込み ---
+    def _step(self) -> bool:
+        """絞り込みを少し進めて結果を更新（最後まで済んだら True）"""
+        self._settled = False
+        finished = self.matcher.step(self.index.paths, self.STEP_BUDGET)
+        self._results = self.matcher.results()
+        if self.selection >= len(self._results):
+            self.selection = max(0, len(self._results) - 1)
+        self.screen.editor.needs_redraw = True
+        return finished
+
+    def on_idle(self) -> bool:
+        """アイドル時の処理（クロール中・絞り込み中なら True を返し、定期的に呼ばれ続ける）"""
+        if not self._active or self.index is None:
+            return False
+        crawling = self.index.crawling
+        if self._settled:
+            return False
+        # クロールが終わった後にもう一度進め、最後に追加・差し替えられた分を反映する
+        self._settled = self._step() and not crawling
+        return not self._settled
+
+    # --- 表示 ---
+    def get_results(self, max_height: int) -> List[str]:
+        """表示する結果（選択中の項目が見える範囲）"""
+        start = max(0, self.selection - max_height + 1)
+        return self._results[start:start + max_height]
+
+    def get_selection_offset(self, max_height: int) -> int:
+        """選択中の項目の表示位置"""
+        return min(self.selection, max_height - 1)
+
+    def get_status(self) -> str:
+        """ステータスラインに表示する件数（[一致数/総数]、クロール中は + を付ける）"""
+        if self.index is None:
+            return ''
+        more = '+' if self.index.crawling or not self.matcher.is_done(self.index.paths) else ''
+        return f"[{self.matcher.match_count}{more}/{len(self.index.paths)}]"
@@ -2,10 +2,14 @@
 Notification Controller
 
 Manages notification system including adding, removing, and rendering
-notifications with different levels and durations.
+notifications with different levels and durations. Active notifications are
+drawn by UIController as a message area above the status line (oldest at
+the top, one row per line of a multi-line message); an idle hook redraws the
+screen when one expires. Escape in normal mode dismisses them.
 """
 
-from typing import Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Tuple
 from uzuki.ui.notification import NotificationManager, NotificationRenderer, NotificationLevel
 
 class NotificationController:
@@ -15,28 +19,30 @@ class NotificationController:
         self.screen = screen
         self.notifications = NotificationManager()
         self.notification_renderer = NotificationRenderer(self.notifications)
+        screen.container.register_hook('idle', self.on_idle)
     
     def add(self, message: str, level: NotificationLevel = NotificationLevel.INFO, 
             duration: float = 3.0, metadata: Optional[Dict[str, Any]] = None):
         """通知を追加"""
-        self.notifications.add(message, level, duration, metadata)
+        notification_id = self.notifications.add(message, level, duration, metadata)
         self.screen.editor.needs_redraw = True
+        return notification_id
     
     def add_info(self, message: str, duration: float = 3.0):
         """情報通知を追加"""
-        self.add(message, NotificationLevel.INFO, duration)
+        return self.add(message, NotificationLevel.INFO, duration)
     
     def add_success(self, message: str, duration: float = 3.0):
         """成功通知を追加"""
-        self.add(message, NotificationLevel.SUCCESS, duration)
+        return self.add(message, NotificationLevel.SUCCESS, duration)
     
     def add_warning(self, message: str, duration: float = 4.0):
         """警告通知を追加"""
-        self.add(message, NotificationLevel.WARNING, duration)
+        return self.add(message, NotificationLevel.WARNING, duration)
     
     def add_error(self, message: str, duration: float = 5.0):
         """エラー通知を追加"""
-        self.add(message, NotificationLevel.ERROR, duration)
+        return self.add(message, NotificationLevel.ERROR, duration)
     
     def remove(self, notification_id: int):
         """通知を削除"""
@@ -50,7 +56,7 @@ class NotificationController:
     
     def get_active_notifications(self):
         """アクティブな通知を取得"""
-        return self.notifications.get_active_notifications()
+        return self.notifications.get_active()
     
     def set_colors(self, colors: Dict[NotificationLevel, int]):
         """通知の色を設定"""
@@ -66,4 +72,22 @@ class NotificationController:
     
     def render(self, stdscr, width: int, max_height: int) -> int:
         """通知を描画し、使用した行数を返す"""
-        return self.notification_renderer.render(stdscr, width, max_height) 
\ No newline at end of file
+        return self.notification_renderer.render(stdscr, width, max_height)
+    
+    def lines(self, width: int, max_lines: int) -> List[Tuple[str, int]]:
+        """メッセージ欄に表示する行 (テキスト, 色)"""
+        return self.notification_renderer.lines(width, max_lines)
+    
+    def on_idle(self):
+        """期限が切れた通知を消すために描き直す（次に期限が切れるまでのミリ秒数を返す）"""
+        count = len(self.notifications.notifications)
+        active = self.notifications.get_active()
+        if len(active) < count:
+            self.screen.editor.needs_redraw = True
+            return 1
+        if not active:
+            return False
+        remaining = min(n.created_at + n.duration for n in active) - time.time()
+        if remaining == float('inf'):
+            return False
+        return max(1, int(remaining * 1000) + 1)
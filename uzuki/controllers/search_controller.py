@@ -0,0 +1,172 @@
+"""
+Search Controller
+
+Manages buffer search: the `/` and `?` prompts with incremental preview,
+`n` / `N` repetition, match highlighting for visible lines, and the match
+count that is computed in the background for large buffers (and not at all
+for buffers in large-file mode, see FileController).
+"""
+
+from typing import List, Optional, Tuple
+from uzuki.core.search import SearchEngine
+
+class SearchController:
+    """検索を制御するコントローラー"""
+
+    BACKGROUND_THRESHOLD = 20000   # これ以上の行数ではマッチ数を別スレッドで数える
+    PREVIEW_TIMEOUT = 0.02         # インクリメンタル検索のプレビューにかける最大秒数
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.engine = SearchEngine()
+        self.engine.attach(screen.editor.buffer)
+
+        # 設定
+        self.incremental = True
+        self.highlight_matches = True
+
+        # 状態
+        self.direction_forward = True  # 最後の検索方向
+        self.highlight_active = False  # ハイライト表示中（:nohlsearch で解除）
+        self._origin: Optional[Tuple[int, int]] = None  # 検索開始時のカーソル位置
+        self._previous: Tuple[str, bool] = ('', False)  # 検索開始前のパターンとハイライト状態
+        self._counting = False
+
+        # 集計中はアイドル時に進捗を反映する
+        screen.container.register_hook('idle', self.on_idle)
+
+    def apply_config(self, search_config: dict):
+        """検索設定を適用"""
+        self.engine.set_case_sensitive(search_config.get('case_sensitive', False))
+        self.incremental = search_config.get('incremental_search', True)
+        self.highlight_matches = search_config.get('highlight_matches', True)
+        self.screen.ui.damage.mark_all()
+
+    # --- プロンプト ---
+    def start(self, forward: bool = True):
+        """検索プロンプトを開く（/ または ?）"""
+        cursor = self.screen.editor.cursor
+        self._origin = (cursor.row, cursor.col)
+        self._previous = (self.engine.pattern, self.highlight_active)
+        self.screen.editor.search_mode.begin(forward)
+        self.screen.set_mode('search')
+
+    def update(self, pattern: str, forward: bool):
+        """入力中のパターンでプレビュー（incremental_search が有効な場合）"""
+        if not self.incremental or self._origin is None:
+            return
+        self._set_pattern(pattern)
+        row, col = self._origin
+        match = None
+        if pattern:
+            match = self.engine.find(self.screen.editor.buffer.lines, row, col, forward,
+                                     timeout=self.PREVIEW_TIMEOUT)
+        if match:
+            row, col = match[0], match[1]
+        self._move_cursor(row, col)
+        if pattern:
+            self._start_count()
+
+    def confirm(self, pattern: str, forward: bool):
+        """検索を確定（空なら前回のパターンで検索）"""
+        origin = self._origin
+        self._origin = None
+        if not pattern:
+            pattern = self.engine.pattern
+        if not pattern:
+            return
+        self.direction_forward = forward
+        self._set_pattern(pattern)
+        if origin is not None:
+            self._move_cursor(*origin)
+        self._jump(forward)
+
+    def cancel(self):
+        """検索を取り消してカーソルとパターンを元に戻す"""
+        if self._origin is not None:
+            self._move_cursor(*self._origin)
+            self._origin = None
+        pattern, highlight = self._previous
+        self._set_pattern(pattern)
+        self.highlight_active = highlight
+
+    # --- n / N ---
+    def next(self, reverse: bool = False):
+        """前回の検索を繰り返す（reverse なら逆方向）"""
+        if not self.engine.pattern:
+            self.screen.notify_error("No previous search pattern")
+            return
+        self.highlight_active = True
+        self.screen.ui.damage.mark_all()
+        self._jump(self.direction_forward != reverse)
+
+    def clear_highlight(self):
+        """ハイライトを消す（パターンは保持）"""
+        if self.highlight_active:
+            self.highlight_active = False
+            self.screen.ui.damage.mark_all()
+            self.screen.editor.needs_redraw = True
+
+    def _set_pattern(self, pattern: str):
+        if self.engine.set_pattern(pattern):
+            self.screen.ui.damage.mark_all()
+        self.highlight_active = bool(pattern)
+        self.screen.editor.needs_redraw = True
+
+    def _jump(self, forward: bool):
+        """カーソルから次のマッチへ移動"""
+        lines = self.screen.editor.buffer.lines
+        cursor = self.screen.editor.cursor
+        match = self.engine.find(lines, cursor.row, cursor.col, forward)
+        if match is None:
+            self.screen.notify_error(f"Pattern not found: {self.engine.pattern}")
+            return
+        row, col, wrapped = match
+        if wrapped:
+            self.screen.notify_warning("search hit BOTTOM, continuing at TOP" if forward
+                                       else "search hit TOP, continuing at BOTTOM")
+        self._move_cursor(row, col)
+        self._start_count()
+
+    def _move_cursor(self, row: int, col: int):
+        self.screen.editor.cursor.move_to(row, col, self.screen.editor.buffer)
+        self.screen.editor.needs_redraw = True
+
+    # --- マッチ数 ---
+    def _start_count(self):
+        """マッチ数を数え直す（数え終わっていて編集もなければ何もしない。巨大ファイルモードでは数えない）"""
+        engine = self.engine
+        lines = self.screen.editor.buffer.lines
+        if engine.is_counted(lines) or engine.is_counting() or self.screen.file.buffers.current.large:
+            return
+        background = len(lines) >= self.BACKGROUND_THRESHOLD
+        engine.count(lines, background=background)
+        self._counting = background
+
+    def on_idle(self) -> bool:
+        """アイドル時の処理（集計中なら True を返し、定期的に呼ばれ続ける）"""
+        if not self._counting:
+            return False
+        self.screen.editor.needs_redraw = True  # 途中経過をステータスラインに反映
+        if self.engine.is_counting():
+            return True
+        self._counting = False
+        return False
+
+    def get_status(self) -> str:
+        """ステータスラインに表示するマッチ数"""
+        engine = self.engine
+        if not self.highlight_active or not engine.pattern:
+            return ''
+        if engine.count_complete:
+            return f"[{engine.match_count} match{'es' if engine.match_count != 1 else ''}]"
+        if self._counting:
+            return f"[{engine.match_count}+ matches]"
+        return ''
+
+    # --- ハイライト ---
+    def match_spans(self, row: int) -> List[Tuple[int, int]]:
+        """表示中の行のマッチ範囲（ハイライトが無効なら空）"""
+        if not (self.highlight_matches and self.highlight_active):
+            return []
+        return self.engine.line_matches(self.screen.editor.buffer.lines, row)
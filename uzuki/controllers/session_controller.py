@@ -0,0 +1,106 @@
+"""
+Session Controller
+
+Saves the open buffers to a session file with `:mksession [file]` and
+restores them at startup with `uzuki --session [file]` (see
+core/session.py). A session records each named buffer's path, encoding,
+cursor and scroll position, and, with `file.session_undo`, the undo history
+of buffers without unsaved changes.
+
+Restoring reads only the buffer that was being shown; the others are added
+to the buffer list as evicted buffers and read from disk the first time they
+are visited, with the recorded encoding instead of detection if the file is
+unchanged. A file that changed since the session was saved has its encoding
+detected again and its undo history dropped. Window
+splits are not saved.
+"""
+
+import os
+from typing import Optional
+from uzuki.core.session import BufferState, Session, pack_history
+from uzuki.ui.notification import NotificationLevel
+
+class SessionController:
+    """セッションの保存・復元を制御するコントローラー"""
+
+    DEFAULT_FILE = 'Session.uzuki'  # ファイルを指定しないときのセッションファイル（カレントディレクトリ）
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.save_undo = True
+        self.path: Optional[str] = None  # 最後に保存・復元したセッションファイル
+
+    def apply_config(self, file_config: dict):
+        """ファイル設定を適用"""
+        self.save_undo = file_config.get('session_undo', True)
+
+    def _resolve(self, path: Optional[str]) -> str:
+        return os.path.abspath(os.path.expanduser(path or self.path or self.DEFAULT_FILE))
+
+    # --- 保存 ---
+    def capture(self) -> Session:
+        """開いているバッファの状態を集める（名前のないバッファは除く）"""
+        file = self.screen.file
+        editor = self.screen.editor
+        display = self.screen.ui.editor_display
+        buffers = file.buffers
+        session = Session()
+        for entry in buffers:
+            file_manager = entry.file_manager
+            if not file_manager.filename:
+                continue
+            if entry is buffers.current:
+                session.current = len(session.buffers)
+                cursor = (editor.cursor.row, editor.cursor.col)
+                scroll = (display.scroll_y, display.scroll_x, display.wrap_skip)
+                history = editor.history.get_state()
+            else:
+                if entry is buffers.alternate:
+                    session.alternate = len(session.buffers)
+                cursor, scroll, history = entry.cursor, entry.scroll, entry.history
+            # 変更のあるバッファの履歴はファイルの内容に当てはまらない
+            if not self.save_undo or entry.is_modified or file.is_loading(entry):
+                history = None
+            session.buffers.append(BufferState(
+                os.path.abspath(file_manager.filename), file_manager.encoding,
+                cursor, scroll, entry.stat, pack_history(history)))
+        return session
+
+    def save(self, path: Optional[str] = None) -> bool:
+        """セッションファイルに書く"""
+        path = self._resolve(path)
+        session = self.capture()
+        if not session.buffers:
+            self.screen.notify_error("No named buffers to save")
+            return False
+        try:
+            session.save(path)
+        except (OSError, ValueError) as e:
+            self.screen.notifications.add(f"Cannot write session: {e}", NotificationLevel.ERROR, duration=5.0)
+            return False
+        self.path = path
+        self.screen.notifications.add(f"Session saved: {path} ({len(session.buffers)} buffers)",
+                                      NotificationLevel.SUCCESS)
+        return True
+
+    # --- 復元 ---
+    def restore(self, path: Optional[str] = None) -> bool:
+        """セッションファイルのバッファを開く（表示していたバッファだけ読み込む）"""
+        path = self._resolve(path)
+        try:
+            session = Session.load(path)
+        except (OSError, ValueError) as e:
+            self.screen.notifications.add(f"Cannot read session: {e}", NotificationLevel.ERROR, duration=5.0)
+            return False
+        self.path = path
+        entries = session.add_to(self.screen.file.buffers)
+        if not entries:
+            self.screen.notify_warning(f"Session is empty: {path}")
+            return False
+        current = entries[session.current] if 0 <= session.current < len(entries) else entries[0]
+        alternate = entries[session.alternate] if 0 <= session.alternate < len(entries) else None
+        if not self.screen.file.show_restored(current, alternate):
+            return False
+        self.screen.notifications.add(f"Session restored: {path} ({len(entries)} buffers)",
+                                      NotificationLevel.SUCCESS)
+        return True
@@ -0,0 +1,245 @@
+"""
+Swap Controller
+
+Keeps a swap journal (see core/swap_journal.py) for every modified buffer
+that has a file name, so unsaved edits survive a crash of the editor or the
+terminal. Edits are recorded as they happen and appended to the journal on
+idle, so the cost is proportional to the edit, not to the file; the journal
+is rewritten from the buffer once it has grown past twice the file size.
+A buffer's journal is removed when it is saved or reloaded. When the editor
+exits normally it first waits for pending writes, then removes the journals
+of buffers without unsaved changes and keeps the others (a save that failed,
+or changes left unsaved by :q) for `:recover`.
+
+When a file is opened and a swap file left by an editor that is no longer
+running exists, a warning offers `:recover` (replay the journal on top of
+the file on disk, as one undoable change) or `:recover discard`. The
+warning, like the one for a file being edited by another running editor,
+stays in the message area until the swap file is dealt with, the buffer
+is closed or it is dismissed with Escape. Buffers with
+a swap file that has not been dealt with are not journaled, so the old swap
+file is never overwritten.
+"""
+
+import os
+from typing import Dict, Optional
+from uzuki.core.buffer_list import BufferEntry
+from uzuki.core.file_manager import FileManager
+from uzuki.core.line_diff import apply_hunks, diff_lines
+from uzuki.core.swap_journal import SwapFile, SwapJournal, journal_path
+from uzuki.ui.notification import NotificationLevel
+
+class SwapController:
+    """スワップファイル（クラッシュからの復旧）を制御するコントローラー"""
+
+    NOTICE_DURATION = float('inf')  # スワップファイルを見つけた警告を出しておく秒数（対処するまで）
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.enabled = True
+        self.directory = os.path.join(os.path.expanduser('~'), '.config', 'uzuki', 'swap')
+
+        # 状態
+        self._journals: Dict[int, SwapJournal] = {}  # バッファ番号 -> 書いているジャーナル
+        self._found: Dict[int, str] = {}   # バッファ番号 -> 見つけたほかのプロセスのスワップファイル
+        self._checked: Dict[int, Optional[str]] = {}  # スワップファイルを確かめたバッファ -> そのときのパス
+        self._notices: Dict[int, int] = {}  # バッファ番号 -> スワップファイルを見つけた警告の通知 ID
+        self._version = None               # 確かめた BufferList.version
+
+        screen.editor.buffer.add_edit_listener(self._on_edit)
+        screen.container.register_hook('idle', self.on_idle)
+
+    def apply_config(self, file_config: dict):
+        """ファイル設定を適用"""
+        self.enabled = file_config.get('swap_file', True)
+        self.directory = os.path.expanduser(file_config.get('swap_directory') or self.directory)
+        if not self.enabled:
+            self.close()
+
+    # --- 記録 ---
+    def _on_edit(self, kind: str, row: int, col: int, text: str):
+        """編集を記録する（キー入力ごとに呼ばれるのでメモリに溜めるだけ）"""
+        if not self.enabled:
+            return
+        entry = self.screen.file.buffers.current
+        journal = self._journals.get(entry.number)
+        if journal is None:
+            # 変更の通知は編集リスナーの後なので、is_modified はこの編集の前の状態
+            modified = entry.is_modified
+            journal = self._open(entry, modified)
+            if journal is None or modified:
+                return  # 変更済みのバッファは今の内容（この編集を含む）から始めている
+        journal.record(kind, row, col, text)
+
+    def _open(self, entry: BufferEntry, modified: bool) -> Optional[SwapJournal]:
+        """バッファのジャーナルを書き始める（ほかのスワップファイルがあれば None）"""
+        filename = entry.file_manager.filename
+        if not filename or self._check(entry) or self.screen.file.is_loading(entry):
+            return None
+        journal = SwapJournal(journal_path(filename, self.directory), filename, entry.stat)
+        try:
+            # 記録せずに変更したバッファ（設定で有効にしたときなど）は今の内容から始める
+            journal.start(self._lines(entry) if modified else None)
+        except OSError as e:
+            self.screen.notifications.add(f"Cannot write swap file: {e}", NotificationLevel.WARNING, duration=5.0)
+            self._checked[entry.number] = filename
+            self._found[entry.number] = ''  # このバッファでは記録しない
+            return None
+        self._journals[entry.number] = journal
+        return journal
+
+    def _lines(self, entry: BufferEntry):
+        return self.screen.editor.buffer.lines if entry is self.screen.file.buffers.current else entry.lines
+
+    def on_idle(self):
+        """アイドル時に記録をスワップファイルに追記し、保存されたバッファのジャーナルを消す"""
+        buffers = self.screen.file.buffers
+        if buffers.version != self._version:
+            self._version = buffers.version
+            self._scan()
+        for number, journal in list(self._journals.items()):
+            entry = buffers.get(number)
+            if (entry is None or not entry.is_modified
+                    or os.path.abspath(entry.file_manager.filename or '') != journal.filepath):
+                journal.close()
+                del self._journals[number]
+                continue
+            try:
+                if entry.stat != journal.base_stat:
+                    # 保存・読み直しの後、反映する前に編集された：今の内容から記録し直す
+                    journal.base_stat = entry.stat
+                    journal.start(self._lines(entry))
+                    continue
+                journal.flush()
+                if journal.needs_compaction():
+                    journal.compact(self._lines(entry))
+            except OSError as e:
+                journal.close()
+                del self._journals[number]
+                self.screen.notifications.add(f"Cannot write swap file: {e}", NotificationLevel.WARNING, duration=5.0)
+        return False
+
+    # --- スワップファイルの検出 ---
+    def _scan(self):
+        """開いたバッファに残っているスワップファイルを確かめ、閉じたバッファの記録をやめる"""
+        buffers = self.screen.file.buffers
+        for number in list(self._checked):
+            if buffers.get(number) is None:
+                self._checked.pop(number)
+                self._found.pop(number, None)
+                self._dismiss(number)
+        for entry in buffers:
+            self._check(entry)
+
+    def _check(self, entry: BufferEntry) -> bool:
+        """ほかのプロセスが残したスワップファイルがあるか（初めて見たときは警告する）"""
+        filename = entry.file_manager.filename
+        if not filename or not self.enabled:
+            return False
+        if self._checked.get(entry.number) == filename:
+            return entry.number in self._found
+        self._checked[entry.number] = filename
+        self._found.pop(entry.number, None)
+        self._dismiss(entry.number)
+        if entry.number in self._journals:
+            return False
+        path = journal_path(filename, self.directory)
+        if not os.path.exists(path):
+            return False
+        swap = SwapFile.read(path)
+        self._found[entry.number] = path
+        if swap is None:
+            message = f"Unreadable swap file for {entry.name}: {path} (:recover discard to delete)"
+        elif swap.is_owner_alive():
+            message = f"{entry.name} is being edited by another process (pid {swap.pid})"
+        else:
+            message = (f"Swap file found for {entry.name} ({len(swap.records)} edits): "
+                       f":recover to restore, :recover discard to delete")
+        self._notices[entry.number] = self.screen.notifications.add(
+            message, NotificationLevel.WARNING, duration=self.NOTICE_DURATION)
+        return True
+
+    def _dismiss(self, number: int):
+        """バッファのスワップファイルの警告を消す"""
+        notification_id = self._notices.pop(number, None)
+        if notification_id is not None:
+            self.screen.notifications.remove(notification_id)
+
+    # --- 復旧 ---
+    def recover(self, discard: bool = False) -> bool:
+        """表示中のバッファのスワップファイルの記録を当て直す（discard なら削除する）"""
+        file = self.screen.file
+        editor = self.screen.editor
+        entry = file.buffers.current
+        self._check(entry)
+        path = self._found.get(entry.number)
+        if not path:
+            self.screen.notify_error("No swap file for this buffer")
+            return False
+        swap = SwapFile.read(path)
+        if discard:
+            if swap is not None and swap.is_owner_alive():
+                self.screen.notify_error(f"Swap file is in use by process {swap.pid}")
+                return False
+            self._remove_found(entry, path)
+            self.screen.notify_info(f"Deleted swap file: {path}")
+            return True
+        if swap is None:
+            self.screen.notify_error(f"Cannot read swap file: {path}")
+            return False
+        if swap.is_owner_alive():
+            self.screen.notify_error(f"Swap file is in use by process {swap.pid}")
+            return False
+        if file.is_loading(entry):
+            self.screen.notify_error("File is still loading")
+            return False
+
+        old_lines = editor.buffer.lines
+        try:
+            # 記録はディスク上のファイルに当てる（開いた後に編集していればファイルを読み直す）
+            base = self._read_disk(entry) if entry.is_modified else old_lines
+            new_lines = swap.replay(base)
+        except (ValueError, IOError) as e:
+            self.screen.notifications.add(f"Cannot recover: {e}", NotificationLevel.ERROR, duration=5.0)
+            return False
+        self._remove_found(entry, path)
+
+        # 記録を当てた結果との差分を1回の undo で戻せる変更として当てる（この変更から新しく記録する）
+        hunks = diff_lines(old_lines, new_lines)
+        if hunks:
+            editor.history.begin_group()
+            apply_hunks(editor.buffer, new_lines, hunks)
+            editor.history.end_group()
+        lines = editor.buffer.lines
+        editor.cursor.row = min(editor.cursor.row, len(lines) - 1)
+        editor.cursor.col = min(editor.cursor.col, len(lines[editor.cursor.row]))
+        editor.needs_redraw = True
+        message = f"Recovered {len(swap.records)} edits for {entry.name}"
+        if swap.base_stat is not None and swap.base_stat != file.buffers.file_stat(entry.file_manager.filename):
+            self.screen.notify_warning(f"{message}; the file changed after the swap file was written, check the result")
+        else:
+            self.screen.notifications.add(f"{message} (:w to save)", NotificationLevel.SUCCESS)
+        return True
+
+    @staticmethod
+    def _read_disk(entry: BufferEntry):
+        filename = entry.file_manager.filename
+        if not os.path.exists(filename):
+            return ['']
+        return FileManager().load_file(filename)
+
+    def _remove_found(self, entry: BufferEntry, path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        self._found.pop(entry.number, None)
+        self._dismiss(entry.number)
+
+    def close(self, keep_modified: bool = False):
+        """ジャーナルをすべて閉じて削除する（keep_modified なら変更を保存できていないバッファのものは追記して残す）"""
+        if keep_modified:
+            self.on_idle()  # 保存済みのバッファのジャーナルを消し、残りには記録を書き足す
+        for journal in self._journals.values():
+            journal.close(remove=not keep_modified)
+        self._journals.clear()
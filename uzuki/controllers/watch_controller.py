@@ -0,0 +1,162 @@
+"""
+Watch Controller
+
+Watches the files of open buffers for changes made outside the editor
+(inotify where available, stat polling otherwise). When `file.auto_reload`
+is enabled, an unmodified buffer is reloaded by patching only the changed
+line ranges, so the cursor and undo history stay valid; otherwise, and for
+buffers with unsaved changes, a warning is shown. Saving over a file that
+changed on disk is refused by FileController unless forced with `:w!`.
+"""
+
+import os
+from typing import Dict, Optional, Set, Tuple
+from uzuki.core.buffer_list import BufferEntry
+from uzuki.core.file_watcher import FileWatcher
+from uzuki.core.line_diff import adjust_row, apply_hunks, diff_lines
+from uzuki.ui.notification import NotificationLevel
+
+class WatchController:
+    """外部でのファイル変更の監視を制御するコントローラー"""
+
+    WAKE_INTERVAL_MS = 500  # 監視中に入力がなくても変更を確認する間隔
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.watcher = FileWatcher()
+        self.auto_reload = False
+
+        # 状態
+        self._version = None      # 監視対象に反映した BufferList.version
+        self._watched: Set[str] = set()
+        self._pending: Set[int] = set()  # 表示したときに読み直すバッファの番号
+        self._warned: Dict[int, Optional[Tuple[int, int]]] = {}  # 警告済みのファイルの状態
+
+        screen.container.register_hook('idle', self.on_idle)
+
+    def apply_config(self, file_config: dict):
+        """ファイル設定を適用"""
+        self.auto_reload = file_config.get('auto_reload', False)
+
+    # --- 監視 ---
+    def _sync(self):
+        """開いているバッファのファイルを監視対象に合わせる"""
+        buffers = self.screen.file.buffers
+        paths = {os.path.abspath(entry.file_manager.filename)
+                 for entry in buffers if entry.file_manager.filename}
+        for path in self._watched - paths:
+            self.watcher.unwatch(path)
+        for path in paths - self._watched:
+            self.watcher.watch(path)
+        self._watched = paths
+        self._version = buffers.version
+
+    def on_idle(self):
+        """アイドル時に変更を確認（監視中は次に確認するまでのミリ秒数を返す）"""
+        buffers = self.screen.file.buffers
+        if buffers.version != self._version:
+            self._sync()
+        for path in self.watcher.poll():
+            entry = buffers.find(path)
+            if entry is not None:
+                self.check(entry)
+        current = buffers.current
+        if current.number in self._pending:
+            self._pending.discard(current.number)
+            self.check(current)
+        return self.WAKE_INTERVAL_MS if self._watched else False
+
+    def check(self, entry: BufferEntry):
+        """ファイルが読み込み・保存時から変わっていれば読み直すか警告する"""
+        file = self.screen.file
+        if entry.stat is None or file.is_loading(entry) or self.screen.autosave.is_saving(entry):
+            return  # 自動保存の書き込みは書き終わりの反映で記録し直す
+        disk = file.buffers.file_stat(entry.file_manager.filename)
+        if disk == entry.stat:
+            self._warned.pop(entry.number, None)
+            return
+        if disk is not None and entry.evicted:
+            return  # 次に表示するときに読み直す
+        if disk is not None and self.auto_reload and not entry.is_modified:
+            if entry is file.buffers.current:
+                self.reload(entry)
+            else:
+                self._pending.add(entry.number)
+            return
+        if self._warned.get(entry.number, 0) == disk:
+            return
+        self._warned[entry.number] = disk
+        if disk is None:
+            self.screen.notify_warning(f"File removed on disk: {entry.name}")
+        else:
+            self.screen.notify_warning(f"File changed on disk: {entry.name} (:e to reload, :w! to overwrite)")
+
+    # --- 読み直し ---
+    def reload(self, entry: BufferEntry) -> bool:
+        """表示中のバッファをファイルの内容に合わせる（変わった行だけを書き換える）"""
+        editor = self.screen.editor
+        buffers = self.screen.file.buffers
+        file_manager = entry.file_manager
+        filepath = file_manager.filename
+        old_lines = editor.buffer.lines
+        old_source = file_manager.mapped_source
+        try:
+            new_lines = file_manager.load_file(filepath, lazy_threshold=self.screen.file.large_file_size)
+        except Exception as e:
+            self.screen.notifications.add(f"Failed to reload file: {e}", NotificationLevel.ERROR, duration=5.0)
+            return False
+
+        if self._is_lazy(old_lines) or self._is_lazy(new_lines):
+            # 遅延読み込みのストアは全体を読むことになるので差し替える（履歴は当てはまらない）
+            editor.buffer.lines = new_lines
+            editor.history.clear()
+            hunks = None
+            self.screen.ui.invalidate()
+            if old_source is not None and old_source is not file_manager.mapped_source:
+                old_source.close()  # 差し替えたストアの mmap とファイルを手放す
+        else:
+            hunks = diff_lines(old_lines, new_lines)
+            if hunks:
+                # 1回の undo で読み直す前に戻せるようにまとめる
+                insert_mode = editor.mode is editor.insert_mode
+                editor.history.begin_group()
+                apply_hunks(editor.buffer, new_lines, hunks)
+                if insert_mode:
+                    editor.history.begin_group()
+                else:
+                    editor.history.end_group()
+        self._adjust_cursors(entry, hunks)
+
+        file_manager.is_modified = False
+        entry.stat = buffers.file_stat(filepath)
+        entry.size = buffers.estimate_size(editor.buffer.lines, entry.stat[1] if entry.stat else None)
+        # 大きさが変わったので巨大ファイルモードを判定し直す
+        self.screen.file.update_large_mode(entry)
+        self._warned.pop(entry.number, None)
+        editor.needs_redraw = True
+        if hunks is None:
+            self.screen.notify_info(f"Reloaded: {entry.name}")
+        else:
+            self.screen.notify_info(f"Reloaded: {entry.name} ({len(hunks)} change{'s' if len(hunks) != 1 else ''})")
+        return True
+
+    def _adjust_cursors(self, entry: BufferEntry, hunks):
+        """カーソル位置（このバッファを表示しているほかのウィンドウを含む）を書き換え後の行に合わせる"""
+        editor = self.screen.editor
+        lines = editor.buffer.lines
+
+        def adjust(row: int, col: int) -> Tuple[int, int]:
+            if hunks:
+                row = adjust_row(row, hunks)
+            row = max(0, min(row, len(lines) - 1))
+            return row, max(0, min(col, len(lines[row])))
+
+        editor.cursor.row, editor.cursor.col = adjust(editor.cursor.row, editor.cursor.col)
+        for window in self.screen.ui.windows.windows:
+            if window.entry is entry and window is not self.screen.ui.current_window:
+                window.cursor = adjust(*window.cursor)
+
+    @staticmethod
+    def _is_lazy(lines) -> bool:
+        is_lazy = getattr(lines, 'is_lazy', None)
+        return is_lazy is not None and is_lazy()
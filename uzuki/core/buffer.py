@@ -1,31 +1,134 @@
+from typing import Tuple
+
+from uzuki.core.text_store import ChunkedLineStore, TEXT_STORES
+
+
 class Buffer:
-    """行リストでテキストを管理"""
-    def __init__(self):
-        self.lines = ['']
+    """行リストでテキストを管理（行データは差し替え可能なストアに保持）"""
+    def __init__(self, store_factory=None):
+        self.store_factory = store_factory or ChunkedLineStore
+        self._store = self.store_factory([''])
         self.on_change = None  # 変更通知コールバック
+        self.edit_listeners = []  # 編集操作リスナー（undo履歴など）
+        self.read_only = False    # 編集を受け付けない（ファイルの読み込み中など）
+
+    @property
+    def lines(self):
+        """行の読み取りビュー（list[str] 互換）"""
+        return self._store
+
+    @lines.setter
+    def lines(self, lines):
+        """行データを置き換え（ストアはそのまま採用、それ以外はストアに変換）"""
+        # 遅延読み込みの ChunkedLineStore などはストア種別に関わらずそのまま使う
+        if not isinstance(lines, tuple(TEXT_STORES.values())):
+            lines = self.store_factory(lines)
+        if not len(lines):
+            lines.insert(0, '')
+        self._store = lines
+
+    def set_store_type(self, name: str):
+        """ストアの種類を切り替え（'chunked' / 'list'）"""
+        store_factory = TEXT_STORES.get(name)
+        if store_factory is None:
+            raise ValueError(f"Unknown text store: {name}")
+        if store_factory is not self.store_factory:
+            self.store_factory = store_factory
+            self.lines = list(self._store)
 
     def set_change_callback(self, callback):
         """変更通知コールバックを設定"""
         self.on_change = callback
 
-    def _notify_change(self):
-        """変更を通知"""
+    def add_edit_listener(self, listener):
+        """編集操作リスナーを追加（listener(kind, row, col, text)、kind は 'insert' / 'delete'）"""
+        self.edit_listeners.append(listener)
+
+    def remove_edit_listener(self, listener):
+        """編集操作リスナーを削除"""
+        if listener in self.edit_listeners:
+            self.edit_listeners.remove(listener)
+
+    def _notify_change(self, start: int, end: int, delta: int = 0):
+        """変更を通知（[start, end) は変更後の行範囲、delta は行数の増減）"""
         if self.on_change:
-            self.on_change()
+            self.on_change(start, end, delta)
+
+    def _notify_edit(self, kind: str, row: int, col: int, text: str):
+        """編集操作をリスナーに通知"""
+        for listener in self.edit_listeners:
+            listener(kind, row, col, text)
+
+    # --- 編集プリミティブ（insert_text と delete_text は互いに逆操作） ---
+    def insert_text(self, row: int, col: int, text: str) -> Tuple[int, int]:
+        """(row, col) に改行を含むテキストを挿入し、挿入末尾の位置を返す"""
+        if not text or self.read_only:
+            return row, col
+        line = self._store[row]
+        if '\n' not in text:
+            self._store[row] = line[:col] + text + line[col:]
+            end = (row, col + len(text))
+        else:
+            parts = text.split('\n')
+            new_lines = parts[1:]
+            end = (row + len(new_lines), len(new_lines[-1]))
+            new_lines[-1] += line[col:]
+            self._store[row] = line[:col] + parts[0]
+            self._store.insert_lines(row + 1, new_lines)
+        self._notify_edit('insert', row, col, text)
+        self._notify_change(row, end[0] + 1, end[0] - row)
+        return end
+
+    def get_text(self, row: int, col: int, end_row: int, end_col: int) -> str:
+        """(row, col) から (end_row, end_col) までのテキストを取得"""
+        if row == end_row:
+            return self._store[row][col:end_col]
+        parts = [self._store[row][col:]]
+        parts.extend(self._store[row + 1:end_row])
+        parts.append(self._store[end_row][:end_col])
+        return '\n'.join(parts)
+
+    def delete_text(self, row: int, col: int, end_row: int, end_col: int) -> str:
+        """(row, col) から (end_row, end_col) までを削除し、削除したテキストを返す"""
+        if self.read_only:
+            return ''
+        text = self.get_text(row, col, end_row, end_col)
+        if not text:
+            return text
+        if row == end_row:
+            line = self._store[row]
+            self._store[row] = line[:col] + line[end_col:]
+        else:
+            self._store[row] = self._store[row][:col] + self._store[end_row][end_col:]
+            self._store.delete_lines(row + 1, end_row + 1)
+        self._notify_edit('delete', row, col, text)
+        self._notify_change(row, row + 1, row - end_row)
+        return text
+
+    @staticmethod
+    def text_end(row: int, col: int, text: str) -> Tuple[int, int]:
+        """(row, col) に text を置いたときの末尾位置"""
+        newlines = text.count('\n')
+        if not newlines:
+            return row, col + len(text)
+        return row + newlines, len(text) - text.rindex('\n') - 1
 
     def insert(self, row: int, col: int, char: str):
-        line = self.lines[row]
-        self.lines[row] = line[:col] + char + line[col:]
-        self._notify_change()
+        self.insert_text(row, col, char)
 
     def delete(self, row: int, col: int):
-        line = self.lines[row]
-        if col < len(line):
-            self.lines[row] = line[:col] + line[col+1:]
-            self._notify_change()
+        if col < len(self._store[row]):
+            self.delete_text(row, col, row, col + 1)
 
     def split_line(self, row: int, col: int):
-        line = self.lines[row]
-        self.lines[row] = line[:col]
-        self.lines.insert(row+1, line[col:])
-        self._notify_change()
+        self.insert_text(row, col, '\n')
+
+    def delete_line(self, row: int):
+        """行を削除（最後の1行は空にする）"""
+        last = len(self._store) - 1
+        if row < last:
+            self.delete_text(row, 0, row + 1, 0)
+        elif row > 0:
+            self.delete_text(row - 1, len(self._store[row - 1]), row, len(self._store[row]))
+        else:
+            self.delete_text(0, 0, 0, len(self._store[0]))
@@ -0,0 +1,183 @@
+"""
+Buffer List
+
+開いているファイルごとのバッファの一覧。
+
+- 各バッファは行ストアと FileManager、カーソル・スクロール位置、undo 履歴を持つ
+- 最近使った順（LRU）を保持し、概算メモリ量が上限を超えたら古い順に
+  変更のないバッファの行ストアを手放す（ファイルパスと更新時刻だけを残す）
+- 手放したバッファは次に切り替えたときにファイルから読み直す
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from uzuki.core.file_manager import FileManager
+
+
+class BufferEntry:
+    """バッファ一覧の1項目"""
+
+    __slots__ = ('number', 'file_manager', 'lines', 'cursor', 'scroll',
+                 'history', 'syntax', 'size', 'stat', 'evicted', 'large')
+
+    def __init__(self, number: int, file_manager: FileManager):
+        self.number = number
+        self.file_manager = file_manager
+        self.lines = None      # 行ストア（手放した・表示中のバッファは None）
+        self.cursor: Tuple[int, int] = (0, 0)
+        self.scroll: Tuple[int, int, int] = (0, 0, 0)  # (scroll_y, scroll_x, wrap_skip)
+        self.history = None    # History.get_state() の値
+        self.syntax = None     # SyntaxHighlighter.get_state() の値
+        self.size = 0          # 行ストアの概算メモリ量（バイト）
+        self.stat: Optional[Tuple[int, int]] = None  # 読み込み・保存時のファイルの (更新時刻, サイズ)
+        self.evicted = False   # 行ストアを手放してファイル上の参照だけになっているか
+        self.large = False     # 巨大ファイルモード（ハイライトなど、ファイルの大きさに比例する機能を止める）
+
+    @property
+    def name(self) -> str:
+        """表示用の名前"""
+        return self.file_manager.filename or '[No Name]'
+
+    @property
+    def is_modified(self) -> bool:
+        return self.file_manager.is_modified
+
+
+class BufferList:
+    """最近使った順を保持するバッファ一覧"""
+
+    LINE_OVERHEAD = 56  # 1行あたりの概算オーバーヘッド（str オブジェクト + 参照）
+    DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+    def __init__(self, memory_budget: Optional[int] = None):
+        self.memory_budget = memory_budget or self.DEFAULT_MEMORY_BUDGET
+        self._entries: Dict[int, BufferEntry] = {}
+        self._recent: "OrderedDict[int, BufferEntry]" = OrderedDict()  # 古い順
+        self._paths: Dict[str, int] = {}  # 正規化したパス -> バッファ番号
+        self._next_number = 1
+        self.current: Optional[BufferEntry] = None
+        self.alternate: Optional[BufferEntry] = None  # 直前に表示していたバッファ
+        self.version = 0  # バッファの追加・削除・名前の変更で増える
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    @staticmethod
+    def _key(filepath: str) -> str:
+        return os.path.normcase(os.path.realpath(filepath))
+
+    # --- 追加・検索 ---
+    def add(self, file_manager: FileManager) -> BufferEntry:
+        """バッファを追加（表示中にはしない）"""
+        entry = BufferEntry(self._next_number, file_manager)
+        self._next_number += 1
+        self._entries[entry.number] = entry
+        self._recent[entry.number] = entry
+        if file_manager.filename:
+            self._paths[self._key(file_manager.filename)] = entry.number
+        self.version += 1
+        return entry
+
+    def rename(self, entry: BufferEntry):
+        """ファイル名の変更を索引に反映（保存先を変えたときなど）"""
+        for key, number in list(self._paths.items()):
+            if number == entry.number:
+                del self._paths[key]
+        if entry.file_manager.filename:
+            self._paths[self._key(entry.file_manager.filename)] = entry.number
+        self.version += 1
+
+    def remove(self, entry: BufferEntry):
+        """バッファを一覧から除く（表示中のバッファは先に切り替えておく）"""
+        self._entries.pop(entry.number, None)
+        self._recent.pop(entry.number, None)
+        for key, number in list(self._paths.items()):
+            if number == entry.number:
+                del self._paths[key]
+        if self.alternate is entry:
+            self.alternate = None
+        self.version += 1
+
+    def get(self, number: int) -> Optional[BufferEntry]:
+        return self._entries.get(number)
+
+    def find(self, filepath: str) -> Optional[BufferEntry]:
+        """ファイルパスからバッファを探す"""
+        number = self._paths.get(self._key(filepath))
+        return self._entries.get(number) if number is not None else None
+
+    def match(self, pattern: str) -> List[BufferEntry]:
+        """名前に pattern を含むバッファ（完全一致があればそれだけ）"""
+        exact = self.find(pattern)
+        if exact is not None:
+            return [exact]
+        return [entry for entry in self._entries.values() if pattern in entry.name]
+
+    def neighbor(self, entry: BufferEntry, count: int) -> BufferEntry:
+        """番号順で count 個先（負なら前）のバッファ（端で折り返す）"""
+        numbers = sorted(self._entries)
+        index = numbers.index(entry.number)
+        return self._entries[numbers[(index + count) % len(numbers)]]
+
+    # --- 切り替え ---
+    def set_current(self, entry: BufferEntry):
+        """表示中のバッファを設定し、最近使ったものとして記録"""
+        if self.current is not None and self.current is not entry:
+            self.alternate = self.current
+        self.current = entry
+        self._recent.move_to_end(entry.number)
+
+    @staticmethod
+    def file_stat(filepath: Optional[str]) -> Optional[Tuple[int, int]]:
+        """ファイルの (更新時刻, サイズ)（なければ None）"""
+        if not filepath:
+            return None
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def estimate_size(self, lines, text_size: Optional[int] = None) -> int:
+        """行ストアの概算メモリ量（text_size は文字数の代わりに使うファイルサイズ）
+
+        遅延読み込みのストアは行索引の分だけ数える
+        """
+        is_lazy = getattr(lines, 'is_lazy', None)
+        if is_lazy is not None and is_lazy():
+            return len(lines) * 8
+        if text_size is None:
+            text_size = sum(map(len, lines))
+        return text_size + len(lines) * self.LINE_OVERHEAD
+
+    def evict(self, keep=()) -> List[BufferEntry]:
+        """メモリ上限を超えていれば古い順に変更のないバッファを手放す（手放したものを返す）
+
+        keep のバッファ（ウィンドウに表示中のものなど）は手放さない
+        """
+        total = sum(entry.size for entry in self._entries.values() if entry.lines is not None)
+        if self.current is not None:
+            total += self.current.size
+        evicted = []
+        for entry in list(self._recent.values()):
+            if total <= self.memory_budget:
+                break
+            # ファイルから読み直せるものだけ手放す
+            if (entry is self.current or entry in keep or entry.lines is None
+                    or entry.is_modified or entry.stat is None):
+                continue
+            total -= entry.size
+            entry.lines = None
+            entry.syntax = None
+            entry.evicted = True
+            file_manager = entry.file_manager
+            if file_manager.mapped_source is not None:
+                file_manager.mapped_source.close()
+                file_manager.mapped_source = None
+            evicted.append(entry)
+        return evicted
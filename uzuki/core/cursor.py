@@ -14,6 +14,10 @@ class Cursor:
         if self.on_move:
             self.on_move()
 
+    def move_to(self, row: int, col: int, buffer):
+        """指定位置に移動"""
+        self.move(row - self.row, col - self.col, buffer)
+
     def move(self, d_row: int, d_col: int, buffer):
         old_row, old_col = self.row, self.col
         self.row = max(0, min(self.row + d_row, len(buffer.lines)-1))
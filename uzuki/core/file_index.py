@@ -0,0 +1,180 @@
+"""
+File Index
+
+プロジェクト（ディレクトリ以下）のファイル一覧の索引。
+
+- 別スレッドでディレクトリをたどり、見つけたファイルの相対パスを paths に追加していく
+  （クロール中でも paths を参照すれば途中までの結果を使える）
+- ディレクトリごとに (更新時刻, ファイル名, サブディレクトリ名) を持ち、
+  ~/.config/uzuki/index/ に保存する。次回は保存した一覧を読んですぐに使い、
+  クロールでは更新時刻が変わったディレクトリだけを読み直す
+- 隠しディレクトリと IGNORED_DIRS はたどらない。シンボリックリンクのディレクトリも追わない
+"""
+
+import hashlib
+import marshal
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# 相対ディレクトリ -> (更新時刻, ファイル名, サブディレクトリ名)
+DirRecord = Tuple[int, List[str], List[str]]
+
+
+class FileIndex:
+    """ディレクトリ以下のファイルの索引"""
+
+    IGNORED_DIRS = {'__pycache__', 'node_modules'}
+    MAX_FILES = 2_000_000  # これ以上はたどらない（ホームディレクトリなどで開いた場合）
+    FORMAT_VERSION = 1
+
+    def __init__(self, root: str, index_dir: Optional[str] = None):
+        self.root = os.path.abspath(root)
+        self.index_dir = index_dir or os.path.join(os.path.expanduser('~'), '.config', 'uzuki', 'index')
+        self.paths: List[str] = []  # root からの相対パス（クロール中は伸びていく）
+        self.generation = 0         # paths を差し替えるたびに増える
+        self.crawling = False
+        self.complete = False       # 最後のクロールが終わったか
+        self._dirs: Dict[str, DirRecord] = {}
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def index_path(self) -> str:
+        """保存先のファイル"""
+        digest = hashlib.sha1(self.root.encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+        return os.path.join(self.index_dir, f"{digest}.idx")
+
+    # --- 保存・読み込み ---
+    def load(self) -> bool:
+        """保存した索引を読む（なければ・読めなければ False）"""
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = marshal.loads(f.read())  # marshal.load(f) より速い
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if not isinstance(data, dict) or data.get('version') != self.FORMAT_VERSION or data.get('root') != self.root:
+            return False
+        self._dirs = data['dirs']
+        self._set_paths(self._flatten(self._dirs))
+        return True
+
+    def save(self):
+        """索引を保存（一時ファイルに書いてから置き換える）"""
+        data = {'version': self.FORMAT_VERSION, 'root': self.root, 'dirs': self._dirs}
+        path = self.index_path
+        temp_path = path + '.tmp'
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                marshal.dump(data, f)
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _flatten(dirs: Dict[str, DirRecord]) -> List[str]:
+        """ディレクトリごとの記録からファイルの相対パスの一覧を作る"""
+        paths = []
+        for rel, (mtime, files, subdirs) in dirs.items():
+            if rel:
+                paths.extend(f"{rel}/{name}" for name in files)
+            else:
+                paths.extend(files)
+        return paths
+
+    def _set_paths(self, paths: List[str]):
+        self.paths = paths
+        self.generation += 1
+
+    # --- クロール ---
+    def start(self):
+        """別スレッドでクロールを開始（実行中なら何もしない。未読み込みなら保存した索引を先に読む）"""
+        if self.crawling:
+            return
+        self._cancelled.clear()
+        self.crawling = True
+        self.complete = False
+        self._thread = threading.Thread(target=self._run, name='uzuki-index', daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """クロールを中断する"""
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """クロールが終わるまで待つ（終わっていれば True）"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.crawling
+
+    def _run(self):
+        try:
+            if not self._dirs:
+                self.load()
+            self.crawl()
+        finally:
+            self.crawling = False
+
+    def crawl(self):
+        """ディレクトリをたどって索引を更新（更新時刻が変わっていないディレクトリは読まない）"""
+        old_dirs = self._dirs
+        dirs: Dict[str, DirRecord] = {}
+        # 保存した一覧がなければ見つけた順にそのまま公開し、あれば終わってから差し替える
+        paths: List[str] = [] if old_dirs else self.paths
+        if not old_dirs:
+            self._set_paths(paths)
+        changed = False
+        stack = ['']
+        while stack:
+            if self._cancelled.is_set() or len(paths) >= self.MAX_FILES:
+                return
+            rel = stack.pop()
+            full = os.path.join(self.root, rel) if rel else self.root
+            try:
+                mtime = os.stat(full).st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            record = old_dirs.get(rel)
+            if record is None or record[0] != mtime:
+                record = self._scan(full, mtime)
+                if record is None:
+                    changed = True
+                    continue
+                changed = True
+            dirs[rel] = record
+            prefix = f"{rel}/" if rel else ''
+            paths.extend(prefix + name for name in record[1])
+            stack.extend(reversed([prefix + name for name in record[2]]))
+        changed = changed or len(dirs) != len(old_dirs)
+        self._dirs = dirs
+        if old_dirs:
+            self._set_paths(paths)
+        self.complete = True
+        if changed:
+            self.save()
+
+    def _scan(self, directory: str, mtime: int) -> Optional[DirRecord]:
+        """ディレクトリを読んでファイル名とたどるサブディレクトリ名を返す"""
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith('.') and entry.name not in self.IGNORED_DIRS:
+                                subdirs.append(entry.name)
+                        elif not (entry.is_symlink() and entry.is_dir()):  # ディレクトリへのリンクは除く
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        files.sort()
+        subdirs.sort()
+        return mtime, files, subdirs
@@ -0,0 +1,93 @@
+"""
+File Loader
+
+ファイルの読み込み・デコード・行分割を別スレッドで行う。
+
+- 読み込んだ行は ListLineStore に順に追加されていくので、
+  読み込み中でも先頭から表示できる（lines を参照する）
+- 読んだバイト数を position に反映し、進捗を表示できるようにする
+- cancel() で中断する（次のチャンクを読む前に止まる）
+- 終わると result に編集用の行ストア、失敗すると error に例外が入る
+"""
+
+import os
+import threading
+from typing import Optional
+
+from uzuki.core.file_manager import FileManager, LoadCancelled
+from uzuki.core.text_store import ChunkedLineStore
+
+
+class FileLoader:
+    """バックグラウンドでのファイル読み込み"""
+
+    def __init__(self, filepath: str, store_factory=ChunkedLineStore, lazy_threshold: Optional[int] = None):
+        self.filepath = filepath
+        self.store_factory = store_factory
+        self.lazy_threshold = lazy_threshold  # これ以上のファイルは遅延読み込みする（None なら FileManager の既定値）
+        self.file_manager = FileManager()
+        self.file_manager.filename = filepath  # 読み込み中の表示用（完了時にも設定される）
+        try:
+            self.size = os.path.getsize(filepath)
+        except OSError:
+            self.size = 0
+        self.position = 0    # 読んだバイト数
+        self.lines = None    # 読み込み中の行（先頭から順に伸びる。読み直すと別のストアになる）
+        self.result = None   # 読み込みが終わった行ストア
+        self.error: Optional[Exception] = None
+        self.done = False
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """読み込みスレッドを開始"""
+        self._thread = threading.Thread(target=self._run, name='uzuki-load', daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """読み込みを中断する"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def progress(self) -> Optional[float]:
+        """読み込んだ割合（0〜1、分からなければ None）"""
+        if not self.size or not self.position:
+            return None
+        return min(1.0, self.position / self.size)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """読み込みが終わるまで待つ（終わっていれば True）"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    def _on_progress(self, lines, position: int):
+        if self._cancelled.is_set():
+            raise LoadCancelled()
+        if lines is not None:
+            self.lines = lines
+        self.position = position
+
+    def _run(self):
+        try:
+            lines = self.file_manager.load_file(self.filepath, progress=self._on_progress,
+                                                lazy_threshold=self.lazy_threshold)
+            if self._cancelled.is_set():
+                raise LoadCancelled()
+            if isinstance(lines, list) and not isinstance(lines, self.store_factory):
+                # 読み込み中に公開したリストを編集用のストアに変換（遅延ストアはそのまま）
+                lines = self.store_factory(lines)
+            self.result = lines
+        except LoadCancelled:
+            source = self.file_manager.mapped_source
+            if source is not None:
+                source.close()
+                self.file_manager.mapped_source = None
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
@@ -1,7 +1,28 @@
 import os
 import codecs
-from typing import List, Optional, Tuple
+import shutil
+import stat
+import tempfile
+from typing import Callable, List, Optional, Tuple
 from pathlib import Path
+from uzuki.core.mapped_file import MappedLineSource, supports_lazy_decoding
+from uzuki.core.stream_decoder import decode_lines, detect_bom, detect_stream_encoding
+from uzuki.core.text_store import ChunkedLineStore, ListLineStore
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# 新しく作るファイルの権限（一時ファイルは 0600 で作られるため、置き換える前にこれにする）
+NEW_FILE_MODE = 0o666 & ~_current_umask()
+
+
+class LoadCancelled(Exception):
+    """読み込みが中断された（progress コールバックから投げる）"""
+
 
 class FileManager:
     """ファイル操作と文字エンコーディング管理"""
@@ -19,39 +40,36 @@ class FileManager:
         'cp1252',
     ]
     
+    # このサイズ以上のファイルは mmap で遅延読み込みする
+    LAZY_LOAD_THRESHOLD = 64 * 1024 * 1024
+    # 遅延読み込み時のエンコーディング判定に使う先頭サンプルのサイズ
+    DETECT_SAMPLE_SIZE = 1024 * 1024
+    # 保存時にまとめてエンコード・書き込みする行数
+    WRITE_CHUNK_LINES = 8192
+    
     def __init__(self):
         self.filename: Optional[str] = None
         self.encoding: str = 'utf-8'
         self.has_bom: bool = False
         self.line_ending: str = '\n'  # 改行コード
         self.is_modified: bool = False
+        self.mapped_source: Optional[MappedLineSource] = None  # 遅延読み込み中のソース
+        self.backed_up: bool = False  # 読み込み後にバックアップを作ったか
         
-    def detect_encoding(self, filepath: str) -> Tuple[str, bool]:
-        """ファイルの文字エンコーディングを検出"""
+    def detect_encoding(self, filepath: str, sample_size: Optional[int] = None) -> Tuple[str, bool]:
+        """ファイルの文字エンコーディングを検出（sample_size指定時は先頭のみで判定）"""
         try:
-            # まずBOMをチェック
             with open(filepath, 'rb') as f:
-                raw = f.read(4)
+                # まずBOMをチェック
+                bom_encoding = detect_bom(f.read(4))
+                if bom_encoding:
+                    return bom_encoding, True
                 
-            if raw.startswith(codecs.BOM_UTF8):
-                return 'utf-8-sig', True
-            elif raw.startswith(codecs.BOM_UTF16_LE):
-                return 'utf-16-le', True
-            elif raw.startswith(codecs.BOM_UTF16_BE):
-                return 'utf-16-be', True
-            elif raw.startswith(codecs.BOM_UTF32_LE):
-                return 'utf-32-le', True
-            elif raw.startswith(codecs.BOM_UTF32_BE):
-                return 'utf-32-be', True
-            
-            # BOMがない場合、一般的なエンコーディングを試す
-            for encoding in self.COMMON_ENCODINGS:
-                try:
-                    with codecs.open(filepath, 'r', encoding=encoding) as f:
-                        f.read()
+                # BOMがない場合、一般的なエンコーディングを1パスで並行に試す
+                f.seek(0)
+                encoding = detect_stream_encoding(f, self.COMMON_ENCODINGS, sample_size)
+                if encoding:
                     return encoding, False
-                except (UnicodeDecodeError, UnicodeError):
-                    continue
                     
             # デフォルトはUTF-8
             return 'utf-8', False
@@ -68,49 +86,111 @@ class FileManager:
         else:
             return '\n'
     
-    def load_file(self, filepath: str) -> List[str]:
-        """ファイルを読み込み"""
+    def load_file(self, filepath: str, progress: Optional[Callable] = None,
+                  encoding: Optional[str] = None, lazy_threshold: Optional[int] = None) -> List[str]:
+        """ファイルを読み込み
+
+        progress を指定すると読み込みの途中経過を progress(行, 読んだ位置) で通知する
+        （行は読み込み中にも伸びていく ListLineStore。decode_lines を参照）。
+        encoding を指定するとまずそのエンコーディングで読み、読めなければ判定し直す。
+        lazy_threshold 以上のファイルは遅延読み込みする（省略すると LAZY_LOAD_THRESHOLD）
+        """
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"File not found: {filepath}")
         
-        # エンコーディングを検出
-        self.encoding, self.has_bom = self.detect_encoding(filepath)
+        # 巨大ファイルは mmap で遅延読み込み
+        if lazy_threshold is None:
+            lazy_threshold = self.LAZY_LOAD_THRESHOLD
+        if os.path.getsize(filepath) >= lazy_threshold:
+            lines = self._load_lazy(filepath)
+            if lines is not None:
+                return lines
         
         try:
-            with codecs.open(filepath, 'r', encoding=self.encoding) as f:
-                content = f.read()
-            
-            # 改行コードを検出
-            self.line_ending = self.detect_line_ending(content)
+            with open(filepath, 'rb') as f:
+                # BOMがあればそのエンコーディングに確定
+                bom_encoding = detect_bom(f.read(4))
+                f.seek(0)
+                store = ListLineStore if progress is not None else list
+                if not bom_encoding and encoding in self.COMMON_ENCODINGS and encoding != 'utf-8-sig':
+                    # 前に判定したエンコーディング（セッションの復元など）は判定せずに使う
+                    try:
+                        encoding, splitter = decode_lines(f, [encoding], self.DETECT_SAMPLE_SIZE,
+                                                          progress, store)
+                    except UnicodeError:
+                        f.seek(0)
+                        encoding = None
+                else:
+                    encoding = None
+                if encoding is None:
+                    encodings = [bom_encoding] if bom_encoding else self.COMMON_ENCODINGS
+                    # 判定とデコード・行分割を1回の読み込みで行う
+                    encoding, splitter = decode_lines(f, encodings, self.DETECT_SAMPLE_SIZE, progress, store)
             
-            # 行に分割（改行コードを除去）
-            lines = content.splitlines()
+            lines = splitter.lines
             if not lines:
                 lines = ['']
             
+            self.encoding = encoding
+            self.has_bom = bom_encoding is not None
+            self.line_ending = splitter.line_ending
             self.filename = filepath
             self.is_modified = False
+            self.mapped_source = None
+            self.backed_up = False
             
             return lines
             
-        except UnicodeDecodeError as e:
-            raise UnicodeError(f"Failed to decode file with {self.encoding}: {e}")
+        except LoadCancelled:
+            raise
+        except UnicodeError as e:
+            raise UnicodeError(f"Failed to decode file: {e}")
         except Exception as e:
             raise IOError(f"Failed to read file: {e}")
     
-    def save_file(self, filepath: str, lines: List[str], encoding: Optional[str] = None) -> None:
-        """ファイルを保存"""
+    def _load_lazy(self, filepath: str) -> Optional[ChunkedLineStore]:
+        """mmap + 改行索引による遅延読み込み（対応できない場合は None）"""
+        encoding, has_bom = self.detect_encoding(filepath, sample_size=self.DETECT_SAMPLE_SIZE)
+        data_start = 0
+        decode_encoding = encoding
+        if encoding == 'utf-8-sig':
+            data_start = len(codecs.BOM_UTF8)
+            decode_encoding = 'utf-8'
+        if not supports_lazy_decoding(decode_encoding):
+            return None
+        
+        try:
+            source = MappedLineSource(filepath, decode_encoding, data_start)
+        except (OSError, ValueError):
+            return None
+        
+        # 改行コードを先頭サンプルから判定（CRのみのファイルは対象外）
+        sample = source.sample()
+        if b'\r\n' in sample:
+            line_ending = '\r\n'
+        elif b'\r' in sample and b'\n' not in sample:
+            source.close()
+            return None
+        else:
+            line_ending = '\n'
+        
+        self.encoding = encoding
+        self.has_bom = has_bom
+        self.line_ending = line_ending
+        self.filename = filepath
+        self.is_modified = False
+        self.mapped_source = source
+        self.backed_up = False
+        return ChunkedLineStore.from_source(source)
+    
+    def save_file(self, filepath: str, lines: List[str], encoding: Optional[str] = None,
+                  backup_extension: Optional[str] = None, fsync: bool = False,
+                  progress: Optional[Callable[[int], None]] = None) -> None:
+        """ファイルを保存（backup_extension を指定すると保存前のファイルをバックアップとして残す）"""
         save_encoding = encoding or self.encoding
         
         try:
-            # ディレクトリが存在しない場合は作成
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            with codecs.open(filepath, 'w', encoding=save_encoding) as f:
-                for i, line in enumerate(lines):
-                    f.write(line)
-                    if i < len(lines) - 1:  # 最後の行以外は改行を追加
-                        f.write(self.line_ending)
+            self.write_file(filepath, lines, save_encoding, self.line_ending, backup_extension, fsync, progress)
             
             self.filename = filepath
             self.encoding = save_encoding
@@ -119,6 +199,144 @@ class FileManager:
         except Exception as e:
             raise IOError(f"Failed to save file: {e}")
     
+    def write_file(self, filepath: str, lines: List[str], encoding: str, line_ending: str,
+                   backup_extension: Optional[str] = None, fsync: bool = False,
+                   progress: Optional[Callable[[int], None]] = None) -> Optional[str]:
+        """状態を変えずにファイルへ書き出す（書き込みスレッドからも呼ぶ）。作ったバックアップのパスを返す
+
+        同じディレクトリの一時ファイルに書いてから置き換えるので、途中で失敗しても元のファイルは残る。
+        ただし、ほかのハードリンクがあるファイル（置き換えると他の名前が古い内容のまま残る）と、
+        ディレクトリに一時ファイルを作れないファイルは元のファイルに直接書き込む（途中で失敗すると壊れる）。
+        progress を指定すると書き出した行数を progress(行数) で通知する
+        """
+        # シンボリックリンクはリンク先を置き換える（ファイル名だけのパスも絶対パスになる）
+        target = os.path.realpath(filepath)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        
+        # バックアップのハードリンクを作る前に調べる
+        in_place = self._has_other_links(target)
+        # 直接書き込むときにハードリンクのバックアップでは一緒に書き換わってしまう
+        backup_path = self._make_backup(target, backup_extension, copy=in_place) if backup_extension else None
+        if in_place:
+            self._write_in_place(target, lines, encoding, line_ending, fsync, progress)
+        else:
+            self._replace_file(target, lines, encoding, line_ending, backup_path, fsync, progress)
+        return backup_path
+    
+    @staticmethod
+    def _has_other_links(filepath: str) -> bool:
+        """ファイルにほかの名前（ハードリンク）があるか"""
+        try:
+            return os.stat(filepath).st_nlink > 1
+        except OSError:
+            return False
+    
+    def _make_backup(self, filepath: str, extension: str, copy: bool = False) -> Optional[str]:
+        """保存前のファイルをハードリンクでバックアップにする（copy を指定するか、作れなければコピーする）
+
+        元のファイルは書き込みが終わるまで元のパスに残す（移してしまうと書き込みに失敗したときに失われる）
+        """
+        if not os.path.isfile(filepath):
+            return None
+        backup_path = filepath + extension
+        try:
+            os.unlink(backup_path)
+        except FileNotFoundError:
+            pass
+        if copy:
+            shutil.copy2(filepath, backup_path)
+            return backup_path
+        try:
+            os.link(filepath, backup_path)
+        except OSError:
+            # ハードリンクを作れないファイルシステムでは内容をコピーする
+            shutil.copy2(filepath, backup_path)
+        return backup_path
+    
+    def _write_lines(self, f, lines: List[str], encoding: str, line_ending: Optional[str] = None,
+                     progress: Optional[Callable[[int], None]] = None):
+        """行を改行コード付きでエンコードして書き出す（WRITE_CHUNK_LINES 行ずつまとめて1回で書く）"""
+        line_ending = line_ending or self.line_ending
+        # BOM 付きのエンコーディングでも BOM は先頭の1回だけになる
+        encoder = codecs.getincrementalencoder(encoding)()
+        total = len(lines)
+        for start in range(0, total, self.WRITE_CHUNK_LINES):
+            stop = min(start + self.WRITE_CHUNK_LINES, total)
+            text = line_ending.join(lines[start:stop])
+            if stop < total:  # 最後の行以外は改行を追加
+                text += line_ending
+            f.write(encoder.encode(text))
+            if progress is not None:
+                progress(stop)
+        f.write(encoder.encode('', final=True))
+    
+    def _replace_file(self, filepath: str, lines: List[str], encoding: str,
+                      line_ending: Optional[str] = None, mode_from: Optional[str] = None,
+                      fsync: bool = False, progress: Optional[Callable[[int], None]] = None):
+        """同じディレクトリの一時ファイルに書き出してから置き換える（権限は mode_from か元のファイルに合わせる）
+
+        ディレクトリに書き込めず一時ファイルを作れないときは、元のファイルに直接書き込む
+        """
+        directory = os.path.dirname(os.path.abspath(filepath))
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(filepath)}.", suffix='.tmp', dir=directory)
+        except PermissionError:
+            self._write_in_place(filepath, lines, encoding, line_ending, fsync, progress)
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self._write_lines(f, lines, encoding, line_ending, progress)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._copy_permissions(mode_from or filepath, temp_path)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        if fsync:
+            self._fsync_directory(directory)
+    
+    def _write_in_place(self, filepath: str, lines: List[str], encoding: str,
+                        line_ending: Optional[str] = None, fsync: bool = False,
+                        progress: Optional[Callable[[int], None]] = None):
+        """元のファイルを切り詰めて直接書き出す（inode・ハードリンク・権限はそのまま）"""
+        with open(filepath, 'wb') as f:
+            self._write_lines(f, lines, encoding, line_ending, progress)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    
+    @staticmethod
+    def _copy_permissions(source: str, temp_path: str):
+        """一時ファイルの権限と所有者を元のファイルに合わせる（新しいファイルは umask に従う）"""
+        try:
+            st = os.stat(source)
+        except FileNotFoundError:
+            os.chmod(temp_path, NEW_FILE_MODE)
+            return
+        os.chmod(temp_path, stat.S_IMODE(st.st_mode))
+        if hasattr(os, 'chown'):
+            try:
+                os.chown(temp_path, st.st_uid, st.st_gid)
+            except OSError:
+                pass  # 所有者を変えられない場合は保存したユーザーのものになる
+    
+    @staticmethod
+    def _fsync_directory(directory: str):
+        """置き換えたディレクトリのエントリをディスクに書き出す"""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
     def get_file_info(self) -> dict:
         """ファイル情報を取得"""
         if not self.filename:
@@ -1,81 +1,161 @@
 import os
 import glob
-from typing import List, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from uzuki.core.file_index import FileIndex
+
+
+class DirectorySnapshot:
+    """os.scandir で読んだディレクトリの内容（ソート済みの一覧を条件ごとにキャッシュ）"""
+    
+    __slots__ = ('directory', 'mtime', 'entries', '_listings')
+    
+    def __init__(self, directory: str, mtime: int, entries: list):
+        self.directory = directory
+        self.mtime = mtime        # 読んだときのディレクトリの更新時刻（ns）
+        self.entries = entries    # (名前, フルパス, ディレクトリか, DirEntry)
+        self._listings: Dict[tuple, List[Tuple[str, str, bool]]] = {}
+    
+    @classmethod
+    def scan(cls, directory: str, mtime: int) -> 'DirectorySnapshot':
+        """ディレクトリを読む（種別は DirEntry のキャッシュを使い、項目ごとの stat はしない）"""
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                entries.append((entry.name, entry.path, is_dir, entry))
+        return cls(directory, mtime, entries)
+    
+    @staticmethod
+    def _stat(entry: os.DirEntry):
+        try:
+            return entry.stat()
+        except OSError:
+            return None
+    
+    def listing(self, sort_by: str, reverse: bool, hidden: bool,
+                pattern: Optional[str]) -> List[Tuple[str, str, bool]]:
+        """表示用の一覧（ディレクトリが先）"""
+        key = (sort_by, reverse, hidden, pattern)
+        result = self._listings.get(key)
+        if result is not None:
+            return result
+        
+        items = self.entries
+        if not hidden:
+            items = [item for item in items if not item[0].startswith('.')]
+        if pattern:
+            items = [item for item in items if item[2] or glob.fnmatch.fnmatch(item[0], pattern)]
+        
+        # ソート（更新時刻・サイズは DirEntry が保持する stat を使う）
+        if sort_by == 'name':
+            items = sorted(items, key=lambda x: x[0].lower(), reverse=reverse)
+        elif sort_by == 'modified':
+            def modified(item):
+                stat = self._stat(item[3])
+                return stat.st_mtime if stat else 0
+            items = sorted(items, key=modified, reverse=reverse)
+        elif sort_by == 'size':
+            def size(item):
+                stat = None if item[2] else self._stat(item[3])
+                return stat.st_size if stat else 0
+            items = sorted(items, key=size, reverse=reverse)
+        
+        # ディレクトリを先に表示
+        result = ([item[:3] for item in items if item[2]] +
+                  [item[:3] for item in items if not item[2]])
+        self._listings[key] = result
+        return result
+
+
 class FileSelector:
     """ファイル選択機能"""
     
+    SNAPSHOT_CACHE_SIZE = 16  # 内容をキャッシュするディレクトリの数
+    
     def __init__(self):
         self.current_dir = os.getcwd()
         self.file_patterns = ['*', '*.txt', '*.py', '*.js', '*.html', '*.css', '*.md']
         self.hidden_files = False
         self.sort_by = 'name'  # 'name', 'modified', 'size'
         self.sort_reverse = False
+        self._snapshots: "OrderedDict[str, DirectorySnapshot]" = OrderedDict()
+        self._indexes: Dict[str, FileIndex] = {}  # find_files_by_pattern の索引
     
     def get_files_in_directory(self, directory: Optional[str] = None, 
-                              pattern: Optional[str] = None) -> List[Tuple[str, str, bool]]:
+                              pattern: Optional[str] = None,
+                              hidden: Optional[bool] = None) -> List[Tuple[str, str, bool]]:
         """ディレクトリ内のファイル一覧を取得
         
+        ディレクトリの内容は更新時刻が変わるか refresh() を呼ぶまでキャッシュし、
+        ソート結果も条件ごとに保持する（返すリストは共有なので変更しないこと）
+        
         Returns:
             List of (name, full_path, is_directory) tuples
         """
         target_dir = directory or self.current_dir
-        
-        if not os.path.exists(target_dir):
+        snapshot = self._snapshot(target_dir)
+        if snapshot is None:
             return []
-        
-        files = []
-        
+        if hidden is None:
+            hidden = self.hidden_files
+        return snapshot.listing(self.sort_by, self.sort_reverse, hidden, pattern)
+    
+    def _snapshot(self, directory: str) -> Optional['DirectorySnapshot']:
+        """ディレクトリのスナップショットを取得（更新時刻が変わっていれば読み直す）"""
+        snapshots = self._snapshots
         try:
-            for item in os.listdir(target_dir):
-                if not self.hidden_files and item.startswith('.'):
-                    continue
-                
-                full_path = os.path.join(target_dir, item)
-                is_dir = os.path.isdir(full_path)
-                
-                # パターンフィルタリング
-                if pattern and not is_dir:
-                    if not glob.fnmatch.fnmatch(item, pattern):
-                        continue
-                
-                files.append((item, full_path, is_dir))
-        except PermissionError:
-            return []
-        
-        # ソート
-        if self.sort_by == 'name':
-            files.sort(key=lambda x: x[0].lower(), reverse=self.sort_reverse)
-        elif self.sort_by == 'modified':
-            files.sort(key=lambda x: os.path.getmtime(x[1]), reverse=self.sort_reverse)
-        elif self.sort_by == 'size':
-            files.sort(key=lambda x: os.path.getsize(x[1]) if not x[2] else 0, reverse=self.sort_reverse)
-        
-        # ディレクトリを先に表示
-        dirs = [f for f in files if f[2]]
-        regular_files = [f for f in files if not f[2]]
-        
-        return dirs + regular_files
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            snapshots.pop(directory, None)
+            return None
+        snapshot = snapshots.get(directory)
+        if snapshot is not None and snapshot.mtime == mtime:
+            snapshots.move_to_end(directory)
+            return snapshot
+        try:
+            snapshot = DirectorySnapshot.scan(directory, mtime)
+        except OSError:
+            snapshots.pop(directory, None)
+            return None
+        snapshots[directory] = snapshot
+        snapshots.move_to_end(directory)
+        if len(snapshots) > self.SNAPSHOT_CACHE_SIZE:
+            snapshots.popitem(last=False)
+        return snapshot
+    
+    def refresh(self, directory: Optional[str] = None):
+        """ディレクトリのキャッシュを捨てる（None なら全部）"""
+        if directory is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(directory, None)
     
     def find_files_by_pattern(self, pattern: str, directory: Optional[str] = None) -> List[str]:
-        """パターンにマッチするファイルを検索"""
-        target_dir = directory or self.current_dir
+        """パターンにマッチするファイルを検索
         
-        if not os.path.exists(target_dir):
+        ファイルの索引を使い、更新時刻が変わったディレクトリだけを読み直す
+        （隠しディレクトリと FileIndex.IGNORED_DIRS の中は含まない）
+        """
+        target_dir = os.path.abspath(directory or self.current_dir)
+        
+        if not os.path.isdir(target_dir):
             return []
         
-        matches = []
-        for root, dirs, files in os.walk(target_dir):
-            # 隠しディレクトリをスキップ
-            dirs[:] = [d for d in dirs if not d.startswith('.') or self.hidden_files]
-            
-            for file in files:
-                if glob.fnmatch.fnmatch(file, pattern):
-                    full_path = os.path.join(root, file)
-                    matches.append(full_path)
+        index = self._indexes.get(target_dir)
+        if index is None:
+            index = FileIndex(target_dir)
+            index.load()
+            self._indexes[target_dir] = index
+        index.crawl()
         
-        return matches
+        return [os.path.join(target_dir, path) for path in index.paths
+                if glob.fnmatch.fnmatch(os.path.basename(path), pattern)]
     
     def get_file_info(self, filepath: str) -> Optional[dict]:
         """ファイル情報を取得"""
@@ -147,6 +227,25 @@ class FileBrowser:
         self.scroll_offset = 0
         self.filter_text = ""
         self.show_hidden = False
+        self._filtered = None  # (元の一覧, フィルタ文字列, フィルタ後の一覧)
+    
+    def get_files(self) -> List[Tuple[str, str, bool]]:
+        """フィルタを適用した一覧（ディレクトリの内容とフィルタが変わらなければ前回の結果）"""
+        files = self.selector.get_files_in_directory(hidden=self.show_hidden)
+        if not self.filter_text:
+            return files
+        text = self.filter_text.lower()
+        cached = self._filtered
+        candidates = files
+        if cached is not None and cached[0] is files:
+            if cached[1] == text:
+                return cached[2]
+            if text.startswith(cached[1]):
+                # 入力を続けた場合は前回の結果から絞り込む
+                candidates = cached[2]
+        filtered = [f for f in candidates if text in f[0].lower()]
+        self._filtered = (files, text, filtered)
+        return filtered
     
     def get_display_files(self, max_height: int) -> List[Tuple[str, str, bool, bool]]:
         """表示用ファイル一覧を取得
@@ -154,15 +253,7 @@ class FileBrowser:
         Returns:
             List of (name, path, is_directory, is_selected) tuples
         """
-        files = self.selector.get_files_in_directory()
-        
-        # フィルタリング
-        if self.filter_text:
-            files = [f for f in files if self.filter_text.lower() in f[0].lower()]
-        
-        # 隠しファイルフィルタリング
-        if not self.show_hidden:
-            files = [f for f in files if not f[0].startswith('.')]
+        files = self.get_files()
         
         # スクロール範囲を調整
         if self.current_index >= len(files):
@@ -191,27 +282,21 @@ class FileBrowser:
     
     def move_down(self):
         """下に移動"""
-        files = self.selector.get_files_in_directory()
-        if self.filter_text:
-            files = [f for f in files if self.filter_text.lower() in f[0].lower()]
-        if not self.show_hidden:
-            files = [f for f in files if not f[0].startswith('.')]
-        
-        if self.current_index < len(files) - 1:
+        if self.current_index < len(self.get_files()) - 1:
             self.current_index += 1
     
     def get_selected_file(self) -> Optional[str]:
         """選択されたファイルのパスを取得"""
-        files = self.selector.get_files_in_directory()
-        if self.filter_text:
-            files = [f for f in files if self.filter_text.lower() in f[0].lower()]
-        if not self.show_hidden:
-            files = [f for f in files if not f[0].startswith('.')]
-        
+        files = self.get_files()
         if 0 <= self.current_index < len(files):
             return files[self.current_index][1]
         return None
     
+    def refresh(self):
+        """表示中のディレクトリを読み直す"""
+        self.selector.refresh(self.selector.get_current_directory())
+        self._filtered = None
+    
     def set_filter(self, filter_text: str):
         """フィルタを設定"""
         self.filter_text = filter_text
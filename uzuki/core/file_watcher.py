@@ -0,0 +1,241 @@
+"""
+File Watcher
+
+開いているファイルの外部での変更の監視。
+
+- Linux では ctypes で inotify を使う。ファイルではなく親ディレクトリを監視するので、
+  一時ファイルからの置き換えで保存するエディタの変更も拾え、監視の数はディレクトリ数で済む
+- inotify が使えない環境では stat のポーリングにする。1回に調べる数を POLL_BATCH に
+  抑え、一巡は POLL_INTERVAL 秒に1回までにする
+- poll() は変わった可能性のあるファイルを返すだけで、本当に変わったかは呼び出し側が
+  読み込み時の (更新時刻, サイズ) と比べて判断する
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+# inotify の定数（<sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class Inotify:
+    """ctypes 経由の inotify"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    @classmethod
+    def create(cls) -> Optional['Inotify']:
+        """使えなければ None"""
+        try:
+            return cls()
+        except (OSError, AttributeError):
+            return None
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {path}")
+        return wd
+
+    def rm_watch(self, wd: int):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """溜まっているイベント (wd, mask, name) をすべて読む（ブロックしない）"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileWatcher:
+    """ファイルの変更監視（inotify が使えなければ stat のポーリング）"""
+
+    POLL_INTERVAL = 1.0  # ポーリングで全ファイルを一巡する最短の間隔（秒）
+    POLL_BATCH = 64      # 1回の poll() で stat するファイル数
+
+    def __init__(self, use_inotify: bool = True):
+        self._inotify = Inotify.create() if use_inotify else None
+        self._files: Dict[str, Optional[Tuple[int, int]]] = {}  # パス -> 最後に見た (更新時刻, サイズ)
+        self._dir_files: Dict[str, Set[str]] = {}  # 監視中のディレクトリ -> ファイル名
+        self._dir_wds: Dict[str, int] = {}
+        self._wd_dirs: Dict[int, str] = {}
+        self._polled: List[str] = []  # ポーリングで調べるファイル（inotify で監視できないもの）
+        self._poll_index = 0
+        self._poll_started = 0.0
+        self._changed: Set[str] = set()
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._inotify is not None else 'poll'
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, path: str) -> bool:
+        return os.path.abspath(path) in self._files
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    # --- 監視の追加・削除 ---
+    def watch(self, path: str):
+        """ファイルの監視を始める"""
+        path = os.path.abspath(path)
+        if path in self._files:
+            return
+        self._files[path] = self._stat(path)
+        directory, name = os.path.split(path)
+        if self._inotify is not None and self._watch_directory(directory):
+            self._dir_files[directory].add(name)
+        else:
+            self._polled.append(path)
+
+    def unwatch(self, path: str):
+        """ファイルの監視をやめる"""
+        path = os.path.abspath(path)
+        if path not in self._files:
+            return
+        del self._files[path]
+        self._changed.discard(path)
+        if path in self._polled:
+            self._polled.remove(path)
+            return
+        directory, name = os.path.split(path)
+        names = self._dir_files.get(directory)
+        if names is None:
+            return
+        names.discard(name)
+        if not names:
+            wd = self._dir_wds.pop(directory)
+            del self._wd_dirs[wd]
+            del self._dir_files[directory]
+            self._inotify.rm_watch(wd)
+
+    def _watch_directory(self, directory: str) -> bool:
+        if directory in self._dir_wds:
+            return True
+        try:
+            wd = self._inotify.add_watch(directory)
+        except OSError:
+            return False
+        self._dir_wds[directory] = wd
+        self._wd_dirs[wd] = directory
+        self._dir_files[directory] = set()
+        return True
+
+    def _drop_directory(self, wd: int):
+        """監視できなくなったディレクトリのファイルをポーリングに回す"""
+        directory = self._wd_dirs.pop(wd, None)
+        if directory is None:
+            return
+        del self._dir_wds[directory]
+        for name in self._dir_files.pop(directory):
+            path = os.path.join(directory, name)
+            self._polled.append(path)
+            self._changed.add(path)
+
+    # --- 変更の取得 ---
+    def poll(self) -> List[str]:
+        """前回から変わった可能性のあるファイル"""
+        if self._inotify is not None:
+            self._read_inotify()
+        if self._polled:
+            self._poll_files()
+        changed = [path for path in self._changed if path in self._files]
+        self._changed.clear()
+        return changed
+
+    def _read_inotify(self):
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                # 取りこぼしたので全部を調べ直させる
+                self._changed.update(self._files)
+                continue
+            directory = self._wd_dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                self._drop_directory(wd)
+                continue
+            if name in self._dir_files[directory]:
+                self._changed.add(os.path.join(directory, name))
+
+    def _poll_files(self):
+        """ポーリング対象を POLL_BATCH 件ずつ stat する"""
+        now = time.monotonic()
+        if self._poll_index == 0:
+            if now - self._poll_started < self.POLL_INTERVAL:
+                return
+            self._poll_started = now
+        paths = self._polled[self._poll_index:self._poll_index + self.POLL_BATCH]
+        self._poll_index += len(paths)
+        if self._poll_index >= len(self._polled):
+            self._poll_index = 0
+        for path in paths:
+            stat = self._stat(path)
+            if stat != self._files.get(path):
+                self._files[path] = stat
+                self._changed.add(path)
+
+    def close(self):
+        """監視をすべてやめる"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._files.clear()
+        self._dir_files.clear()
+        self._dir_wds.clear()
+        self._wd_dirs.clear()
+        self._polled.clear()
+        self._changed.clear()
@@ -0,0 +1,143 @@
+"""
+File Writer
+
+ファイルの書き出しを別スレッドで行う。
+
+- 書き出す行は呼び出し側が取ったスナップショット（ChunkedLineStore.snapshot()）で、
+  書き込み中にバッファを編集してもスレッド間で行を奪い合わない
+- 同じファイルの書き込みがまだ始まっていなければ新しい方に置き換える
+  （キューに残るのは1ファイルにつき1件まで）
+- 書き込み中の件の進み具合（書き出した行数）を progress で参照できる
+- 終わった書き込みは poll() で受け取り、書き込みにかかった時間と
+  キューに残っている件数をステータス表示に使う
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional
+
+
+class WriteJob:
+    """書き込み1件"""
+
+    __slots__ = ('file_manager', 'path', 'lines', 'encoding', 'line_ending', 'backup_extension',
+                 'fsync', 'tag', 'total', 'written', 'queued_at', 'elapsed', 'error')
+
+    def __init__(self, file_manager, path: str, lines, encoding: str, line_ending: str,
+                 backup_extension: Optional[str] = None, fsync: bool = False, tag: Any = None):
+        self.file_manager = file_manager
+        self.path = path
+        self.lines = lines
+        self.encoding = encoding
+        self.line_ending = line_ending
+        self.backup_extension = backup_extension
+        self.fsync = fsync
+        self.tag = tag              # 呼び出し側が完了時に照合する値
+        self.total = len(lines)
+        self.written = 0            # 書き出した行数
+        self.queued_at = time.monotonic()
+        self.elapsed = 0.0          # キューに入れてから書き終わるまでの秒数
+        self.error: Optional[Exception] = None
+
+
+class FileWriter:
+    """バックグラウンドでのファイル書き込み"""
+
+    def __init__(self):
+        self._queue: Deque[WriteJob] = deque()
+        self._done: List[WriteJob] = []
+        self._running: Optional[WriteJob] = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def depth(self) -> int:
+        """書き終わっていない件数（書き込み中を含む）"""
+        with self._cond:
+            return len(self._queue) + (self._running is not None)
+
+    @property
+    def progress(self) -> Optional[float]:
+        """書き込み中の件の進み具合（0〜1、書き込み中でなければ None）"""
+        job = self._running
+        if job is None:
+            return None
+        return job.written / job.total if job.total else 0.0
+
+    def is_busy(self, path: Optional[str] = None) -> bool:
+        """書き込み待ち・書き込み中か（path を指定するとそのファイルについて。poll() で受け取る前を含む）"""
+        with self._cond:
+            jobs = list(self._queue) + self._done
+            if self._running is not None:
+                jobs.append(self._running)
+        return any(path is None or job.path == path for job in jobs)
+
+    def submit(self, job: WriteJob):
+        """書き込みをキューに入れる（同じファイルの始まっていない書き込みは置き換える）"""
+        with self._cond:
+            for i, queued in enumerate(self._queue):
+                if queued.path == job.path:
+                    job.queued_at = queued.queued_at
+                    job.backup_extension = job.backup_extension or queued.backup_extension
+                    self._queue[i] = job
+                    break
+            else:
+                self._queue.append(job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='uzuki-write', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def poll(self) -> List[WriteJob]:
+        """前回から書き終わった書き込み"""
+        with self._cond:
+            done, self._done = self._done, []
+        return done
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """キューが空になるまで待つ（空になれば True）"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._running is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """残りの書き込みを終えてスレッドを止める"""
+        finished = self.wait(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        return finished
+
+    @staticmethod
+    def _progress_of(job: WriteJob):
+        def progress(written: int):
+            job.written = written
+        return progress
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    self._thread = None
+                    return
+                job = self._running = self._queue.popleft()
+            try:
+                job.file_manager.write_file(job.path, job.lines, job.encoding, job.line_ending,
+                                            job.backup_extension, job.fsync, self._progress_of(job))
+            except Exception as e:
+                job.error = e
+            job.elapsed = time.monotonic() - job.queued_at
+            job.lines = None  # スナップショットを手放す
+            with self._cond:
+                self._running = None
+                self._done.append(job)
+                self._cond.notify_all()
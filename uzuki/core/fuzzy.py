@@ -0,0 +1,168 @@
+"""
+Fuzzy Matcher
+
+ファイルパスのあいまい検索。
+
+- 入力した文字が順番どおりに含まれるパスを探し、スコアの高い上位 limit 件だけを
+  ヒープで保持する（全件を並べ替えない）
+- 絞り込みは一定件数ずつ、時間の上限まで進めて返す。残りはアイドル時に続きを進める
+  （クロール中に伸びていく一覧にも、追加された分だけを追って対応する）
+- 入力を1文字足したときは前回一致したパスだけを調べ直す
+"""
+
+import heapq
+import re
+import time
+from itertools import compress
+from typing import List, Optional, Tuple
+
+SEPARATORS = '/_-. '
+
+# スコア
+CONSECUTIVE_BONUS = 8   # 直前の文字と連続している
+BOUNDARY_BONUS = 6      # 単語の先頭（区切り文字の直後）
+BASENAME_BONUS = 4      # ファイル名部分に一致
+SUBSTRING_BONUS = 20    # ファイル名が入力をそのまま含む
+
+
+def fuzzy_pattern(query: str) -> "re.Pattern":
+    """入力の文字が順番どおりに含まれるかを調べる正規表現（a[^b]*b[^c]*c の形でバックトラックしない）"""
+    parts = [re.escape(query[0])] if query else []
+    for ch in query[1:]:
+        escaped = re.escape(ch)
+        parts.append(f"[^{escaped}]*{escaped}")
+    return re.compile(''.join(parts))
+
+
+def fuzzy_score(query: str, path: str) -> Optional[int]:
+    """一致のスコア（query・path は小文字にしたもの。一致しなければ None）
+
+    末尾から逆向きに一致させ、ファイル名部分の一致を優先する
+    """
+    base_start = path.rfind('/') + 1
+    score = 0
+    end = len(path)
+    prev = -1
+    for ch in reversed(query):
+        index = path.rfind(ch, 0, end)
+        if index < 0:
+            return None
+        if index + 1 == prev:
+            score += CONSECUTIVE_BONUS
+        if index == 0 or path[index - 1] in SEPARATORS:
+            score += BOUNDARY_BONUS
+        if index >= base_start:
+            score += BASENAME_BONUS
+        prev = index
+        end = index
+    if query in path[base_start:]:
+        score += SUBSTRING_BONUS
+    return score
+
+
+class FuzzyMatcher:
+    """上位 limit 件を少しずつ求めるあいまい検索"""
+
+    SLICE = 512  # 時間を確認する間隔（件数）
+
+    def __init__(self, limit: int = 100):
+        self.limit = limit
+        self.query = ''
+        self._pattern = None
+        self._paths: Optional[List[str]] = None
+        self._reset()
+
+    def _reset(self):
+        self._position = 0           # paths のここから先は未調査
+        self._candidates: Optional[List[int]] = None  # 先に調べる番号（前回の一致）
+        self._candidate_pos = 0
+        self._matched: List[int] = []  # 今回の一致（次の絞り込みに使う）
+        self._heap: List[Tuple[int, int, int]] = []  # (スコア, -長さ, -番号) の最小ヒープ
+
+    @property
+    def match_count(self) -> int:
+        """これまでに見つかった一致の数"""
+        if not self.query:
+            return len(self._paths) if self._paths is not None else 0
+        return len(self._matched)
+
+    def set_query(self, query: str):
+        """入力を変更（前回の入力を伸ばしただけなら前回の一致から絞り込む）"""
+        query = query.lower()
+        if query == self.query:
+            return
+        if self.query and query.startswith(self.query) and self._paths is not None:
+            # 調べ済みで一致しなかったものは除き、未調査の分はそのまま残す
+            rest = self._candidates[self._candidate_pos:] if self._candidates is not None else []
+            position = self._position
+            candidates = self._matched + rest if rest else self._matched
+            self._reset()
+            self._position = position
+            self._candidates = candidates
+        else:
+            self._reset()
+        self.query = query
+        self._pattern = fuzzy_pattern(query) if query else None
+
+    def step(self, paths: List[str], budget: float = 0.015) -> bool:
+        """絞り込みを budget 秒まで進める（paths の最後まで済んだら True）"""
+        if paths is not self._paths:
+            self._paths = paths
+            self._reset()
+        if not self.query:
+            return True
+        deadline = time.perf_counter() + budget
+        search = self._pattern.search
+        while True:
+            if self._candidates is not None and self._candidate_pos < len(self._candidates):
+                start = self._candidate_pos
+                indices = self._candidates[start:start + self.SLICE]
+                self._candidate_pos = start + len(indices)
+                texts = [paths[i].lower() for i in indices]
+            else:
+                start = self._position
+                end = min(start + self.SLICE, len(paths))
+                if start >= end:
+                    return True
+                indices = range(start, end)
+                texts = [path.lower() for path in paths[start:end]]
+                self._position = end
+            hits = list(compress(indices, map(search, texts)))
+            if hits:
+                self._matched.extend(hits)
+                self._rank(paths, hits)
+            if time.perf_counter() >= deadline:
+                return False
+
+    def _rank(self, paths: List[str], hits: List[int]):
+        """一致したものにスコアをつけて上位 limit 件に入れる"""
+        query = self.query
+        heap = self._heap
+        limit = self.limit
+        for index in hits:
+            path = paths[index]
+            score = fuzzy_score(query, path.lower())
+            if score is None:
+                continue
+            key = (score, -len(path), -index)
+            if len(heap) < limit:
+                heapq.heappush(heap, key)
+            elif key > heap[0]:
+                heapq.heapreplace(heap, key)
+
+    def is_done(self, paths: List[str]) -> bool:
+        """paths を（今ある分の）最後まで調べ終えたか"""
+        if paths is not self._paths:
+            return False
+        if not self.query:
+            return True
+        pending = self._candidates is not None and self._candidate_pos < len(self._candidates)
+        return not pending and self._position >= len(self._paths)
+
+    def results(self) -> List[str]:
+        """スコアの高い順の一致（空の入力なら一覧の先頭）"""
+        if self._paths is None:
+            return []
+        if not self.query:
+            return self._paths[:self.limit]
+        return [self._paths[-key[2]] for key in sorted(self._heap, reverse=True)]
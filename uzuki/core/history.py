@@ -1,23 +1,235 @@
-class History:
-    """Undo/Redo 操作用スタック管理"""
+import time
+from collections import deque
+from typing import List, Optional
+
+
+class Change:
+    """Undo の1単位（操作列と時刻）"""
+    __slots__ = ('ops', 'time', 'size')
+
     def __init__(self):
-        self.undo_stack = []
-        self.redo_stack = []
+        self.ops: List[list] = []  # [kind, row, col, text] の列（kind は 'insert' / 'delete'）
+        self.time = time.time()
+        self.size = 0  # 概算メモリ量（文字数 + 操作ごとのオーバーヘッド）
+
+
+class History:
+    """操作ログ方式の Undo/Redo 管理
 
-    def record(self, state):
-        self.undo_stack.append(state)
+    Buffer の編集操作（insert_text / delete_text）を逆操作として記録する。
+    挿入モード中の操作は1つの Change にまとめ、連続した入力は1操作に結合する。
+    """
+
+    OP_OVERHEAD = 64                  # 1操作あたりの概算オーバーヘッド（バイト）
+    DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.undo_stack: "deque[Change]" = deque()
+        self.redo_stack: List[Change] = []
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.limit_changes = False  # 上限を超える Change は最後の1つでも残さない（巨大ファイルモード）
+        self.buffer = None
+        self.cursor = None
+        self._size = 0             # undo/redo スタック全体の概算サイズ
+        self._group: Optional[Change] = None  # 記録中のグループ
+        self._group_open = False
+        self._applying = False     # undo/redo 適用中は記録しない
+
+    def attach(self, buffer, cursor):
+        """バッファとカーソルに接続"""
+        if self.buffer is not None:
+            self.buffer.remove_edit_listener(self.record)
+        self.buffer = buffer
+        self.cursor = cursor
+        buffer.add_edit_listener(self.record)
+
+    def clear(self):
+        """履歴を破棄"""
+        self.undo_stack.clear()
         self.redo_stack.clear()
+        self._size = 0
+        self._group = None
+
+    def get_state(self):
+        """履歴を取り出す（バッファ切り替え時に退避する）"""
+        self.end_group()
+        return self.undo_stack, self.redo_stack, self._size
+
+    def set_state(self, state):
+        """get_state() で取り出した履歴に差し替える（None なら空にする）"""
+        self.end_group()
+        if state is None:
+            self.undo_stack, self.redo_stack, self._size = deque(), [], 0
+        else:
+            self.undo_stack, self.redo_stack, self._size = state
+
+    # --- グループ ---
+    def begin_group(self):
+        """以降の操作を1つの Change にまとめる（挿入モード開始時）"""
+        self.end_group()
+        self._group_open = True
 
-    def undo(self):
+    def end_group(self):
+        """グループを閉じる"""
+        self._group_open = False
+        self._group = None
+
+    # --- 記録 ---
+    def record(self, kind: str, row: int, col: int, text: str):
+        """編集操作を記録（Buffer の編集リスナー）"""
+        if self._applying:
+            return
+        if self.redo_stack:
+            self._size -= sum(change.size for change in self.redo_stack)
+            self.redo_stack.clear()
+
+        group = self._group
+        if group is None:
+            group = Change()
+            self.undo_stack.append(group)
+            if self._group_open:
+                self._group = group
+        group.time = time.time()
+
+        ops = group.ops
+        count = len(ops)
+        last_size = self._op_size(ops[-1]) if ops else 0
+        if not (ops and self._merge(ops, kind, row, col, text)):
+            ops.append([kind, row, col, text])
+        # 変化したのは末尾の操作だけなので差分でサイズを更新
+        if len(ops) > count:
+            delta = self._op_size(ops[-1])
+        elif len(ops) < count:
+            delta = -last_size
+        else:
+            delta = self._op_size(ops[-1]) - last_size
+        group.size += delta
+        self._size += delta
+        if not ops:
+            # 入力をすべて消した場合は空の Change を残さない
+            self.undo_stack.pop()
+            self._group = None
+        self._enforce_limit()
+
+    def _op_size(self, op: list) -> int:
+        return len(op[3]) + self.OP_OVERHEAD
+
+    def _merge(self, ops: List[list], kind: str, row: int, col: int, text: str) -> bool:
+        """直前の操作と結合できれば結合する"""
+        last = ops[-1]
+        last_kind, last_row, last_col, last_text = last
+        if kind == 'insert' and last_kind == 'insert':
+            # 連続入力
+            if self.buffer.text_end(last_row, last_col, last_text) == (row, col):
+                last[3] = last_text + text
+                return True
+        elif kind == 'delete' and last_kind == 'delete':
+            if row == last_row and col == last_col:
+                # 前方削除の連続
+                last[3] = last_text + text
+                return True
+            if self.buffer.text_end(row, col, text) == (last_row, last_col):
+                # 後方削除（Backspace）の連続
+                last[1], last[2], last[3] = row, col, text + last_text
+                return True
+        elif kind == 'delete' and last_kind == 'insert':
+            # 入力した直後の文字を Backspace で消した場合は挿入を縮める
+            if (last_text.endswith(text) and
+                    self.buffer.text_end(last_row, last_col, last_text) == self.buffer.text_end(row, col, text)):
+                last[3] = last_text[:-len(text)]
+                if not last[3]:
+                    ops.pop()
+                return True
+        return False
+
+    def _enforce_limit(self):
+        """メモリ上限を超えたら古い Change から捨てる"""
+        while self._size > self.max_bytes and len(self.undo_stack) > 1:
+            self._size -= self.undo_stack.popleft().size
+        if self.limit_changes and self._size > self.max_bytes and self.undo_stack:
+            # 記録中のグループも捨てる（以降の操作は新しい Change になる）
+            if self.undo_stack.pop() is self._group:
+                self._group = None
+            self._size = sum(change.size for change in self.redo_stack)
+
+    # --- 適用 ---
+    def _apply(self, change: Change, undo: bool):
+        """Change を適用（undo なら逆操作を逆順に）"""
+        buffer = self.buffer
+        ops = reversed(change.ops) if undo else change.ops
+        position = None
+        self._applying = True
+        try:
+            for kind, row, col, text in ops:
+                if (kind == 'insert') != undo:
+                    position = buffer.insert_text(row, col, text)
+                else:
+                    end_row, end_col = buffer.text_end(row, col, text)
+                    buffer.delete_text(row, col, end_row, end_col)
+                    position = (row, col)
+        finally:
+            self._applying = False
+        if undo and change.ops:
+            position = (change.ops[0][1], change.ops[0][2])
+        if position and self.cursor is not None:
+            self._set_cursor(*position)
+
+    def _set_cursor(self, row: int, col: int):
+        lines = self.buffer.lines
+        self.cursor.row = max(0, min(row, len(lines) - 1))
+        self.cursor.col = max(0, min(col, len(lines[self.cursor.row])))
+
+    def undo(self) -> bool:
+        """1つ前の状態に戻す"""
+        self.end_group()
         if not self.undo_stack:
-            return None
-        state = self.undo_stack.pop()
-        self.redo_stack.append(state)
-        return state
+            return False
+        change = self.undo_stack.pop()
+        self._apply(change, undo=True)
+        self.redo_stack.append(change)
+        return True
 
-    def redo(self):
+    def redo(self) -> bool:
+        """取り消した変更をやり直す"""
+        self.end_group()
         if not self.redo_stack:
-            return None
-        state = self.redo_stack.pop()
-        self.undo_stack.append(state)
-        return state
+            return False
+        change = self.redo_stack.pop()
+        self._apply(change, undo=False)
+        self.undo_stack.append(change)
+        return True
+
+    def earlier(self, count: int = 1, seconds: Optional[float] = None) -> int:
+        """count 回、または seconds 秒前の状態まで戻す（戻した数を返す）"""
+        moved = 0
+        if seconds is not None:
+            target = time.time() - seconds
+            while self.undo_stack and self.undo_stack[-1].time > target:
+                self.undo()
+                moved += 1
+            return moved
+        while moved < count and self.undo():
+            moved += 1
+        return moved
+
+    def later(self, count: int = 1, seconds: Optional[float] = None) -> int:
+        """count 回、または seconds 秒後の状態まで進める（進めた数を返す）"""
+        moved = 0
+        if seconds is not None:
+            if not self.redo_stack:
+                return 0
+            base = self.undo_stack[-1].time if self.undo_stack else self.redo_stack[-1].time
+            target = base + seconds
+            while self.redo_stack and self.redo_stack[-1].time <= target:
+                self.redo()
+                moved += 1
+            return moved
+        while moved < count and self.redo():
+            moved += 1
+        return moved
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
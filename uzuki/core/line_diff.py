@@ -0,0 +1,78 @@
+"""
+Line Diff
+
+行単位の差分と、差分だけをバッファに当てる処理。
+
+- 先頭と末尾の共通部分を除き、残りを difflib で比べる
+  （残りが大きすぎる場合は1つの置き換えにする）
+- 当てる処理は Buffer の insert_text / delete_text で行うので、
+  undo 履歴・検索や構文のキャッシュ・再描画範囲はそのまま更新される
+"""
+
+import difflib
+from typing import List, Sequence, Tuple
+
+# (old_start, old_end, new_start, new_end) の置き換え
+Hunk = Tuple[int, int, int, int]
+
+MAX_DIFF_LINES = 100_000  # 共通部分を除いた残りがこれより多ければ細かく比べない
+
+
+def diff_lines(old: Sequence[str], new: Sequence[str]) -> List[Hunk]:
+    """old を new にする置き換えの列（old の行番号順）"""
+    old_len = len(old)
+    new_len = len(new)
+    start = 0
+    for a, b in zip(old, new):
+        if a != b:
+            break
+        start += 1
+    old_end, new_end = old_len, new_len
+    while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    if start == old_end and start == new_end:
+        return []
+    if max(old_end - start, new_end - start) > MAX_DIFF_LINES:
+        return [(start, old_end, start, new_end)]
+
+    matcher = difflib.SequenceMatcher(None, old[start:old_end], new[start:new_end])
+    return [(i1 + start, i2 + start, j1 + start, j2 + start)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def apply_hunks(buffer, new: Sequence[str], hunks: List[Hunk]):
+    """差分をバッファに当てる（後ろの置き換えから当てて行番号がずれないようにする）"""
+    for old_start, old_end, new_start, new_end in reversed(hunks):
+        lines = buffer.lines
+        text = '\n'.join(new[new_start:new_end])
+        if old_end < len(lines):
+            # 後ろに行が残る場合は行頭から行頭までを置き換える
+            if old_end > old_start:
+                buffer.delete_text(old_start, 0, old_end, 0)
+            if new_end > new_start:
+                buffer.insert_text(old_start, 0, text + '\n')
+        elif old_start > 0:
+            # 末尾までの置き換えは前の行の行末から
+            row = old_start - 1
+            if old_end > old_start:
+                buffer.delete_text(row, len(lines[row]), old_end - 1, len(lines[old_end - 1]))
+            if new_end > new_start:
+                buffer.insert_text(row, len(lines[row]), '\n' + text)
+        else:
+            # 全体の置き換え
+            last = len(lines) - 1
+            buffer.delete_text(0, 0, last, len(lines[last]))
+            buffer.insert_text(0, 0, text)
+
+
+def adjust_row(row: int, hunks: List[Hunk]) -> int:
+    """差分を当てた後の行番号（置き換えられた行の中なら置き換え後の範囲に収める）"""
+    delta = 0
+    for old_start, old_end, new_start, new_end in hunks:
+        if row < old_start:
+            break
+        if row < old_end:
+            return new_start + min(row - old_start, max(0, new_end - new_start - 1))
+        delta = new_end - old_end
+    return row + delta
@@ -0,0 +1,161 @@
+"""
+Mapped File
+
+巨大ファイルを mmap し、改行オフセットのページ索引を作って
+表示に必要なページだけをデコードする遅延ローダー。
+ページのキャッシュはロックで守り、書き込みスレッドからも読めるようにする。
+"""
+
+import codecs
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+# 改行バイトが他の文字の一部に現れない（ページ単位で独立にデコードできる）エンコーディングのみ対象
+_STATEFUL_ENCODINGS = {'iso2022_jp', 'iso2022_jp_1', 'iso2022_jp_2', 'iso2022_jp_2004',
+                       'iso2022_jp_3', 'iso2022_jp_ext', 'iso2022_kr', 'utf_7'}
+
+
+def supports_lazy_decoding(encoding: str) -> bool:
+    """ページ単位の独立デコードが可能なエンコーディングかチェック"""
+    try:
+        name = codecs.lookup(encoding).name.replace('-', '_')
+    except LookupError:
+        return False
+    if name in _STATEFUL_ENCODINGS:
+        return False
+    try:
+        return '\n'.encode(encoding) == b'\n'
+    except UnicodeError:
+        return False
+
+
+class MappedLineSource:
+    """mmap したファイルの行をページ単位で遅延デコードするソース"""
+
+    PAGE_BYTES = 256 * 1024  # 1ページの目安バイト数（改行位置で区切る）
+    CACHE_PAGES = 64         # デコード済みページのLRU容量
+
+    def __init__(self, filepath: str, encoding: str, data_start: int = 0,
+                 page_bytes: Optional[int] = None, cache_pages: Optional[int] = None):
+        self.filepath = filepath
+        self.encoding = encoding
+        self.page_bytes = page_bytes or self.PAGE_BYTES
+        self.cache_pages = cache_pages or self.CACHE_PAGES
+        self._cache: "OrderedDict[int, List[str]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self._file = open(filepath, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data_start = data_start
+
+        self.page_starts: List[int] = []
+        self.page_lines: List[int] = []
+        self._build_index()
+
+    def _build_index(self):
+        """改行位置でページ境界を決め、ページごとの行数を数える"""
+        mm = self._mm
+        size = self.size
+        starts = [self.data_start]
+        pos = self.data_start
+        while pos + self.page_bytes < size:
+            newline = mm.find(b'\n', pos + self.page_bytes)
+            if newline == -1 or newline + 1 >= size:
+                break
+            pos = newline + 1
+            starts.append(pos)
+
+        # 行数は読み込みバッファ上で数える（マップ全体をRSSに載せない）
+        counts = []
+        buf = bytearray(self.page_bytes * 2)
+        view = memoryview(buf)
+        f = self._file
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else size
+            length = end - start
+            if length > len(buf):
+                buf = bytearray(length)
+                view = memoryview(buf)
+            f.seek(start)
+            read = f.readinto(view[:length])
+            counts.append(buf.count(b'\n', 0, read))
+        view.release()
+
+        # 最終行が改行で終わらない場合はその行も数える
+        if size > self.data_start and mm[size - 1:size] != b'\n':
+            counts[-1] += 1
+
+        self.page_starts = starts
+        self.page_lines = counts
+
+    @property
+    def line_count(self) -> int:
+        """総行数"""
+        return sum(self.page_lines)
+
+    @property
+    def page_count(self) -> int:
+        """ページ数"""
+        return len(self.page_starts)
+
+    def page_line_count(self, page: int) -> int:
+        """ページの行数"""
+        return self.page_lines[page]
+
+    def get_page(self, page: int) -> List[str]:
+        """ページの行を取得（LRUキャッシュ付き）"""
+        with self._cache_lock:
+            lines = self._cache.get(page)
+            if lines is not None:
+                self._cache.move_to_end(page)
+                return lines
+
+        lines = self._decode_page(page)
+        with self._cache_lock:
+            self._cache[page] = lines
+            if len(self._cache) > self.cache_pages:
+                self._cache.popitem(last=False)
+        return lines
+
+    def _decode_page(self, page: int) -> List[str]:
+        """ページをデコードして行に分割"""
+        start = self.page_starts[page]
+        end = self.page_starts[page + 1] if page + 1 < len(self.page_starts) else self.size
+        raw = self._mm[start:end]
+        expected = self.page_lines[page]
+
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        text = decoder.decode(raw, final=True)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n')
+        lines = text.split('\n')
+        if text.endswith('\n'):
+            lines.pop()
+
+        if len(lines) != expected:
+            # 不正バイトが改行を巻き込んだ場合は行ごとにデコードし直す
+            raw_lines = raw.split(b'\n')
+            if raw.endswith(b'\n'):
+                raw_lines.pop()
+            lines = []
+            for raw_line in raw_lines:
+                if raw_line.endswith(b'\r'):
+                    raw_line = raw_line[:-1]
+                lines.append(raw_line.decode(self.encoding, errors='replace'))
+        return lines
+
+    def sample(self, length: int = 64 * 1024) -> bytes:
+        """先頭のバイト列を取得（改行コード判定用）"""
+        return self._mm[self.data_start:self.data_start + length]
+
+    def close(self):
+        """マップとファイルを閉じる"""
+        self._cache.clear()
+        try:
+            self._mm.close()
+        finally:
+            self._file.close()
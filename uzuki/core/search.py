@@ -0,0 +1,257 @@
+"""
+Search Engine
+
+正規表現によるバッファ内検索。
+
+- コンパイル済みパターンを LRU でキャッシュする
+- 行ごとのマッチ位置をキャッシュし、Buffer の編集で変わった行だけ捨てる
+- 巨大なバッファではマッチ数をバックグラウンドのスレッドで数え、
+  途中経過を match_count に反映する
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+Span = Tuple[int, int]
+
+
+class SearchEngine:
+    """バッファ内の検索とマッチ位置のキャッシュ"""
+
+    PATTERN_CACHE_SIZE = 32   # 保持するコンパイル済みパターン数
+    LINE_CACHE_SIZE = 4096    # 保持する行ごとのマッチ結果の数
+    COUNT_SLICE = 4096        # バックグラウンドで1度に読む行数
+
+    def __init__(self, case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.pattern = ''                  # 現在の検索パターン（入力されたまま）
+        self.regex: Optional[Pattern] = None
+        self._patterns: "OrderedDict[Tuple[str, int], Pattern]" = OrderedDict()
+        self._line_matches: "OrderedDict[int, List[Span]]" = OrderedDict()
+        self._lines = None                 # キャッシュが対応する行ストア
+
+        # マッチ数（バックグラウンドで数える場合は途中経過）
+        self.match_count = 0
+        self.count_complete = False
+        self._generation = 0               # パターン変更・編集のたびに増える
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_generation = -1       # 実行中のスレッドが数えている世代
+
+    # --- パターン ---
+    def compile(self, pattern: str) -> Optional[Pattern]:
+        """パターンをコンパイル（正規表現として不正ならリテラルとして扱う）"""
+        if not pattern:
+            return None
+        flags = 0 if self.case_sensitive else re.IGNORECASE
+        key = (pattern, flags)
+        regex = self._patterns.get(key)
+        if regex is not None:
+            self._patterns.move_to_end(key)
+            return regex
+        try:
+            regex = re.compile(pattern, flags)
+        except re.error:
+            regex = re.compile(re.escape(pattern), flags)
+        self._patterns[key] = regex
+        if len(self._patterns) > self.PATTERN_CACHE_SIZE:
+            self._patterns.popitem(last=False)
+        return regex
+
+    def set_pattern(self, pattern: str) -> bool:
+        """検索パターンを設定（変わった場合は True）"""
+        regex = self.compile(pattern)
+        if pattern == self.pattern and regex is self.regex:
+            return False
+        with self._lock:
+            self._generation += 1
+            self.pattern = pattern
+            self.regex = regex
+            self._line_matches.clear()
+            self.match_count = 0
+            self.count_complete = False
+        return True
+
+    def set_case_sensitive(self, case_sensitive: bool):
+        """大文字小文字を区別するかを設定（パターンは再コンパイル）"""
+        if case_sensitive != self.case_sensitive:
+            self.case_sensitive = case_sensitive
+            pattern = self.pattern
+            self.pattern = None
+            self.set_pattern(pattern)
+
+    def clear(self):
+        """検索パターンを解除"""
+        self.set_pattern('')
+
+    # --- 編集の反映 ---
+    def attach(self, buffer):
+        """バッファの編集を監視する"""
+        buffer.add_edit_listener(self.on_edit)
+
+    def on_edit(self, kind: str, row: int, col: int, text: str):
+        """編集された行のキャッシュだけを捨て、以降の行番号をずらす（Buffer の編集リスナー）"""
+        newlines = text.count('\n')
+        with self._lock:
+            self._generation += 1  # 数え直しが必要
+            self.count_complete = False
+            cache = self._line_matches
+            if not cache:
+                return
+            if not newlines:
+                cache.pop(row, None)
+                return
+            # 挿入は row の1行が newlines+1 行に、削除は newlines+1 行が row の1行になる
+            old_end = row + 1 if kind == 'insert' else row + newlines + 1
+            delta = newlines if kind == 'insert' else -newlines
+            shifted = OrderedDict()
+            for line, spans in cache.items():
+                if line < row:
+                    shifted[line] = spans
+                elif line >= old_end:
+                    shifted[line + delta] = spans
+            self._line_matches = shifted
+
+    def _check_lines(self, lines):
+        """行ストアが差し替えられていたらキャッシュを捨てる"""
+        if lines is not self._lines:
+            with self._lock:
+                self._lines = lines
+                self._line_matches.clear()
+                self._generation += 1
+                self.count_complete = False
+
+    # --- マッチ位置 ---
+    def _spans(self, line: str) -> List[Span]:
+        return [match.span() for match in self.regex.finditer(line) if match.end() > match.start()]
+
+    def line_matches(self, lines, row: int) -> List[Span]:
+        """行のマッチ範囲 [(start, end), ...] を取得（キャッシュ付き）"""
+        if self.regex is None:
+            return []
+        self._check_lines(lines)
+        cache = self._line_matches
+        spans = cache.get(row)
+        if spans is not None:
+            cache.move_to_end(row)
+            return spans
+        spans = self._spans(lines[row])
+        cache[row] = spans
+        if len(cache) > self.LINE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return spans
+
+    def _iter_rows(self, lines, row: int, forward: bool) -> Iterator[Tuple[int, int, str]]:
+        """row から1周ぶん (step, 行番号, 行) を順に返す（行はまとめて読む）"""
+        total = len(lines)
+        block = self.COUNT_SLICE
+        step = 0
+        while step <= total:
+            if forward:
+                start = (row + step) % total
+                end = min(total, start + block, start + total + 1 - step)
+                chunk = lines[start:end]
+                for offset, line in enumerate(chunk):
+                    yield step + offset, start + offset, line
+            else:
+                end = (row - step) % total + 1
+                start = max(0, end - block, end - (total + 1 - step))
+                chunk = lines[start:end]
+                for offset in range(len(chunk) - 1, -1, -1):
+                    yield step + (len(chunk) - 1 - offset), start + offset, chunk[offset]
+            step += len(chunk)
+
+    def find(self, lines, row: int, col: int, forward: bool = True,
+             timeout: Optional[float] = None) -> Optional[Tuple[int, int, bool]]:
+        """(row, col) の次（前）のマッチ位置を探す
+
+        (行, 列, 折り返したか) を返す。timeout 秒を過ぎたら見つからなかったものとする
+        """
+        regex = self.regex
+        if regex is None:
+            return None
+        total = len(lines)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for step, index, line in self._iter_rows(lines, row, forward):
+            if deadline is not None and not step & 0xff and time.monotonic() > deadline:
+                return None
+            if regex.search(line) is None:
+                continue
+            starts = [match.start() for match in regex.finditer(line) if match.end() > match.start()]
+            if step == 0:
+                # カーソル位置より後（前）のマッチだけ
+                starts = [start for start in starts if (start > col if forward else start < col)]
+            elif step == total:
+                # 1周して元の行に戻った
+                starts = [start for start in starts if (start <= col if forward else start >= col)]
+            if starts:
+                wrapped = index < row if forward else index > row
+                if step == total:
+                    wrapped = True
+                return index, starts[0] if forward else starts[-1], wrapped
+        return None
+
+    # --- マッチ数 ---
+    def count(self, lines, background: bool = False):
+        """マッチ数を数える（background なら別スレッドで数え、途中経過を反映）"""
+        self._check_lines(lines)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self.match_count = 0
+            self.count_complete = False
+        if self.regex is None:
+            self.count_complete = True
+            return
+        if background:
+            self._worker_generation = generation
+            self._worker = threading.Thread(target=self._count_worker, args=(lines, generation),
+                                            name='uzuki-search', daemon=True)
+            self._worker.start()
+        else:
+            self._count_worker(lines, generation)
+
+    def _count_worker(self, lines, generation: int):
+        regex = self.regex
+        position = 0
+        try:
+            while True:
+                if generation != self._generation:
+                    return
+                chunk = lines[position:position + self.COUNT_SLICE]
+                if not chunk:
+                    break
+                found = 0
+                for line in chunk:
+                    for match in regex.finditer(line):
+                        if match.end() > match.start():
+                            found += 1
+                position += len(chunk)
+                with self._lock:
+                    if generation != self._generation:
+                        return
+                    self.match_count += found
+        except (IndexError, ValueError):
+            # 数えている途中でバッファが変更された（世代が変わっているので結果は捨てる）
+            return
+        with self._lock:
+            if generation == self._generation:
+                self.count_complete = True
+
+    def is_counted(self, lines) -> bool:
+        """lines のマッチ数を数え終わっているか"""
+        return self.count_complete and lines is self._lines
+
+    def is_counting(self) -> bool:
+        """バックグラウンドで数えている途中か"""
+        worker = self._worker
+        return (worker is not None and worker.is_alive()
+                and self._worker_generation == self._generation and not self.count_complete)
+
+    def cancel(self):
+        """バックグラウンドの集計を止める"""
+        with self._lock:
+            self._generation += 1
@@ -0,0 +1,146 @@
+"""
+Session
+
+開いているバッファの一覧を保存・復元するセッションファイル。
+
+- バッファごとにパス・エンコーディング・カーソルとスクロール位置・保存時のファイルの
+  (更新時刻, サイズ)、必要なら undo 履歴を持つ。行の内容は持たない
+- 形式は版付きの dict を marshal で書いたもの（読み込みが速く、版が違えば読まない）
+- 復元したバッファは手放したバッファ（BufferEntry.evicted）として一覧に加えるだけで、
+  最初に表示したときにファイルから読む。ファイルが保存時から変わっていなければ記録した
+  エンコーディングを判定の代わりに使い、変わっていれば判定し直して undo 履歴は捨てる
+  （FileController._reload）
+- undo 履歴は変更のないバッファのものだけを書く（変更があると内容がファイルと合わない）。
+  バッファごとに marshal したバイト列にしておき、表示するまで Change には戻さない
+"""
+
+import marshal
+import os
+from collections import deque
+from typing import List, Optional, Tuple
+
+from uzuki.core.buffer_list import BufferEntry, BufferList
+from uzuki.core.file_manager import FileManager
+from uzuki.core.history import Change
+
+FORMAT_VERSION = 1
+
+
+def pack_history(state) -> Optional[bytes]:
+    """History.get_state() の値をセッションに書くバイト列にする"""
+    if state is None:
+        return None
+    if isinstance(state, SavedHistory):
+        return state.data  # 一度も表示していないバッファの履歴はそのまま書く
+    undo_stack, redo_stack, size = state
+
+    def pack(changes):
+        return [(change.ops, change.time, change.size) for change in changes]
+    return marshal.dumps((pack(undo_stack), pack(redo_stack), size))
+
+
+def unpack_history(data: bytes):
+    """pack_history() のバイト列を History.get_state() の形に戻す"""
+    undo_data, redo_data, size = marshal.loads(data)
+
+    def unpack(items):
+        changes = []
+        for ops, timestamp, change_size in items:
+            change = Change()
+            change.ops = [list(op) for op in ops]
+            change.time = timestamp
+            change.size = change_size
+            changes.append(change)
+        return changes
+    return deque(unpack(undo_data)), unpack(redo_data), size
+
+
+class SavedHistory:
+    """セッションから読んだ undo 履歴（バッファを表示するまで Change に戻さない）
+
+    History.set_state() が (undo, redo, サイズ) として展開したときに初めて戻す
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def __iter__(self):
+        return iter(unpack_history(self.data))
+
+
+class BufferState:
+    """セッションに記録する1つのバッファ"""
+
+    __slots__ = ('path', 'encoding', 'cursor', 'scroll', 'stat', 'history')
+
+    def __init__(self, path: str, encoding: str, cursor: Tuple[int, int] = (0, 0),
+                 scroll: Tuple[int, int, int] = (0, 0, 0), stat: Optional[Tuple[int, int]] = None,
+                 history: Optional[tuple] = None):
+        self.path = path
+        self.encoding = encoding
+        self.cursor = cursor
+        self.scroll = scroll      # (scroll_y, scroll_x, wrap_skip)
+        self.stat = stat          # 保存時のファイルの (更新時刻, サイズ)
+        self.history = history    # pack_history() のバイト列
+
+    def to_tuple(self) -> tuple:
+        return self.path, self.encoding, self.cursor, self.scroll, self.stat, self.history
+
+
+class Session:
+    """バッファの一覧と表示中のバッファ"""
+
+    def __init__(self, buffers: Optional[List[BufferState]] = None, current: int = 0, alternate: int = -1):
+        self.buffers: List[BufferState] = buffers or []
+        self.current = current      # 表示中のバッファの位置
+        self.alternate = alternate  # 直前に表示していたバッファの位置（なければ -1）
+
+    # --- 保存・読み込み ---
+    def save(self, path: str):
+        """セッションファイルに書く（一時ファイルに書いてから置き換える）"""
+        data = marshal.dumps({
+            'version': FORMAT_VERSION,
+            'current': self.current,
+            'alternate': self.alternate,
+            'buffers': [state.to_tuple() for state in self.buffers],
+        })
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Session':
+        """セッションファイルを読む（形式や版が違えば ValueError）"""
+        with open(path, 'rb') as f:
+            try:
+                data = marshal.loads(f.read())
+            except (EOFError, ValueError, TypeError):
+                raise ValueError(f"Not a session file: {path}")
+        if not isinstance(data, dict) or data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported session file: {path}")
+        buffers = [BufferState(*item) for item in data['buffers']]
+        return cls(buffers, data['current'], data['alternate'])
+
+    # --- 復元 ---
+    def add_to(self, buffers: BufferList) -> List[BufferEntry]:
+        """バッファを読み込まずに（手放した状態で）一覧に加える。一覧に同じファイルがあればそれを使う"""
+        entries = []
+        for state in self.buffers:
+            entry = buffers.find(state.path)
+            if entry is None:
+                file_manager = FileManager()
+                file_manager.filename = state.path
+                file_manager.encoding = state.encoding
+                entry = buffers.add(file_manager)
+                entry.evicted = True
+                entry.stat = state.stat
+                entry.cursor = tuple(state.cursor)
+                entry.scroll = tuple(state.scroll)
+                entry.history = SavedHistory(state.history) if state.history is not None else None
+            entries.append(entry)
+        return entries
@@ -0,0 +1,177 @@
+"""
+Stream Decoder
+
+候補エンコーディングのインクリメンタルデコーダを並行に走らせ、
+1回の読み込みでエンコーディング判定と行分割を行う。
+"""
+
+import codecs
+from typing import BinaryIO, Callable, Iterable, List, Optional, Tuple
+
+READ_SIZE = 256 * 1024  # 1回の読み込みバイト数
+
+# BOM とそのエンコーディング（長いものから判定）
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+
+def detect_bom(head: bytes) -> Optional[str]:
+    """先頭バイト列の BOM からエンコーディングを判定"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+class LineSplitter:
+    """デコード済みテキストを受け取りながら行に分割する（\\n / \\r\\n / \\r）"""
+
+    def __init__(self, lines: Optional[List[str]] = None):
+        self.lines: List[str] = lines if lines is not None else []
+        self.has_crlf = False
+        self.has_cr = False
+        self._partial: List[str] = []  # 改行待ちの行断片
+        self._pending_cr = False       # 直前のチャンクが \r で終わった
+
+    def feed(self, text: str):
+        """テキスト断片を追加"""
+        if self._pending_cr:
+            text = '\r' + text
+            self._pending_cr = False
+        if text.endswith('\r'):
+            # 次のチャンクの \n と組になる可能性があるので保留
+            text = text[:-1]
+            self._pending_cr = True
+        if '\r' in text:
+            if '\r\n' in text:
+                self.has_crlf = True
+                text = text.replace('\r\n', '\n')
+            if '\r' in text:
+                self.has_cr = True
+                text = text.replace('\r', '\n')
+        if '\n' not in text:
+            if text:
+                self._partial.append(text)
+            return
+
+        parts = text.split('\n')
+        if self._partial:
+            self._partial.append(parts[0])
+            parts[0] = ''.join(self._partial)
+            self._partial = []
+        tail = parts.pop()
+        if tail:
+            self._partial.append(tail)
+        self.lines.extend(parts)
+
+    def close(self) -> List[str]:
+        """残りを確定して行リストを返す（末尾の改行は空行を作らない）"""
+        if self._pending_cr:
+            self._pending_cr = False
+            self.has_cr = True
+            self.lines.append(''.join(self._partial))
+            self._partial = []
+        elif self._partial:
+            self.lines.append(''.join(self._partial))
+            self._partial = []
+        return self.lines
+
+    @property
+    def line_ending(self) -> str:
+        """検出した改行コード"""
+        if self.has_crlf:
+            return '\r\n'
+        if self.has_cr:
+            return '\r'
+        return '\n'
+
+
+def _start_decoders(encodings: Iterable[str]) -> List[list]:
+    """[エンコーディング, デコーダ, デコード済み断片] のリストを作成"""
+    return [[encoding, codecs.getincrementaldecoder(encoding)(), []] for encoding in encodings]
+
+
+def _feed_all(candidates: List[list], chunk: bytes, final: bool = False) -> List[list]:
+    """全候補にチャンクを与え、失敗した候補を落とす"""
+    survivors = []
+    for candidate in candidates:
+        try:
+            candidate[2].append(candidate[1].decode(chunk, final))
+        except UnicodeError:
+            continue
+        survivors.append(candidate)
+    return survivors
+
+
+def detect_stream_encoding(f: BinaryIO, encodings: Iterable[str],
+                           sample_size: Optional[int] = None) -> Optional[str]:
+    """先頭 sample_size バイト（None なら全体）をデコードできる最初の候補を返す"""
+    candidates = _start_decoders(encodings)
+    read = 0
+    while candidates and (sample_size is None or read < sample_size):
+        chunk = f.read(READ_SIZE)
+        if not chunk:
+            candidates = _feed_all(candidates, b'', final=True)
+            break
+        read += len(chunk)
+        candidates = _feed_all(candidates, chunk)
+        for candidate in candidates:
+            candidate[2].clear()  # 判定のみなのでデコード結果は保持しない
+    return candidates[0][0] if candidates else None
+
+
+def decode_lines(f: BinaryIO, encodings: Iterable[str], sample_size: int,
+                 progress: Optional[Callable[[Optional[List[str]], int], None]] = None,
+                 store: Callable[[], List[str]] = list) -> Tuple[str, LineSplitter]:
+    """エンコーディングを判定しながら行に分割する
+
+    先頭 sample_size バイトは全候補を並行にデコードし、残った最初の候補で
+    続きをストリーム処理する。後半で失敗した場合のみ次の候補で読み直す。
+    progress(行リスト, 読んだ位置) はチャンクを読むたびに呼ばれる（判定中の行リストは None、
+    読み直すと別の行リストになる）。例外を投げると読み込みを中断する。
+    行リストは store() で作る
+    """
+    start = f.tell()
+    remaining = list(encodings)
+    while remaining:
+        f.seek(start)
+        candidates = _start_decoders(remaining)
+        read = 0
+        while len(candidates) > 1 and read < sample_size:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                break
+            read += len(chunk)
+            candidates = _feed_all(candidates, chunk)
+            if progress is not None:
+                progress(None, f.tell())
+        if not candidates:
+            break
+
+        encoding, decoder, decoded = candidates[0]
+        remaining = [candidate[0] for candidate in candidates[1:]]
+        del candidates
+        splitter = LineSplitter(store())
+        for text in decoded:
+            splitter.feed(text)
+        del decoded
+        try:
+            while True:
+                if progress is not None:
+                    progress(splitter.lines, f.tell())
+                chunk = f.read(READ_SIZE)
+                if not chunk:
+                    break
+                splitter.feed(decoder.decode(chunk))
+            splitter.feed(decoder.decode(b'', True))
+        except UnicodeError:
+            continue
+        splitter.close()
+        return encoding, splitter
+
+    raise UnicodeError("No candidate encoding could decode the file")
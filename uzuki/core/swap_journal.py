@@ -0,0 +1,231 @@
+"""
+Swap Journal
+
+バッファの保存していない編集を追記していくスワップファイル（クラッシュからの復旧用）。
+
+- 編集（挿入・削除）を小さなバイナリレコードにしてメモリに溜め、flush() で
+  ファイルの末尾に追記する。書く量は編集の大きさだけで、ファイルの大きさによらない
+- 続けて打った文字や BackSpace・Delete の繰り返しは、溜めている間に1つのレコードにまとめる
+- ジャーナルが伸びてファイルの大きさの2倍を超えたら、バッファ全体を1つのレコードにした
+  ジャーナルに書き直す（compact）
+- ヘッダーにはファイルのパス、書き始めたときのファイルの (更新時刻, サイズ)、
+  プロセス ID を持つ。復旧時にはディスク上のファイルに記録を順に当て直す
+- 書きかけで途切れた末尾のレコードは読み飛ばす
+- flush() は OS に渡すまで（fsync はしない）。エディタや端末が落ちても残る
+"""
+
+import hashlib
+import os
+import struct
+from typing import List, Optional, Tuple
+
+from uzuki.core.buffer import Buffer
+from uzuki.core.text_store import ListLineStore
+
+MAGIC = b'UZSWAP'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<6sBIqqI')  # magic, version, pid, 更新時刻, サイズ, パスのバイト数
+RECORD = struct.Struct('<BIII')     # 種類, 行, 桁, テキストのバイト数
+
+# レコードの種類
+INSERT = 1
+DELETE = 2
+CONTENT = 3  # バッファ全体（compact で書く）
+
+# (種類, 行, 桁, テキスト)
+Record = Tuple[int, int, int, str]
+
+
+def _encode(text: str) -> bytes:
+    return text.encode('utf-8', 'surrogatepass')
+
+
+def _decode(data: bytes) -> str:
+    return data.decode('utf-8', 'surrogatepass')
+
+
+def journal_path(filepath: str, directory: str) -> str:
+    """ファイルのスワップファイルのパス（ディレクトリ内でパスのハッシュを名前にする）"""
+    filepath = os.path.abspath(filepath)
+    digest = hashlib.sha1(filepath.encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+    return os.path.join(directory, f"{os.path.basename(filepath)}.{digest}.swp")
+
+
+class SwapJournal:
+    """1つのバッファのスワップファイル"""
+
+    COMPACT_MIN_BYTES = 1024 * 1024  # これより小さいうちは書き直さない
+
+    def __init__(self, path: str, filepath: str, base_stat: Optional[Tuple[int, int]]):
+        self.path = path
+        self.filepath = os.path.abspath(filepath)
+        self.base_stat = base_stat  # 記録を当てるディスク上のファイルの (更新時刻, サイズ)
+        self.size = 0               # ファイルに書いたバイト数
+        self._pending: List[list] = []  # flush() していないレコード [種類, 行, 桁, テキスト]
+        self._file = None
+        self._compact_at = self.COMPACT_MIN_BYTES
+
+    # --- 書き込み ---
+    def start(self, lines=None):
+        """ヘッダーだけのジャーナルを作る（lines を指定するとその内容から始める）"""
+        self._pending.clear()
+        self._write_new(lines)
+
+    def record(self, kind: str, row: int, col: int, text: str):
+        """編集を1つ記録（Buffer の編集リスナーの形式。続けて打った文字などはまとめる）"""
+        pending = self._pending
+        last = pending[-1] if pending else None
+        if kind == 'insert':
+            if last is not None and last[0] == INSERT and Buffer.text_end(last[1], last[2], last[3]) == (row, col):
+                last[3] += text
+                return
+            pending.append([INSERT, row, col, text])
+        else:
+            if last is not None and last[0] == DELETE:
+                if (last[1], last[2]) == (row, col):
+                    last[3] += text  # Delete の繰り返し
+                    return
+                if Buffer.text_end(row, col, text) == (last[1], last[2]):
+                    last[1], last[2], last[3] = row, col, text + last[3]  # BackSpace の繰り返し
+                    return
+            pending.append([DELETE, row, col, text])
+
+    def flush(self) -> int:
+        """溜めた記録を追記し、書いたバイト数を返す"""
+        if not self._pending:
+            return 0
+        chunks = []
+        for kind, row, col, text in self._pending:
+            data = _encode(text)
+            chunks.append(RECORD.pack(kind, row, col, len(data)))
+            chunks.append(data)
+        self._pending.clear()
+        data = b''.join(chunks)
+        self._file.write(data)
+        self._file.flush()
+        self.size += len(data)
+        return len(data)
+
+    def needs_compaction(self) -> bool:
+        """書き直した方がよいほど伸びたか"""
+        return self.size > self._compact_at
+
+    def compact(self, lines):
+        """バッファ全体を1つのレコードにしたジャーナルに書き直す"""
+        self._pending.clear()
+        self._write_new(lines)
+
+    def _write_new(self, lines):
+        """ジャーナルを作り直す（一時ファイルに書いてから置き換える）"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        path = os.fsencode(self.filepath)
+        mtime, size = self.base_stat or (0, -1)
+        data = [HEADER.pack(MAGIC, FORMAT_VERSION, os.getpid(), mtime, size, len(path)), path]
+        if lines is not None:
+            content = _encode('\n'.join(lines))
+            data.append(RECORD.pack(CONTENT, 0, 0, len(content)))
+            data.append(content)
+        data = b''.join(data)
+
+        temp_path = self.path + '.tmp'
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, 'ab')
+        self.size = len(data)
+        # 書き直しはバッファ（ヘッダーだけなら元のファイル）の大きさの2倍まで伸びてから
+        content_size = self.size if lines is not None else max(size, 0)
+        self._compact_at = max(self.COMPACT_MIN_BYTES, 2 * content_size)
+
+    def close(self, remove: bool = True):
+        """ジャーナルを閉じる（remove なら削除する）"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._pending.clear()
+        if remove:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class SwapFile:
+    """読み込んだスワップファイル（復旧用）"""
+
+    def __init__(self, path: str, pid: int, filepath: str,
+                 base_stat: Optional[Tuple[int, int]], records: List[Record]):
+        self.path = path
+        self.pid = pid
+        self.filepath = filepath
+        self.base_stat = base_stat
+        self.records = records
+
+    @classmethod
+    def read(cls, path: str) -> Optional['SwapFile']:
+        """スワップファイルを読む（読めない・形式が違えば None。途切れた末尾のレコードは捨てる）"""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, pid, mtime, size, path_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+        offset = HEADER.size
+        filepath = os.fsdecode(data[offset:offset + path_len])
+        offset += path_len
+        records = []
+        while offset + RECORD.size <= len(data):
+            kind, row, col, length = RECORD.unpack_from(data, offset)
+            end = offset + RECORD.size + length
+            if end > len(data) or kind not in (INSERT, DELETE, CONTENT):
+                break
+            try:
+                text = _decode(data[offset + RECORD.size:end])
+            except UnicodeDecodeError:
+                break
+            records.append((kind, row, col, text))
+            offset = end
+        base_stat = (mtime, size) if size >= 0 else None
+        return cls(path, pid, filepath, base_stat, records)
+
+    def is_owner_alive(self) -> bool:
+        """書いたプロセスがまだ動いているか（自分と同じ ID なら以前の自分なので動いていない）"""
+        if self.pid == os.getpid():
+            return False
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+        return True
+
+    def replay(self, lines) -> List[str]:
+        """lines に記録を順に当てた結果の行（記録がファイルに合わなければ ValueError）"""
+        buffer = Buffer(ListLineStore)
+        buffer.lines = ListLineStore(lines)
+        for kind, row, col, text in self.records:
+            if kind == CONTENT:
+                buffer.lines = ListLineStore(text.split('\n'))
+                continue
+            if not 0 <= row < len(buffer.lines) or col > len(buffer.lines[row]):
+                raise ValueError(f"edit at line {row + 1} is outside the file")
+            if kind == INSERT:
+                buffer.insert_text(row, col, text)
+            else:
+                end_row, end_col = Buffer.text_end(row, col, text)
+                if end_row >= len(buffer.lines) or buffer.get_text(row, col, end_row, end_col) != text:
+                    raise ValueError(f"deleted text at line {row + 1} does not match the file")
+                buffer.delete_text(row, col, end_row, end_col)
+        return list(buffer.lines)
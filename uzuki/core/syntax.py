@@ -0,0 +1,312 @@
+"""
+Syntax Highlighting
+
+行単位の字句解析による構文ハイライト。
+
+- 字句解析器（Lexer）は1行と開始状態を受け取り、トークンと終了状態を返す
+- SyntaxHighlighter は行ごとの終了状態をキャッシュし、編集された行から
+  状態が編集前と一致する（収束する）ところまでだけ解析し直す
+- トークンは表示する行を問い合わせられたときだけ求め、(開始状態, 行) をキーに
+  LRU でキャッシュする
+"""
+
+import builtins
+import keyword
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple, Type
+
+# (開始列, 終了列, 種類)
+Token = Tuple[int, int, str]
+
+
+class Lexer:
+    """字句解析器の基底クラス（状態を持たないプレーンテキスト）"""
+
+    name = 'text'
+    initial_state: Hashable = None
+
+    def tokenize(self, line: str, state: Hashable) -> Tuple[List[Token], Hashable]:
+        """1行を解析して (トークン, 終了状態) を返す"""
+        return [], state
+
+    def end_state(self, line: str, state: Hashable) -> Hashable:
+        """行の終了状態だけを求める（サブクラスで高速化できる）"""
+        return self.tokenize(line, state)[1]
+
+
+class PythonLexer(Lexer):
+    """Python の字句解析器（状態は三重引用符の文字列の中かどうか）"""
+
+    name = 'python'
+
+    KEYWORDS = frozenset(keyword.kwlist) - {'True', 'False', 'None'}
+    CONSTANTS = frozenset(('True', 'False', 'None', 'self', 'cls'))
+    BUILTINS = frozenset(name for name in dir(builtins) if not name.startswith('_'))
+
+    TOKEN_RE = re.compile(r"""
+        (?P<comment>\#.*)
+      | (?P<string>(?<!\w)[rRbBuUfF]{0,2}(?P<quote>'''|\"\"\"|'|\"))
+      | (?P<number>(?<![\w.])(?:0[xX][0-9a-fA-F_]+|0[bB][01_]+|0[oO][0-7_]+
+                   |(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?[jJ]?))
+      | (?P<decorator>@[^\W\d][\w.]*)
+      | (?P<name>[^\W\d]\w*)
+    """, re.VERBOSE)
+
+    def tokenize(self, line: str, state: Hashable) -> Tuple[List[Token], Hashable]:
+        tokens: List[Token] = []
+        pos = 0
+        if state is not None:
+            # 前の行から続く三重引用符の文字列
+            end = self._find_close(line, 0, state)
+            if end < 0:
+                if line:
+                    tokens.append((0, len(line), 'string'))
+                return tokens, state
+            tokens.append((0, end, 'string'))
+            pos = end
+
+        previous = None  # 直前のキーワード（def / class の後の名前用）
+        search = self.TOKEN_RE.search
+        while True:
+            match = search(line, pos)
+            if match is None:
+                break
+            kind = match.lastgroup
+            start = match.start()
+            if kind == 'string':
+                quote = match.group('quote')
+                end = self._find_close(line, match.end(), quote)
+                if end < 0:
+                    tokens.append((start, len(line), 'string'))
+                    if len(quote) == 3:
+                        return tokens, quote
+                    break
+                tokens.append((start, end, 'string'))
+                pos = end
+                previous = None
+                continue
+
+            end = match.end()
+            pos = end
+            if kind == 'name':
+                word = match.group()
+                if previous == 'def':
+                    kind = 'function'
+                elif previous == 'class':
+                    kind = 'class'
+                elif word in self.KEYWORDS:
+                    kind = 'keyword'
+                elif word in self.CONSTANTS:
+                    kind = 'constant'
+                elif word in self.BUILTINS:
+                    kind = 'builtin'
+                else:
+                    previous = None
+                    continue
+                previous = word if kind == 'keyword' else None
+            elif kind == 'decorator' and line[:start].strip():
+                # 行頭以外の @ は演算子
+                pos = start + 1
+                continue
+            tokens.append((start, end, kind))
+        return tokens, None
+
+    def end_state(self, line: str, state: Hashable) -> Hashable:
+        # 三重引用符を含まない行は状態を変えない
+        if state is None:
+            if '"""' not in line and "'''" not in line:
+                return None
+        elif state not in line:
+            return state
+        return self.tokenize(line, state)[1]
+
+    @staticmethod
+    def _find_close(line: str, pos: int, quote: str) -> int:
+        """閉じ引用符の直後の位置（見つからなければ -1）"""
+        while True:
+            index = line.find(quote, pos)
+            if index < 0:
+                return -1
+            # 直前のバックスラッシュが奇数個ならエスケープされている
+            backslashes = 0
+            while index - backslashes > 0 and line[index - backslashes - 1] == '\\':
+                backslashes += 1
+            if backslashes % 2 == 0:
+                return index + len(quote)
+            pos = index + 1
+
+
+# 拡張子 -> 字句解析器
+LEXERS: Dict[str, Type[Lexer]] = {
+    '.py': PythonLexer,
+    '.pyw': PythonLexer,
+    '.pyi': PythonLexer,
+}
+
+
+def register_lexer(extensions, lexer_class: Type[Lexer]):
+    """拡張子に字句解析器を登録"""
+    for extension in extensions:
+        LEXERS[extension.lower()] = lexer_class
+
+
+def get_lexer_for_filename(filename: Optional[str]) -> Optional[Lexer]:
+    """ファイル名から字句解析器を選ぶ（対応していなければ None）"""
+    if not filename:
+        return None
+    lexer_class = LEXERS.get(os.path.splitext(filename)[1].lower())
+    return lexer_class() if lexer_class else None
+
+
+class SyntaxHighlighter:
+    """行ごとの字句解析状態をキャッシュする構文ハイライト"""
+
+    TOKEN_CACHE_SIZE = 4096  # 保持する行ごとのトークン列の数
+    READ_BLOCK = 1024        # 状態を進めるときに1度に読む行数
+
+    def __init__(self):
+        self.lexer: Optional[Lexer] = None
+        self._states: List[Hashable] = []  # 行ごとの終了状態
+        self._valid = 0                    # [0, _valid) 行の終了状態は確定している
+        self._dirty_last: Optional[int] = None  # 最後に編集された行（ここ以降で収束を判定）
+        self._stale_from: Optional[int] = None  # 途中で解析をやめた行（ここ以降は更に前の編集前の状態）
+        self._changed_from: Optional[int] = None  # 開始状態が編集前から変わった最初の行
+        self._tokens: "OrderedDict[Tuple[Hashable, str], List[Token]]" = OrderedDict()
+        self._lines = None                 # キャッシュが対応する行ストア
+
+    def set_lexer(self, lexer: Optional[Lexer]):
+        """字句解析器を設定（キャッシュは捨てる）"""
+        self.lexer = lexer
+        self._reset()
+
+    def set_filename(self, filename: Optional[str]):
+        """ファイル名に応じて字句解析器を切り替える"""
+        lexer = get_lexer_for_filename(filename)
+        if type(lexer) is not type(self.lexer):
+            self.set_lexer(lexer)
+
+    def _reset(self):
+        self._states = []
+        self._valid = 0
+        self._dirty_last = None
+        self._stale_from = None
+        self._changed_from = None
+        self._tokens.clear()
+
+    def get_state(self):
+        """解析状態を取り出す（バッファ切り替え時に退避する）"""
+        return self.lexer, self._lines, self._states, self._valid, self._dirty_last, self._stale_from
+
+    def set_state(self, state):
+        """get_state() で取り出した解析状態に戻す（トークンのキャッシュは内容をキーにするので共有する）"""
+        self.lexer, self._lines, self._states, self._valid, self._dirty_last, self._stale_from = state
+        self._changed_from = None
+
+    # --- 編集の反映 ---
+    def attach(self, buffer):
+        """バッファの編集を監視する"""
+        buffer.add_edit_listener(self.on_edit)
+
+    def on_edit(self, kind: str, row: int, col: int, text: str):
+        """編集された行以降を未確定にし、編集前の状態を行番号をずらして残す（Buffer の編集リスナー）"""
+        if self.lexer is None:
+            return
+        newlines = text.count('\n')
+        states = self._states
+        if newlines and row < len(states):
+            if kind == 'insert':
+                # row 行目の末尾は row + newlines 行目に移る
+                states[row:row] = [None] * newlines
+            else:
+                del states[row:row + newlines]
+        delta = newlines if kind == 'insert' else -newlines
+        last = row + newlines if kind == 'insert' else row
+        if self._dirty_last is not None:
+            previous = self._dirty_last
+            if previous > row:
+                previous = max(row, previous + delta)
+            last = max(last, previous)
+        self._dirty_last = last
+        if self._stale_from is not None and self._stale_from > row:
+            self._stale_from = max(row, self._stale_from + delta)
+        self._valid = min(self._valid, row, len(states))
+
+    def _check_lines(self, lines):
+        """行ストアが差し替えられていたらキャッシュを捨てる"""
+        if lines is not self._lines:
+            self._lines = lines
+            self._reset()
+        elif len(self._states) > len(lines):
+            del self._states[len(lines):]
+            self._valid = min(self._valid, len(lines))
+
+    def _advance(self, lines, row: int):
+        """row 行目の開始状態が求まるまで終了状態を確定させる"""
+        lexer = self.lexer
+        states = self._states
+        k = self._valid
+        state = states[k - 1] if k else lexer.initial_state
+        while k < row:
+            block = lines[k:min(row, k + self.READ_BLOCK)]
+            if not block:
+                break
+            for line in block:
+                state = lexer.end_state(line, state)
+                if k < len(states):
+                    if self._dirty_last is not None and k >= self._dirty_last:
+                        if states[k] == state and (self._stale_from is None or k >= self._stale_from):
+                            # 編集前と同じ状態に戻った: 以降は解析し直さなくてよい
+                            self._valid = len(states)
+                            self._dirty_last = None
+                            self._stale_from = None
+                            if self._valid >= row:
+                                return
+                            self._advance(lines, row)
+                            return
+                        if self._changed_from is None or k + 1 < self._changed_from:
+                            self._changed_from = k + 1
+                    states[k] = state
+                else:
+                    states.append(state)
+                k += 1
+                self._valid = k
+        if self._dirty_last is not None and k < len(states):
+            # 収束する前に止めた: k 行目以降は更に前の内容から求めた状態なので、
+            # 後で解析し直すときは k 行目以降でだけ収束を判定する
+            self._stale_from = max(k, self._stale_from or 0)
+
+    def prepare(self, lines, end_row: int) -> Optional[int]:
+        """end_row 行目までの状態を確定させ、見た目が変わりうる最初の行を返す
+
+        編集で後続行の開始状態が変わった場合（三重引用符の開閉など）に、
+        その行から再描画が必要になる
+        """
+        if self.lexer is None:
+            return None
+        self._check_lines(lines)
+        self._advance(lines, min(end_row, len(lines)))
+        changed, self._changed_from = self._changed_from, None
+        return changed
+
+    def line_tokens(self, lines, row: int) -> List[Token]:
+        """行のトークン列を取得（キャッシュ付き）"""
+        lexer = self.lexer
+        if lexer is None:
+            return []
+        self._check_lines(lines)
+        self._advance(lines, row)
+        state = self._states[row - 1] if row else lexer.initial_state
+        line = lines[row]
+        key = (state, line)
+        cache = self._tokens
+        tokens = cache.get(key)
+        if tokens is not None:
+            cache.move_to_end(key)
+            return tokens
+        tokens = lexer.tokenize(line, state)[0]
+        cache[key] = tokens
+        if len(cache) > self.TOKEN_CACHE_SIZE:
+            cache.popitem(last=False)
+        return tokens
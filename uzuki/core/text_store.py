@@ -0,0 +1,286 @@
+"""
+Text Store
+
+Buffer の行データを保持するストア実装。
+
+- ListLineStore: 従来どおりの list[str]（小さなファイル向け）
+- ChunkedLineStore: 行をチャンクに分割し、チャンク行数を Fenwick 木で管理する
+  ロープ状のストア。行の挿入・削除・参照が O(log n) + O(チャンクサイズ) で済む。
+  チャンクは MappedLineSource のページ番号でもよく、書き込み時に初めて実体化する。
+  snapshot() はチャンクを共有した読み取り用の複製を O(チャンク数) で作り、
+  共有中のチャンクは書き込み時にコピーする（バックグラウンドの保存用）
+"""
+
+from collections.abc import MutableSequence
+from typing import Iterable, Iterator, List, Tuple, Union
+
+
+class ListLineStore(list):
+    """list[str] そのままの行ストア"""
+
+    def insert_lines(self, index: int, lines: Iterable[str]):
+        """index の位置に複数行を挿入"""
+        self[index:index] = list(lines)
+
+    def delete_lines(self, start: int, end: int):
+        """[start, end) の行を削除"""
+        del self[start:end]
+
+    def snapshot(self) -> 'ListLineStore':
+        """現在の内容の複製（行の参照をコピーする）"""
+        return ListLineStore(self)
+
+
+class ChunkedLineStore(MutableSequence):
+    """チャンク分割された行ストア（リストのリスト + Fenwick 木）"""
+
+    CHUNK_SIZE = 512  # チャンク分割時の目標行数
+    CHUNK_MAX = 1024  # これを超えたら分割
+
+    def __init__(self, lines: Iterable[str] = ()):
+        lines = list(lines)
+        size = self.CHUNK_SIZE
+        # 各チャンクは行リスト、または遅延ソースのページ番号(int)
+        self._chunks: List[Union[List[str], int]] = [lines[i:i + size] for i in range(0, len(lines), size)]
+        self._len = len(lines)
+        self._source = None
+        self._shared: set = set()  # スナップショットと共有しているチャンクの id
+        self._rebuild_index()
+
+    @classmethod
+    def from_source(cls, source) -> 'ChunkedLineStore':
+        """MappedLineSource から遅延ストアを作成（ページはアクセス時にデコード）"""
+        store = cls()
+        store._source = source
+        store._chunks = list(range(source.page_count))
+        store._len = source.line_count
+        store._rebuild_index()
+        return store
+
+    @property
+    def source(self):
+        """遅延ソース（なければ None）"""
+        return self._source
+
+    def is_lazy(self) -> bool:
+        """遅延ソースに基づくストアかチェック"""
+        return self._source is not None
+
+    def _chunk_len(self, chunk) -> int:
+        if isinstance(chunk, int):
+            return self._source.page_line_count(chunk)
+        return len(chunk)
+
+    def _read_chunk(self, chunk_index: int) -> List[str]:
+        """読み取り用にチャンクを取得（ページはLRU経由）"""
+        chunk = self._chunks[chunk_index]
+        if isinstance(chunk, int):
+            return self._source.get_page(chunk)
+        return chunk
+
+    def _own_chunk(self, chunk_index: int) -> List[str]:
+        """書き込み用にチャンクを実体化"""
+        chunk = self._chunks[chunk_index]
+        if isinstance(chunk, int):
+            chunk = list(self._source.get_page(chunk))
+            self._chunks[chunk_index] = chunk
+        elif id(chunk) in self._shared:
+            # スナップショットと共有しているチャンクはコピーしてから書き込む
+            chunk = list(chunk)
+            self._chunks[chunk_index] = chunk
+        return chunk
+
+    def snapshot(self) -> 'ChunkedLineStore':
+        """現在の内容の読み取り用スナップショット（チャンクを共有し、以降の書き込みはコピーに行う）"""
+        shared = {id(chunk) for chunk in self._chunks if not isinstance(chunk, int)}
+        self._shared = shared
+        snapshot = type(self).__new__(type(self))
+        snapshot._chunks = list(self._chunks)
+        snapshot._len = self._len
+        snapshot._source = self._source
+        snapshot._shared = shared
+        snapshot._tree = list(self._tree)
+        snapshot._top_bit = self._top_bit
+        return snapshot
+
+    # --- インデックス管理 ---
+    def _rebuild_index(self):
+        """チャンク行数の Fenwick 木を再構築（チャンクの増減時のみ）"""
+        n = len(self._chunks)
+        tree = [0] * (n + 1)
+        for i, chunk in enumerate(self._chunks, 1):
+            tree[i] += self._chunk_len(chunk)
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._top_bit = 1 << (n.bit_length() - 1) if n else 0
+
+    def _add_count(self, chunk_index: int, delta: int):
+        """チャンクの行数変化を Fenwick 木に反映"""
+        tree = self._tree
+        i = chunk_index + 1
+        n = len(tree) - 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """行番号から (チャンク番号, チャンク内オフセット) を求める"""
+        tree = self._tree
+        n = len(tree) - 1
+        pos = 0
+        rem = index
+        step = self._top_bit
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= rem:
+                pos = nxt
+                rem -= tree[nxt]
+            step >>= 1
+        return pos, rem
+
+    def _normalize_index(self, index: int) -> int:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("line index out of range")
+        return index
+
+    def _split_chunk(self, chunk_index: int):
+        """大きくなりすぎたチャンクを分割"""
+        chunk = self._own_chunk(chunk_index)
+        size = self.CHUNK_SIZE
+        pieces = [chunk[i:i + size] for i in range(0, len(chunk), size)]
+        self._chunks[chunk_index:chunk_index + 1] = pieces
+        self._rebuild_index()
+
+    # --- 参照 ---
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                return self.get_range(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+        chunk_index, offset = self._locate(self._normalize_index(index))
+        return self._read_chunk(chunk_index)[offset]
+
+    def get_range(self, start: int, stop: int) -> List[str]:
+        """[start, stop) の行をリストで取得"""
+        result: List[str] = []
+        if start >= stop:
+            return result
+        chunk_index, offset = self._locate(start)
+        remaining = stop - start
+        while remaining > 0 and chunk_index < len(self._chunks):
+            part = self._read_chunk(chunk_index)[offset:offset + remaining]
+            result.extend(part)
+            remaining -= len(part)
+            chunk_index += 1
+            offset = 0
+        return result
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk_index in range(len(self._chunks)):
+            yield from self._read_chunk(chunk_index)
+
+    # --- 変更 ---
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                raise ValueError("extended slice assignment is not supported")
+            self.delete_lines(start, max(start, stop))
+            self.insert_lines(start, value)
+            return
+        chunk_index, offset = self._locate(self._normalize_index(index))
+        self._own_chunk(chunk_index)[offset] = value
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                for i in sorted(range(start, stop, step), reverse=True):
+                    del self[i]
+                return
+            self.delete_lines(start, max(start, stop))
+            return
+        index = self._normalize_index(index)
+        self.delete_lines(index, index + 1)
+
+    def insert(self, index: int, value: str):
+        self.insert_lines(index, (value,))
+
+    def insert_lines(self, index: int, lines: Iterable[str]):
+        """index の位置に複数行を挿入"""
+        lines = list(lines)
+        if not lines:
+            return
+        if index < 0:
+            index = max(0, index + self._len)
+        index = min(index, self._len)
+
+        if not self._chunks:
+            self._chunks = [[]]
+            self._rebuild_index()
+
+        if index == self._len:
+            chunk_index = len(self._chunks) - 1
+            offset = self._chunk_len(self._chunks[chunk_index])
+        else:
+            chunk_index, offset = self._locate(index)
+
+        chunk = self._own_chunk(chunk_index)
+        chunk[offset:offset] = lines
+        self._len += len(lines)
+        if len(chunk) > self.CHUNK_MAX:
+            self._split_chunk(chunk_index)
+        else:
+            self._add_count(chunk_index, len(lines))
+
+    def delete_lines(self, start: int, end: int):
+        """[start, end) の行を削除"""
+        start = max(0, start)
+        end = min(end, self._len)
+        if start >= end:
+            return
+        chunk_index, offset = self._locate(start)
+        remaining = end - start
+        structural = False
+        while remaining > 0:
+            chunk_len = self._chunk_len(self._chunks[chunk_index])
+            take = min(remaining, chunk_len - offset)
+            remaining -= take
+            self._len -= take
+            if take == chunk_len:
+                # チャンク全体の削除はページを実体化しない
+                del self._chunks[chunk_index]
+                structural = True
+            else:
+                chunk = self._own_chunk(chunk_index)
+                del chunk[offset:offset + take]
+                if not structural:
+                    self._add_count(chunk_index, -take)
+                chunk_index += 1
+            offset = 0
+        if structural:
+            self._rebuild_index()
+
+    def clear(self):
+        self._chunks = []
+        self._len = 0
+        self._rebuild_index()
+
+    def chunk_count(self) -> int:
+        """チャンク数を取得（デバッグ・ベンチマーク用）"""
+        return len(self._chunks)
+
+
+# 設定名からストアクラスを引く
+TEXT_STORES = {
+    'chunked': ChunkedLineStore,
+    'list': ListLineStore,
+}
@@ -1,3 +1,5 @@
+import sys
+from typing import List, Tuple, Union
 from uzuki.input.keycodes import Key
 
 class KeyInfo:
@@ -8,11 +10,114 @@ class KeyInfo:
         self.char = chr(raw_code) if raw_code < 256 and raw_code >= 32 else None
         self.is_printable = 32 <= raw_code < 127  # 印字可能文字の範囲
 
+class PasteBlock:
+    """ブラケットペーストで受け取ったテキスト"""
+    def __init__(self, text: str):
+        self.text = text
+
 class InputHandler:
-    """キー情報作成クラス"""
+    """キー情報作成クラス（ブラケットペーストの切り出しも担当）"""
+    ENABLE_BRACKETED_PASTE = '\x1b[?2004h'
+    DISABLE_BRACKETED_PASTE = '\x1b[?2004l'
+    
     def __init__(self, screen):
         self.screen = screen
+        self.in_paste = False        # ペースト本文の受信中
+        self._paste_data = bytearray()  # 受信中のペースト本文
+        self._pending = []           # マーカーの途中かもしれないコード
 
     def create_key_info(self, raw_code: int) -> KeyInfo:
         """KeyInfoオブジェクトを作成"""
         return KeyInfo(raw_code)
+    
+    def enable_bracketed_paste(self):
+        """端末のブラケットペーストを有効化"""
+        self._write_terminal(self.ENABLE_BRACKETED_PASTE)
+    
+    def disable_bracketed_paste(self):
+        """端末のブラケットペーストを無効化"""
+        self._write_terminal(self.DISABLE_BRACKETED_PASTE)
+    
+    def _write_terminal(self, sequence: str):
+        try:
+            sys.stdout.write(sequence)
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+    
+    def feed(self, raw_codes: List[int]) -> List[Union[int, PasteBlock]]:
+        """キーコード列からペースト部分を切り出す（キーコードと PasteBlock の列を返す）"""
+        events: List[Union[int, PasteBlock]] = []
+        codes = self._pending + list(raw_codes)
+        self._pending = []
+        marker_len = len(Key.PASTE_START)
+        i = 0
+        count = len(codes)
+        while i < count:
+            code = codes[i]
+            if code == 27:
+                window = tuple(codes[i:i + marker_len])
+                marker = Key.PASTE_END if self.in_paste else Key.PASTE_START
+                if window == marker:
+                    if self.in_paste:
+                        events.append(self._finish_paste())
+                    else:
+                        self.in_paste = True
+                    i += marker_len
+                    continue
+                if (len(window) < marker_len and window == marker[:len(window)] and
+                        (self.in_paste or len(window) > 1)):
+                    # マーカーが次の読み込みにまたがっている（単独の ESC はキーとして扱う）
+                    self._pending = list(window)
+                    break
+            if self.in_paste:
+                if 0 <= code < 256:  # キーパッドのコードは捨てる
+                    self._paste_data.append(code)
+            else:
+                events.append(code)
+            i += 1
+        return events
+    
+    def feed_bytes(self, data: bytes) -> Tuple[List[Union[int, PasteBlock]], List[int]]:
+        """端末から直接読んだバイト列を処理し、(イベント列, ペースト後の残りのコード) を返す
+
+        ペースト本文は1バイトずつ getch せずにまとめて読むためのもの。
+        残りのコードは通常の入力として curses に戻す。
+        """
+        if not self.in_paste:
+            return self.feed(list(data)), []
+        buf = self._paste_data
+        buf.extend(self._pending)
+        self._pending = []
+        search_from = max(0, len(buf) - len(Key.PASTE_END) + 1)
+        buf.extend(data)
+        index = buf.find(bytes(Key.PASTE_END), search_from)
+        if index == -1:
+            return [], []
+        rest = list(buf[index + len(Key.PASTE_END):])
+        del buf[index:]
+        return [self._finish_paste()], rest
+    
+    def flush_paste(self) -> List[Union[int, PasteBlock]]:
+        """終了マーカーが届かない場合に受信済みの内容を確定"""
+        events: List[Union[int, PasteBlock]] = []
+        if self.in_paste:
+            self._paste_data.extend(code for code in self._pending if 0 <= code < 256)
+            events.append(self._finish_paste())
+        else:
+            events.extend(self._pending)
+        self._pending = []
+        return events
+    
+    def has_pending(self) -> bool:
+        """ペースト受信中、またはマーカーの途中で止まっているか"""
+        return self.in_paste or bool(self._pending)
+    
+    def _finish_paste(self) -> PasteBlock:
+        """受信したバイト列をテキストにする"""
+        text = self._paste_data.decode('utf-8', errors='replace')
+        self._paste_data = bytearray()
+        self.in_paste = False
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return PasteBlock(text)
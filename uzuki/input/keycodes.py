@@ -12,6 +12,13 @@ class Key:
     UP = curses.KEY_UP
     DOWN = curses.KEY_DOWN
     RAW = None  # 特殊キー以外の全てのキー
+    
+    # ブラケットペーストの開始・終了マーカー（ESC[200~ / ESC[201~）
+    PASTE_START = (27, ord('['), ord('2'), ord('0'), ord('0'), ord('~'))
+    PASTE_END = (27, ord('['), ord('2'), ord('0'), ord('1'), ord('~'))
+    
+    # 名前付きキー（複数文字でも1キーとして扱う）
+    NAMED_KEYS = {'escape', 'enter', 'backspace', 'space', 'tab', 'left', 'right', 'up', 'down'}
 
     @staticmethod
     def from_code(code: int):
@@ -46,12 +53,49 @@ class Key:
         if code in special_keys:
             return special_keys[code]
         
+        # Ctrl+英字（Tab・Enter・CR と重なるコードは除く）
+        if 1 <= code <= 26 and code not in (Key.TAB, Key.ENTER, 13):
+            return 'ctrl_' + chr(code + 96)
+        
         # 印字可能文字
         if code < 256:
             return chr(code)
         
         return f'key_{code}'
     
+    @staticmethod
+    def normalize_name(key: str) -> str:
+        """設定ファイル形式のキー名（'Ctrl+r', 'Escape', 'Shift+Tab'）を内部名に変換"""
+        if len(key) <= 1:
+            return key
+        if ' ' in key.strip():
+            return ' '.join(Key.normalize_name(part) for part in key.split())
+        if '+' in key:
+            modifier, _, base = key.rpartition('+')
+            if base and modifier.lower() in ('ctrl', 'shift'):
+                return f"{modifier.lower()}_{base.lower()}"
+            return key
+        if key.lower() in Key.NAMED_KEYS:
+            return key.lower()
+        return key
+    
+    @staticmethod
+    def is_named_key(key: str) -> bool:
+        """1キーを表す名前かどうかを判定"""
+        return key in Key.NAMED_KEYS or Key.is_combo_key(key) or key.startswith('key_')
+    
+    @staticmethod
+    def split_keys(sequence: str) -> list:
+        """キーマップのキー文字列をキー単位に分割（'dd' -> ['d', 'd'], 'ctrl_r' -> ['ctrl_r']）
+
+        名前付きキーを含む列は空白で区切る（'ctrl_w j' -> ['ctrl_w', 'j']）
+        """
+        if len(sequence) > 1 and ' ' in sequence.strip():
+            return sequence.split()
+        if len(sequence) > 1 and Key.is_named_key(sequence):
+            return [sequence]
+        return list(sequence)
+    
     @staticmethod
     def is_combo_key(key_name: str) -> bool:
         """コンボキーかどうかを判定"""
@@ -5,6 +5,7 @@ class KeySequenceManager:
     def __init__(self, timeout=1000):
         self.timeout = timeout  # ミリ秒
         self.sequence = ""
+        self.keys = []  # キー単位のシーケンス
         self.last_key_time = 0
     
     def add_key(self, key: str) -> str:
@@ -13,9 +14,10 @@ class KeySequenceManager:
         
         # タイムアウトチェック
         if current_time - self.last_key_time > self.timeout:
-            self.sequence = ""
+            self.clear()
         
         self.sequence += key
+        self.keys.append(key)
         self.last_key_time = current_time
         
         return self.sequence
@@ -23,7 +25,12 @@ class KeySequenceManager:
     def clear(self):
         """シーケンスをクリア"""
         self.sequence = ""
+        self.keys = []
     
     def get_sequence(self) -> str:
         """現在のシーケンスを取得"""
-        return self.sequence 
\ No newline at end of file
+        return self.sequence
+    
+    def get_keys(self) -> list:
+        """現在のシーケンスをキー単位で取得"""
+        return self.keys 
\ No newline at end of file
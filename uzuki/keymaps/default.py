@@ -15,19 +15,44 @@ class DefaultKeyMaps:
             'j': 'move_down', 
             'k': 'move_up',
             'l': 'move_right',
+            'ctrl_f': 'page_down',
+            'ctrl_b': 'page_up',
+            'ctrl_d': 'half_page_down',
+            'ctrl_u': 'half_page_up',
+            
+            # ウィンドウ
+            'ctrl_w w': 'window_next',
+            'ctrl_w ctrl_w': 'window_next',
+            'ctrl_w W': 'window_previous',
+            'ctrl_w s': 'window_split',
+            'ctrl_w v': 'window_vsplit',
+            'ctrl_w c': 'window_close',
+            'ctrl_w o': 'window_only',
+            'ctrl_w h': 'window_left',
+            'ctrl_w j': 'window_down',
+            'ctrl_w k': 'window_up',
+            'ctrl_w l': 'window_right',
             
             # モード切り替え
             'i': 'enter_insert_mode',
             ':': 'enter_command_mode',
             'ctrl_e': 'open_file_browser',  # ファイルブラウザーを開く
+            'ctrl_p': 'open_finder',        # ファイル名で検索して開く
+            
+            # 検索
+            '/': 'search_forward',
+            '?': 'search_backward',
+            'n': 'search_next',
+            'N': 'search_previous',
             
             # 表示設定
             'ctrl_l': 'toggle_line_numbers',  # 行番号表示切り替え
             'ctrl_h': 'toggle_current_line_highlight',  # カレント行ハイライト切り替え
-            'ctrl_r': 'toggle_ruler',  # ルーラー表示切り替え
             
             # 編集操作（単一キー）
             'x': 'delete_char',
+            'u': 'undo',
+            'ctrl_r': 'redo',
             'o': 'new_line_below',
             'O': 'new_line_above',
             'a': 'append',
@@ -40,7 +65,7 @@ class DefaultKeyMaps:
             'yy': 'yank_line',
             
             # その他
-            'escape': 'noop',
+            'escape': 'cancel_load',
         }
     
     @staticmethod
@@ -59,6 +84,27 @@ class DefaultKeyMaps:
             'escape': 'enter_normal_mode',
             'enter': 'execute_command',
             'backspace': 'delete_backward',
+            'tab': 'complete_command',
+        }
+    
+    @staticmethod
+    def get_search_mode_bindings():
+        return {
+            'escape': 'enter_normal_mode',
+            'enter': 'execute_search',
+            'backspace': 'delete_backward',
+        }
+    
+    @staticmethod
+    def get_finder_mode_bindings():
+        return {
+            'escape': 'enter_normal_mode',
+            'enter': 'open_selected',
+            'backspace': 'delete_backward',
+            'ctrl_n': 'select_next',
+            'ctrl_p': 'select_previous',
+            'down': 'select_next',
+            'up': 'select_previous',
         }
     
     @staticmethod
@@ -77,6 +123,7 @@ class DefaultKeyMaps:
             
             # 表示設定
             'ctrl_h': 'toggle_hidden',  # 隠しファイル表示切り替え
+            'ctrl_l': 'refresh',        # ディレクトリを読み直す
             
             # ファイル操作
             'n': 'create_file',    # 新規ファイル作成
@@ -1,6 +1,7 @@
 import os
 import importlib.util
-from typing import Dict, Any, Callable, List, Union
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+from uzuki.input.keycodes import Key
 
 class Mode:
     """モード定数 - Neovim風のAPI"""
@@ -8,23 +9,51 @@ class Mode:
     INSERT = 'insert'
     COMMAND = 'command'
     FILE_BROWSER = 'file_browser'
+    SEARCH = 'search'
+    FINDER = 'finder'
     GLOBAL = 'global'
     
     # 便利なエイリアス
     VISUAL = 'visual'  # 将来的な拡張用
     TERMINAL = 'terminal'  # 将来的な拡張用
 
+class KeyTrieNode:
+    """キーマップのプレフィックス木のノード"""
+    __slots__ = ('children', 'action', 'bound')
+
+    def __init__(self):
+        self.children: Dict[str, 'KeyTrieNode'] = {}
+        self.action: Optional[Callable] = None  # 解決済みのハンドラー
+        self.bound = False  # このノードで終わるキーマップがあるか
+
 class KeyMapManager:
     """キーマップ管理クラス - Neovim風のAPIを提供"""
+    # モード名と EditorController 上のモードオブジェクト属性
+    MODE_ATTRIBUTES = {
+        'normal': 'normal_mode',
+        'insert': 'insert_mode',
+        'command': 'command_mode',
+        'file_browser': 'file_browser_mode',
+        'search': 'search_mode',
+        'finder': 'finder_mode',
+    }
+
     def __init__(self, screen):
         self.screen = screen
-        self.keymaps = []  # フラットなリストで管理
+        self._bindings: Dict[Tuple[str, str], Dict[str, Any]] = {}  # (mode, key) -> キーマップ（登録順）
+        self._tries: Dict[str, KeyTrieNode] = {}  # モードごとのコンパイル済みプレフィックス木
+        self._first_keys: Dict[str, set] = {}     # モードごとの先頭キー集合
         
         # デフォルトキーマップを読み込み
         self._load_default_keymaps()
         # ユーザー設定を読み込み
         self._load_user_config()
     
+    @property
+    def keymaps(self) -> List[Dict[str, Any]]:
+        """登録されているキーマップのリスト（登録順）"""
+        return list(self._bindings.values())
+    
     # Neovim風のキーマップメソッド
     def normal(self, key: str, action: Union[str, Callable]):
         """Normal modeのキーマップを設定"""
@@ -42,6 +71,14 @@ class KeyMapManager:
         """File Browser modeのキーマップを設定"""
         self.add_keymap('file_browser', key, action)
     
+    def search(self, key: str, action: Union[str, Callable]):
+        """Search modeのキーマップを設定"""
+        self.add_keymap('search', key, action)
+    
+    def finder(self, key: str, action: Union[str, Callable]):
+        """Finder modeのキーマップを設定"""
+        self.add_keymap('finder', key, action)
+    
     def set(self, modes: List[str], key: str, action: Union[str, Callable]):
         """複数モードに同時にキーマップを設定"""
         for mode in modes:
@@ -63,7 +100,8 @@ class KeyMapManager:
     def load_from_config(self, config: Dict[str, Any]):
         """設定からキーマップを読み込み"""
         # 既存のキーマップをクリア
-        self.keymaps.clear()
+        self._bindings.clear()
+        self.invalidate()
         
         # デフォルトキーマップを再読み込み
         self._load_default_keymaps()
@@ -88,6 +126,8 @@ class KeyMapManager:
             ('insert', DefaultKeyMaps.get_insert_mode_bindings()),
             ('command', DefaultKeyMaps.get_command_mode_bindings()),
             ('file_browser', DefaultKeyMaps.get_file_browser_bindings()),
+            ('search', DefaultKeyMaps.get_search_mode_bindings()),
+            ('finder', DefaultKeyMaps.get_finder_mode_bindings()),
         ]:
             for key, action in bindings.items():
                 self.add_keymap(mode, key, action)
@@ -120,95 +160,123 @@ class KeyMapManager:
     
     def add_keymap(self, mode: str, key: str, action: Union[str, Callable]):
         """キーマップを追加（文字列または関数を受け取る）"""
-        # 既存のキーマップを削除
-        self.remove_keymap(mode, key)
-        
-        self.keymaps.append({
+        key = Key.normalize_name(key)
+        # 既存のキーマップは削除して末尾に登録し直す
+        self._bindings.pop((mode, key), None)
+        self._bindings[(mode, key)] = {
             'mode': mode,
             'key': key,
             'action': action
-        })
+        }
+        self.invalidate(mode)
     
     def remove_keymap(self, mode: str, key: str):
         """キーマップを削除"""
-        self.keymaps = [km for km in self.keymaps 
-                       if not (km['mode'] == mode and km['key'] == key)]
+        key = Key.normalize_name(key)
+        if self._bindings.pop((mode, key), None) is not None:
+            self.invalidate(mode)
     
-    def has_potential_mapping(self, mode: str, sequence: str) -> bool:
-        """指定されたシーケンスで始まるマッピングが存在するかチェック"""
-        from uzuki.input.keycodes import Key
-        
-        # モード固有のマッピングをチェック
-        for keymap in self.keymaps:
-            if keymap['mode'] == mode:
-                key = keymap['key']
-                
-                # コンボキーの場合、プレフィックスが一致するかチェック
-                if Key.is_combo_key(key):
-                    prefix = Key.get_combo_prefix(key)
-                    if sequence.startswith(prefix):
-                        return True
-                # 通常のキーの場合
-                elif key.startswith(sequence):
-                    return True
+    def invalidate(self, mode: Optional[str] = None):
+        """コンパイル済みの木を破棄（mode=None なら全モード）"""
+        if mode is None or mode == 'global':
+            # グローバルは全モードの先頭キー集合に含まれる
+            self._tries.clear()
+            self._first_keys.clear()
+        else:
+            self._tries.pop(mode, None)
+            self._first_keys.pop(mode, None)
+    
+    def _get_trie(self, mode: str) -> KeyTrieNode:
+        """モードのプレフィックス木を取得（未構築なら構築）"""
+        trie = self._tries.get(mode)
+        if trie is None:
+            trie = self._build_trie(mode)
+            self._tries[mode] = trie
+        return trie
+    
+    def _build_trie(self, mode: str) -> KeyTrieNode:
+        """モードのキーマップからプレフィックス木を構築し、ハンドラーを解決しておく"""
+        root = KeyTrieNode()
+        handlers = None
+        for (keymap_mode, key), keymap in self._bindings.items():
+            if keymap_mode != mode or not key:
+                continue
+            node = root
+            for name in Key.split_keys(key):
+                child = node.children.get(name)
+                if child is None:
+                    child = node.children[name] = KeyTrieNode()
+                node = child
+            action = keymap['action']
+            if not callable(action):
+                if handlers is None:
+                    handlers = self._get_action_handlers(mode)
+                action = handlers.get(action)
+            node.action = action
+            node.bound = True
+        return root
+    
+    def _find_node(self, mode: str, keys: List[str]) -> Optional[KeyTrieNode]:
+        """キー列に対応するノードを取得"""
+        node = self._get_trie(mode)
+        for name in keys:
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+    
+    def has_potential_mapping(self, mode: str, sequence: str, keys: Optional[List[str]] = None) -> bool:
+        """指定されたシーケンスで始まるより長いマッピングが存在するかチェック（キー単位で比較）"""
+        if keys is None:
+            keys = Key.split_keys(sequence)
         
-        # グローバルマッピングもチェック
-        for keymap in self.keymaps:
-            if keymap['mode'] == 'global':
-                key = keymap['key']
-                
-                # コンボキーの場合、プレフィックスが一致するかチェック
-                if Key.is_combo_key(key):
-                    prefix = Key.get_combo_prefix(key)
-                    if sequence.startswith(prefix):
-                        return True
-                # 通常のキーの場合
-                elif key.startswith(sequence):
-                    return True
+        # モード固有とグローバルのマッピングをチェック
+        for trie_mode in (mode, 'global'):
+            node = self._find_node(trie_mode, keys)
+            if node is not None and node.children:
+                return True
         
         return False
     
-    def get_action(self, mode: str, key_sequence: str) -> Callable:
-        """キーシーケンスに対応するアクションを取得（最長一致）"""
-        # 最長一致で検索（キーの長さで降順ソート）
-        for keymap in sorted(self.keymaps, key=lambda x: len(x['key']), reverse=True):
-            if (keymap['mode'] == mode and 
-                key_sequence == keymap['key']):  # 完全一致に変更
-                action = keymap['action']
-                if callable(action):
-                    return action
-                else:
-                    return self._get_action_handler(mode, action)
+    def get_first_keys(self, mode: str) -> set:
+        """モード（とグローバル）のマッピングの先頭キー集合を取得"""
+        first_keys = self._first_keys.get(mode)
+        if first_keys is None:
+            first_keys = set(self._get_trie(mode).children)
+            if mode != 'global':
+                first_keys.update(self._get_trie('global').children)
+            self._first_keys[mode] = first_keys
+        return first_keys
+    
+    def get_action(self, mode: str, key_sequence: str, keys: Optional[List[str]] = None) -> Callable:
+        """キーシーケンスに対応するアクションを取得（モード固有を優先し、なければグローバル）"""
+        if keys is None:
+            keys = Key.split_keys(key_sequence)
+        if not keys:
+            return None
         
-        # グローバルキーマップを検索
-        for keymap in sorted(self.keymaps, key=lambda x: len(x['key']), reverse=True):
-            if (keymap['mode'] == 'global' and 
-                key_sequence == keymap['key']):  # 完全一致に変更
-                action = keymap['action']
-                if callable(action):
-                    return action
-                else:
-                    return self._get_action_handler('global', action)
+        for trie_mode in (mode, 'global'):
+            node = self._find_node(trie_mode, keys)
+            if node is not None and node.bound:
+                return node.action
         
         return None
     
-    def _get_action_handler(self, mode: str, action_name: str) -> Callable:
-        """アクションハンドラーを取得"""
-        mode_map = {
-            'normal': self.screen.editor.normal_mode,
-            'insert': self.screen.editor.insert_mode,
-            'command': self.screen.editor.command_mode,
-            'file_browser': self.screen.editor.file_browser_mode,
-            'global': None,  # グローバルは特別処理
-        }
-        
-        mode_obj = mode_map.get(mode)
+    def _get_action_handlers(self, mode: str) -> Dict[str, Callable]:
+        """モードのアクションハンドラー辞書を取得"""
         if mode == 'global':
-            return self._get_global_handlers().get(action_name)
-        elif mode_obj and hasattr(mode_obj, 'get_action_handlers'):
-            return mode_obj.get_action_handlers().get(action_name)
+            return self._get_global_handlers()
         
-        return None
+        attribute = self.MODE_ATTRIBUTES.get(mode)
+        mode_obj = getattr(self.screen.editor, attribute, None) if attribute else None
+        if mode_obj and hasattr(mode_obj, 'get_action_handlers'):
+            return mode_obj.get_action_handlers()
+        
+        return {}
+    
+    def _get_action_handler(self, mode: str, action_name: str) -> Callable:
+        """アクションハンドラーを取得"""
+        return self._get_action_handlers(mode).get(action_name)
     
     def debug_keymaps(self, mode: str = None):
         """デバッグ用：登録されているキーマップを表示"""
@@ -8,6 +8,10 @@ class BaseMode:
         """デフォルトのキー処理（サブクラスでオーバーライド）"""
         pass
     
+    def handle_paste(self, text: str):
+        """ペーストされたテキストの処理（サブクラスでオーバーライド）"""
+        pass
+    
     def get_action_handlers(self):
         """アクションハンドラーを取得（サブクラスでオーバーライド）"""
         return {}
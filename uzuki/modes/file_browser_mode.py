@@ -29,6 +29,7 @@ class FileBrowserMode(BaseMode):
             'toggle_filter': self._toggle_filter_mode,
             'clear_filter': self._clear_filter,
             'toggle_hidden': self.browser.toggle_hidden_files,
+            'refresh': self._refresh,
             
             # モード切り替え
             'enter_normal_mode': self._exit_browser,
@@ -89,6 +90,11 @@ class FileBrowserMode(BaseMode):
         else:
             self.screen.notify_warning("Please select a valid file")
     
+    def _refresh(self):
+        """ディレクトリを読み直す"""
+        self.browser.refresh()
+        self.screen.notify_info("Directory refreshed")
+    
     def _toggle_filter_mode(self):
         """フィルタモードを切り替え"""
         self.filter_mode = not self.filter_mode
@@ -0,0 +1,59 @@
+"""
+Finder Mode - ファイル名のあいまい検索モード（Ctrl+p・:files）
+"""
+
+from uzuki.modes.base_mode import BaseMode
+
+class FinderMode(BaseMode):
+    """Finder mode - 検索文字列の入力と候補の選択"""
+
+    def __init__(self, screen):
+        super().__init__(screen, 'finder')
+        self.query_buf = ''
+
+    def begin(self):
+        """入力を開始"""
+        self.query_buf = ''
+
+    @property
+    def prompt(self) -> str:
+        """プロンプト文字"""
+        return '> '
+
+    def get_action_handlers(self):
+        """Finder modeのアクションハンドラー"""
+        return {
+            'enter_normal_mode': self._cancel,
+            'open_selected': lambda: self.screen.finder.open_selected(),
+            'select_next': lambda: self.screen.finder.move_selection(1),
+            'select_previous': lambda: self.screen.finder.move_selection(-1),
+            'delete_backward': self._delete_backward,
+        }
+
+    def handle_default(self, key_info):
+        """デフォルト処理：文字入力・バックスペース"""
+        if key_info.key_name == 'backspace':
+            self._delete_backward()
+            return
+        if key_info.is_printable and key_info.char:
+            self._set_query(self.query_buf + key_info.char)
+
+    def handle_paste(self, text: str):
+        """ペーストの1行目を検索文字列に追加"""
+        self._set_query(self.query_buf + text.split('\n', 1)[0])
+
+    def _set_query(self, query: str):
+        self.query_buf = query
+        self.screen.finder.update(query)
+
+    def _cancel(self):
+        """ファインダーを閉じる"""
+        self.query_buf = ''
+        self.screen.finder.close()
+
+    def _delete_backward(self):
+        """バックスペース処理（空なら閉じる）"""
+        if not self.query_buf:
+            self._cancel()
+            return
+        self._set_query(self.query_buf[:-1])
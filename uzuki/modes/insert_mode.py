@@ -23,10 +23,23 @@ class InsertMode(BaseMode):
     def handle_default(self, key_info):
         """デフォルト処理 - 文字を挿入"""
         if key_info.is_printable and key_info.char:
-            buf = self.screen.editor.buffer
-            buf.insert(self.screen.editor.cursor.row, self.screen.editor.cursor.col, key_info.char)
-            self.screen.editor.cursor.move(0, 1, buf)
-            self.screen.editor.needs_redraw = True
+            self.insert_text(key_info.char)
+    
+    def handle_paste(self, text: str):
+        """ペーストを1回の挿入・1つの undo 単位として挿入（キーマップは通さない）"""
+        history = self.screen.editor.history
+        history.begin_group()
+        self.insert_text(text)
+        # 続けて入力した文字は別の undo 単位にする
+        history.begin_group()
+    
+    def insert_text(self, text: str):
+        """カーソル位置にテキストをまとめて挿入（変更通知は1回）"""
+        buf = self.screen.editor.buffer
+        cursor = self.screen.editor.cursor
+        end_row, end_col = buf.insert_text(cursor.row, cursor.col, text)
+        cursor.move_to(end_row, end_col, buf)
+        self.screen.editor.needs_redraw = True
     
     def _new_line(self):
         """新しい行を作成"""
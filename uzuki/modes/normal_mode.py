@@ -23,6 +23,22 @@ class NormalMode(BaseMode):
             'move_first_non_blank': lambda: self._move_first_non_blank(),
             'move_beginning_of_file': lambda: self.screen.editor.cursor.move(-self.screen.editor.cursor.row, 0, self.screen.editor.buffer),
             'move_end_of_file': lambda: self._move_end_of_file(),
+            'page_down': lambda: self.screen.ui.scroll_page(1),
+            'page_up': lambda: self.screen.ui.scroll_page(-1),
+            'half_page_down': lambda: self.screen.ui.scroll_page(0.5),
+            'half_page_up': lambda: self.screen.ui.scroll_page(-0.5),
+            
+            # ウィンドウ
+            'window_next': lambda: self.screen.ui.focus_next_window(1),
+            'window_previous': lambda: self.screen.ui.focus_next_window(-1),
+            'window_split': lambda: self.screen.ui.split_window('horizontal'),
+            'window_vsplit': lambda: self.screen.ui.split_window('vertical'),
+            'window_close': lambda: self.screen.ui.close_window(),
+            'window_only': lambda: self.screen.ui.only_window(),
+            'window_left': lambda: self.screen.ui.focus_window_direction('h'),
+            'window_down': lambda: self.screen.ui.focus_window_direction('j'),
+            'window_up': lambda: self.screen.ui.focus_window_direction('k'),
+            'window_right': lambda: self.screen.ui.focus_window_direction('l'),
             
             # モード切り替え
             'enter_insert_mode': lambda: self.screen.set_mode('insert'),
@@ -30,9 +46,17 @@ class NormalMode(BaseMode):
             'append_end_of_line': lambda: self._append_end_of_line(),
             'enter_command_mode': lambda: self.screen.set_mode('command'),
             
+            # 検索
+            'search_forward': lambda: self.screen.search.start(forward=True),
+            'search_backward': lambda: self.screen.search.start(forward=False),
+            'search_next': lambda: self.screen.search.next(),
+            'search_previous': lambda: self.screen.search.next(reverse=True),
+            
             # 編集操作
             'delete_char': lambda: self.screen.editor.buffer.delete(self.screen.editor.cursor.row, self.screen.editor.cursor.col),
             'delete_line': self._delete_line,
+            'undo': lambda: self.screen.editor.undo(),
+            'redo': lambda: self.screen.editor.redo(),
             
             # 表示切り替え
             'toggle_line_numbers': self._toggle_line_numbers,
@@ -43,12 +67,21 @@ class NormalMode(BaseMode):
             'save_file': lambda: self.screen.save_file(),
             'quit': lambda: self.screen.quit(),
             'open_file_browser': lambda: self.screen.open_file_browser(),
+            'open_finder': lambda: self.screen.finder.open(),
+            'cancel_load': lambda: self.screen.file.cancel_load() or self.screen.clear_notifications(),
         }
     
     def handle_default(self, key_info):
         """デフォルト処理"""
         pass
     
+    def handle_paste(self, text: str):
+        """ペーストをカーソル位置に1つの undo 単位として挿入"""
+        buf = self.screen.editor.buffer
+        cursor = self.screen.editor.cursor
+        end_row, end_col = buf.insert_text(cursor.row, cursor.col, text)
+        cursor.move_to(end_row, end_col, buf)
+    
     def _move_end_of_line(self):
         """行の末尾に移動"""
         line = self.screen.editor.buffer.lines[self.screen.editor.cursor.row]
@@ -95,9 +128,8 @@ class NormalMode(BaseMode):
     
     def _delete_line(self):
         """現在の行を削除"""
-        line = self.screen.editor.buffer.lines[self.screen.editor.cursor.row]
         if len(self.screen.editor.buffer.lines) > 1:
-            del self.screen.editor.buffer.lines[self.screen.editor.cursor.row]
+            self.screen.editor.buffer.delete_line(self.screen.editor.cursor.row)
             if self.screen.editor.cursor.row >= len(self.screen.editor.buffer.lines):
                 self.screen.editor.cursor.row = len(self.screen.editor.buffer.lines) - 1
             self.screen.editor.cursor.col = min(self.screen.editor.cursor.col, len(self.screen.editor.buffer.lines[self.screen.editor.cursor.row]))
@@ -0,0 +1,68 @@
+"""
+Search Mode - 検索パターン入力モード（/ と ?）
+"""
+
+from uzuki.modes.base_mode import BaseMode
+
+class SearchMode(BaseMode):
+    """Search mode - 検索パターンの入力"""
+
+    def __init__(self, screen):
+        super().__init__(screen, 'search')
+        self.pattern_buf = ''
+        self.forward = True
+
+    def begin(self, forward: bool):
+        """入力を開始"""
+        self.pattern_buf = ''
+        self.forward = forward
+
+    @property
+    def prompt(self) -> str:
+        """プロンプト文字（/ または ?）"""
+        return '/' if self.forward else '?'
+
+    def get_action_handlers(self):
+        """Search modeのアクションハンドラー"""
+        return {
+            'enter_normal_mode': self._cancel,
+            'execute_search': self._execute,
+            'delete_backward': self._delete_backward,
+        }
+
+    def handle_default(self, key_info):
+        """デフォルト処理：文字入力・バックスペース"""
+        if key_info.key_name == 'backspace':
+            self._delete_backward()
+            return
+        if key_info.is_printable and key_info.char:
+            self._set_pattern(self.pattern_buf + key_info.char)
+
+    def handle_paste(self, text: str):
+        """ペーストの1行目をパターンに追加"""
+        self._set_pattern(self.pattern_buf + text.split('\n', 1)[0])
+
+    def _set_pattern(self, pattern: str):
+        self.pattern_buf = pattern
+        self.screen.search.update(pattern, self.forward)
+        self.screen.editor.needs_redraw = True
+
+    def _execute(self):
+        """検索を確定"""
+        pattern = self.pattern_buf
+        self.screen.set_mode('normal')
+        self.pattern_buf = ''
+        self.screen.search.confirm(pattern, self.forward)
+
+    def _cancel(self):
+        """検索を取り消し"""
+        self.screen.set_mode('normal')
+        self.pattern_buf = ''
+        self.screen.search.cancel()
+
+    def _delete_backward(self):
+        """バックスペース処理（空なら取り消し）"""
+        if not self.pattern_buf:
+            self._cancel()
+            return
+        self._set_pattern(self.pattern_buf[:-1])
@@ -144,7 +144,7 @@ class EditorService(IEditorService):
         self.running = False
         self.logger.info("Editor quit requested")
     
-    def _on_buffer_change(self):
+    def _on_buffer_change(self, start: int = 0, end: int = 0, delta: int = 0):
         """バッファ変更時のコールバック"""
         self.needs_redraw = True
         self.logger.debug("Buffer changed")
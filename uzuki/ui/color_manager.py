@@ -17,6 +17,8 @@ class ColorManager:
         self._color_pairs = {}
         self._true_color_support = False
         self._fallback_mode = False
+        self._search_match_style = None
+        self._syntax_styles: Dict[Tuple[str, bool], int] = {}
         
         # 基本色定義
         self.colors = {
@@ -38,6 +40,19 @@ class ColorManager:
             'bright_white': 15,
         }
         
+        # 構文トークンの種類 -> (文字色, スタイル)
+        self.syntax_colors = {
+            'keyword': ('magenta', 'bold'),
+            'constant': ('cyan', 'normal'),
+            'builtin': ('cyan', 'normal'),
+            'function': ('blue', 'bold'),
+            'class': ('yellow', 'bold'),
+            'decorator': ('yellow', 'normal'),
+            'string': ('green', 'normal'),
+            'number': ('red', 'normal'),
+            'comment': ('bright_black', 'dim'),
+        }
+        
         # スタイル定義
         self.styles = {
             'normal': curses.A_NORMAL,
@@ -199,7 +214,7 @@ class ColorManager:
             return self._color_pairs[key]
         
         # 新しいペアIDを割り当て
-        pair_id = len(self._color_pairs) + 16  # 基本色ペアの後に配置
+        pair_id = len(self._color_pairs) + 17  # 基本色ペア（1〜16）の後に配置
         
         try:
             fg = self.colors.get(fg_color, 7)
@@ -231,6 +246,43 @@ class ColorManager:
         """ハイライト用スタイル"""
         return self.get_style(13, 'bold')  # 明るいマゼンタ + 太字
     
+    def get_search_match_style(self) -> int:
+        """検索マッチ用スタイル（黄背景）"""
+        if self._search_match_style is None:
+            try:
+                if curses.has_colors():
+                    self._search_match_style = self.create_style('black', 'yellow')
+                else:
+                    self._search_match_style = curses.A_REVERSE
+            except curses.error:
+                self._search_match_style = curses.A_REVERSE
+        return self._search_match_style
+    
+    def get_syntax_style(self, kind: str, current_line: bool = False) -> int:
+        """構文トークン用スタイル（カレント行では背景を保つため文字スタイルのみ）"""
+        key = (kind, current_line)
+        style = self._syntax_styles.get(key)
+        if style is not None:
+            return style
+        fg_color, text_style = self.syntax_colors.get(kind, ('white', 'normal'))
+        if current_line:
+            style = self.get_current_line_style() | self.styles.get(text_style, curses.A_NORMAL)
+        else:
+            try:
+                if curses.has_colors():
+                    style = self.create_style(fg_color, None, text_style)
+                else:
+                    style = self.styles.get(text_style, curses.A_NORMAL)
+            except curses.error:
+                style = self.styles.get(text_style, curses.A_NORMAL)
+        self._syntax_styles[key] = style
+        return style
+    
+    def set_syntax_color(self, kind: str, fg_color: str, style: str = 'normal'):
+        """構文トークンの色を設定"""
+        self.syntax_colors[kind] = (fg_color, style)
+        self._syntax_styles.clear()
+    
     def get_current_line_style(self) -> int:
         """カレント行用スタイル（反転色）"""
         try:
@@ -0,0 +1,54 @@
+"""
+Damage Tracker
+
+再描画が必要な領域（バッファ行の範囲・ステータスライン・画面全体）を記録し、
+変更のあった部分だけを描き直せるようにする。
+"""
+
+from typing import List, Optional, Tuple
+
+
+class DamageTracker:
+    """再描画が必要な領域を管理するクラス"""
+
+    def __init__(self):
+        self.full = True  # 画面全体の再描画が必要
+        self.ranges: List[Tuple[int, Optional[int]]] = []  # バッファ行範囲 [start, end)（end=None は末尾まで）
+
+    def mark_all(self):
+        """画面全体を再描画対象にする"""
+        self.full = True
+        self.ranges.clear()
+
+    def mark_lines(self, start: int, end: Optional[int] = None):
+        """バッファ行 [start, end) を再描画対象にする（end=None は以降すべて）"""
+        if self.full:
+            return
+        if end is not None and end <= start:
+            end = start + 1
+        self.ranges.append((start, end))
+
+    def update(self, other: 'DamageTracker'):
+        """other の再描画領域を追加"""
+        if other.full:
+            self.mark_all()
+        elif not self.full:
+            self.ranges.extend(other.ranges)
+
+    def is_dirty(self) -> bool:
+        """再描画が必要な領域があるか"""
+        return self.full or bool(self.ranges)
+
+    def is_line_damaged(self, line: int) -> bool:
+        """バッファ行が再描画対象か"""
+        if self.full:
+            return True
+        for start, end in self.ranges:
+            if start <= line and (end is None or line < end):
+                return True
+        return False
+
+    def clear(self):
+        """記録をリセット（描画後に呼ぶ）"""
+        self.full = False
+        self.ranges.clear()
@@ -2,11 +2,21 @@
 Editor Display
 
 エディタの表示を一元管理するシンプルなクラス
+
+横スクロール位置（scroll_x）は文字数ではなく表示桁で持つ。
+全角文字・タブの幅は LayoutCache で行ごとに求める。
+
+折り返し表示（wrap）では横スクロールせず、先頭行（scroll_y）とその行内で
+隠れている画面行数（wrap_skip）で表示位置を持つ。
 """
 
+import bisect
 import curses
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from .color_manager import color_manager
+from .damage import DamageTracker
+from .line_layout import LayoutCache, LineLayout
+from .wrap_layout import WrapLayout
 
 class EditorDisplay:
     """エディタ表示管理クラス"""
@@ -16,42 +26,215 @@ class EditorDisplay:
         self.current_line_highlight = True
         self.line_num_width = 4
         self.scroll_y = 0
-        self.scroll_x = 0
+        self.scroll_x = 0             # 横スクロール位置（表示桁）
+        self.layouts = LayoutCache()  # 行ごとの文字位置と表示桁の対応
+        self._last_layout = None      # 前回描画時のレイアウト（変化したら全体を再描画）
+        self._last_cursor_row = None  # 前回描画時のカーソル行（カレント行ハイライト用）
+        self.match_provider = None    # 行番号 -> 検索マッチ範囲のリスト（表示中の行だけ問い合わせる）
+        self.highlighter = None       # 構文ハイライト（SyntaxHighlighter）
+        self.syntax_highlight = True
+        self.wrap = False
+        self.wrap_skip = 0                 # 折り返し表示で先頭行のうち隠れている画面行数
+        self.wrap_layout = WrapLayout()    # バッファ行と画面行の対応（折り返し表示用）
+        self._drawn_at = {}                # 折り返し表示で前回描画した行 -> (先頭の画面行, 画面行数)
+        self._cursor_screen = None         # 折り返し表示でのカーソルの座標（描画領域の左上から）
     
     def render(self, stdscr, lines: List[str], cursor_row: int, cursor_col: int, 
-               start_y: int, start_x: int, height: int, width: int):
-        """エディタを描画"""
-        # スクロール位置を更新
-        self._update_scroll(cursor_row, cursor_col, height, width)
+               start_y: int, start_x: int, height: int, width: int,
+               damage: Optional[DamageTracker] = None) -> bool:
+        """エディタを描画（damage 指定時は再描画が必要な行だけ描き直す）
+
+        画面全体を描き直した場合は True を返す
+        """
+        if self.wrap:
+            return self._render_wrapped(stdscr, lines, cursor_row, cursor_col,
+                                        start_y, start_x, height, width, damage)
+        if self.wrap_layout.total_lines:
+            self.wrap_layout.clear()
+            self.wrap_skip = 0
         
-        # 表示範囲を計算
-        display_start = self.scroll_y
-        display_end = min(display_start + height, len(lines))
+        # スクロール位置を更新（カーソルのある文字全体が見えるように）
+        layouts = self.layouts
+        cursor_layout = layouts.get(lines, cursor_row)
+        self._update_scroll(cursor_row, cursor_layout.char_to_col(cursor_col), height, width,
+                            cursor_layout.char_to_col(cursor_col + 1))
         
         # 行番号の幅を計算
         if self.show_line_numbers:
             self.line_num_width = self._calculate_line_num_width(len(lines))
         
+        if damage is None:
+            damage = DamageTracker()
+        
+        highlighter = self.highlighter if self.syntax_highlight else None
+        lexer = highlighter.lexer if highlighter is not None else None
+        
+        # スクロール・行番号幅・表示設定・バッファ・言語が変わった場合は全体を再描画
+        layout = (self.scroll_y, self.scroll_x, self.line_num_width, self.show_line_numbers,
+                  self.current_line_highlight, start_y, start_x, height, width, id(lines), lexer,
+                  layouts.tab_size, False)
+        self._mark_damage(damage, layout, lines, cursor_row, highlighter, self.scroll_y + height)
+        
+        full = damage.full
+        if full:
+            stdscr.erase()
+        
         # コンテンツ領域の開始位置
         content_x = start_x + (self.line_num_width if self.show_line_numbers else 0)
         content_width = width - (self.line_num_width if self.show_line_numbers else 0)
         
-        # 各行を描画
-        for i in range(display_end - display_start):
+        # 再描画が必要な行を描画（バッファ末尾より後ろの行は消去のみ）
+        total = len(lines)
+        for i in range(height):
+            line_idx = self.scroll_y + i
+            if not full:
+                if not damage.is_line_damaged(line_idx):
+                    continue
+                try:
+                    stdscr.move(start_y + i, start_x)
+                    stdscr.clrtoeol()
+                except curses.error:
+                    pass
+            if line_idx >= total:
+                if full:
+                    break
+                continue
             y = start_y + i
-            line_idx = display_start + i
-            line = lines[line_idx] if line_idx < len(lines) else ""
             
             # 行番号を描画
             if self.show_line_numbers:
                 self._draw_line_number(stdscr, y, start_x, line_idx + 1)
             
             # 行内容を描画
-            self._draw_line_content(stdscr, y, content_x, line, content_width, 
-                                  line_idx == cursor_row)
+            self._draw_row(stdscr, y, content_x, lines, line_idx, layouts.get(lines, line_idx),
+                           self.scroll_x, content_width, line_idx == cursor_row, highlighter)
+        return full
+    
+    def _render_wrapped(self, stdscr, lines, cursor_row: int, cursor_col: int,
+                        start_y: int, start_x: int, height: int, width: int,
+                        damage: Optional[DamageTracker]) -> bool:
+        """折り返し表示で描画（表示される行だけ現在の幅で折り返す）"""
+        layouts = self.layouts
+        wrap = self.wrap_layout
+        if self.show_line_numbers:
+            self.line_num_width = self._calculate_line_num_width(len(lines))
+        content_x = start_x + (self.line_num_width if self.show_line_numbers else 0)
+        content_width = max(1, width - (self.line_num_width if self.show_line_numbers else 0))
+        wrap.sync(lines)
+        wrap.set_width(content_width)
+        self.scroll_x = 0
+        self._cursor_screen = None
+        
+        # カーソルが見えるように先頭行を決める
+        cursor_layout = layouts.get(lines, cursor_row)
+        cursor_x = cursor_layout.char_to_col(cursor_col)
+        breaks = cursor_layout.wrap(wrap.width)
+        cursor_sub = bisect.bisect_right(breaks, cursor_x) - 1
+        self._update_scroll_wrapped(lines, cursor_row, cursor_sub, height)
+        
+        if damage is None:
+            damage = DamageTracker()
+        highlighter = self.highlighter if self.syntax_highlight else None
+        lexer = highlighter.lexer if highlighter is not None else None
+        layout = (self.scroll_y, self.wrap_skip, self.line_num_width, self.show_line_numbers,
+                  self.current_line_highlight, start_y, start_x, height, width, id(lines), lexer,
+                  layouts.tab_size, True)
+        self._mark_damage(damage, layout, lines, cursor_row, highlighter, self.scroll_y + height)
+        
+        full = damage.full
+        if full:
+            stdscr.erase()
+            self._drawn_at = {}
+        
+        # 画面上の位置・画面行数が前回と変わった行も描き直す
+        drawn_at = {}
+        total = len(lines)
+        y = 0
+        line_idx = self.scroll_y
+        skip = self.wrap_skip
+        while y < height and line_idx < total:
+            line_layout = layouts.get(lines, line_idx)
+            breaks = line_layout.wrap(wrap.width)
+            rows = wrap.line_rows(line_idx, line_layout)
+            position = (y - skip, rows)
+            drawn_at[line_idx] = position
+            is_current = line_idx == cursor_row
+            if is_current:
+                self._cursor_screen = (y - skip + cursor_sub,
+                                       content_x - start_x + cursor_x - breaks[cursor_sub])
+            redraw = full or damage.is_line_damaged(line_idx) or self._drawn_at.get(line_idx) != position
+            for sub in range(skip, rows):
+                if y >= height:
+                    break
+                if redraw:
+                    if not full:
+                        self._clear_row(stdscr, start_y + y, start_x)
+                    if self.show_line_numbers:
+                        self._draw_line_number(stdscr, start_y + y, start_x, line_idx + 1 if sub == 0 else None)
+                    left = breaks[sub]
+                    right = breaks[sub + 1] if sub + 1 < rows else left + content_width
+                    self._draw_row(stdscr, start_y + y, content_x, lines, line_idx, line_layout,
+                                   left, right - left, is_current, highlighter)
+                y += 1
+            skip = 0
+            line_idx += 1
+        
+        # バッファ末尾より後ろの画面行は消去
+        if not full:
+            for rest in range(y, height):
+                self._clear_row(stdscr, start_y + rest, start_x)
+        self._drawn_at = drawn_at
+        return full
     
-    def _update_scroll(self, cursor_row: int, cursor_col: int, height: int, width: int):
-        """スクロール位置を更新"""
+    def _mark_damage(self, damage: DamageTracker, layout: tuple, lines, cursor_row: int,
+                     highlighter, end_row: int):
+        """表示設定・カーソル行・字句解析状態の変化に応じて再描画範囲を追加"""
+        # スクロール・行番号幅・表示設定・バッファ・言語が変わった場合は全体を再描画
+        if layout != self._last_layout:
+            damage.mark_all()
+            self._last_layout = layout
+        
+        # カレント行が変わった場合は新旧の行を再描画
+        if cursor_row != self._last_cursor_row:
+            if self.current_line_highlight and self._last_cursor_row is not None:
+                damage.mark_lines(self._last_cursor_row, self._last_cursor_row + 1)
+                damage.mark_lines(cursor_row, cursor_row + 1)
+            self._last_cursor_row = cursor_row
+        
+        # 編集で後続行の字句解析状態が変わった場合（三重引用符の開閉など）は以降の表示行も描き直す
+        if highlighter is not None and highlighter.lexer is not None:
+            changed = highlighter.prepare(lines, end_row)
+            if changed is not None and changed < end_row:
+                damage.mark_lines(max(changed, self.scroll_y), end_row)
+    
+    def _draw_row(self, stdscr, y: int, x: int, lines, line_idx: int, layout: LineLayout,
+                  left: int, width: int, is_current: bool, highlighter):
+        """行の表示桁 [left, left + width) を描画（構文ハイライト・検索マッチを重ねる）"""
+        self._draw_line_content(stdscr, y, x, layout, left, width, is_current)
+        if highlighter is not None and highlighter.lexer is not None:
+            tokens = highlighter.line_tokens(lines, line_idx)
+            if tokens:
+                self._draw_tokens(stdscr, y, x, layout, left, width, tokens,
+                                  is_current and self.current_line_highlight)
+        if self.match_provider is not None:
+            spans = self.match_provider(line_idx)
+            if spans:
+                self._draw_matches(stdscr, y, x, layout, left, width, spans)
+    
+    def _clear_row(self, stdscr, y: int, x: int):
+        try:
+            stdscr.move(y, x)
+            stdscr.clrtoeol()
+        except curses.error:
+            pass
+    
+    def invalidate(self):
+        """次回の描画で全体を描き直す"""
+        self._last_layout = None
+    
+    def _update_scroll(self, cursor_row: int, cursor_x: int, height: int, width: int,
+                       cursor_end_x: Optional[int] = None):
+        """スクロール位置を更新（cursor_x はカーソルの表示桁、cursor_end_x はその文字の右端）"""
         # 縦スクロール
         if cursor_row < self.scroll_y:
             self.scroll_y = cursor_row
@@ -60,10 +243,69 @@ class EditorDisplay:
         
         # 横スクロール
         content_width = width - (self.line_num_width if self.show_line_numbers else 0)
-        if cursor_col < self.scroll_x:
-            self.scroll_x = cursor_col
-        elif cursor_col >= self.scroll_x + content_width:
-            self.scroll_x = cursor_col - content_width + 1
+        cursor_end_x = max(cursor_x + 1, cursor_end_x or 0)
+        if cursor_x < self.scroll_x:
+            self.scroll_x = cursor_x
+        elif cursor_end_x > self.scroll_x + content_width:
+            self.scroll_x = max(0, min(cursor_x, cursor_end_x - content_width))
+    
+    def _update_scroll_wrapped(self, lines, cursor_row: int, cursor_sub: int, height: int):
+        """折り返し表示のスクロール位置を更新（cursor_sub はカーソル行内の画面行）
+
+        調べるのは先頭行からカーソル行まで、または画面1枚分の行だけ
+        """
+        wrap = self.wrap_layout
+        layouts = self.layouts
+        
+        def rows_of(line: int) -> int:
+            return wrap.line_rows(line, layouts.get(lines, line))
+        
+        top = min(self.scroll_y, max(0, len(lines) - 1))
+        skip = min(self.wrap_skip, rows_of(top) - 1)
+        if cursor_row < top or (cursor_row == top and cursor_sub < skip):
+            top, skip = cursor_row, cursor_sub
+        elif cursor_row - top >= height or (
+                sum(rows_of(line) for line in range(top, cursor_row)) - skip + cursor_sub >= height):
+            # カーソルが画面の最下行に来るように上へたどる
+            top, skip = cursor_row, cursor_sub
+            remaining = height - 1
+            if skip > remaining:
+                skip -= remaining
+                remaining = 0
+            else:
+                remaining -= skip
+                skip = 0
+            while remaining > 0 and top > 0:
+                rows = rows_of(top - 1)
+                top -= 1
+                if rows > remaining:
+                    skip = rows - remaining
+                    break
+                remaining -= rows
+        self.scroll_y, self.wrap_skip = top, skip
+    
+    def scroll_rows(self, lines, cursor_row: int, cursor_col: int, delta: int) -> int:
+        """表示を delta 画面行スクロールし、カーソルの移動先の行を返す（ページ移動用）"""
+        total = len(lines)
+        if total == 0:
+            return 0
+        if not self.wrap or self.wrap_layout.width == 0:
+            top = max(0, min(self.scroll_y + delta, total - 1))
+            moved = top - self.scroll_y
+            self.scroll_y = top
+            return max(0, min(cursor_row + moved, total - 1))
+        
+        # 折り返し表示では画面行の索引で O(log n) で求める（未表示の行は見積もり）
+        wrap = self.wrap_layout
+        wrap.sync(lines)
+        cursor_layout = self.layouts.get(lines, cursor_row)
+        cursor_sub = bisect.bisect_right(cursor_layout.wrap(wrap.width),
+                                         cursor_layout.char_to_col(cursor_col)) - 1
+        top_row = wrap.row_of_line(self.scroll_y) + self.wrap_skip
+        cursor_screen_row = wrap.row_of_line(cursor_row) + cursor_sub
+        new_top = max(0, min(top_row + delta, wrap.total_rows - 1))
+        self.scroll_y, self.wrap_skip = wrap.line_at_row(new_top)
+        return wrap.line_at_row(cursor_screen_row + new_top - top_row)[0]
     
     def _calculate_line_num_width(self, total_lines: int) -> int:
         """行番号の幅を計算"""
@@ -72,9 +314,9 @@ class EditorDisplay:
         digits = len(str(total_lines))
         return max(4, digits + 2)
     
-    def _draw_line_number(self, stdscr, y: int, x: int, line_num: int):
-        """行番号を描画"""
-        line_num_str = str(line_num).rjust(self.line_num_width - 2)
+    def _draw_line_number(self, stdscr, y: int, x: int, line_num: Optional[int]):
+        """行番号を描画（None は折り返した続きの行）"""
+        line_num_str = str(line_num if line_num is not None else '').rjust(self.line_num_width - 2)
         style = color_manager.get_style(0, 'dim')
         
         try:
@@ -83,10 +325,10 @@ class EditorDisplay:
         except curses.error:
             pass
     
-    def _draw_line_content(self, stdscr, y: int, x: int, line: str, width: int, is_current: bool):
-        """行内容を描画"""
-        # 横スクロールを適用
-        display_line = line[self.scroll_x:self.scroll_x + width]
+    def _draw_line_content(self, stdscr, y: int, x: int, layout: LineLayout, left: int, width: int,
+                           is_current: bool):
+        """行内容の表示桁 [left, left + width) を描画"""
+        display_line = layout.slice(left, left + width)
         
         # スタイルを決定
         style = curses.A_NORMAL
@@ -96,16 +338,54 @@ class EditorDisplay:
         try:
             stdscr.addstr(y, x, display_line, style)
         except curses.error:
-            safe_line = display_line[:width-1]
+            safe_line = layout.slice(left, left + width - 1)
             if safe_line:
                 try:
                     stdscr.addstr(y, x, safe_line, style)
                 except curses.error:
                     pass
     
+    def _draw_span(self, stdscr, y: int, x: int, layout: LineLayout, left: int, width: int,
+                   start: int, end: int, style: int) -> bool:
+        """文字範囲 [start, end) を重ねて描画（表示範囲より右なら False）"""
+        right = left + width
+        start_x = layout.char_to_col(start)
+        if start_x >= right:
+            return False
+        end_x = layout.char_to_col(end)
+        if end_x <= left:
+            return True
+        start_x = max(start_x, left)
+        try:
+            stdscr.addstr(y, x + start_x - left, layout.slice(start_x, min(end_x, right)), style)
+        except curses.error:
+            pass
+        return True
+    
+    def _draw_tokens(self, stdscr, y: int, x: int, layout: LineLayout, left: int, width: int,
+                     tokens: List[Tuple[int, int, str]], is_current: bool):
+        """構文トークンを重ねて描画（表示範囲内のみ）"""
+        for start, end, kind in tokens:
+            style = color_manager.get_syntax_style(kind, is_current)
+            if not self._draw_span(stdscr, y, x, layout, left, width, start, end, style):
+                break
+    
+    def _draw_matches(self, stdscr, y: int, x: int, layout: LineLayout, left: int, width: int,
+                      spans: List[Tuple[int, int]]):
+        """検索マッチ部分を重ねて描画（表示範囲内のみ）"""
+        style = color_manager.get_search_match_style()
+        for start, end in spans:
+            if not self._draw_span(stdscr, y, x, layout, left, width, start, end, style):
+                break
+    
     def get_cursor_screen_pos(self, cursor_row: int, cursor_col: int, 
-                             start_y: int, start_x: int) -> Tuple[int, int]:
-        """カーソルの画面座標を取得"""
+                             start_y: int, start_x: int, lines=None) -> Tuple[int, int]:
+        """カーソルの画面座標を取得（lines を渡すと全角文字・タブの幅を考慮する）"""
+        if self.wrap and self._cursor_screen is not None:
+            return start_y + self._cursor_screen[0], start_x + self._cursor_screen[1]
+        cursor_x = cursor_col
+        if lines is not None:
+            cursor_x = self.layouts.get(lines, cursor_row).char_to_col(cursor_col)
         screen_y = start_y + (cursor_row - self.scroll_y)
-        screen_x = start_x + (self.line_num_width if self.show_line_numbers else 0) + (cursor_col - self.scroll_x)
+        screen_x = start_x + (self.line_num_width if self.show_line_numbers else 0) + (cursor_x - self.scroll_x)
         return screen_y, screen_x 
\ No newline at end of file
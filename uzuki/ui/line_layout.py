@@ -0,0 +1,162 @@
+"""
+Line Layout
+
+バッファの行の文字位置と表示桁の対応を求め、行ごとにキャッシュする。
+
+全角文字は2桁、タブは次のタブ位置まで、結合文字は0桁として扱う。
+ASCII の印字可能文字だけの行は文字位置 = 表示桁なので対応表を作らない。
+"""
+
+import bisect
+from collections import OrderedDict
+from itertools import accumulate
+from typing import List, Optional
+from uzuki.utils.text_width import char_width, display_char
+
+
+class LineLayout:
+    """1行の文字位置と表示桁の対応"""
+
+    __slots__ = ('text', 'width', '_cols', '_wrap_width', '_breaks')
+
+    def __init__(self, text: str, tab_size: int = 4):
+        self.text = text
+        self._cols: Optional[List[int]] = None  # 文字 i の開始桁（末尾に行の幅）
+        self._wrap_width = 0
+        self._breaks: List[int] = [0]
+        if text.isascii() and text.isprintable():
+            self.width = len(text)
+            return
+        if '\t' in text:
+            cols = []
+            col = 0
+            for char in text:
+                cols.append(col)
+                if char == '\t':
+                    col += tab_size - col % tab_size
+                else:
+                    col += char_width(char)
+            cols.append(col)
+        else:
+            cols = list(accumulate(map(char_width, text), initial=0))
+        self._cols = cols
+        self.width = cols[-1]
+
+    def char_to_col(self, index: int) -> int:
+        """文字位置 -> 表示桁（行末より後ろは1文字1桁とみなす）"""
+        cols = self._cols
+        if cols is None:
+            return index
+        if index < len(cols):
+            return cols[max(0, index)]
+        return self.width + index - (len(cols) - 1)
+
+    def col_to_char(self, col: int) -> int:
+        """表示桁 -> その桁を含む文字の位置"""
+        cols = self._cols
+        if cols is None:
+            return col
+        if col >= self.width:
+            return len(cols) - 1 + col - self.width
+        return bisect.bisect_right(cols, col) - 1
+
+    def wrap(self, width: int) -> List[int]:
+        """幅 width で折り返したときの各画面行の開始桁（全角文字・タブは行をまたがない）"""
+        if width == self._wrap_width:
+            return self._breaks
+        cols = self._cols
+        total = self.width
+        if cols is None:
+            breaks = list(range(0, total, width)) or [0]
+        else:
+            breaks = [0]
+            start = 0
+            while total - start > width:
+                end = start + width
+                index = bisect.bisect_right(cols, end) - 1
+                if start < cols[index] < end:
+                    # 右端で切れる文字は次の行へ送る
+                    end = cols[index]
+                breaks.append(end)
+                start = end
+        self._wrap_width = width
+        self._breaks = breaks
+        return breaks
+
+    def slice(self, left: int, right: int) -> str:
+        """表示桁 [left, right) に表示する文字列
+
+        タブは空白に展開し、範囲の端で切れる全角文字・タブは空白で埋める
+        """
+        cols = self._cols
+        if cols is None:
+            return self.text[left:right]
+        text = self.text
+        count = len(text)
+        right = min(right, self.width)
+        if left >= right:
+            return ''
+        index = bisect.bisect_right(cols, left) - 1
+        parts = []
+        if cols[index] < left:
+            # 左端で切れる文字
+            parts.append(' ' * (min(cols[index + 1], right) - left))
+            index += 1
+        while index < count and cols[index + 1] <= right:
+            char = text[index]
+            if char == '\t':
+                parts.append(' ' * (cols[index + 1] - cols[index]))
+            else:
+                parts.append(display_char(char))
+            index += 1
+        if index < count and cols[index] < right:
+            # 右端で切れる文字
+            parts.append(' ' * (right - cols[index]))
+        return ''.join(parts)
+
+
+class LayoutCache:
+    """行ごとの LineLayout のキャッシュ"""
+
+    CACHE_SIZE = 2048  # 保持する行数
+
+    def __init__(self, tab_size: int = 4):
+        self.tab_size = tab_size
+        self._layouts: "OrderedDict[int, LineLayout]" = OrderedDict()
+        self._lines = None  # キャッシュが対応する行ストア
+
+    def set_tab_size(self, tab_size: int):
+        """タブ幅を設定（変わったらキャッシュを捨てる）"""
+        if tab_size > 0 and tab_size != self.tab_size:
+            self.tab_size = tab_size
+            self._layouts.clear()
+
+    def attach(self, buffer):
+        """バッファの編集を監視する"""
+        buffer.add_edit_listener(self.on_edit)
+
+    def on_edit(self, kind: str, row: int, col: int, text: str):
+        """編集された行のキャッシュを捨てる（行数が変わる場合は以降の行も）（Buffer の編集リスナー）"""
+        layouts = self._layouts
+        if '\n' not in text:
+            layouts.pop(row, None)
+            return
+        for line in [line for line in layouts if line >= row]:
+            del layouts[line]
+
+    def get(self, lines, row: int) -> LineLayout:
+        """row 行目のレイアウトを取得"""
+        layouts = self._layouts
+        if lines is not self._lines:
+            self._lines = lines
+            layouts.clear()
+        text = lines[row] if 0 <= row < len(lines) else ''
+        layout = layouts.get(row)
+        if layout is not None and (layout.text is text or layout.text == text):
+            layouts.move_to_end(row)
+            return layout
+        layout = LineLayout(text, self.tab_size)
+        layouts[row] = layout
+        if len(layouts) > self.CACHE_SIZE:
+            layouts.popitem(last=False)
+        return layout
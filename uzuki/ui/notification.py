@@ -1,8 +1,9 @@
 import time
 import curses
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from uzuki.utils.text_width import char_width, str_width
 
 class NotificationLevel(Enum):
     """通知レベル"""
@@ -58,9 +59,10 @@ class NotificationManager:
         
         self.notifications.append(notification)
         
-        # 最大数を超えた場合、古い通知を削除
+        # 最大数を超えた場合、古い通知を削除（期限のない通知はなるべく残す）
         if len(self.notifications) > self.max_notifications:
-            self.notifications.pop(0)
+            expiring = [n for n in self.notifications if n.duration != float('inf')]
+            self.notifications.remove(expiring[0] if expiring else self.notifications[0])
         
         return notification.id
     
@@ -132,34 +134,43 @@ class NotificationRenderer:
         }
     
     def render(self, stdscr, max_width: int, start_y: int) -> int:
-        """通知を描画し、使用した行数を返す"""
-        active_notifications = self.manager.get_active()
-        
-        if not active_notifications:
-            return 0
-        
-        used_lines = 0
+        """通知を start_y 行目から上に描画し、使用した行数を返す"""
+        lines = self.lines(max_width, start_y + 1)
+        top = start_y - len(lines) + 1
+        for i, (text, color) in enumerate(lines):
+            stdscr.addstr(top + i, 0, text, color)
+        return len(lines)
+    
+    def lines(self, max_width: int, max_lines: int) -> List[Tuple[str, int]]:
+        """表示する行 (テキスト, 色) を古い順に取得（入りきらなければ新しい通知を優先する）
         
-        for notification in active_notifications:
-            if start_y - used_lines < 0:
+        改行を含む通知は複数行にし、残りの行に収まらない分は省略する
+        """
+        result: List[Tuple[str, int]] = []
+        for notification in reversed(self.manager.get_active()):
+            room = max_lines - len(result)
+            if room <= 0:
                 break
-            
-            # 通知メッセージを準備
             prefix = self.prefixes.get(notification.level, "[INFO]")
-            message = f"{prefix} {notification.message}"
-            
-            # 画面幅に収まるように切り詰め
-            if len(message) > max_width - 1:
-                message = message[:max_width-4] + "..."
-            
-            # 色を設定
+            texts = f"{prefix} {notification.message}".split('\n')
+            if len(texts) > room:
+                hidden = len(texts) - room + 1
+                texts = texts[:room - 1] + [f"... ({hidden} more lines)"] if room > 1 else texts[:1]
             color = self.manager.get_color(notification.level)
-            
-            # 通知を描画
-            stdscr.addstr(start_y - used_lines, 0, message[:max_width-1], color)
-            used_lines += 1
-        
-        return used_lines
+            result[0:0] = [(self._fit(text, max_width - 1), color) for text in texts]
+        return result
+    
+    @staticmethod
+    def _fit(text: str, width: int) -> str:
+        """表示幅に収まるように切り詰める"""
+        if str_width(text) <= width:
+            return text
+        used = 0
+        for i, char in enumerate(text):
+            used += char_width(char)
+            if used > width - 3:
+                return text[:i] + "..."
+        return text
     
     def set_prefixes(self, prefixes: Dict[NotificationLevel, str]):
         """プレフィックスを設定"""
@@ -0,0 +1,64 @@
+"""
+Render Scheduler
+
+描画するタイミングを決める。入力が続いている間（キーリピートやマクロ再生中）は
+途中のフレームを飛ばし、入力が途切れたとき、または最大 fps で決まる締め切りを
+過ぎたときだけ描画する。描画・スキップしたフレーム数を数える。
+
+直前のフレームから締め切りまでの間は次の入力を待ち、届けば描画せずに処理する。
+しばらく入力がなかった後のキーは待たずにすぐ描画する。
+"""
+
+import time
+from typing import Callable, Dict
+
+
+class RenderScheduler:
+    """入力状況に応じて描画をまとめるスケジューラ"""
+
+    DEFAULT_MAX_FPS = 60
+
+    def __init__(self, max_fps: float = DEFAULT_MAX_FPS, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.frame_interval = 0.0
+        self.set_max_fps(max_fps)
+        self.last_frame_time = None  # 最後に描画した時刻
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+
+    def set_max_fps(self, max_fps: float):
+        """最大 fps を設定（0 以下なら制限しない）"""
+        self.frame_interval = 1.0 / max_fps if max_fps and max_fps > 0 else 0.0
+
+    def time_until_deadline(self) -> float:
+        """次のフレームの締め切りまでの秒数（過ぎていれば 0）"""
+        if self.last_frame_time is None:
+            return 0.0
+        return max(0.0, self.last_frame_time + self.frame_interval - self.clock())
+
+    def should_render(self, input_pending: bool) -> bool:
+        """今描画すべきかを判定（入力待ちがなければ常に描画）"""
+        if not input_pending or self.last_frame_time is None:
+            return True
+        return self.clock() - self.last_frame_time >= self.frame_interval
+
+    def frame_rendered(self):
+        """フレームを描画したことを記録"""
+        self.last_frame_time = self.clock()
+        self.frames_rendered += 1
+
+    def frame_skipped(self):
+        """フレームを飛ばしたことを記録"""
+        self.frames_skipped += 1
+
+    def reset_stats(self):
+        """カウンタをリセット"""
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+
+    def stats(self) -> Dict[str, int]:
+        """フレーム数の統計を取得"""
+        return {
+            'rendered': self.frames_rendered,
+            'skipped': self.frames_skipped,
+        }
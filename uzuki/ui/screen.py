@@ -9,23 +9,36 @@ import curses
 import time
 import sys
 import os
+import select
 from typing import Optional
 from uzuki.container import ServiceContainer
 from uzuki.controllers import (
     EditorController,
     FileController,
     ConfigController,
-    NotificationController
+    NotificationController,
+    SearchController,
+    FinderController,
+    WatchController,
+    AutoSaveController,
+    SwapController,
+    SessionController
 )
 from .ui_controller import UIController
 from uzuki.ui.notification import NotificationLevel
 from uzuki.ui.color_manager import color_manager
 from uzuki.utils.debug import init_debug_logger, get_debug_logger
+from uzuki.utils.text_width import str_width
 
 class Screen:
     """メインのスクリーン管理クラス"""
     
-    def __init__(self, initial_file: Optional[str] = None, show_greeting: bool = True, config_file: Optional[str] = None):
+    INPUT_BATCH_MAX = 16384  # 1フレームで処理する先読みキーの上限
+    PASTE_TIMEOUT_MS = 500   # ペースト終了マーカーを待つ時間
+    IDLE_POLL_MS = 100       # バックグラウンド処理中に入力待ちを切り上げる間隔
+    
+    def __init__(self, initial_file: Optional[str] = None, show_greeting: bool = True, config_file: Optional[str] = None,
+                 session_file: Optional[str] = None):
         # デバッグロガーを初期化
         self.debug_logger = init_debug_logger()
         self.debug_logger.info("Screen initialized")
@@ -35,8 +48,14 @@ class Screen:
         
         # コントローラーの初期化（依存関係の順序で）
         self.editor = EditorController(self)
+        self.search = SearchController(self)
         self.notifications = NotificationController(self)
         self.file = FileController(self)
+        self.finder = FinderController(self)
+        self.autosave = AutoSaveController(self)  # 書き終わりの反映が外部の変更の確認より先に走るように
+        self.watch = WatchController(self)
+        self.swap = SwapController(self)
+        self.session = SessionController(self)
         self.ui = UIController(self)
         self.config = ConfigController(self, config_file)
         
@@ -47,6 +66,10 @@ class Screen:
         # 設定を適用
         self.config.apply_config()
         
+        # セッションの復元（空文字列なら既定のセッションファイル）
+        if session_file is not None:
+            self.session.restore(session_file or None)
+        
         # 初期ファイルの読み込み
         if initial_file:
             self.file.load_initial_file(initial_file)
@@ -68,6 +91,10 @@ class Screen:
             # システムカーソルを有効化
             curses.curs_set(1)
             
+            # ブラケットペーストを有効化
+            if self.config.get_config('editor', 'bracketed_paste'):
+                self.editor.input_handler.enable_bracketed_paste()
+            
             # 通知システムの色を設定
             self.notifications.set_colors({
                 NotificationLevel.INFO: curses.A_NORMAL,
@@ -79,39 +106,110 @@ class Screen:
             # Greeting表示
             if self.show_greeting:
                 self._show_greeting()
+            else:
+                self.ui.set_show_greeting(False)
             
             self.debug_logger.info("Main loop started")
             
             while self.running:
-                # 画面を描画（常に描画）
-                self.ui.draw(self.stdscr)
+                # 変更があった場合のみ描画（変更領域だけを描き直す）
+                # 締め切りまでに次の入力が届いたらこのフレームは飛ばす
+                if self.editor.needs_redraw or self.ui.damage.is_dirty():
+                    scheduler = self.ui.scheduler
+                    if scheduler.should_render(self._input_pending(scheduler.time_until_deadline())):
+                        self.ui.draw(self.stdscr)
+                        self.editor.needs_redraw = False
+                        scheduler.frame_rendered()
+                    else:
+                        scheduler.frame_skipped()
+                        self._handle_keys(self._read_input())
+                        continue
                 
-                # カーソル位置を設定
+                # カーソル位置を設定して端末に反映
                 self._set_cursor_position()
+                self.ui.present(self.stdscr)
+                
+                # バックグラウンド処理中は入力がなくても定期的に戻って進捗を描画する
+                # （フックは True か、次に呼ばれるまでに待てる最大のミリ秒数を返す）
+                waits = [self.IDLE_POLL_MS if result is True else result
+                         for result in self.container.execute_hook('idle') if result]
+                self.stdscr.timeout(min(waits) if waits else -1)
                 
-                # キー入力を待つ
-                raw = self.stdscr.getch()
-                self._handle_key(raw)
+                # キー入力を待ち、溜まっている入力もまとめて処理してから描画する
+                self._handle_keys(self._read_input())
+            
+            # 正常に終了したときだけスワップファイルを消す（例外で抜けたときは復旧用に残す）
+            self.close_files()
                 
         except Exception as e:
             self.debug_logger.log_error(e, "Screen.run")
             raise
         finally:
             # クリーンアップ
+            stats = self.ui.scheduler.stats()
+            self.debug_logger.info(f"Frames rendered: {stats['rendered']}, skipped: {stats['skipped']}")
+            self.editor.input_handler.disable_bracketed_paste()
+            self.autosave.close()
             color_manager.cleanup()
             self.container.shutdown()
 
-    def _handle_key(self, raw_code: int):
-        """キー入力を処理"""
+    def close_files(self):
+        """残っている書き込みを終えてから、保存できたバッファのスワップファイルを消す（正常に終了するとき）"""
+        self.autosave.close()
+        self.swap.close(keep_modified=True)
+
+    def _read_input(self) -> list:
+        """入力を読み、キーコードとペーストブロックの列にする"""
+        input_handler = self.editor.input_handler
+        raw = self.stdscr.getch()
+        if raw == -1:
+            # タイムアウト（アイドル処理のため）
+            return []
+        events = input_handler.feed([raw] + self._drain_input())
+        
+        # ペーストの途中なら終了マーカーまで端末から直接まとめて読む（描画は挟まない）
+        fd = sys.stdin.fileno()
+        while input_handler.has_pending():
+            ready, _, _ = select.select([fd], [], [], self.PASTE_TIMEOUT_MS / 1000)
+            data = os.read(fd, 65536) if ready else b''
+            if not data:
+                events.extend(input_handler.flush_paste())
+                break
+            new_events, rest = input_handler.feed_bytes(data)
+            events.extend(new_events)
+            # ペースト後に続く入力は curses に戻してキー変換を通す
+            for code in reversed(rest):
+                curses.ungetch(code)
+        return events
+    
+    def _input_pending(self, timeout: float = 0) -> bool:
+        """読まれていない入力が端末に届いているか（最大 timeout 秒待つ）"""
         try:
-            self.editor.handle_key(raw_code)
-            
-            # エディタの状態に応じて画面を更新
-            if self.editor.needs_redraw:
-                self.ui.draw(self.stdscr)
-                self.editor.needs_redraw = False
+            ready, _, _ = select.select([sys.stdin.fileno()], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        return bool(ready)
+    
+    def _drain_input(self) -> list:
+        """ブロックせずに読める入力（貼り付けなどの先行入力）をすべて読む"""
+        codes = []
+        self.stdscr.nodelay(True)
+        try:
+            while len(codes) < self.INPUT_BATCH_MAX:
+                code = self.stdscr.getch()
+                if code == -1:
+                    break
+                codes.append(code)
+        finally:
+            self.stdscr.nodelay(False)
+        return codes
+    
+    def _handle_keys(self, events: list):
+        """キー入力をまとめて処理（描画はメインループでまとめて行う）"""
+        try:
+            self.editor.handle_keys([event for event in events if event != -1])
         except Exception as e:
-            self.debug_logger.log_error(e, "Screen._handle_key")
+            self.debug_logger.log_error(e, "Screen._handle_keys")
 
     def _show_greeting(self):
         """Greetingを表示"""
@@ -138,52 +236,21 @@ class Screen:
         """カーソル位置を設定"""
         try:
             # 現在のモードに応じてカーソル位置を設定
-            if self.editor.mode.mode_name == 'command':
-                # コマンドモードの場合はステータスラインのコマンド入力位置に
+            mode = self.editor.mode
+            if mode.mode_name in ('command', 'search', 'finder'):
+                # コマンド・検索入力中はステータスラインの入力位置に
                 height, width = self.stdscr.getmaxyx()
                 y = height - 1  # ステータスラインの行
                 
-                # ステータスラインの構築ロジックを直接使用してコマンド位置を計算
-                # モード、ファイル情報、位置情報、行数情報の長さを計算
-                mode_text = f"--{self.editor.mode.mode_name.upper()}--"
-                mode_width = 15
-                
-                # ファイル情報
-                file_info = self.screen.file.get_file_info()
-                filename_width = 0
-                encoding_width = 0
-                if file_info.get('filename'):
-                    filename_width = 30
-                if file_info.get('encoding'):
-                    encoding_width = 12
-                
-                # 位置情報
-                cursor_row = self.editor.cursor.row
-                cursor_col = self.editor.cursor.col
-                position_text = f"{cursor_row+1}:{cursor_col+1}"
-                position_width = 10
-                
-                # 行数情報
-                total_lines = len(self.editor.buffer.lines)
-                line_count_text = f"L{total_lines}"
-                line_count_width = 8
-                
-                # セパレータ
-                separator = " | "
-                separator_width = len(separator)
-                
-                # コマンドセグメントの開始位置を計算
-                # 左から: モード + セパレータ + ファイル名 + セパレータ + エンコーディング + セパレータ + 位置 + セパレータ + 行数 + セパレータ
-                cmd_start = mode_width + separator_width
-                if filename_width > 0:
-                    cmd_start += filename_width + separator_width
-                if encoding_width > 0:
-                    cmd_start += encoding_width + separator_width
-                cmd_start += position_width + separator_width + line_count_width + separator_width
-                
-                # コマンドテキストの長さ
-                cmd_text = f":{self.editor.mode.cmd_buf}"
-                x = cmd_start + len(cmd_text)
+                # 描画したステータスラインからコマンドセグメントの位置を求める
+                if mode.mode_name == 'command':
+                    cmd_text = f":{mode.cmd_buf}"
+                elif mode.mode_name == 'finder':
+                    cmd_text = f"{mode.prompt}{mode.query_buf}"
+                else:
+                    cmd_text = f"{mode.prompt}{mode.pattern_buf}"
+                cmd_start = self.ui.status_line.get_segment_offset('command', width) or 0
+                x = cmd_start + str_width(cmd_text)
                 
                 # 画面幅を超えないように調整
                 if x >= width:
@@ -196,9 +263,9 @@ class Screen:
                 cursor_col = self.editor.cursor.col
                 height, width = self.stdscr.getmaxyx()
                 
-                # エディタ表示からカーソルの画面座標を取得
-                screen_row, screen_col = self.ui.editor_display.get_cursor_screen_pos(
-                    cursor_row, cursor_col, 0, 0)
+                # アクティブなウィンドウからカーソルの画面座標を取得
+                screen_row, screen_col = self.ui.get_cursor_screen_pos(
+                    cursor_row, cursor_col, self.editor.buffer.lines)
                 
                 # カーソルが画面内にある場合のみ設定
                 if 0 <= screen_row < height - 1 and 0 <= screen_col < width:
@@ -243,9 +310,9 @@ class Screen:
         """ファイルを読み込み"""
         return self.file.load_file(filepath)
     
-    def save_file(self, filepath: Optional[str] = None):
-        """ファイルを保存"""
-        return self.file.save_file(filepath)
+    def save_file(self, filepath: Optional[str] = None, force: bool = False, wait: bool = False):
+        """ファイルを保存（force ならファイルが外部で変わっていても上書きする。wait なら書き終わるまで待つ）"""
+        return self.file.save_file(filepath, force, wait)
     
     def set_encoding(self, encoding: str):
         """エンコーディングを設定"""
@@ -1,6 +1,7 @@
 import curses
-from typing import Dict, Any, Callable, List, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from dataclasses import dataclass
+from uzuki.utils.text_width import str_width
 
 @dataclass
 class StatusSegment:
@@ -49,8 +50,21 @@ class StatusLineManager:
     
     def render_content(self, width: int) -> str:
         """ステータスラインの内容をレンダリング"""
+        return self.separator.join(content for _, content in self._layout(width))
+    
+    def get_segment_offset(self, name: str, width: int) -> Optional[int]:
+        """セグメントの表示開始位置を取得（表示されていなければ None）"""
+        offset = 0
+        for segment_name, content in self._layout(width):
+            if segment_name == name:
+                return offset
+            offset += str_width(content) + str_width(self.separator)
+        return None
+    
+    def _layout(self, width: int) -> List[Tuple[str, str]]:
+        """表示するセグメントを (名前, 幅を揃えた内容) の列で取得"""
         if not self.segments:
-            return ''
+            return []
         
         # 優先度順にソート
         sorted_segments = sorted(
@@ -101,22 +115,28 @@ class StatusLineManager:
                 else:  # left
                     content = content + ' ' * (seg_width - len(content))
             
-            result_parts.append(content)
+            result_parts.append((name, content))
         
-        return self.separator.join(result_parts)
+        return result_parts
     
     def update(self, content: str):
         """ステータスラインの内容を更新"""
         # 一時的なセグメントとして保存
         self.add_segment('temp', content, width=None, align='left', priority=0)
     
-    def render(self, stdscr):
-        """ステータスラインを描画"""
+    def render(self, stdscr, content: Optional[str] = None):
+        """ステータスラインを描画（content 省略時はここで組み立てる）"""
         height, width = stdscr.getmaxyx()
-        content = self.render_content(width)
+        if content is None:
+            content = self.render_content(width)
         
-        # 最下行に描画
+        # 最下行に描画（前回の内容が残らないよう行を消してから）
         y = height - 1
+        try:
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+        except curses.error:
+            pass
         try:
             stdscr.addstr(y, 0, content, self.default_style)
         except curses.error:
@@ -138,7 +158,7 @@ class StatusLineBuilder:
     
     def add_segment(self, name: str, content: str, width=None, align: str = 'left', priority: int = 0):
         """セグメントを追加"""
-        self.manager.add_segment(name, content, width, align, priority)
+        self.manager.add_segment(name, content, width, align, priority=priority)
         return self
     
     def build(self) -> str:
@@ -172,9 +192,9 @@ class StatusLineBuilder:
                                     width=20, align='center', priority=70)
         return self
     
-    def command(self, command: str):
-        """コマンド入力セグメント"""
-        self.manager.add_segment('command', f":{command}", 
+    def command(self, command: str, prompt: str = ':'):
+        """コマンド入力セグメント（検索では prompt に / や ? を指定）"""
+        self.manager.add_segment('command', f"{prompt}{command}", 
                                 width=None, align='left', priority=95)
         return self
     
@@ -193,5 +213,5 @@ class StatusLineBuilder:
     def custom(self, name: str, content: str, width: Optional[int] = None, 
                align: str = 'left', priority: int = 0):
         """カスタムセグメント"""
-        self.manager.add_segment(name, content, width, align, priority)
+        self.manager.add_segment(name, content, width, align, priority=priority)
         return self 
\ No newline at end of file
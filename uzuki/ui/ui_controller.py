@@ -1,37 +1,52 @@
 """
 UI Controller
 
-Manages UI rendering including screen drawing, status line, notifications,
-line display, and greeting screen.
+Manages UI rendering including screen drawing, split windows, status line,
+notifications, line display, and greeting screen.
 """
 
 import curses
 from typing import List, Optional
 from uzuki.ui.status_line import StatusLineManager, StatusLineBuilder
-from uzuki.ui.notification import NotificationLevel, NotificationManager
 from uzuki.ui.line_numbers import LineDisplayManager
 from uzuki.ui.color_manager import color_manager
 from uzuki.ui.cursor_display import cursor_display
+from uzuki.core.syntax import SyntaxHighlighter
 from uzuki.utils.screen_utils import GreetingRenderer
 from uzuki.utils.debug import get_debug_logger
 from .editor_display import EditorDisplay
+from .damage import DamageTracker
+from .line_layout import LayoutCache
+from .render_scheduler import RenderScheduler
+from .window import Window, WindowLayout
 
 class UIController:
     """UI描画を制御するコントローラー"""
     
+    LIST_MODES = ('file_browser', 'finder')  # エディタの代わりに一覧を表示するモード
+    
     def __init__(self, screen):
         self.screen = screen
         self.logger = get_debug_logger()
         
-        # 表示管理
-        self.editor_display = EditorDisplay()
+        # 表示管理（表示中のバッファの行レイアウトはウィンドウで共有する）
+        self.layout_cache = LayoutCache()
+        self.layout_cache.attach(screen.editor.buffer)
+        self.windows = WindowLayout(self._create_window(screen.file.buffers.current))
+        self._last_separators = None   # 前回描画した区切り
+        self.damage = DamageTracker()  # 再描画が必要な領域（表示中のバッファの行）
+        self._last_size = None         # 前回描画時の画面サイズ
+        self._last_mode = None         # 前回描画時のモード
+        self._last_status = None       # 前回描画したステータスライン
+        self.scheduler = RenderScheduler()  # 入力が続く間の描画をまとめる
         
         # ステータスライン
         self.status_line = StatusLineManager()
         self.status_builder = StatusLineBuilder(self.status_line)
         
-        # 通知
-        self.notifications = NotificationManager()
+        # 通知（ステータスラインの上のメッセージ欄に表示する）
+        self.message_height = 0        # メッセージ欄の行数
+        self._last_messages = None     # 前回描画したメッセージ欄
         
         # Greeting
         self.greeting = GreetingRenderer()
@@ -45,66 +60,297 @@ class UIController:
         
         self.logger.debug("UIController initialized")
     
+    @property
+    def current_window(self) -> Window:
+        """アクティブなウィンドウ"""
+        return self.windows.current
+    
+    @property
+    def editor_display(self) -> EditorDisplay:
+        """アクティブなウィンドウの表示"""
+        return self.windows.current.display
+    
+    def _create_window(self, entry, source: Optional[EditorDisplay] = None) -> Window:
+        """ウィンドウを作成（source の表示設定とスクロール位置を引き継ぐ）"""
+        display = EditorDisplay()
+        display.layouts = self.layout_cache
+        display.match_provider = self.screen.search.match_spans
+        display.highlighter = self.screen.editor.syntax
+        display.wrap_layout.attach(self.screen.editor.buffer)
+        if source is not None:
+            for name in ('show_line_numbers', 'current_line_highlight', 'syntax_highlight', 'wrap',
+                         'scroll_y', 'scroll_x', 'wrap_skip'):
+                setattr(display, name, getattr(source, name))
+        return Window(entry, display)
+    
     def draw(self, stdscr):
-        """画面を描画"""
+        """画面を描画（変更のあった領域のみ。端末への出力は present で行う）"""
         try:
             # 画面サイズを取得
             height, width = stdscr.getmaxyx()
+            if (height, width) != self._last_size:
+                self._last_size = (height, width)
+                self.damage.mark_all()
+            
+            # ファイルブラウザ・ファインダーは毎回全体を描画し、出入りの際も全体を描き直す
+            mode_name = self.screen.editor.mode.mode_name
+            if mode_name in self.LIST_MODES or self._last_mode in self.LIST_MODES:
+                self.damage.mark_all()
+            self._last_mode = mode_name
+            
+            full = self.damage.full
             
-            # 画面をクリア
-            stdscr.clear()
+            # メッセージ欄の行数を決める（行数が変わるとウィンドウの大きさが変わり描き直される）
+            messages = self.screen.notifications.lines(width, self.message_limit(height))
+            self.message_height = len(messages)
             
             # Greeting表示中でない場合はエディタコンテンツを描画
             if not self.show_greeting:
-                self._draw_editor_content(stdscr, width, height)
+                full = self._draw_editor_content(stdscr, width, height) or full
+            elif full:
+                stdscr.erase()
             
-            # ステータスラインを描画
-            self._draw_status_line(stdscr, width, height)
+            # メッセージ欄・ステータスラインを描画（内容が変わった場合のみ）
+            self._draw_messages(stdscr, messages, height, force=full)
+            self._draw_status_line(stdscr, width, height, force=full)
             
-            # 画面を更新
-            stdscr.refresh()
+            self.damage.clear()
             
         except Exception as e:
             self.logger.log_error(e, "UIController.draw")
     
-    def _draw_editor_content(self, stdscr, width: int, height: int):
-        """エディタコンテンツの描画"""
+    def present(self, stdscr):
+        """描画内容を端末に反映（差分のみ出力される）"""
+        try:
+            # 物理カーソルは最後に反映したウィンドウの位置になるので stdscr を最後にする
+            for window in self.windows.windows:
+                if window.win is not None:
+                    window.win.noutrefresh()
+            stdscr.noutrefresh()
+            curses.doupdate()
+        except curses.error:
+            pass
+    
+    def invalidate(self):
+        """次回の描画で画面全体を描き直す"""
+        self.damage.mark_all()
+        for window in self.windows.windows:
+            window.display.invalidate()
+    
+    def _draw_editor_content(self, stdscr, width: int, height: int) -> bool:
+        """エディタコンテンツの描画（画面全体を描き直した場合は True）"""
         try:
             # ファイルブラウザモードの場合は専用描画
             if self.screen.editor.mode.mode_name == 'file_browser':
+                stdscr.erase()
+                self.editor_display.invalidate()
                 self._draw_file_browser(stdscr, width, height)
-                return
+                return True
+            if self.screen.editor.mode.mode_name == 'finder':
+                stdscr.erase()
+                self.editor_display.invalidate()
+                self._draw_finder(stdscr, width, height)
+                return True
             
             # 通常のエディタコンテンツ描画（コマンドモードも含む）
             # コマンドモードの場合は、バッファの内容を表示し、ステータスラインでコマンドを表示
-            content_height = height - 1  # ステータスライン分を除く
+            content_height = height - 1 - self.message_height  # ステータスラインとメッセージ欄を除く
             
-            # バッファの内容を取得
-            lines = self.screen.editor.buffer.lines
-            if not lines or (len(lines) == 1 and lines[0] == ""):
-                # バッファが空の場合は空行を追加
+            # バッファが空の場合は空行を追加
+            if not self.screen.editor.buffer.lines:
                 self.screen.editor.buffer.lines = [""]
-                lines = self.screen.editor.buffer.lines
             
-            # エディタを描画（コマンドモードでもバッファの内容を表示）
-            cursor_row = self.screen.editor.cursor.row
-            cursor_col = self.screen.editor.cursor.col
-            self.editor_display.render(stdscr, lines, cursor_row, cursor_col, 
-                                     0, 0, content_height, width)
+            full = self.damage.full
+            if full:
+                stdscr.erase()
+            
+            # 各ウィンドウを自分のサブウィンドウに描画（変更が表示範囲にないウィンドウは何もしない）
+            self.windows.arrange(0, 0, content_height, width)
+            for window in self.windows.windows:
+                self._draw_window(stdscr, window)
+            self._draw_separators(stdscr, full)
+            return full
             
         except Exception as e:
             self.logger.log_error(e, "UIController._draw_editor_content")
+            return False
+    
+    def _draw_window(self, stdscr, window: Window):
+        """ウィンドウを描画"""
+        y, x, height, width = window.rect
+        if window.win is None or window.win_rect != window.rect:
+            try:
+                window.win = stdscr.derwin(height, width, y, x)
+            except curses.error:
+                window.win = None
+                return
+            window.win_rect = window.rect
+            window.damage.mark_all()
+        
+        editor = self.screen.editor
+        display = window.display
+        entry = window.entry
+        if entry is self.screen.file.buffers.current:
+            # 表示中のバッファ: 行レイアウト・字句解析状態・検索結果を共有し、変更行だけ描き直す
+            window.damage.update(self.damage)
+            lines = editor.buffer.lines
+            display.layouts = self.layout_cache
+            display.highlighter = editor.syntax
+            display.match_provider = self.screen.search.match_spans
+            window.private_layouts = window.private_highlighter = None
+        else:
+            # 退避中のバッファ: 内容は変わらないので自分のキャッシュで描く
+            if self.damage.full:
+                window.damage.mark_all()
+            lines = entry.lines
+            if lines is None:
+                return
+            if window.private_layouts is None:
+                window.private_layouts = LayoutCache(self.layout_cache.tab_size)
+                window.private_highlighter = SyntaxHighlighter()
+                window.private_highlighter.set_filename(None if entry.large else entry.file_manager.filename)
+            if entry.syntax is not None:
+                window.private_highlighter.set_state(entry.syntax)
+            display.layouts = window.private_layouts
+            display.highlighter = window.private_highlighter
+            display.match_provider = None
+        
+        if window is self.windows.current:
+            cursor_row, cursor_col = editor.cursor.row, editor.cursor.col
+        else:
+            cursor_row = max(0, min(window.cursor[0], len(lines) - 1))
+            cursor_col = max(0, min(window.cursor[1], len(lines[cursor_row])))
+        display.render(window.win, lines, cursor_row, cursor_col, 0, 0, height, width, window.damage)
+        window.damage.clear()
+        if entry.syntax is not None and display.highlighter is window.private_highlighter:
+            # 進めた字句解析状態をバッファ側に戻す
+            entry.syntax = window.private_highlighter.get_state()
+    
+    def _draw_separators(self, stdscr, full: bool):
+        """ウィンドウの区切りを描画（内容が前回と同じなら何もしない）"""
+        separators = []
+        for direction, y, x, length, window in self.windows.separators:
+            if direction == 'horizontal':
+                name = window.entry.name + (' [+]' if window.entry.is_modified else '')
+                separators.append((direction, y, x, length, f" {name} ", window is self.windows.current))
+            else:
+                separators.append((direction, y, x, length, '', False))
+        if not full and separators == self._last_separators:
+            return
+        self._last_separators = separators
+        for direction, y, x, length, text, active in separators:
+            try:
+                if direction == 'horizontal':
+                    style = color_manager.get_reverse_style()
+                    if not active:
+                        style |= curses.A_DIM
+                    stdscr.addstr(y, x, text[:length].ljust(length), style)
+                else:
+                    style = color_manager.get_style(0, 'dim')
+                    for row in range(y, y + length):
+                        stdscr.addstr(row, x, "│", style)
+            except curses.error:
+                pass
+    
+    # --- ウィンドウ操作 ---
+    def visible_buffers(self) -> set:
+        """ウィンドウに表示しているバッファ"""
+        return {window.entry for window in self.windows.windows}
+    
+    def replace_buffer(self, entry, replacement):
+        """entry を表示しているウィンドウに replacement を表示する（バッファを除くとき）"""
+        for window in self.windows.windows:
+            if window.entry is entry:
+                window.entry = replacement
+        self.invalidate()
+    
+    def split_window(self, direction: str = 'horizontal', filepath: Optional[str] = None) -> bool:
+        """アクティブなウィンドウを分割し、新しいウィンドウをアクティブにする"""
+        editor = self.screen.editor
+        current = self.windows.current
+        if current.rect is not None:
+            size = current.rect[2] if direction == 'horizontal' else current.rect[3]
+            if size < 3:
+                self.screen.notify_error("Not enough room")
+                return False
+        window = self._create_window(current.entry, current.display)
+        window.cursor = current.cursor = (editor.cursor.row, editor.cursor.col)
+        self.windows.split(current, window, direction)
+        self.windows.current = window
+        self.invalidate()
+        if filepath:
+            return self.screen.load_file(filepath)
+        return True
+    
+    def focus_window(self, window: Window):
+        """ウィンドウをアクティブにする（別のバッファならそのバッファに切り替える）"""
+        old = self.windows.current
+        if window is old:
+            return
+        editor = self.screen.editor
+        file = self.screen.file
+        old.cursor = (editor.cursor.row, editor.cursor.col)
+        switch = window.entry is not file.buffers.current
+        if switch:
+            file.stash_current()
+        self.windows.current = window
+        if switch:
+            display = window.display
+            scroll = (display.scroll_y, display.scroll_x, display.wrap_skip)
+            file.show_buffer(window.entry)
+            display.scroll_y, display.scroll_x, display.wrap_skip = scroll
+        lines = editor.buffer.lines
+        editor.cursor.row = max(0, min(window.cursor[0], len(lines) - 1))
+        editor.cursor.col = max(0, min(window.cursor[1], len(lines[editor.cursor.row])))
+        self._last_separators = None
+        editor.needs_redraw = True
+    
+    def focus_next_window(self, count: int = 1):
+        """並び順で count 個先のウィンドウをアクティブにする"""
+        self.focus_window(self.windows.next(self.windows.current, count))
+    
+    def focus_window_direction(self, direction: str):
+        """'h' / 'j' / 'k' / 'l' の方向のウィンドウをアクティブにする"""
+        editor = self.screen.editor
+        cursor = self.get_cursor_screen_pos(editor.cursor.row, editor.cursor.col, editor.buffer.lines)
+        window = self.windows.neighbor(self.windows.current, direction, cursor)
+        if window is not None:
+            self.focus_window(window)
+    
+    def close_window(self, window: Optional[Window] = None) -> bool:
+        """ウィンドウを閉じる（最後のウィンドウは閉じない）"""
+        window = window or self.windows.current
+        neighbor = self.windows.close(window)
+        if neighbor is None:
+            return False
+        if window is self.windows.current:
+            self.focus_window(neighbor)
+        window.display.wrap_layout.detach()
+        self.invalidate()
+        return True
+    
+    def only_window(self):
+        """アクティブなウィンドウ以外を閉じる"""
+        for window in self.windows.only(self.windows.current):
+            window.display.wrap_layout.detach()
+        self.invalidate()
+    
+    def get_cursor_screen_pos(self, cursor_row: int, cursor_col: int, lines=None):
+        """カーソルの画面座標（アクティブなウィンドウの位置を含む）"""
+        window = self.windows.current
+        top, left = window.rect[:2] if window.rect else (0, 0)
+        return window.display.get_cursor_screen_pos(cursor_row, cursor_col, top, left, lines)
     
     def _draw_file_browser(self, stdscr, width: int, height: int):
         """ファイルブラウザモードの描画"""
         try:
-            # ファイルブラウザの内容を取得
-            browser_content = self.screen.file.get_file_browser_content()
-            selection = self.screen.file.get_file_browser_selection()
-            
             # 利用可能な高さを計算（ステータスライン分を除く）
             available_height = height - 2
             
+            # ファイルブラウザの内容を取得（表示範囲の分だけ）
+            browser_content = self.screen.file.get_file_browser_content(available_height)
+            selection = self.screen.file.get_file_browser_selection()
+            
             # ファイルリストを描画
             for i, item in enumerate(browser_content[:available_height]):
                 try:
@@ -124,14 +370,55 @@ class UIController:
         except Exception as e:
             self.logger.log_error(e, "UIController._draw_file_browser")
     
-    def _draw_status_line(self, stdscr, width: int, height: int):
-        """ステータスラインを描画"""
+    def _draw_finder(self, stdscr, width: int, height: int):
+        """ファインダーの候補一覧の描画"""
+        try:
+            available_height = height - 1
+            results = self.screen.finder.get_results(available_height)
+            selection = self.screen.finder.get_selection_offset(available_height)
+            
+            for i, path in enumerate(results):
+                try:
+                    # 選択中の候補は反転表示
+                    style = color_manager.get_reverse_style() if i == selection else curses.A_NORMAL
+                    stdscr.addstr(i, 0, path[:width-1], style)
+                except curses.error:
+                    pass
+                    
+        except Exception as e:
+            self.logger.log_error(e, "UIController._draw_finder")
+    
+    @staticmethod
+    def message_limit(height: int) -> int:
+        """メッセージ欄の最大の行数（編集領域の半分まで）"""
+        return max(0, (height - 1) // 2)
+    
+    def _draw_messages(self, stdscr, messages, height: int, force: bool = False):
+        """通知をステータスラインの上に描画（内容が前回と同じなら何もしない）"""
+        if not force and messages == self._last_messages:
+            return
+        self._last_messages = messages
+        top = height - 1 - len(messages)
+        for i, (text, style) in enumerate(messages):
+            try:
+                stdscr.move(top + i, 0)
+                stdscr.clrtoeol()
+                stdscr.addstr(top + i, 0, text, style)
+            except curses.error:
+                pass
+    
+    def _draw_status_line(self, stdscr, width: int, height: int, force: bool = False):
+        """ステータスラインを描画（内容が前回と同じなら何もしない）"""
         try:
             # ステータスラインを構築
             self._build_status_line()
+            content = self.status_line.render_content(width)
+            if not force and content == self._last_status:
+                return
             
             # ステータスラインを描画
-            self.status_line.render(stdscr)
+            self.status_line.render(stdscr, content)
+            self._last_status = content
             
         except Exception as e:
             self.logger.log_error(e, "UIController._draw_status_line")
@@ -162,10 +449,41 @@ class UIController:
             self.status_builder.position(cursor_row, cursor_col)
             self.status_builder.line_count(total_lines)
             
+            # 読み込みの進捗を表示
+            load_status = self.screen.file.get_load_status()
+            if load_status:
+                self.status_builder.custom('loading', load_status, width=len(load_status),
+                                           align='right', priority=60)
+            
+            # 巨大ファイルモードを表示
+            if self.screen.file.buffers.current.large:
+                self.status_builder.custom('large', '[LARGE]', width=7, align='right', priority=45)
+            
+            # 自動保存の状態を表示
+            save_status = self.screen.autosave.get_status()
+            if save_status:
+                self.status_builder.custom('autosave', save_status, width=len(save_status),
+                                           align='right', priority=50)
+            
+            # 検索のマッチ数を表示
+            search_status = self.screen.search.get_status()
+            if search_status:
+                self.status_builder.custom('search', search_status, width=len(search_status),
+                                           align='right', priority=55)
+            
             # コマンドモードの場合はコマンドバッファを表示
             if mode_name == 'command':
                 cmd_text = self.screen.editor.mode.cmd_buf
                 self.status_builder.command(cmd_text)
+            elif mode_name == 'search':
+                search_mode = self.screen.editor.mode
+                self.status_builder.command(search_mode.pattern_buf, search_mode.prompt)
+            elif mode_name == 'finder':
+                finder_mode = self.screen.editor.mode
+                self.status_builder.command(finder_mode.query_buf, finder_mode.prompt)
+                finder_status = self.screen.finder.get_status()
+                self.status_builder.custom('finder', finder_status, width=len(finder_status),
+                                           align='right', priority=55)
             
         except Exception as e:
             self.logger.log_error(e, "UIController._build_status_line")
@@ -203,6 +521,7 @@ class UIController:
     def set_show_greeting(self, show: bool):
         """Greeting表示を設定"""
         self.show_greeting = show
+        self.invalidate()
         self.logger.debug(f"Show greeting set to: {show}")
     
     def toggle_line_numbers(self):
@@ -213,6 +532,21 @@ class UIController:
         """カレント行ハイライトを切り替え"""
         self.editor_display.current_line_highlight = not self.editor_display.current_line_highlight
     
+    def toggle_wrap(self):
+        """折り返し表示を切り替え"""
+        self.editor_display.wrap = not self.editor_display.wrap
+    
+    def scroll_page(self, pages: float):
+        """画面 pages 枚分スクロールし、カーソルも同じだけ移動（負なら上へ）"""
+        rect = self.windows.current.rect
+        height = rect[2] if rect else (self._last_size[0] if self._last_size else curses.LINES) - 1
+        delta = int(max(1, height) * pages) or (1 if pages > 0 else -1)
+        editor = self.screen.editor
+        row = self.editor_display.scroll_rows(editor.buffer.lines, editor.cursor.row,
+                                              editor.cursor.col, delta)
+        editor.cursor.move_to(row, editor.cursor.col, editor.buffer)
+        editor.needs_redraw = True
+    
     def toggle_ruler(self):
         """ルーラー表示を切り替え"""
         # ルーラー機能は現在未実装
@@ -239,6 +573,7 @@ class UIController:
         return {
             'line_numbers': self.editor_display.show_line_numbers,
             'current_line_highlight': self.editor_display.current_line_highlight,
+            'wrap': self.editor_display.wrap,
             'horizontal_offset': self.editor_display.scroll_x,
             'vertical_offset': self.editor_display.scroll_y
         } 
\ No newline at end of file
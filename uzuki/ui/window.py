@@ -0,0 +1,196 @@
+"""
+Window Layout
+
+エディタ領域の分割（:split / :vsplit）を木で管理する。
+
+- 葉はウィンドウ（表示するバッファ・スクロール位置・カーソル位置・curses のサブウィンドウ）
+- 節は分割の向きと子の並び。配置は描画のたびに画面サイズから求め、
+  変わったウィンドウだけサブウィンドウを作り直す
+- ウィンドウの間には区切り（上下分割ではバッファ名を出す行、左右分割では縦線）を置く
+"""
+
+from typing import List, Optional, Tuple
+
+from .damage import DamageTracker
+from .editor_display import EditorDisplay
+
+# (y, x, 高さ, 幅)
+Rect = Tuple[int, int, int, int]
+
+
+class Window:
+    """分割された編集領域の1つ"""
+
+    def __init__(self, entry, display: EditorDisplay):
+        self.entry = entry            # 表示するバッファ（BufferEntry）
+        self.display = display        # スクロール位置・表示設定・折り返し索引
+        self.cursor = (0, 0)          # アクティブでない間のカーソル位置
+        self.damage = DamageTracker() # このウィンドウで再描画が必要な行
+        self.rect: Optional[Rect] = None
+        self.win = None               # curses のサブウィンドウ（derwin）
+        self.win_rect: Optional[Rect] = None  # サブウィンドウを作ったときの rect
+        self.private_layouts = None   # 表示中でないバッファを表示するときの LayoutCache
+        self.private_highlighter = None  # 同上の SyntaxHighlighter
+
+
+class WindowSplit:
+    """分割の節（'horizontal' は上下に、'vertical' は左右に並べる）"""
+
+    def __init__(self, direction: str, children: list):
+        self.direction = direction
+        self.children = children
+
+
+class WindowLayout:
+    """ウィンドウの分割木"""
+
+    MIN_HEIGHT = 1  # ウィンドウの最小の高さ（区切りを除く）
+    MIN_WIDTH = 1
+
+    def __init__(self, window: Window):
+        self.root = window
+        self.current = window
+        self.separators: List[Tuple[str, int, int, int, Window]] = []  # (向き, y, x, 長さ, 上/左のウィンドウ)
+
+    @property
+    def windows(self) -> List[Window]:
+        """ウィンドウを画面の並び順で取得"""
+        result = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Window):
+                result.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return result
+
+    def __len__(self) -> int:
+        return len(self.windows)
+
+    def _parent(self, target, node=None) -> Optional[WindowSplit]:
+        node = node or self.root
+        if isinstance(node, Window):
+            return None
+        for child in node.children:
+            if child is target:
+                return node
+            parent = self._parent(target, child)
+            if parent is not None:
+                return parent
+        return None
+
+    # --- 分割・削除 ---
+    def split(self, window: Window, new_window: Window, direction: str):
+        """window を分割して new_window を上（左）に置く"""
+        parent = self._parent(window)
+        if parent is not None and parent.direction == direction:
+            # 同じ向きの分割に並べる
+            index = parent.children.index(window)
+            parent.children.insert(index, new_window)
+            return
+        split = WindowSplit(direction, [new_window, window])
+        if parent is None:
+            self.root = split
+        else:
+            parent.children[parent.children.index(window)] = split
+
+    def close(self, window: Window) -> Optional[Window]:
+        """window を閉じ、代わりにアクティブにするウィンドウを返す（最後の1つは閉じない）"""
+        parent = self._parent(window)
+        if parent is None:
+            return None
+        index = parent.children.index(window)
+        parent.children.pop(index)
+        if len(parent.children) == 1:
+            # 子が1つになった節はその子で置き換える
+            child = parent.children[0]
+            grandparent = self._parent(parent)
+            if grandparent is None:
+                self.root = child
+            else:
+                grandparent.children[grandparent.children.index(parent)] = child
+        neighbor = parent.children[min(index, len(parent.children) - 1)]
+        while not isinstance(neighbor, Window):
+            neighbor = neighbor.children[0]
+        return neighbor
+
+    def only(self, window: Window) -> List[Window]:
+        """window 以外を閉じ、閉じたウィンドウを返す"""
+        closed = [other for other in self.windows if other is not window]
+        self.root = window
+        return closed
+
+    # --- 配置 ---
+    def arrange(self, y: int, x: int, height: int, width: int):
+        """画面の領域にウィンドウを配置（rect と区切りの位置を更新）"""
+        self.separators = []
+        self._arrange(self.root, y, x, height, width)
+
+    def _arrange(self, node, y: int, x: int, height: int, width: int):
+        if isinstance(node, Window):
+            node.rect = (y, x, max(self.MIN_HEIGHT, height), max(self.MIN_WIDTH, width))
+            return
+        count = len(node.children)
+        vertical = node.direction == 'vertical'
+        # 区切りの分を除いて均等に分ける（余りは前から1ずつ）
+        total = (width if vertical else height) - (count - 1)
+        size, extra = divmod(max(total, count), count)
+        offset = x if vertical else y
+        for i, child in enumerate(node.children):
+            length = size + (1 if i < extra else 0)
+            if vertical:
+                self._arrange(child, y, offset, height, length)
+            else:
+                self._arrange(child, offset, x, length, width)
+            offset += length
+            if i < count - 1:
+                last = self._last_window(child)
+                if vertical:
+                    self.separators.append(('vertical', y, offset, height, last))
+                else:
+                    self.separators.append(('horizontal', offset, x, width, last))
+                offset += 1
+
+    @staticmethod
+    def _last_window(node) -> Window:
+        """節の中で最後（下・右）のウィンドウ"""
+        while not isinstance(node, Window):
+            node = node.children[-1]
+        return node
+
+    # --- 移動 ---
+    def next(self, window: Window, count: int = 1) -> Window:
+        """画面の並び順で count 個先（負なら前）のウィンドウ"""
+        windows = self.windows
+        return windows[(windows.index(window) + count) % len(windows)]
+
+    def neighbor(self, window: Window, direction: str, cursor: Tuple[int, int]) -> Optional[Window]:
+        """direction（'h' / 'j' / 'k' / 'l'）の方向に隣接するウィンドウ
+
+        cursor はカーソルの画面座標で、並んだ候補のうちカーソルの行・桁に重なるものを選ぶ
+        """
+        if window.rect is None:
+            return None
+        y, x, height, width = window.rect
+        cursor_y, cursor_x = cursor
+        best = None
+        best_key = None
+        for other in self.windows:
+            if other is window or other.rect is None:
+                continue
+            oy, ox, oheight, owidth = other.rect
+            if direction == 'h' and ox + owidth < x:
+                distance, overlap = x - (ox + owidth), oy <= cursor_y < oy + oheight
+            elif direction == 'l' and ox > x + width:
+                distance, overlap = ox - (x + width), oy <= cursor_y < oy + oheight
+            elif direction == 'k' and oy + oheight < y:
+                distance, overlap = y - (oy + oheight), ox <= cursor_x < ox + owidth
+            elif direction == 'j' and oy > y + height:
+                distance, overlap = oy - (y + height), ox <= cursor_x < ox + owidth
+            else:
+                continue
+            key = (distance, not overlap)
+            if best_key is None or key < best_key:
+                best, best_key = other, key
+        return best
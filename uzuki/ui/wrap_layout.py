@@ -0,0 +1,226 @@
+"""
+Wrap Layout
+
+折り返し表示（wrap）でのバッファ行と画面行の対応。
+
+行ごとの画面行数をチャンクに分けて持ち、チャンクごとの行数・画面行数を
+Fenwick 木で管理する（ChunkedLineStore と同じ構成）。
+
+- バッファ行 -> 先頭の画面行、画面行 -> バッファ行の変換は O(log n) + O(チャンクサイズ)
+- 編集では変更された行の数だけ更新し、ファイル全体は数え直さない
+- まだ表示していない行は前回の幅での行数（初めは1行）を見積もりとして使い、
+  表示するときに現在の幅で折り返し直す。そのため画面幅が変わっても
+  折り返し直すのは表示される行だけで済む
+"""
+
+from typing import List, Tuple
+
+from .line_layout import LineLayout
+
+
+class WrapLayout:
+    """バッファ行ごとの画面行数の索引"""
+
+    CHUNK_SIZE = 512  # チャンク分割時の目標行数
+    CHUNK_MAX = 1024  # これを超えたら分割
+
+    def __init__(self):
+        self.width = 0     # 折り返し幅（表示桁）
+        self._lines = None  # 索引が対応する行ストア
+        self._buffer = None  # 監視しているバッファ
+        self._counts: List[List[int]] = []   # チャンクごとの各行の画面行数
+        self._widths: List[List[int]] = []   # 各行を数えたときの幅（0 は未計測）
+        self._line_tree: List[int] = [0]     # チャンク行数の Fenwick 木
+        self._row_tree: List[int] = [0]      # チャンク画面行数の Fenwick 木
+        self._top_bit = 0
+        self.total_lines = 0
+        self.total_rows = 0
+
+    # --- 構築 ---
+    def sync(self, lines):
+        """行ストアが差し替えられていたら索引を作り直す（各行1行と見積もる）"""
+        if lines is self._lines and self.total_lines == len(lines):
+            return
+        self._lines = lines
+        count = len(lines)
+        size = self.CHUNK_SIZE
+        self._counts = [[1] * min(size, count - i) for i in range(0, count, size)]
+        self._widths = [[0] * len(chunk) for chunk in self._counts]
+        self.total_lines = count
+        self.total_rows = count
+        self._rebuild_index()
+
+    def clear(self):
+        """索引を捨てる（折り返し表示をやめたとき）"""
+        self._lines = None
+        self._counts, self._widths = [], []
+        self.total_lines = self.total_rows = 0
+        self._rebuild_index()
+
+    def set_width(self, width: int):
+        """折り返し幅を設定（行数は表示するときに数え直す）"""
+        self.width = max(1, width)
+
+    def _rebuild_index(self):
+        """Fenwick 木を再構築（チャンクの増減時のみ）"""
+        n = len(self._counts)
+        line_tree = [0] * (n + 1)
+        row_tree = [0] * (n + 1)
+        for i, chunk in enumerate(self._counts, 1):
+            line_tree[i] += len(chunk)
+            row_tree[i] += sum(chunk)
+            parent = i + (i & -i)
+            if parent <= n:
+                line_tree[parent] += line_tree[i]
+                row_tree[parent] += row_tree[i]
+        self._line_tree = line_tree
+        self._row_tree = row_tree
+        self._top_bit = 1 << (n.bit_length() - 1) if n else 0
+
+    def _add(self, tree: List[int], chunk_index: int, delta: int):
+        i = chunk_index + 1
+        n = len(tree) - 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, tree: List[int], chunk_index: int) -> int:
+        """チャンク [0, chunk_index) の合計"""
+        total = 0
+        i = chunk_index
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _descend(self, tree: List[int], value: int) -> Tuple[int, int]:
+        """合計が value を超える最初のチャンクと、その手前までの残り"""
+        n = len(tree) - 1
+        pos = 0
+        step = self._top_bit
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= value:
+                pos = nxt
+                value -= tree[nxt]
+            step >>= 1
+        return pos, value
+
+    def _locate(self, line: int) -> Tuple[int, int]:
+        """バッファ行から (チャンク番号, チャンク内オフセット)"""
+        return self._descend(self._line_tree, line)
+
+    # --- 編集の反映 ---
+    def attach(self, buffer):
+        """バッファの編集を監視する"""
+        self._buffer = buffer
+        buffer.add_edit_listener(self.on_edit)
+
+    def detach(self):
+        """バッファの監視をやめる（ウィンドウを閉じたとき）"""
+        if self._buffer is not None:
+            self._buffer.remove_edit_listener(self.on_edit)
+            self._buffer = None
+
+    def on_edit(self, kind: str, row: int, col: int, text: str):
+        """編集された行を未計測にし、増減した行だけ索引を更新（Buffer の編集リスナー）"""
+        if self._lines is None or not self._counts:
+            return
+        if self._buffer is not None and self._buffer.lines is not self._lines:
+            # 別のバッファを表示しているウィンドウの索引
+            return
+        newlines = text.count('\n')
+        if newlines:
+            if kind == 'insert':
+                self._insert(row + 1, newlines)
+            else:
+                self._delete(row + 1, row + 1 + newlines)
+        if row < self.total_lines:
+            chunk_index, offset = self._locate(row)
+            self._widths[chunk_index][offset] = 0
+
+    def _insert(self, line: int, count: int):
+        """line の位置に count 行（各1行と見積もる）を挿入"""
+        line = min(line, self.total_lines)
+        if not self._counts:
+            self._counts, self._widths = [[]], [[]]
+            self._rebuild_index()
+        if line == self.total_lines:
+            chunk_index = len(self._counts) - 1
+            offset = len(self._counts[chunk_index])
+        else:
+            chunk_index, offset = self._locate(line)
+        counts = self._counts[chunk_index]
+        counts[offset:offset] = [1] * count
+        self._widths[chunk_index][offset:offset] = [0] * count
+        self.total_lines += count
+        self.total_rows += count
+        if len(counts) > self.CHUNK_MAX:
+            size = self.CHUNK_SIZE
+            widths = self._widths[chunk_index]
+            self._counts[chunk_index:chunk_index + 1] = [counts[i:i + size] for i in range(0, len(counts), size)]
+            self._widths[chunk_index:chunk_index + 1] = [widths[i:i + size] for i in range(0, len(widths), size)]
+            self._rebuild_index()
+        else:
+            self._add(self._line_tree, chunk_index, count)
+            self._add(self._row_tree, chunk_index, count)
+
+    def _delete(self, start: int, end: int):
+        """[start, end) の行を削除"""
+        end = min(end, self.total_lines)
+        while start < end:
+            chunk_index, offset = self._locate(start)
+            counts = self._counts[chunk_index]
+            take = min(end - start, len(counts) - offset)
+            rows = sum(counts[offset:offset + take])
+            del counts[offset:offset + take]
+            del self._widths[chunk_index][offset:offset + take]
+            self.total_lines -= take
+            self.total_rows -= rows
+            end -= take
+            if counts:
+                self._add(self._line_tree, chunk_index, -take)
+                self._add(self._row_tree, chunk_index, -rows)
+            else:
+                del self._counts[chunk_index]
+                del self._widths[chunk_index]
+                self._rebuild_index()
+
+    # --- 参照 ---
+    def line_rows(self, line: int, layout: LineLayout) -> int:
+        """line 行目の画面行数（現在の幅で数えていなければ数え直す）"""
+        chunk_index, offset = self._locate(line)
+        widths = self._widths[chunk_index]
+        counts = self._counts[chunk_index]
+        if widths[offset] == self.width:
+            return counts[offset]
+        rows = len(layout.wrap(self.width))
+        delta = rows - counts[offset]
+        counts[offset] = rows
+        widths[offset] = self.width
+        if delta:
+            self._add(self._row_tree, chunk_index, delta)
+            self.total_rows += delta
+        return rows
+
+    def row_of_line(self, line: int) -> int:
+        """line 行目の先頭の画面行（未表示の行は見積もり）"""
+        line = max(0, min(line, self.total_lines))
+        if line == self.total_lines:
+            return self.total_rows
+        chunk_index, offset = self._locate(line)
+        return self._prefix(self._row_tree, chunk_index) + sum(self._counts[chunk_index][:offset])
+
+    def line_at_row(self, row: int) -> Tuple[int, int]:
+        """画面行から (バッファ行, その行内の画面行) を求める"""
+        if self.total_lines == 0:
+            return 0, 0
+        row = max(0, min(row, self.total_rows - 1))
+        chunk_index, rest = self._descend(self._row_tree, row)
+        line = self._prefix(self._line_tree, chunk_index)
+        for count in self._counts[chunk_index]:
+            if rest < count:
+                return line, rest
+            rest -= count
+            line += 1
+        return self.total_lines - 1, 0